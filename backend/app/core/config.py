@@ -1,6 +1,6 @@
 from functools import lru_cache
 from pathlib import Path
-from typing import List
+from typing import Dict, List
 
 from pydantic import AnyUrl, Field
 from pydantic_settings import BaseSettings
@@ -19,23 +19,44 @@ class Settings(BaseSettings):
     api_key_header: str = Field(default="X-API-Key", env="API_KEY_HEADER")
     api_keys: List[str] = Field(default_factory=list, env="API_KEYS")
     rate_limit_per_minute: int = Field(default=120, env="RATE_LIMIT_PER_MINUTE")
+    rate_limit_backend: str = Field(default="redis", env="RATE_LIMIT_BACKEND")  # "redis" or "local"
 
     database_url: str = Field(default_factory=_default_database_url, env="DATABASE_URL")
+    db_pool_size: int = Field(default=10, env="DB_POOL_SIZE")
+    db_max_overflow: int = Field(default=20, env="DB_MAX_OVERFLOW")
+    db_pool_timeout: float = Field(default=30.0, env="DB_POOL_TIMEOUT")
+    db_pool_recycle: int = Field(default=1800, env="DB_POOL_RECYCLE")
+    db_pool_pre_ping: bool = Field(default=True, env="DB_POOL_PRE_PING")
+    sqlite_wal: bool = Field(default=True, env="SQLITE_WAL")
+    sqlite_synchronous: str = Field(default="NORMAL", env="SQLITE_SYNCHRONOUS")
+    sqlite_busy_timeout_ms: int = Field(default=5000, env="SQLITE_BUSY_TIMEOUT_MS")
 
     redis_url: AnyUrl = Field(
         default="redis://redis:6379/0",
         env="REDIS_URL",
     )
+    job_events_enabled: bool = Field(default=True, env="JOB_EVENTS_ENABLED")
+    job_events_stream: str = Field(default="job-events", env="JOB_EVENTS_STREAM")
+    job_events_maxlen: int = Field(default=100_000, env="JOB_EVENTS_MAXLEN")
+    metrics_reconcile_seconds: float = Field(default=60.0, env="METRICS_RECONCILE_SECONDS")
+    job_stream_heartbeat_seconds: float = Field(default=15.0, env="JOB_STREAM_HEARTBEAT_SECONDS")
+    job_stream_max_connections: int = Field(default=5000, env="JOB_STREAM_MAX_CONNECTIONS")  # per replica
+    job_stream_buffer: int = Field(default=256, env="JOB_STREAM_BUFFER")  # queued events per stream
     broker_queue: str = Field(default="pipeline", env="BROKER_QUEUE")
+    queue_tts: str = Field(default="tts", env="QUEUE_TTS")  # re-dub tasks go straight to TTS workers
 
     minio_endpoint: str = Field(default="minio:9000", env="MINIO_ENDPOINT")
     minio_access_key: str = Field(default="minioadmin", env="MINIO_ACCESS_KEY")
     minio_secret_key: str = Field(default="minioadmin", env="MINIO_SECRET_KEY")
+    minio_secure: bool = Field(default=False, env="MINIO_SECURE")
+    minio_region: str = Field(default="us-east-1", env="MINIO_REGION")
     minio_bucket_raw: str = Field(default="raw", env="MINIO_BUCKET_RAW")
     minio_bucket_processed: str = Field(default="proc", env="MINIO_BUCKET_PROCESSED")
     minio_bucket_public: str = Field(default="pub", env="MINIO_BUCKET_PUBLIC")
     upload_url_expiry_seconds: int = Field(default=3600, env="UPLOAD_URL_EXPIRY")
     download_url_expiry_seconds: int = Field(default=900, env="DOWNLOAD_URL_EXPIRY")
+    signed_url_cache_size: int = Field(default=4096, env="SIGNED_URL_CACHE_SIZE")  # 0 disables
+    signed_url_refresh_ratio: float = Field(default=0.5, env="SIGNED_URL_REFRESH_RATIO")
 
     allowed_languages: List[str] = Field(
         default_factory=lambda: ["en", "es", "fr", "de"],
@@ -44,6 +65,16 @@ class Settings(BaseSettings):
     upload_part_size: int = Field(default=8 * 1024 * 1024, env="UPLOAD_PART_SIZE")  # 8 MB
     max_upload_size: int = Field(default=8 * 1024 * 1024 * 1024, env="MAX_UPLOAD_SIZE")  # 8 GB
     max_active_jobs_per_key: int = Field(default=5, env="MAX_ACTIVE_JOBS_PER_KEY")
+    active_jobs_cache_seconds: float = Field(default=30.0, env="ACTIVE_JOBS_CACHE_SECONDS")  # 0 counts every time
+    response_cache_enabled: bool = Field(default=True, env="RESPONSE_CACHE_ENABLED")
+    response_cache_seconds: float = Field(default=300.0, env="RESPONSE_CACHE_SECONDS")
+    bulk_job_max_items: int = Field(default=1000, env="BULK_JOB_MAX_ITEMS")
+    job_coalescing: bool = Field(default=True, env="JOB_COALESCING")
+    scheduler_enabled: bool = Field(default=False, env="SCHEDULER_ENABLED")
+    scheduler_interval_seconds: float = Field(default=1.0, env="SCHEDULER_INTERVAL_SECONDS")
+    scheduler_max_inflight: int = Field(default=32, env="SCHEDULER_MAX_INFLIGHT")  # dispatched, unfinished jobs
+    scheduler_dispatch_batch: int = Field(default=8, env="SCHEDULER_DISPATCH_BATCH")  # jobs per tick
+    tenant_weights: Dict[str, float] = Field(default_factory=dict, env="TENANT_WEIGHTS")
 
     class Config:
         env_file = ".env"
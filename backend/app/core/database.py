@@ -1,25 +1,53 @@
 from collections.abc import AsyncGenerator
 
+from sqlalchemy import inspect, text
+from sqlalchemy.schema import CreateColumn
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlmodel import SQLModel
 
+from shared.database import EngineProfile, configure_sqlite, driver_url, engine_options
+
 from .config import get_settings
 
 _settings = get_settings()
+_profile = EngineProfile.from_settings(_settings)
 
-if _settings.database_url.startswith("sqlite"):
-    async_database_url = _settings.database_url.replace("sqlite:///", "sqlite+aiosqlite:///")
-else:
-    async_database_url = _settings.database_url
+async_database_url = driver_url(_settings.database_url, asynchronous=True)
 
-engine: AsyncEngine = create_async_engine(async_database_url, future=True, echo=False)
+engine: AsyncEngine = create_async_engine(
+    async_database_url, future=True, echo=False, **engine_options(async_database_url, _profile)
+)
+configure_sqlite(engine.sync_engine, _profile)
 SessionLocal = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
 
 
+def _add_missing_columns(connection) -> None:
+    # create_all skips existing tables; add columns declared since (nullable or server-defaulted).
+    inspector = inspect(connection)
+    for table in SQLModel.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing or (not column.nullable and column.server_default is None):
+                continue
+            ddl = CreateColumn(column).compile(dialect=connection.dialect)
+            connection.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {ddl}"))
+
+
+def _create_missing_indexes(connection) -> None:
+    # create_all skips existing tables, so indexes added later are created here.
+    for table in SQLModel.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(connection, checkfirst=True)
+
+
 async def init_db() -> None:
-    """Create database schema if missing."""
+    """Create database schema (and any newly declared columns/indexes) if missing."""
     async with engine.begin() as conn:
         await conn.run_sync(SQLModel.metadata.create_all)
+        await conn.run_sync(_add_missing_columns)
+        await conn.run_sync(_create_missing_indexes)
 
 
 async def get_session() -> AsyncGenerator[AsyncSession, None]:
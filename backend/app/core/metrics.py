@@ -0,0 +1,44 @@
+try:  # pragma: no cover - prometheus_client may be missing in unit test envs
+    from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, Counter, Gauge, Histogram, generate_latest
+except ImportError:  # pragma: no cover
+    from typing import Any
+
+    CONTENT_TYPE_LATEST = "text/plain; charset=utf-8"
+
+    def generate_latest(_: Any) -> bytes:
+        return b""
+
+    class _NoOpMetric:
+        def __init__(self, *args: object, **kwargs: object) -> None:
+            pass
+
+        def labels(self, **_: str) -> "_NoOpMetric":
+            return self
+
+        def inc(self, *_: float, **__: float) -> None:
+            return None
+
+        def dec(self, *_: float, **__: float) -> None:
+            return None
+
+        def set(self, *_: float, **__: float) -> None:
+            return None
+
+        def observe(self, *_: float, **__: float) -> None:
+            return None
+
+    class Counter(_NoOpMetric):
+        pass
+
+    class Gauge(_NoOpMetric):
+        pass
+
+    class Histogram(_NoOpMetric):
+        pass
+
+    class _Registry:
+        pass
+
+    REGISTRY = _Registry()
+
+__all__ = ["CONTENT_TYPE_LATEST", "REGISTRY", "Counter", "Gauge", "Histogram", "generate_latest"]
@@ -2,9 +2,10 @@ from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from .core.config import get_settings
-from .core.database import init_db
+from .core.database import SessionLocal, init_db
 from .dependencies.security import require_api_key
 from .routes import assets, health, jobs, uploads, metrics
+from .services import active_jobs, job_events, job_metrics, scheduler
 
 settings = get_settings()
 
@@ -27,6 +28,19 @@ app.add_middleware(
 @app.on_event("startup")
 async def on_startup() -> None:
     await init_db()
+    job_events.start()
+    job_metrics.start(SessionLocal)
+    active_jobs.start()
+    if settings.scheduler_enabled:
+        scheduler.start(SessionLocal)
+
+
+@app.on_event("shutdown")
+async def on_shutdown() -> None:
+    await scheduler.stop()
+    await active_jobs.stop()
+    await job_metrics.stop()
+    await job_events.stop()
 
 
 secure_dependency = Depends(require_api_key)
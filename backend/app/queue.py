@@ -1,9 +1,14 @@
 from __future__ import annotations
 
+import logging
+import time
+from typing import Any, List, Optional, Sequence, Tuple
+
 from celery import Celery
 
 from .core.config import get_settings
 
+_log = logging.getLogger(__name__)
 settings = get_settings()
 
 celery_app = Celery(
@@ -16,11 +21,58 @@ celery_app.conf.task_default_queue = settings.broker_queue
 celery_app.conf.result_expires = 3600
 
 
-def enqueue_pipeline_job(job_external_id: str, resume_from: str | None = None) -> str:
+def enqueue_pipeline_job(
+    job_external_id: str,
+    resume_from: str | None = None,
+    *,
+    task_id: Optional[str] = None,
+    producer: Any = None,
+) -> str:
     """Send the master pipeline task to Celery."""
     task = celery_app.send_task(
         "workers.pipeline.run_pipeline",
         kwargs={"job_id": job_external_id, "resume_from": resume_from},
         queue=settings.broker_queue,
+        task_id=task_id,
+        producer=producer,
+        # Lets workers measure how long the task waited in the queue.
+        headers={"enqueued_at": time.time()},
     )
     return task.id
+
+
+def enqueue_pipeline_jobs(jobs: Sequence[Tuple[str, Optional[str], Optional[str]]]) -> List[str]:
+    """Send `(job_external_id, resume_from, task_id)` pipeline tasks over one broker connection.
+
+    One producer (connection and channel) is acquired for the whole batch instead
+    of one pool checkout per task. Returns the ids of the tasks sent, in order:
+    sending stops at the first broker error, so a shorter list means the
+    remaining jobs were never queued.
+    """
+    sent: List[str] = []
+    try:
+        with celery_app.producer_or_acquire() as producer:
+            for job_external_id, resume_from, task_id in jobs:
+                sent.append(enqueue_pipeline_job(job_external_id, resume_from, task_id=task_id, producer=producer))
+    except Exception as exc:
+        _log.warning("Queued %d of %d pipeline tasks before the broker failed (%s)", len(sent), len(jobs), exc)
+    return sent
+
+
+def enqueue_redub_job(job_external_id: str) -> str:
+    """Send the re-dub task for a job's dirty segments to Celery."""
+    task = celery_app.send_task(
+        "workers.pipeline.run_redub_stage",
+        kwargs={"job_id": job_external_id},
+        queue=settings.queue_tts,
+        headers={"enqueued_at": time.time()},
+    )
+    return task.id
+
+
+def revoke_task(task_id: str) -> None:
+    """Drop a queued task (workers skip revoked ids); a running stage stops at its next checkpoint."""
+    try:
+        celery_app.control.revoke(task_id)
+    except Exception as exc:  # pragma: no cover - depends on the broker
+        _log.warning("Could not revoke task %s (%s)", task_id, exc)
@@ -1,10 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..core.config import get_settings
 from ..core.database import get_session
-from ..schemas.assets import AssetResponse
+from ..models import JobStage
+from ..queue import enqueue_redub_job
+from ..schemas.assets import AssetResponse, SegmentEditRequest, SegmentEditResponse
 from ..services import assets as asset_service
+from ..services import jobs as job_service
+from ..services import response_cache
 from ..services import storage
 
 router = APIRouter(prefix="/assets", tags=["assets"])
@@ -33,12 +39,17 @@ def _map_asset(asset) -> AssetResponse:
 @router.get("/{asset_id}", response_model=AssetResponse)
 async def get_asset(
     asset_id: str,
+    request: Request,
     session: AsyncSession = Depends(get_session),
-) -> AssetResponse:
-    asset = await asset_service.get_asset_by_external_id(session, asset_id)
-    if asset is None:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Asset not found.")
-    return _map_asset(asset)
+) -> Response:
+    async def load() -> bytes:
+        asset = await asset_service.get_asset_by_external_id(session, asset_id)
+        if asset is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Asset not found.")
+        return _map_asset(asset).model_dump_json(by_alias=True).encode()
+
+    # Served from the response cache, or 304 when the client's ETag still matches.
+    return await response_cache.respond(request, response_cache.ASSET, asset_id, load)
 
 
 @router.get("/{asset_id}/hls/master.m3u8")
@@ -61,3 +72,42 @@ async def get_asset_master_playlist(
         "assetId": asset.external_id,
         "masterUrl": storage.build_signed_url(public_key, bucket=settings.minio_bucket_public),
     }
+
+
+@router.patch("/{asset_id}/segments", response_model=SegmentEditResponse)
+async def edit_segments(
+    asset_id: str,
+    payload: SegmentEditRequest,
+    request: Request,
+    session: AsyncSession = Depends(get_session),
+) -> SegmentEditResponse:
+    asset = await asset_service.get_asset_by_external_id(session, asset_id)
+    if asset is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Asset not found.")
+    if f"public_{payload.target_lang}" not in asset.storage_keys:
+        # Segment indices are checked by the re-dub worker, which has the translations.
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No published dub for this language.")
+    edits = {edit.idx: edit.text for edit in payload.edits}
+    dirty = await asset_service.mark_segments_edited(session, asset=asset, language=payload.target_lang, edits=edits)
+
+    job_id = None
+    if payload.redub:
+        client_id = getattr(request.state, "client_id", "anonymous")
+        # Re-dubs bypass the job scheduler: they only touch the edited segments.
+        presets = payload.presets
+        if presets is None:
+            presets = await job_service.latest_presets(session, asset_id=asset.id, language=payload.target_lang)  # type: ignore[arg-type]
+        job = await job_service.create_job(
+            session,
+            asset=asset,
+            target_langs=[payload.target_lang],
+            presets=presets,
+            requested_by=client_id if client_id != "anonymous" else None,
+            stage=JobStage.TTS,
+            dispatched_at=datetime.utcnow(),
+            kind="redub",
+        )
+        task_id = enqueue_redub_job(job_external_id=job.external_id)
+        await job_service.record_task_id(session, job=job, task_id=task_id)
+        job_id = job.external_id
+    return SegmentEditResponse(assetId=asset.external_id, targetLang=payload.target_lang, dirty=dirty, jobId=job_id)
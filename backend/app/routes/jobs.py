@@ -1,26 +1,48 @@
-from typing import Optional
+import asyncio
+import json
+import uuid
+import weakref
+from contextlib import AsyncExitStack, ExitStack
+from datetime import datetime
+from typing import AsyncIterator, List, Literal, Optional, Tuple
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.background import BackgroundTask
 
 from ..core.config import get_settings
 from ..core.database import get_session
 from ..models import Asset, Job, JobStage, JobStatus
 from ..schemas.jobs import (
+    BulkJobCreateRequest,
+    BulkJobCreateResponse,
+    BulkJobResult,
     JobCreateRequest,
     JobListResponse,
     JobResponse,
     JobRetryRequest,
 )
 from ..services import assets as asset_service
+from ..services import active_jobs, job_events, job_streams, response_cache
 from ..services import jobs as job_service
-from ..queue import enqueue_pipeline_job
+from ..services import scheduler
+from ..queue import enqueue_pipeline_job, enqueue_pipeline_jobs, revoke_task
 
 router = APIRouter(prefix="/jobs", tags=["jobs"])
 settings = get_settings()
 
+# Serializes coalescing decisions per asset within this process.
+_coalesce_locks: "weakref.WeakValueDictionary[int, asyncio.Lock]" = weakref.WeakValueDictionary()
 
-def map_job(job: Job, asset_external_id: str) -> JobResponse:
+
+def map_job(
+    job: Job,
+    asset_external_id: str,
+    *,
+    coalesced: bool = False,
+    coalesced_with: Optional[List[Job]] = None,
+) -> JobResponse:
     return JobResponse(
         jobId=job.external_id,
         assetId=asset_external_id,
@@ -34,23 +56,61 @@ def map_job(job: Job, asset_external_id: str) -> JobResponse:
         targetLangs=job.target_langs,
         presets=job.presets,
         logsKey=job.logs_key,
+        priority=job.priority,
+        kind=job.kind,
+        dispatchedAt=job.dispatched_at,
         stageHistory=job.stage_history or {},
+        coalesced=coalesced,
+        coalescedWith=[other.external_id for other in coalesced_with or []],
     )
 
 
+def _coalesce(target_langs: List[str], inflight: List[Job]) -> Tuple[List[str], List[Job]]:
+    """Languages still to schedule, and the in-flight jobs that already cover the others."""
+    leader = next((job for job in inflight if set(target_langs) <= set(job.target_langs)), None)
+    if leader is not None:
+        return [], [leader]
+    # Languages already in flight are left to those jobs; only the rest is scheduled.
+    coalesced_with: List[Job] = []
+    for job in inflight:
+        if any(lang in job.target_langs for lang in target_langs):
+            coalesced_with.append(job)
+            target_langs = [lang for lang in target_langs if lang not in job.target_langs]
+    return target_langs, coalesced_with
+
+
 @router.get("", response_model=JobListResponse)
 async def list_jobs(
+    request: Request,
     page: int = Query(1, ge=1),
     page_size: int = Query(20, alias="pageSize", ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="`nextCursor` of the previous page"),
+    job_status: Optional[JobStatus] = Query(None, alias="status"),
+    stage: Optional[JobStage] = Query(None),
+    requested_by: Optional[str] = Query(None, alias="requestedBy", description='Requester id, or "me"'),
+    total: Literal["exact", "estimate", "none"] = Query("exact"),
     session: AsyncSession = Depends(get_session),
 ) -> JobListResponse:
-    jobs, total = await job_service.list_jobs(session, page=page, page_size=page_size)
-    responses: list[JobResponse] = []
-    for job in jobs:
-        asset = await session.get(Asset, job.asset_id)
-        asset_external_id = asset.external_id if asset else str(job.asset_id)
-        responses.append(map_job(job, asset_external_id))
-    return JobListResponse(items=responses, total=total, page=page, page_size=page_size)
+    if requested_by == "me":
+        requested_by = _client_id(request)
+    filters = job_service.JobFilters(status=job_status, stage=stage, requested_by=requested_by)
+    try:
+        rows, next_cursor = await job_service.list_jobs(
+            session, page_size=page_size, cursor=cursor, page=page, filters=filters
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    count, estimated = None, False
+    if total != "none":
+        count, estimated = await job_service.count_jobs(session, filters=filters, estimate=total == "estimate")
+    return JobListResponse(
+        items=[map_job(job, asset_external_id or str(job.asset_id)) for job, asset_external_id in rows],
+        total=count,
+        totalEstimated=estimated,
+        page=page,
+        pageSize=page_size,
+        nextCursor=next_cursor,
+    )
 
 
 @router.post("/translate", response_model=JobResponse)
@@ -74,40 +134,260 @@ async def create_translation_job(
         asset.target_langs = payload.target_langs
         session.add(asset)
         await session.commit()
+        await response_cache.invalidate_assets(asset.external_id)
 
     client_id = _client_id(request)
-    if settings.max_active_jobs_per_key > 0 and client_id != "anonymous":
-        active = await job_service.count_active_jobs_for_requester(session, client_id)
-        if active >= settings.max_active_jobs_per_key:
-            raise HTTPException(
-                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                detail="Job quota exceeded for this API key.",
+    requested_by = client_id if client_id != "anonymous" else None
+    lock = _coalesce_locks.setdefault(asset.id, asyncio.Lock())  # type: ignore[arg-type]
+    async with lock:
+        target_langs = list(payload.target_langs)
+        coalesced_with: List[Job] = []
+        if settings.job_coalescing:
+            inflight = await job_service.find_inflight_jobs(
+                session,
+                asset_id=asset.id,  # type: ignore[arg-type]
+                presets=payload.presets,
+                requested_by=requested_by,
             )
+            target_langs, coalesced_with = _coalesce(target_langs, inflight)
+            if not target_langs:
+                return map_job(coalesced_with[0], asset.external_id, coalesced=True, coalesced_with=coalesced_with[1:])
+
+        if settings.max_active_jobs_per_key > 0 and requested_by is not None:
+            active = await active_jobs.tracker.count(session, client_id)
+            if active >= settings.max_active_jobs_per_key:
+                raise HTTPException(
+                    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                    detail="Job quota exceeded for this API key.",
+                )
+
+        job = await job_service.create_job(
+            session,
+            asset=asset,
+            target_langs=target_langs,
+            presets=payload.presets,
+            requested_by=requested_by,
+            priority=payload.priority,
+            stage=_parse_stage(payload.resume_from),
+            dispatched_at=_dispatch_time(),
+        )
+        if requested_by is not None:
+            active_jobs.tracker.add(requested_by, [job.external_id])
+    if settings.scheduler_enabled:
+        scheduler.wake()
+    else:
+        resume_value = payload.resume_from.value if payload.resume_from else None
+        task_id = enqueue_pipeline_job(job_external_id=job.external_id, resume_from=resume_value)
+        await job_service.record_task_id(session, job=job, task_id=task_id)
+    return map_job(job, asset.external_id, coalesced_with=coalesced_with)
 
-    job = await job_service.create_job(
-        session,
-        asset=asset,
-        target_langs=payload.target_langs,
-        presets=payload.presets,
-        requested_by=client_id if client_id != "anonymous" else None,
+
+@router.post("/translate/bulk", response_model=BulkJobCreateResponse)
+async def create_translation_jobs(
+    payload: BulkJobCreateRequest,
+    request: Request,
+    session: AsyncSession = Depends(get_session),
+) -> BulkJobCreateResponse:
+    """Create many jobs at once: one asset query, one INSERT transaction, one broker connection.
+
+    Each item is validated, coalesced and counted against the quota like a
+    `POST /translate` call (earlier items of the batch count as in flight), and
+    fails on its own with the status that call would have returned.
+    """
+    if len(payload.items) > settings.bulk_job_max_items:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {settings.bulk_job_max_items} items per request.",
+        )
+    assets = await asset_service.get_assets_by_external_ids(session, (item.asset_id for item in payload.items))
+    client_id = _client_id(request)
+    requested_by = client_id if client_id != "anonymous" else None
+    results: List[Optional[BulkJobResult]] = [None] * len(payload.items)
+    created: List[Tuple[int, Job, Asset, List[Job], Optional[JobStage]]] = []
+    changed_assets: List[str] = []
+
+    async with AsyncExitStack() as locks:
+        for asset in sorted(assets.values(), key=lambda item: item.id):  # fixed order; no lock cycles
+            await locks.enter_async_context(_coalesce_locks.setdefault(asset.id, asyncio.Lock()))  # type: ignore[arg-type]
+        inflight = (
+            await job_service.find_inflight_jobs_by_asset(session, (asset.id for asset in assets.values()))
+            if settings.job_coalescing
+            else {}
+        )
+        quota = settings.max_active_jobs_per_key if requested_by is not None else 0
+        active = await active_jobs.tracker.count(session, client_id) if quota > 0 else 0
+
+        for index, item in enumerate(payload.items):
+            asset = assets.get(item.asset_id)
+            if asset is None:
+                results[index] = BulkJobResult(index=index, status=status.HTTP_404_NOT_FOUND, error="Asset not found.")
+                continue
+            unsupported = [language for language in item.target_langs if language not in settings.allowed_languages]
+            if unsupported:
+                results[index] = BulkJobResult(
+                    index=index,
+                    status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                    error=f"Unsupported language requested: {unsupported[0]}",
+                )
+                continue
+            if not asset.target_langs:
+                asset.target_langs = list(item.target_langs)
+                session.add(asset)
+                changed_assets.append(asset.external_id)
+
+            target_langs = list(item.target_langs)
+            coalesced_with: List[Job] = []
+            if settings.job_coalescing:
+                candidates = [
+                    job
+                    for job in inflight.get(asset.id, [])  # type: ignore[arg-type]
+                    if job_service.same_output(job, presets=item.presets, requested_by=requested_by)
+                ]
+                target_langs, coalesced_with = _coalesce(target_langs, candidates)
+                if not target_langs:
+                    job_response = map_job(
+                        coalesced_with[0], asset.external_id, coalesced=True, coalesced_with=coalesced_with[1:]
+                    )
+                    results[index] = BulkJobResult(index=index, status=status.HTTP_200_OK, job=job_response)
+                    continue
+            if quota > 0 and active >= quota:
+                results[index] = BulkJobResult(
+                    index=index,
+                    status=status.HTTP_429_TOO_MANY_REQUESTS,
+                    error="Job quota exceeded for this API key.",
+                )
+                continue
+
+            job = job_service.build_job(
+                asset=asset,
+                target_langs=target_langs,
+                presets=item.presets,
+                requested_by=requested_by,
+                priority=item.priority,
+                stage=_parse_stage(item.resume_from),
+                dispatched_at=_dispatch_time(),
+                # Known before the INSERT, so the task id needs no second write.
+                task_id=None if settings.scheduler_enabled else str(uuid.uuid4()),
+            )
+            active += 1
+            inflight.setdefault(asset.id, []).append(job)  # type: ignore[arg-type]
+            created.append((index, job, asset, coalesced_with, item.resume_from))
+
+        await job_service.create_jobs(session, [job for _, job, _, _, _ in created])
+        await response_cache.invalidate_assets(*changed_assets)
+        if requested_by is not None:
+            active_jobs.tracker.add(requested_by, [job.external_id for _, job, _, _, _ in created])
+
+    if created:
+        if settings.scheduler_enabled:
+            scheduler.wake()
+        else:
+            # Up to `bulk_job_max_items` blocking broker publishes; keep them off the event loop.
+            sent = await asyncio.to_thread(
+                enqueue_pipeline_jobs,
+                [
+                    (job.external_id, resume_from.value if resume_from else None, job.task_id)
+                    for _, job, _, _, resume_from in created
+                ],
+            )
+            unqueued = created[len(sent) :]
+            created = created[: len(sent)]
+            await job_service.fail_unqueued_jobs(
+                session, [job for _, job, _, _, _ in unqueued], "Could not be queued (broker unavailable)."
+            )
+            for index, job, _, _, _ in unqueued:
+                results[index] = BulkJobResult(
+                    index=index,
+                    status=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    error=f"Job {job.external_id} could not be queued; retry it or resubmit the item.",
+                )
+    for index, job, asset, coalesced_with, _ in created:
+        job_response = map_job(job, asset.external_id, coalesced_with=coalesced_with)
+        results[index] = BulkJobResult(index=index, status=status.HTTP_200_OK, job=job_response)
+
+    items = [result for result in results if result is not None]
+    return BulkJobCreateResponse(
+        items=items,
+        created=len(created),
+        coalesced=sum(1 for result in items if result.job is not None and result.job.coalesced),
+        failed=sum(1 for result in items if result.error is not None),
     )
-    resume_value = payload.resume_from.value if payload.resume_from else None
-    enqueue_pipeline_job(job_external_id=job.external_id, resume_from=resume_value)
-    return map_job(job, asset.external_id)
 
 
 @router.get("/{job_id}", response_model=JobResponse)
 async def get_job(
     job_id: str,
+    request: Request,
     session: AsyncSession = Depends(get_session),
-) -> JobResponse:
-    job = await job_service.get_job_by_external_id(session, job_id)
-    if job is None:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found.")
+) -> Response:
+    async def load() -> bytes:
+        job = await job_service.get_job_by_external_id(session, job_id)
+        if job is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found.")
+        asset = await session.get(Asset, job.asset_id)
+        asset_external_id = asset.external_id if asset else str(job.asset_id)
+        return map_job(job, asset_external_id).model_dump_json(by_alias=True).encode()
+
+    # Served from the response cache, or 304 when the client's ETag still matches.
+    return await response_cache.respond(request, response_cache.JOB, job_id, load)
+
+
+_FINAL_STATUSES = {JobStatus.SUCCESS.value, JobStatus.FAILED.value, JobStatus.CANCELLED.value}
 
-    asset = await session.get(Asset, job.asset_id)
-    asset_external_id = asset.external_id if asset else str(job.asset_id)
-    return map_job(job, asset_external_id)
+
+@router.get("/{job_id}/events", response_class=StreamingResponse)
+async def stream_job(
+    job_id: str,
+    request: Request,
+    session: AsyncSession = Depends(get_session),
+) -> StreamingResponse:
+    """Server-Sent Events: a `job` snapshot, then one `progress` event per change until the job ends."""
+    if not job_events.following():
+        # Without the event stream this replica would never see worker updates.
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Progress streaming unavailable.")
+    if job_streams.connections() >= settings.job_stream_max_connections:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Too many progress streams.")
+    # Watch before reading the snapshot, so no change falls between the two.
+    with ExitStack() as setup:
+        watcher = setup.enter_context(job_streams.watch(job_id))
+        job = await job_service.get_job_by_external_id(session, job_id)
+        if job is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found.")
+        asset = await session.get(Asset, job.asset_id)
+        snapshot = map_job(job, asset.external_id if asset else str(job.asset_id))
+        stack = setup.pop_all()
+    # The stream can stay open for hours; do not hold a pooled connection meanwhile.
+    await session.close()
+    return StreamingResponse(
+        _progress_events(watcher, snapshot, request, stack),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        # Also runs when the client disconnects before the first event.
+        background=BackgroundTask(stack.close),
+    )
+
+
+def _sse(event: str, data: str) -> str:
+    return f"event: {event}\ndata: {data}\n\n"
+
+
+async def _progress_events(
+    watcher: job_streams.Watcher, snapshot: JobResponse, request: Request, stack: ExitStack
+) -> AsyncIterator[str]:
+    with stack:
+        yield _sse("job", snapshot.model_dump_json(by_alias=True))
+        if snapshot.status.value in _FINAL_STATUSES:
+            return
+        while not watcher.overflowed:
+            event = await watcher.next(settings.job_stream_heartbeat_seconds)
+            if event is None:
+                if await request.is_disconnected():
+                    return
+                yield ": keepalive\n\n"
+                continue
+            yield _sse("progress", json.dumps(event))
+            if event.get("status") in _FINAL_STATUSES:
+                return
 
 
 def _parse_stage(value: Optional[JobStage]) -> JobStage:
@@ -118,6 +398,11 @@ def _client_id(request: Request) -> str:
     return getattr(request.state, "client_id", "anonymous")
 
 
+def _dispatch_time() -> Optional[datetime]:
+    # Jobs are left undispatched for the scheduler; otherwise they go to Celery right away.
+    return None if settings.scheduler_enabled else datetime.utcnow()
+
+
 @router.post("/{job_id}/retry", response_model=JobResponse)
 async def retry_job(
     job_id: str,
@@ -132,8 +417,14 @@ async def retry_job(
     client_id = _client_id(request)
     if job.requested_by and client_id != job.requested_by:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Cannot retry jobs created by another API key.")
-    await job_service.reset_job_for_retry(session, job=job, resume_stage=resume_stage)
-    enqueue_pipeline_job(job_external_id=job.external_id, resume_from=resume_stage.value)
+    await job_service.reset_job_for_retry(
+        session, job=job, resume_stage=resume_stage, dispatched_at=_dispatch_time()
+    )
+    if settings.scheduler_enabled:
+        scheduler.wake()
+    else:
+        task_id = enqueue_pipeline_job(job_external_id=job.external_id, resume_from=resume_stage.value)
+        await job_service.record_task_id(session, job=job, task_id=task_id)
     asset = await session.get(Asset, job.asset_id)
     asset_external_id = asset.external_id if asset else str(job.asset_id)
     return map_job(job, asset_external_id)
@@ -154,4 +445,7 @@ async def cancel_job(
     if job.requested_by and client_id != job.requested_by:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Cannot cancel jobs created by another API key.")
     await job_service.cancel_job(session, job=job)
+    if job.task_id:
+        # Revoking broadcasts over the broker with a blocking client; keep it off the event loop.
+        await asyncio.to_thread(revoke_task, job.task_id)
     return Response(status_code=status.HTTP_204_NO_CONTENT)
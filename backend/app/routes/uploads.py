@@ -1,4 +1,5 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from minio.error import S3Error
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..core.config import get_settings
@@ -7,6 +8,7 @@ from ..schemas.uploads import (
     UploadCompleteRequest,
     UploadInitRequest,
     UploadInitResponse,
+    UploadStatusResponse,
 )
 from ..services import assets as asset_service
 from ..services import storage
@@ -47,11 +49,49 @@ async def init_upload(
     return UploadInitResponse(
         assetId=asset_id,
         uploadId=upload_id,
-        partSize=settings.upload_part_size,
+        partSize=storage.part_size_for(payload.size),
         parts=parts,
     )
 
 
+@router.get("/{asset_id}/parts", response_model=UploadStatusResponse)
+async def get_upload_parts(
+    asset_id: str,
+    upload_id: str = Query(..., alias="uploadId"),
+    size: int = Query(..., ge=0),
+    session: AsyncSession = Depends(get_session),
+) -> UploadStatusResponse:
+    """List parts already stored and re-sign URLs for the missing ones (resume)."""
+    asset = await asset_service.get_asset_by_external_id(session, asset_id)
+    if asset is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Asset not found.")
+
+    object_name = asset.storage_keys.get("raw")
+    if object_name is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Upload not initialized correctly for asset.",
+        )
+
+    try:
+        uploaded = storage.list_uploaded_parts(object_name, upload_id)
+    except S3Error as exc:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Upload not found: {exc.code}") from exc
+    pending = storage.get_presigned_parts(
+        object_name=object_name,
+        upload_id=upload_id,
+        total_size=size,
+        skip_parts={part["partNumber"] for part in uploaded},
+    )
+    return UploadStatusResponse(
+        assetId=asset.external_id,
+        uploadId=upload_id,
+        partSize=storage.part_size_for(size),
+        uploadedParts=uploaded,
+        parts=pending,
+    )
+
+
 @router.post("/complete")
 async def complete_upload(
     payload: UploadCompleteRequest,
@@ -68,7 +108,13 @@ async def complete_upload(
             detail="Upload not initialized correctly for asset.",
         )
 
-    storage.complete_multipart_upload(object_name, payload.upload_id, payload.etags)
+    try:
+        storage.complete_multipart_upload(object_name, payload.upload_id, payload.etags)
+    except (S3Error, ValueError) as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Could not complete multipart upload: {exc}",
+        ) from exc
     asset = await asset_service.upsert_asset_by_external_id(
         session,
         external_id=payload.asset_id,
@@ -38,3 +38,29 @@ class AssetResponse(AssetBase):
 
     class Config:
         allow_population_by_field_name = True
+
+
+class SegmentEdit(BaseModel):
+    idx: int = Field(ge=0)
+    text: str = Field(min_length=1)
+
+
+class SegmentEditRequest(BaseModel):
+    target_lang: Languages = Field(alias="targetLang")
+    edits: List[SegmentEdit] = Field(min_length=1)
+    redub: bool = True
+    # Defaults to the presets of the last successful job for the language.
+    presets: Optional[Dict[str, str]] = None
+
+    class Config:
+        allow_population_by_field_name = True
+
+
+class SegmentEditResponse(BaseModel):
+    asset_id: str = Field(alias="assetId")
+    target_lang: Languages = Field(alias="targetLang")
+    dirty: List[int] = Field(default_factory=list)
+    job_id: Optional[str] = Field(default=None, alias="jobId")
+
+    class Config:
+        allow_population_by_field_name = True
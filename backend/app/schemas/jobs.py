@@ -12,11 +12,16 @@ class JobCreateRequest(BaseModel):
     target_langs: List[Languages] = Field(alias="targetLangs")
     presets: Dict[str, str] = Field(default_factory=dict)
     resume_from: Optional[JobStage] = Field(default=None, alias="resumeFrom")
+    priority: int = Field(default=0, ge=0, le=9)
 
     class Config:
         allow_population_by_field_name = True
 
 
+class BulkJobCreateRequest(BaseModel):
+    items: List[JobCreateRequest] = Field(min_length=1)
+
+
 class JobRetryRequest(BaseModel):
     resume_from: Optional[JobStage] = Field(default=None, alias="resumeFrom")
 
@@ -38,6 +43,11 @@ class JobResponse(BaseModel):
     presets: Dict[str, str] = Field(default_factory=dict)
     stage_history: Dict[str, dict] = Field(default_factory=dict, alias="stageHistory")
     logs_key: Optional[str] = Field(default=None, alias="logsKey")
+    priority: int = 0
+    kind: str = "pipeline"
+    dispatched_at: Optional[datetime] = Field(default=None, alias="dispatchedAt")
+    coalesced: bool = False
+    coalesced_with: List[str] = Field(default_factory=list, alias="coalescedWith")
 
     class Config:
         allow_population_by_field_name = True
@@ -45,9 +55,28 @@ class JobResponse(BaseModel):
 
 class JobListResponse(BaseModel):
     items: List[JobResponse]
-    total: int
+    # None when `total=none` was requested.
+    total: Optional[int] = None
+    total_estimated: bool = Field(default=False, alias="totalEstimated")
     page: int
     page_size: int = Field(alias="pageSize")
+    next_cursor: Optional[str] = Field(default=None, alias="nextCursor")
 
     class Config:
         allow_population_by_field_name = True
+
+
+class BulkJobResult(BaseModel):
+    index: int
+    # HTTP status the item would have had on `POST /jobs/translate` (200, 404, 422 or 429),
+    # or 503 when its job was created but could not be queued.
+    status: int
+    job: Optional[JobResponse] = None
+    error: Optional[str] = None
+
+
+class BulkJobCreateResponse(BaseModel):
+    items: List[BulkJobResult]
+    created: int
+    coalesced: int
+    failed: int
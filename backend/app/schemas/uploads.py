@@ -1,4 +1,4 @@
-from typing import List
+from typing import List, Optional
 
 from pydantic import BaseModel, Field
 
@@ -12,6 +12,14 @@ class UploadInitRequest(BaseModel):
 class UploadPart(BaseModel):
     part_number: int = Field(alias="partNumber")
     upload_url: str = Field(alias="uploadUrl")
+    offset: Optional[int] = None
+    size: Optional[int] = None
+
+
+class UploadedPart(BaseModel):
+    part_number: int = Field(alias="partNumber")
+    etag: str
+    size: Optional[int] = None
 
 
 class UploadInitResponse(BaseModel):
@@ -21,10 +29,18 @@ class UploadInitResponse(BaseModel):
     parts: List[UploadPart]
 
 
+class UploadStatusResponse(BaseModel):
+    asset_id: str = Field(alias="assetId")
+    upload_id: str = Field(alias="uploadId")
+    part_size: int = Field(alias="partSize")
+    uploaded_parts: List[UploadedPart] = Field(alias="uploadedParts")
+    parts: List[UploadPart]
+
+
 class UploadCompleteRequest(BaseModel):
     asset_id: str = Field(alias="assetId")
     upload_id: str = Field(alias="uploadId")
-    etags: List[str]
+    etags: List[str] = Field(default_factory=list)
     src_lang: str = Field(alias="srcLang")
     target_langs: List[str] = Field(alias="targetLangs")
 
@@ -0,0 +1,101 @@
+"""Active (PENDING/RUNNING) job ids per API key, for `MAX_ACTIVE_JOBS_PER_KEY`.
+
+Job creation used to run a COUNT over the jobs table on every call. Now each
+replica loads a key's active jobs once, then keeps the set current from job
+events (`services/job_events.py`): API events carry the `requester` and add
+jobs (including those created on other replicas), and terminal events
+remove them. A set is reloaded after `ACTIVE_JOBS_CACHE_SECONDS`, which bounds
+the effect of lost events. While the replica is not following the event
+stream, worker updates would be missed, so every check counts in the
+database as before.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Any, Dict, Iterable, List, Set
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.config import get_settings
+from ..core.metrics import Counter
+from ..models import JobStatus
+from . import job_events
+from . import jobs as job_service
+
+settings = get_settings()
+
+_lookups = Counter("active_jobs_lookups_total", "Active job count lookups", ["result"])
+
+_ACTIVE = {JobStatus.PENDING.value, JobStatus.RUNNING.value}
+
+
+class ActiveJobs:
+    def __init__(self) -> None:
+        self._jobs: Dict[str, Set[str]] = {}
+        self._loaded_at: Dict[str, float] = {}
+        self._owners: Dict[str, str] = {}  # job id -> requester, for the loaded requesters
+        self._replays: List[List[Dict[str, Any]]] = []  # events seen while a load query runs
+
+    def apply(self, event: Dict[str, Any]) -> None:
+        for replay in self._replays:
+            replay.append(event)
+        job_id, status = event.get("job"), event.get("status")
+        if not job_id or not status:
+            return
+        if status in _ACTIVE:
+            # Worker events carry no requester; they only matter for jobs already known.
+            requester = event.get("requester") or self._owners.get(job_id)
+            if requester in self._jobs:
+                self._jobs[requester].add(job_id)
+                self._owners[job_id] = requester
+        else:
+            requester = self._owners.pop(job_id, None)
+            if requester in self._jobs:
+                self._jobs[requester].discard(job_id)
+
+    def add(self, requester: str, job_ids: Iterable[str]) -> None:
+        """Count jobs this replica just created, before their events come back."""
+        if requester in self._jobs:
+            for job_id in job_ids:
+                self._jobs[requester].add(job_id)
+                self._owners[job_id] = requester
+
+    async def count(self, session: AsyncSession, requester: str) -> int:
+        if not job_events.following() or settings.active_jobs_cache_seconds <= 0:
+            _lookups.labels(result="query").inc()
+            return await job_service.count_active_jobs_for_requester(session, requester)
+        loaded_at = self._loaded_at.get(requester)
+        if loaded_at is None or time.monotonic() - loaded_at > settings.active_jobs_cache_seconds:
+            _lookups.labels(result="load").inc()
+            await self._load(session, requester)
+        else:
+            _lookups.labels(result="cached").inc()
+        return len(self._jobs[requester])
+
+    async def _load(self, session: AsyncSession, requester: str) -> None:
+        replay: List[Dict[str, Any]] = []
+        self._replays.append(replay)
+        try:
+            job_ids = await job_service.active_job_ids_for_requester(session, requester)
+        finally:
+            self._replays.remove(replay)
+        for job_id in self._jobs.pop(requester, ()):
+            self._owners.pop(job_id, None)
+        self._jobs[requester] = set(job_ids)
+        self._owners.update((job_id, requester) for job_id in job_ids)
+        self._loaded_at[requester] = time.monotonic()
+        # Changes committed while the query ran may be missing from its result.
+        for event in replay:
+            self.apply(event)
+
+
+tracker = ActiveJobs()
+
+
+def start() -> None:
+    job_events.subscribe(tracker.apply)
+
+
+async def stop() -> None:
+    job_events.unsubscribe(tracker.apply)
@@ -2,12 +2,13 @@ from __future__ import annotations
 
 import uuid
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional
 
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..models import Asset
+from ..models import Asset, Segment
+from . import response_cache
 
 
 def generate_asset_id() -> str:
@@ -68,6 +69,7 @@ async def upsert_asset_by_external_id(
 
     await session.commit()
     await session.refresh(asset)
+    await response_cache.invalidate_assets(asset.external_id)
     return asset
 
 
@@ -79,3 +81,38 @@ async def list_assets(session: AsyncSession) -> List[Asset]:
 async def get_asset_by_external_id(session: AsyncSession, external_id: str) -> Optional[Asset]:
     result = await session.execute(select(Asset).where(Asset.external_id == external_id))
     return result.scalar_one_or_none()
+
+
+async def get_assets_by_external_ids(session: AsyncSession, external_ids: Iterable[str]) -> Dict[str, Asset]:
+    ids = list(set(external_ids))
+    if not ids:
+        return {}
+    result = await session.execute(select(Asset).where(Asset.external_id.in_(ids)))
+    return {asset.external_id: asset for asset in result.scalars()}
+
+
+async def mark_segments_edited(
+    session: AsyncSession,
+    *,
+    asset: Asset,
+    language: str,
+    edits: Dict[int, str],
+) -> List[int]:
+    """Store edited target texts and flag the segments dirty for the next re-dub."""
+    result = await session.execute(
+        select(Segment).where(
+            Segment.asset_id == asset.id,
+            Segment.language == language,
+            Segment.idx.in_(list(edits)),
+        )
+    )
+    existing = {segment.idx: segment for segment in result.scalars()}
+    now = datetime.utcnow()
+    for idx, text in edits.items():
+        segment = existing.get(idx) or Segment(asset_id=asset.id, idx=idx, language=language)  # type: ignore[arg-type]
+        segment.text_tgt = text
+        segment.dirty = True
+        segment.updated_at = now
+        session.add(segment)
+    await session.commit()
+    return sorted(edits)
@@ -0,0 +1,124 @@
+"""Job event stream in the API (see `shared/job_events.py`).
+
+One background task per replica follows the stream (blocking XREAD, starting
+after the newest entry) and hands every event to the handlers registered
+with `subscribe`. `publish` appends the API's own transitions (create, retry,
+cancel). With `JOB_EVENTS_ENABLED=false`, or while Redis is unreachable,
+`publish` calls the local handlers directly, so a single replica still sees
+its own transitions; worker events then only arrive through reconciliation.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional
+
+from shared.job_events import decode, encode
+
+from ..core.config import get_settings
+from ..core.metrics import Counter
+
+if TYPE_CHECKING:  # pragma: no cover
+    from redis.asyncio import Redis
+
+_log = logging.getLogger(__name__)
+settings = get_settings()
+
+Handler = Callable[[Dict[str, Any]], None]
+
+_events_consumed = Counter("job_events_consumed_total", "Job events received from the stream")
+
+_handlers: List[Handler] = []
+_client: Optional["Redis"] = None
+_task: Optional[asyncio.Task] = None
+_following = False
+
+
+def client() -> "Redis":
+    global _client
+    if _client is None:
+        from redis.asyncio import Redis
+
+        _client = Redis.from_url(str(settings.redis_url), socket_connect_timeout=1)
+    return _client
+
+
+def subscribe(handler: Handler) -> None:
+    if handler not in _handlers:
+        _handlers.append(handler)
+
+
+def unsubscribe(handler: Handler) -> None:
+    if handler in _handlers:
+        _handlers.remove(handler)
+
+
+def following() -> bool:
+    """Whether this replica currently receives the events of every producer (workers included)."""
+    return _following
+
+
+def dispatch(event: Dict[str, Any]) -> None:
+    for handler in list(_handlers):
+        try:
+            handler(event)
+        except Exception:  # pragma: no cover - one faulty handler must not starve the others
+            _log.exception("Job event handler %r failed", handler)
+
+
+async def publish(event: Dict[str, Any]) -> None:
+    """Append `event` to the stream, or dispatch it locally when the stream is unavailable."""
+    if settings.job_events_enabled and _following:
+        try:
+            await client().xadd(
+                settings.job_events_stream, encode(event), maxlen=settings.job_events_maxlen, approximate=True
+            )
+            return
+        except Exception as exc:
+            _log.warning("Job event publishing failed (%s); dispatching locally", exc)
+    dispatch(event)
+
+
+async def _run() -> None:
+    global _following
+    last_id = "0-0"
+    while True:
+        try:
+            if not _following:
+                # Start after the newest entry; from here on our own publishes come back through the stream.
+                newest = await client().xrevrange(settings.job_events_stream, count=1)
+                last_id = newest[0][0] if newest else "0-0"
+                _following = True
+            response = await client().xread({settings.job_events_stream: last_id}, block=5000, count=500)
+            for _stream, entries in response or []:
+                for entry_id, fields in entries:
+                    last_id = entry_id
+                    _events_consumed.inc()
+                    dispatch(decode(fields))
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            # Events published meanwhile are missed; reconciliation catches up.
+            if _following:
+                _log.warning("Job event stream unavailable (%s); retrying", exc)
+            _following = False
+            await asyncio.sleep(5)
+
+
+def start() -> None:
+    global _task
+    if settings.job_events_enabled and (_task is None or _task.done()):
+        _task = asyncio.get_running_loop().create_task(_run())
+
+
+async def stop() -> None:
+    global _task, _following
+    if _task is not None:
+        _task.cancel()
+        try:
+            await _task
+        except asyncio.CancelledError:
+            pass
+        _task = None
+    _following = False
@@ -0,0 +1,199 @@
+"""Job gauges and stage metrics, kept up to date from job events.
+
+Scrapes used to run two GROUP BY queries over the jobs table and walk the 200
+most recent `stage_history` blobs. Now each replica keeps the per-status counts
+and the stage of every active (PENDING/RUNNING) job in memory, applies each job
+event as it arrives (`services/job_events.py`), and only exports the counts on
+scrape. A background task reconciles against the database every
+`METRICS_RECONCILE_SECONDS` (one status GROUP BY plus the active jobs) to
+repair drift from lost events.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections import OrderedDict, deque
+from threading import Lock
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.config import get_settings
+from ..core.metrics import Counter, Gauge, Histogram
+from ..models import JobStage, JobStatus
+from . import job_events
+from . import jobs as job_service
+
+_log = logging.getLogger(__name__)
+settings = get_settings()
+
+_jobs_total = Gauge("jobs_total", "Jobs by status", ["status"])
+_jobs_running = Gauge("jobs_running", "Jobs currently running")
+_jobs_stage_active = Gauge("jobs_stage_active", "Jobs currently running per stage", ["stage"])
+_stage_duration = Histogram(
+    "api_stage_duration_seconds",
+    "Stage durations derived from job history",
+    ["stage"],
+    buckets=(1, 5, 10, 30, 60, 120, 300, 600),
+)
+_stage_failures = Counter("api_stage_failures_total", "Stage failures derived from job history", ["stage"])
+_reconcile_drift = Gauge("job_metrics_reconcile_drift", "Jobs whose status the last reconciliation corrected")
+
+_ACTIVE = {JobStatus.PENDING, JobStatus.RUNNING}
+_STAGE_HISTORY_CACHE_SIZE = 5000
+_FINISHED_CACHE_SIZE = 5000
+_stage_history_lock = Lock()
+_stage_history_events: set[Tuple[str, str, str]] = set()
+_stage_history_order: Deque[Tuple[str, str, str]] = deque()
+
+
+def _mark_stage_event(job_id: str, stage: str, updated_at: str | None) -> bool:
+    if not updated_at:
+        return False
+    key = (job_id, stage, updated_at)
+    with _stage_history_lock:
+        if key in _stage_history_events:
+            return False
+        _stage_history_events.add(key)
+        _stage_history_order.append(key)
+        if len(_stage_history_order) > _STAGE_HISTORY_CACHE_SIZE:
+            old_key = _stage_history_order.popleft()
+            _stage_history_events.discard(old_key)
+    return True
+
+
+def record_stage_history(job_id: str, history: Dict[str, dict]) -> int:
+    """Observe durations and failures of new `stage_history` entries; returns how many were new."""
+    recorded = 0
+    for stage, info in history.items():
+        updated_at = info.get("updatedAt")
+        if not _mark_stage_event(job_id, stage, updated_at):
+            continue
+        details = info.get("details") or {}
+        duration_ms = details.get("durationMs")
+        if isinstance(duration_ms, (int, float)) and duration_ms > 0:
+            _stage_duration.labels(stage=stage).observe(duration_ms / 1000.0)
+        status = (info.get("status") or "").lower()
+        if status == "failed":
+            _stage_failures.labels(stage=stage).inc()
+        recorded += 1
+    return recorded
+
+
+def _reset_stage_history_cache_for_tests() -> None:
+    with _stage_history_lock:
+        _stage_history_events.clear()
+        _stage_history_order.clear()
+
+
+class JobCounts:
+    """Per-status job counts and running jobs per stage, maintained from events."""
+
+    def __init__(self) -> None:
+        self.by_status: Dict[JobStatus, int] = {}
+        self.running: Dict[JobStage, int] = {}
+        self._active: Dict[str, Tuple[JobStatus, Optional[JobStage]]] = {}
+        # Recently finished jobs; late worker updates for them (e.g. after a cancel) are ignored.
+        self._finished: "OrderedDict[str, JobStatus]" = OrderedDict()
+        self._lock = Lock()
+
+    def apply(self, event: Dict[str, Any]) -> None:
+        job_id = event.get("job")
+        if not job_id:
+            return
+        if event.get("status"):
+            stage = JobStage(event["stage"]) if event.get("stage") else None
+            self._transition(job_id, JobStatus(event["status"]), stage)
+        if event.get("history"):
+            record_stage_history(job_id, event["history"])
+
+    def _transition(self, job_id: str, status: JobStatus, stage: Optional[JobStage]) -> None:
+        with self._lock:
+            previous = self._active.pop(job_id, None)
+            if previous is not None:
+                self._count(*previous, -1)
+                stage = stage or previous[1]
+            elif job_id in self._finished:
+                if status != JobStatus.PENDING:  # only a retry reopens a finished job
+                    return
+                self._count(self._finished.pop(job_id), None, -1)
+            self._count(status, stage, 1)
+            if status in _ACTIVE:
+                self._active[job_id] = (status, stage)
+            else:
+                self._finished[job_id] = status
+                while len(self._finished) > _FINISHED_CACHE_SIZE:
+                    self._finished.popitem(last=False)
+
+    def _count(self, status: JobStatus, stage: Optional[JobStage], delta: int) -> None:
+        self.by_status[status] = max(self.by_status.get(status, 0) + delta, 0)
+        if status == JobStatus.RUNNING and stage is not None:
+            self.running[stage] = max(self.running.get(stage, 0) + delta, 0)
+
+    def reconcile(self, by_status: Dict[JobStatus, int], active: Dict[str, Tuple[JobStatus, JobStage]]) -> int:
+        """Replace the counts with a database snapshot; returns how many jobs were off."""
+        with self._lock:
+            drift = sum(abs(by_status.get(status, 0) - self.by_status.get(status, 0)) for status in JobStatus)
+            self.by_status = dict(by_status)
+            self._active = dict(active)
+            self.running = {}
+            for status, stage in active.values():
+                if status == JobStatus.RUNNING:
+                    self.running[stage] = self.running.get(stage, 0) + 1
+            for job_id in active:
+                self._finished.pop(job_id, None)
+            return drift
+
+    def export(self) -> None:
+        """Set the gauges; constant cost, whatever the size of the jobs table."""
+        with self._lock:
+            by_status, running = dict(self.by_status), dict(self.running)
+        for status in JobStatus:
+            _jobs_total.labels(status=status.value.lower()).set(by_status.get(status, 0))
+        _jobs_running.set(by_status.get(JobStatus.RUNNING, 0))
+        for stage in JobStage:
+            _jobs_stage_active.labels(stage=stage.value).set(running.get(stage, 0))
+
+
+counts = JobCounts()
+_task: Optional[asyncio.Task] = None
+
+
+async def reconcile(session: AsyncSession) -> int:
+    by_status = await job_service.count_jobs_by_status(session)
+    active = await job_service.active_job_states(session)
+    drift = counts.reconcile(by_status, active)
+    _reconcile_drift.set(drift)
+    return drift
+
+
+async def _run(session_factory: Callable[[], AsyncSession]) -> None:
+    while True:
+        try:
+            async with session_factory() as session:
+                await reconcile(session)
+        except asyncio.CancelledError:
+            raise
+        except Exception:  # pragma: no cover - keep the last counts after transient DB errors
+            _log.exception("Job metrics reconciliation failed")
+        await asyncio.sleep(settings.metrics_reconcile_seconds)
+
+
+def start(session_factory: Callable[[], AsyncSession]) -> None:
+    global _task
+    job_events.subscribe(counts.apply)
+    if _task is None or _task.done():
+        _task = asyncio.get_running_loop().create_task(_run(session_factory))
+
+
+async def stop() -> None:
+    global _task
+    job_events.unsubscribe(counts.apply)
+    if _task is not None:
+        _task.cancel()
+        try:
+            await _task
+        except asyncio.CancelledError:
+            pass
+        _task = None
@@ -0,0 +1,79 @@
+"""Per-replica fan-out of job events to progress streams (`GET /v1/jobs/{id}/events`).
+
+Every open stream registers a `Watcher` for its job. The replica subscribes
+once to `services/job_events.py`, and each event is put on the queues of that
+job's watchers; no database query is made per event or per viewer. A watcher
+whose queue fills up (a client that stopped reading) is marked as overflowed
+and its stream is closed, so the client reconnects and starts from a fresh
+snapshot instead of missing updates.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional, Set
+
+from ..core.config import get_settings
+from ..core.metrics import Counter, Gauge
+from . import job_events
+
+settings = get_settings()
+
+_connections = Gauge("job_stream_connections", "Open job progress streams")
+_pushed = Counter("job_stream_events_total", "Job events queued for progress streams")
+_overflows = Counter("job_stream_overflows_total", "Progress streams closed because the client fell behind")
+
+
+class Watcher:
+    def __init__(self, job_external_id: str, buffer: int) -> None:
+        self.job_external_id = job_external_id
+        self.queue: "asyncio.Queue[Dict[str, Any]]" = asyncio.Queue(maxsize=buffer)
+        self.overflowed = False
+
+    def push(self, event: Dict[str, Any]) -> None:
+        if self.overflowed:
+            return
+        try:
+            self.queue.put_nowait(event)
+            _pushed.inc()
+        except asyncio.QueueFull:
+            self.overflowed = True
+            _overflows.inc()
+
+    async def next(self, timeout: float) -> Optional[Dict[str, Any]]:
+        """The next event, or None after `timeout` seconds without one."""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+_watchers: Dict[str, Set[Watcher]] = {}
+
+
+def connections() -> int:
+    return sum(len(watchers) for watchers in _watchers.values())
+
+
+def _on_event(event: Dict[str, Any]) -> None:
+    for watcher in list(_watchers.get(event.get("job"), ())):
+        watcher.push(event)
+
+
+@contextmanager
+def watch(job_external_id: str) -> Iterator[Watcher]:
+    """Receive the events of one job while the block runs."""
+    job_events.subscribe(_on_event)
+    watcher = Watcher(job_external_id, settings.job_stream_buffer)
+    _watchers.setdefault(job_external_id, set()).add(watcher)
+    _connections.inc()
+    try:
+        yield watcher
+    finally:
+        _connections.dec()
+        watchers = _watchers.get(job_external_id)
+        if watchers is not None:
+            watchers.discard(watcher)
+            if not watchers:
+                del _watchers[job_external_id]
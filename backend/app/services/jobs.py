@@ -1,43 +1,198 @@
 from __future__ import annotations
 
+import base64
+import binascii
+import json
 import uuid
+from dataclasses import dataclass
 from datetime import datetime
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional
 
-from sqlalchemy import func, select
+from sqlalchemy import func, insert, select, text, tuple_, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from shared.job_events import job_event
+
 from ..models import Asset, Job, JobStage, JobStatus
+from . import job_events, response_cache
 
 
 def generate_job_id() -> str:
     return str(uuid.uuid4())
 
 
-async def create_job(
-    session: AsyncSession,
+def build_job(
     *,
     asset: Asset,
     target_langs: List[str],
     presets: dict,
     requested_by: Optional[str],
+    priority: int = 0,
+    stage: JobStage = JobStage.ASR,
+    dispatched_at: Optional[datetime] = None,
+    kind: str = "pipeline",
+    task_id: Optional[str] = None,
 ) -> Job:
-    job = Job(
+    return Job(
         external_id=generate_job_id(),
         asset_id=asset.id,  # type: ignore[arg-type]
-        stage=JobStage.ASR,
+        stage=stage,
         status=JobStatus.PENDING,
         progress=0.0,
         target_langs=target_langs,
         presets=presets,
         requested_by=requested_by,
+        priority=priority,
+        dispatched_at=dispatched_at,
+        kind=kind,
+        task_id=task_id,
+    )
+
+
+async def create_job(
+    session: AsyncSession,
+    *,
+    asset: Asset,
+    target_langs: List[str],
+    presets: dict,
+    requested_by: Optional[str],
+    priority: int = 0,
+    stage: JobStage = JobStage.ASR,
+    dispatched_at: Optional[datetime] = None,
+    kind: str = "pipeline",
+) -> Job:
+    job = build_job(
+        asset=asset,
+        target_langs=target_langs,
+        presets=presets,
+        requested_by=requested_by,
+        priority=priority,
+        stage=stage,
+        dispatched_at=dispatched_at,
+        kind=kind,
     )
     session.add(job)
     await session.commit()
     await session.refresh(job)
+    await _published(job)
     return job
 
 
+async def _published(job: Job) -> None:
+    await job_events.publish(
+        job_event(
+            job.external_id,
+            status=job.status,
+            stage=job.stage,
+            progress=job.progress,
+            requester=job.requested_by,
+        )
+    )
+
+
+async def create_jobs(session: AsyncSession, jobs: List[Job]) -> List[Job]:
+    """Insert `jobs` (from `build_job`) as one executemany INSERT and commit.
+
+    The returned jobs are not attached to the session and have no `id`; they
+    are identified by `external_id`.
+    """
+    if jobs:
+        columns = [column.name for column in Job.__table__.columns if column.name != "id"]
+        rows = [{name: getattr(job, name) for name in columns} for job in jobs]
+        await session.execute(insert(Job.__table__), rows)
+    await session.commit()
+    for job in jobs:
+        await _published(job)
+    return jobs
+
+
+async def fail_unqueued_jobs(session: AsyncSession, jobs: List[Job], reason: str) -> None:
+    """Mark jobs whose task never reached the broker FAILED, so nothing coalesces onto them.
+
+    They can be resubmitted through `POST /jobs/{jobId}/retry`.
+    """
+    if not jobs:
+        return
+    now = datetime.utcnow()
+    await session.execute(
+        update(Job)
+        .where(Job.external_id.in_([job.external_id for job in jobs]))  # type: ignore[attr-defined]
+        .values(
+            status=JobStatus.FAILED,
+            failed_stage=Job.stage,
+            error_message=reason,
+            task_id=None,
+            ended_at=now,
+            updated_at=now,
+        )
+    )
+    await session.commit()
+    for job in jobs:
+        job.status, job.failed_stage, job.error_message = JobStatus.FAILED, job.stage, reason
+        job.task_id, job.ended_at, job.updated_at = None, now, now
+        await _published(job)
+    await response_cache.invalidate_jobs(*(job.external_id for job in jobs))
+
+
+async def find_inflight_jobs(
+    session: AsyncSession,
+    *,
+    asset_id: int,
+    presets: dict,
+    requested_by: Optional[str],
+) -> List[Job]:
+    """PENDING/RUNNING jobs for an asset that would produce the same output (oldest first)."""
+    stmt = (
+        select(Job)
+        .where(
+            Job.asset_id == asset_id,
+            Job.kind == "pipeline",
+            Job.status.in_([JobStatus.PENDING, JobStatus.RUNNING]),
+        )
+        .order_by(Job.created_at)
+    )
+    result = await session.execute(stmt)
+    return [job for job in result.scalars() if same_output(job, presets=presets, requested_by=requested_by)]
+
+
+def same_output(job: Job, *, presets: dict, requested_by: Optional[str]) -> bool:
+    """Whether `job` produces what a request with these presets, from this key, asks for."""
+    return (job.presets or {}) == (presets or {}) and job.requested_by == requested_by
+
+
+async def find_inflight_jobs_by_asset(session: AsyncSession, asset_ids: Iterable[int]) -> Dict[int, List[Job]]:
+    """PENDING/RUNNING pipeline jobs of several assets in one query, oldest first per asset."""
+    inflight: Dict[int, List[Job]] = {}
+    ids = list(asset_ids)
+    if not ids:
+        return inflight
+    stmt = (
+        select(Job)
+        .where(
+            Job.asset_id.in_(ids),
+            Job.kind == "pipeline",
+            Job.status.in_([JobStatus.PENDING, JobStatus.RUNNING]),
+        )
+        .order_by(Job.created_at)
+    )
+    for job in (await session.execute(stmt)).scalars():
+        inflight.setdefault(job.asset_id, []).append(job)
+    return inflight
+
+
+async def latest_presets(session: AsyncSession, *, asset_id: int, language: str) -> dict:
+    """Voice presets of the most recent successful job that dubbed `language`."""
+    stmt = (
+        select(Job)
+        .where(Job.asset_id == asset_id, Job.status == JobStatus.SUCCESS)
+        .order_by(Job.created_at.desc())
+    )
+    for job in (await session.execute(stmt)).scalars():
+        if language in (job.target_langs or []):
+            return dict(job.presets or {})
+    return {}
+
+
 async def get_job_by_external_id(session: AsyncSession, external_id: str) -> Optional[Job]:
     result = await session.execute(select(Job).where(Job.external_id == external_id))
     return result.scalar_one_or_none()
@@ -63,23 +218,104 @@ async def update_job_stage(
     job.error_message = error_message
     await session.commit()
     await session.refresh(job)
+    await _published(job)
+    await response_cache.invalidate_jobs(job.external_id)
     return job
 
 
+@dataclass(frozen=True)
+class JobFilters:
+    status: Optional[JobStatus] = None
+    stage: Optional[JobStage] = None
+    requested_by: Optional[str] = None
+
+    def clauses(self) -> list:
+        clauses = []
+        if self.status is not None:
+            clauses.append(Job.status == self.status)
+        if self.stage is not None:
+            clauses.append(Job.stage == self.stage)
+        if self.requested_by is not None:
+            clauses.append(Job.requested_by == self.requested_by)
+        return clauses
+
+
+def encode_cursor(job: Job) -> str:
+    """Opaque position after `job` in (created_at, id) descending order."""
+    raw = json.dumps({"t": job.created_at.isoformat(), "i": job.id}).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """Inverse of `encode_cursor`; raises ValueError for anything else."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        position = json.loads(raw)
+        return datetime.fromisoformat(position["t"]), int(position["i"])
+    except (binascii.Error, UnicodeDecodeError, TypeError, KeyError, ValueError) as exc:
+        raise ValueError("Invalid cursor") from exc
+
+
 async def list_jobs(
     session: AsyncSession,
     *,
-    page: int = 1,
     page_size: int = 20,
-) -> tuple[List[Job], int]:
-    page = max(page, 1)
+    cursor: Optional[str] = None,
+    page: int = 1,
+    filters: JobFilters = JobFilters(),
+) -> tuple[List[tuple[Job, Optional[str]]], Optional[str]]:
+    """One page of jobs, newest first, each with its asset's external id (one joined query).
+
+    Pages continue from `cursor` (keyset on created_at, id), so deep pages cost the
+    same as the first. `page` is an OFFSET fallback for clients without a cursor.
+    Returns the rows and the cursor of the next page (None on the last page).
+    """
     page_size = max(min(page_size, 100), 1)
-    offset = (page - 1) * page_size
-    query = select(Job).order_by(Job.created_at.desc()).offset(offset).limit(page_size)
-    result = await session.execute(query)
-    jobs = list(result.scalars())
-    total = await session.scalar(select(func.count(Job.id)))
-    return jobs, total or 0
+    query = (
+        select(Job, Asset.external_id)
+        .outerjoin(Asset, Asset.id == Job.asset_id)
+        .where(*filters.clauses())
+        .order_by(Job.created_at.desc(), Job.id.desc())
+        .limit(page_size + 1)
+    )
+    if cursor is not None:
+        created_at, job_id = decode_cursor(cursor)
+        query = query.where(tuple_(Job.created_at, Job.id) < tuple_(created_at, job_id))
+    elif page > 1:
+        query = query.offset((page - 1) * page_size)
+    rows = [(job, asset_external_id) for job, asset_external_id in (await session.execute(query)).all()]
+    next_cursor = encode_cursor(rows[page_size - 1][0]) if len(rows) > page_size else None
+    return rows[:page_size], next_cursor
+
+
+async def count_jobs(
+    session: AsyncSession,
+    *,
+    filters: JobFilters = JobFilters(),
+    estimate: bool = False,
+) -> tuple[int, bool]:
+    """Number of jobs matching `filters`, and whether it is an estimate.
+
+    Estimates come from the planner on Postgres and from the largest rowid for an
+    unfiltered SQLite table; otherwise the count is exact (an index range scan
+    with the composite indexes).
+    """
+    clauses = filters.clauses()
+    if estimate:
+        dialect = session.get_bind().dialect.name
+        if dialect == "postgresql":
+            statement = select(Job.id).where(*clauses).compile(
+                dialect=session.get_bind().dialect, compile_kwargs={"literal_binds": True}
+            )
+            plan = await session.scalar(text(f"EXPLAIN (FORMAT JSON) {statement}"))
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            return int(plan[0]["Plan"]["Plan Rows"]), True
+        if dialect == "sqlite" and not clauses:
+            # Ids are never reused, so this only overcounts deleted jobs.
+            return await session.scalar(select(func.max(Job.id))) or 0, True
+    total = await session.scalar(select(func.count()).select_from(Job).where(*clauses))
+    return total or 0, False
 
 
 async def reset_job_for_retry(
@@ -87,6 +323,7 @@ async def reset_job_for_retry(
     *,
     job: Job,
     resume_stage: JobStage,
+    dispatched_at: Optional[datetime] = None,
 ) -> Job:
     job.stage = resume_stage
     job.status = JobStatus.PENDING
@@ -95,9 +332,12 @@ async def reset_job_for_retry(
     job.error_message = None
     job.started_at = None
     job.ended_at = None
+    job.dispatched_at = dispatched_at
     job.updated_at = datetime.utcnow()
     await session.commit()
     await session.refresh(job)
+    await _published(job)
+    await response_cache.invalidate_jobs(job.external_id)
     return job
 
 
@@ -115,9 +355,16 @@ async def cancel_job(
     job.updated_at = datetime.utcnow()
     await session.commit()
     await session.refresh(job)
+    await _published(job)
+    await response_cache.invalidate_jobs(job.external_id)
     return job
 
 
+async def record_task_id(session: AsyncSession, *, job: Job, task_id: Optional[str]) -> None:
+    job.task_id = task_id
+    await session.commit()
+
+
 async def count_active_jobs_for_requester(session: AsyncSession, requested_by: Optional[str]) -> int:
     if not requested_by:
         return 0
@@ -128,6 +375,14 @@ async def count_active_jobs_for_requester(session: AsyncSession, requested_by: O
     return await session.scalar(stmt) or 0
 
 
+async def active_job_ids_for_requester(session: AsyncSession, requested_by: str) -> List[str]:
+    stmt = select(Job.external_id).where(
+        Job.requested_by == requested_by,
+        Job.status.in_([JobStatus.PENDING, JobStatus.RUNNING]),
+    )
+    return list((await session.execute(stmt)).scalars())
+
+
 async def count_jobs_by_status(session: AsyncSession) -> dict[JobStatus, int]:
     stmt = select(Job.status, func.count(Job.id)).group_by(Job.status)
     result = await session.execute(stmt)
@@ -137,20 +392,9 @@ async def count_jobs_by_status(session: AsyncSession) -> dict[JobStatus, int]:
     return counts
 
 
-async def count_running_jobs_by_stage(session: AsyncSession) -> dict[JobStage, int]:
-    stmt = (
-        select(Job.stage, func.count(Job.id))
-        .where(Job.status == JobStatus.RUNNING)
-        .group_by(Job.stage)
+async def active_job_states(session: AsyncSession) -> dict[str, tuple[JobStatus, JobStage]]:
+    """Status and stage of every PENDING/RUNNING job, by external id."""
+    stmt = select(Job.external_id, Job.status, Job.stage).where(
+        Job.status.in_([JobStatus.PENDING, JobStatus.RUNNING])
     )
-    result = await session.execute(stmt)
-    counts: dict[JobStage, int] = {}
-    for stage, total in result.all():
-        counts[stage] = int(total or 0)
-    return counts
-
-
-async def fetch_recent_jobs(session: AsyncSession, limit: int = 200) -> list[Job]:
-    stmt = select(Job).order_by(Job.updated_at.desc()).limit(limit)
-    result = await session.execute(stmt)
-    return list(result.scalars())
+    return {external_id: (status, stage) for external_id, status, stage in (await session.execute(stmt)).all()}
@@ -0,0 +1,124 @@
+"""Sliding-window request limits per API key, shared by all API replicas.
+
+Each key has one counter per `RATE_LIMIT_WINDOW` seconds. A request is
+allowed while `current + previous * (1 - elapsed / window)` stays below the
+limit, which smooths out the burst a fixed window allows at its boundary.
+Rejected requests are not counted.
+
+With `RATE_LIMIT_BACKEND=redis` (the default) both counters live in Redis and
+one Lua script checks and increments them atomically. The keys expire after
+two windows. If Redis is unreachable, the replica falls back to the local
+counters for `_RETRY_SECONDS`. The limit is then enforced per replica until
+Redis answers again. `RATE_LIMIT_BACKEND=local` always uses the local
+counters. They are pruned as windows pass, so they no longer grow with every
+key and minute seen.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+from ..core.config import get_settings
+from ..core.metrics import Counter
+
+if TYPE_CHECKING:  # pragma: no cover
+    from redis.asyncio import Redis
+    from redis.commands.core import AsyncScript
+
+_log = logging.getLogger(__name__)
+settings = get_settings()
+
+RATE_LIMIT_WINDOW = 60  # seconds
+_RETRY_SECONDS = 30.0
+
+_decisions = Counter("rate_limit_decisions_total", "Rate limit checks", ["backend", "result"])
+
+# KEYS: current window, previous window. ARGV: limit, weight of the previous window, ttl.
+_SLIDING_WINDOW = """
+local current = tonumber(redis.call('GET', KEYS[1]) or '0')
+local previous = tonumber(redis.call('GET', KEYS[2]) or '0')
+if current + previous * tonumber(ARGV[2]) >= tonumber(ARGV[1]) then
+  return 0
+end
+redis.call('INCR', KEYS[1])
+redis.call('EXPIRE', KEYS[1], ARGV[3])
+return 1
+"""
+
+
+class LocalWindows:
+    """In-process sliding-window counters: `{client_id: [window, current, previous]}`."""
+
+    def __init__(self) -> None:
+        self._windows: Dict[str, List[int]] = {}
+        self._pruned_window = 0
+
+    def __len__(self) -> int:
+        return len(self._windows)
+
+    def allow(self, client_id: str, limit: int, now: float) -> bool:
+        window, elapsed = divmod(now, RATE_LIMIT_WINDOW)
+        window = int(window)
+        if window > self._pruned_window:
+            self._prune(window)
+        record = self._windows.get(client_id)
+        if record is None or record[0] < window - 1:
+            record = self._windows[client_id] = [window, 0, 0]
+        elif record[0] == window - 1:
+            record[:] = [window, 0, record[1]]
+        if record[1] + record[2] * (1 - elapsed / RATE_LIMIT_WINDOW) >= limit:
+            return False
+        record[1] += 1
+        return True
+
+    def _prune(self, window: int) -> None:
+        # Counters two windows old no longer affect any decision.
+        self._windows = {client_id: record for client_id, record in self._windows.items() if record[0] >= window - 1}
+        self._pruned_window = window
+
+
+local_windows = LocalWindows()
+_client: Optional["Redis"] = None
+_script: Optional["AsyncScript"] = None
+_paused_until = 0.0
+
+
+def client() -> "Redis":
+    global _client
+    if _client is None:
+        from redis.asyncio import Redis
+
+        _client = Redis.from_url(str(settings.redis_url), socket_connect_timeout=1, socket_timeout=1)
+    return _client
+
+
+async def _redis_allow(client_id: str, limit: int, now: float) -> bool:
+    global _script
+    if _script is None:
+        _script = client().register_script(_SLIDING_WINDOW)
+    window, elapsed = divmod(now, RATE_LIMIT_WINDOW)
+    # The hash tag keeps both keys in one cluster slot, as a multi-key script requires.
+    keys = [f"ratelimit:{{{client_id}}}:{int(window)}", f"ratelimit:{{{client_id}}}:{int(window) - 1}"]
+    weight = 1 - elapsed / RATE_LIMIT_WINDOW
+    return bool(await _script(keys=keys, args=[limit, weight, 2 * RATE_LIMIT_WINDOW]))
+
+
+async def allow(client_id: str, limit: Optional[int] = None) -> bool:
+    """Count one request for `client_id`; False when it exceeds the limit."""
+    global _paused_until
+    limit = settings.rate_limit_per_minute if limit is None else limit
+    now = time.time()
+    if settings.rate_limit_backend == "redis" and time.monotonic() >= _paused_until:
+        try:
+            allowed = await _redis_allow(client_id, limit, now)
+            _decisions.labels(backend="redis", result="allowed" if allowed else "limited").inc()
+            return allowed
+        except Exception as exc:
+            _paused_until = time.monotonic() + _RETRY_SECONDS
+            _log.warning("Redis rate limiting unavailable for %.0f s (%s); limiting per replica", _RETRY_SECONDS, exc)
+    allowed = local_windows.allow(client_id, limit, now)
+    _decisions.labels(backend="local", result="allowed" if allowed else "limited").inc()
+    return allowed
+
@@ -0,0 +1,198 @@
+"""Read-through Redis cache of serialized job and asset responses, with ETags.
+
+`GET /v1/jobs/{jobId}` and `GET /v1/assets/{assetId}` serve the cached JSON
+body when there is one, and answer `304 Not Modified` when `If-None-Match`
+matches its ETag. Neither case touches the database or serializes a model.
+On a miss the route loads and serializes the response once and stores it for
+`RESPONSE_CACHE_SECONDS`. Asset responses embed signed URLs, so they are kept
+for at most half of the time a URL is guaranteed to stay valid.
+
+Writers invalidate entries: the API when it creates, retries, cancels or
+dispatches a job or changes an asset, and the workers on every job state
+write (`workers/common/events.py`). Key layout and the fill guard are
+described in `shared/response_cache.py`. While Redis is unreachable, every
+request is served from the database for `_RETRY_SECONDS`; the ETag is still
+computed from the body, so clients can keep revalidating.
+
+Invalidations ignore that pause: each one is attempted, and one that fails
+stays pending and is sent with the next. Reads go back to Redis only after
+every pending invalidation has been applied, so an entry whose write happened
+during the outage is never served afterwards.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import time
+from typing import TYPE_CHECKING, Awaitable, Callable, Optional, Set, Tuple
+
+from fastapi import Request, Response
+
+from shared.response_cache import ASSET, GENERATION_TTL_SECONDS, JOB, entry_key, generation_key
+
+from ..core.config import get_settings
+from ..core.metrics import Counter, Histogram
+
+if TYPE_CHECKING:  # pragma: no cover
+    from redis.asyncio import Redis
+    from redis.commands.core import AsyncScript
+
+_log = logging.getLogger(__name__)
+settings = get_settings()
+
+_RETRY_SECONDS = 30.0
+
+_lookups = Counter("response_cache_requests_total", "Cached response lookups", ["kind", "result"])
+_latency = Histogram(
+    "response_cache_request_seconds",
+    "Time to answer a cacheable GET, by cache result",
+    ["kind", "result"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+)
+
+# KEYS: entry, generation. ARGV: generation read before the query ("" if none), etag, body, ttl.
+_FILL = """
+if (redis.call('GET', KEYS[2]) or '') ~= ARGV[1] then
+  return 0
+end
+redis.call('HSET', KEYS[1], 'etag', ARGV[2], 'body', ARGV[3])
+redis.call('EXPIRE', KEYS[1], ARGV[4])
+return 1
+"""
+
+_client: Optional["Redis"] = None
+_fill: Optional["AsyncScript"] = None
+_paused_until = 0.0
+_pending: Set[Tuple[str, str]] = set()  # (kind, external_id) invalidations not applied yet
+
+
+def client() -> "Redis":
+    global _client
+    if _client is None:
+        from redis.asyncio import Redis
+
+        _client = Redis.from_url(str(settings.redis_url), socket_connect_timeout=1, socket_timeout=1)
+    return _client
+
+
+def _available() -> bool:
+    return settings.response_cache_enabled and time.monotonic() >= _paused_until
+
+
+def _unavailable(exc: Exception) -> None:
+    global _paused_until
+    _paused_until = time.monotonic() + _RETRY_SECONDS
+    _log.warning("Response cache unavailable for %.0f s (%s)", _RETRY_SECONDS, exc)
+
+
+def etag_for(body: bytes) -> str:
+    return '"' + hashlib.blake2b(body, digest_size=12).hexdigest() + '"'
+
+
+def ttl_for(kind: str) -> int:
+    if kind == ASSET:
+        url_lifetime = settings.download_url_expiry_seconds * (1 - settings.signed_url_refresh_ratio)
+        return max(1, int(min(settings.response_cache_seconds, url_lifetime / 2)))
+    return max(1, int(settings.response_cache_seconds))
+
+
+def _matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    # Weak comparison (RFC 9110 13.1.2), as proxies may add the W/ prefix.
+    return header.strip() == "*" or etag in (tag.strip().removeprefix("W/") for tag in header.split(","))
+
+
+def _response(request: Request, etag: str, body: bytes) -> Response:
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if _matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+async def respond(
+    request: Request,
+    kind: str,
+    external_id: str,
+    load: Callable[[], Awaitable[bytes]],
+) -> Response:
+    """Serve the cached body of `kind`/`external_id`, or `load()` it and cache it.
+
+    `load` returns the serialized response; exceptions it raises (e.g. 404)
+    propagate and nothing is cached.
+    """
+    started = time.perf_counter()
+    generation = None
+    if _available() and (not _pending or await _flush()):
+        try:
+            pipe = client().pipeline(transaction=False)
+            pipe.hmget(entry_key(kind, external_id), "etag", "body")
+            pipe.get(generation_key(kind, external_id))
+            (etag, body), generation = await pipe.execute()
+            if etag is not None and body is not None:
+                etag = etag.decode()
+                response = _response(request, etag, body)
+                _observe(kind, "not_modified" if response.status_code == 304 else "hit", started)
+                return response
+            generation = (generation or b"").decode()
+        except Exception as exc:
+            _unavailable(exc)
+            generation = None
+    body = await load()
+    etag = etag_for(body)
+    if generation is not None:
+        await _store(kind, external_id, generation, etag, body)
+    _observe(kind, "miss" if generation is not None else "bypass", started)
+    return _response(request, etag, body)
+
+
+def _observe(kind: str, result: str, started: float) -> None:
+    _lookups.labels(kind=kind, result=result).inc()
+    _latency.labels(kind=kind, result=result).observe(time.perf_counter() - started)
+
+
+async def _store(kind: str, external_id: str, generation: str, etag: str, body: bytes) -> None:
+    global _fill
+    try:
+        if _fill is None:
+            _fill = client().register_script(_FILL)
+        keys = [entry_key(kind, external_id), generation_key(kind, external_id)]
+        await _fill(keys=keys, args=[generation, etag, body, ttl_for(kind)])
+    except Exception as exc:
+        _unavailable(exc)
+
+
+async def invalidate(kind: str, *external_ids: str) -> None:
+    if not external_ids or not settings.response_cache_enabled:
+        return
+    _pending.update((kind, external_id) for external_id in external_ids)
+    await _flush()
+
+
+async def _flush() -> bool:
+    """Apply the pending invalidations; False (and reads paused) if Redis failed."""
+    batch = list(_pending)
+    was_available = _available()
+    try:
+        pipe = client().pipeline(transaction=False)
+        for kind, external_id in batch:
+            pipe.delete(entry_key(kind, external_id))
+            pipe.incr(generation_key(kind, external_id))
+            pipe.expire(generation_key(kind, external_id), GENERATION_TTL_SECONDS)
+        await pipe.execute()
+    except Exception as exc:
+        if was_available:
+            _unavailable(exc)
+        return False
+    _pending.difference_update(batch)
+    return True
+
+
+async def invalidate_jobs(*external_ids: str) -> None:
+    await invalidate(JOB, *external_ids)
+
+
+async def invalidate_assets(*external_ids: str) -> None:
+    await invalidate(ASSET, *external_ids)
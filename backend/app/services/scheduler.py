@@ -0,0 +1,244 @@
+"""Dispatch PENDING jobs to Celery in weighted fair-share order.
+
+With `SCHEDULER_ENABLED`, the API stores jobs as undispatched PENDING rows and a
+background loop hands them to Celery at a controlled rate: at most
+`SCHEDULER_DISPATCH_BATCH` per tick, and never more than `SCHEDULER_MAX_INFLIGHT`
+dispatched jobs that have not finished. Tenants (`requested_by`) share dispatch
+slots in proportion to `TENANT_WEIGHTS` (start-time fair queuing), so a large
+backlog from one API key no longer starves everyone else. Within a tenant, jobs
+run by priority, then submission order.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional
+
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.config import get_settings
+from ..core.metrics import Counter, Gauge, Histogram
+from ..models import Job, JobStatus
+from ..queue import enqueue_pipeline_job
+from . import response_cache
+
+_log = logging.getLogger(__name__)
+settings = get_settings()
+
+ANONYMOUS = "anonymous"
+
+_queue_depth = Gauge("scheduler_queue_depth", "Jobs waiting for dispatch per tenant", ["tenant"])
+_oldest_wait = Gauge("scheduler_oldest_wait_seconds", "Age of the oldest undispatched job per tenant", ["tenant"])
+_queue_wait = Histogram(
+    "scheduler_queue_wait_seconds",
+    "Time from submission (or retry) to dispatch per tenant",
+    ["tenant"],
+    buckets=(1, 5, 15, 30, 60, 300, 900, 1800, 3600, 7200),
+)
+_dispatched = Counter("scheduler_dispatched_total", "Jobs handed to Celery per tenant", ["tenant"])
+_reported_tenants: set[str] = set()
+
+
+@dataclass
+class QueuedJob:
+    job_id: int
+    external_id: str
+    tenant: str
+    priority: int
+    created_at: datetime
+    queued_at: datetime
+    resume_from: Optional[str] = None
+    cost: float = 1.0
+
+
+class FairScheduler:
+    """Start-time fair queuing over tenants.
+
+    Each tenant carries a finish tag; dispatching a job of cost `c` advances it
+    by `c / weight`. The tenant with the smallest start tag goes next, where a
+    tenant returning from idle starts at the current virtual clock instead of
+    its stale tag, so idle time does not bank credit.
+    """
+
+    def __init__(self, weights: Optional[Dict[str, float]] = None, default_weight: float = 1.0) -> None:
+        self.weights = dict(weights or {})
+        self.default_weight = default_weight
+        self._finish: Dict[str, float] = {}
+        self._clock = 0.0
+
+    def weight(self, tenant: str) -> float:
+        return max(self.weights.get(tenant, self.default_weight), 1e-6)
+
+    def _start_tag(self, tenant: str) -> float:
+        return max(self._finish.get(tenant, 0.0), self._clock)
+
+    def order(self, candidates: Iterable[QueuedJob], limit: int) -> List[QueuedJob]:
+        """Pick up to `limit` jobs from `candidates`, charging each tenant as it is served."""
+        queues: Dict[str, List[QueuedJob]] = {}
+        for job in candidates:
+            queues.setdefault(job.tenant, []).append(job)
+        for jobs in queues.values():
+            jobs.sort(key=lambda job: (-job.priority, job.created_at, job.job_id))
+            jobs.reverse()  # pop() from the end
+        picked: List[QueuedJob] = []
+        while queues and len(picked) < limit:
+            tenant = min(queues, key=lambda name: (self._start_tag(name), name))
+            job = queues[tenant].pop()
+            start = self._start_tag(tenant)
+            self._clock = start
+            self._finish[tenant] = start + job.cost / self.weight(tenant)
+            picked.append(job)
+            if not queues[tenant]:
+                del queues[tenant]
+        return picked
+
+
+def _tenant(requested_by: Optional[str]) -> str:
+    return requested_by or ANONYMOUS
+
+
+async def _inflight_count(session: AsyncSession) -> int:
+    stmt = select(func.count(Job.id)).where(
+        Job.dispatched_at.is_not(None),
+        Job.status.in_([JobStatus.PENDING, JobStatus.RUNNING]),
+    )
+    return await session.scalar(stmt) or 0
+
+
+async def _report_depth(session: AsyncSession, now: datetime) -> None:
+    stmt = (
+        select(Job.requested_by, func.count(Job.id), func.min(Job.updated_at))
+        .where(Job.status == JobStatus.PENDING, Job.dispatched_at.is_(None))
+        .group_by(Job.requested_by)
+    )
+    seen: set[str] = set()
+    for requested_by, depth, oldest in (await session.execute(stmt)).all():
+        tenant = _tenant(requested_by)
+        seen.add(tenant)
+        _queue_depth.labels(tenant=tenant).set(int(depth or 0))
+        _oldest_wait.labels(tenant=tenant).set(max((now - oldest).total_seconds(), 0.0) if oldest else 0.0)
+    for tenant in _reported_tenants - seen:
+        _queue_depth.labels(tenant=tenant).set(0)
+        _oldest_wait.labels(tenant=tenant).set(0)
+    _reported_tenants.clear()
+    _reported_tenants.update(seen)
+
+
+async def fetch_candidates(session: AsyncSession, per_tenant: int) -> List[QueuedJob]:
+    """The first `per_tenant` undispatched PENDING jobs of every tenant, in tenant order."""
+    rank = (
+        func.row_number()
+        .over(partition_by=Job.requested_by, order_by=(Job.priority.desc(), Job.created_at, Job.id))
+        .label("rank")
+    )
+    ranked = (
+        select(Job.id, Job.external_id, Job.requested_by, Job.priority, Job.created_at, Job.updated_at, Job.stage, rank)
+        .where(Job.status == JobStatus.PENDING, Job.dispatched_at.is_(None), Job.kind == "pipeline")
+        .subquery()
+    )
+    stmt = select(ranked).where(ranked.c.rank <= per_tenant)
+    return [
+        QueuedJob(
+            job_id=row.id,
+            external_id=row.external_id,
+            tenant=_tenant(row.requested_by),
+            priority=row.priority or 0,
+            created_at=row.created_at,
+            queued_at=row.updated_at or row.created_at,
+            resume_from=row.stage.value if row.stage else None,
+        )
+        for row in (await session.execute(stmt)).all()
+    ]
+
+
+async def dispatch_once(
+    session: AsyncSession,
+    scheduler: FairScheduler,
+    *,
+    enqueue: Optional[Callable[..., object]] = None,
+) -> int:
+    """Run one scheduling tick; returns the number of jobs sent to Celery."""
+    enqueue = enqueue or enqueue_pipeline_job
+    now = datetime.utcnow()
+    capacity = min(settings.scheduler_max_inflight - await _inflight_count(session), settings.scheduler_dispatch_batch)
+    dispatched = 0
+    if capacity > 0:
+        candidates = await fetch_candidates(session, capacity)
+        for queued in scheduler.order(candidates, capacity):
+            # The conditional claim keeps several API replicas from dispatching the same job.
+            claim = (
+                update(Job)
+                .where(Job.id == queued.job_id, Job.dispatched_at.is_(None), Job.status == JobStatus.PENDING)
+                .values(dispatched_at=now)
+            )
+            if (await session.execute(claim)).rowcount != 1:
+                await session.rollback()
+                continue
+            await session.commit()
+            await response_cache.invalidate_jobs(queued.external_id)  # dispatchedAt changed
+            try:
+                # A blocking Celery publish; run it off the event loop.
+                task_id = await asyncio.to_thread(
+                    enqueue, job_external_id=queued.external_id, resume_from=queued.resume_from
+                )
+            except Exception as exc:  # pragma: no cover - depends on the broker
+                _log.warning("Dispatch of job %s failed (%s); will retry", queued.external_id, exc)
+                await session.execute(update(Job).where(Job.id == queued.job_id).values(dispatched_at=None))
+                await session.commit()
+                await response_cache.invalidate_jobs(queued.external_id)
+                break
+            if isinstance(task_id, str):
+                await session.execute(update(Job).where(Job.id == queued.job_id).values(task_id=task_id))
+                await session.commit()
+            _queue_wait.labels(tenant=queued.tenant).observe(max((now - queued.queued_at).total_seconds(), 0.0))
+            _dispatched.labels(tenant=queued.tenant).inc()
+            dispatched += 1
+    await _report_depth(session, now)
+    return dispatched
+
+
+_scheduler = FairScheduler(settings.tenant_weights)
+_wake = asyncio.Event()
+_task: Optional[asyncio.Task] = None
+
+
+def wake() -> None:
+    """Ask the dispatch loop to run now instead of at the next interval."""
+    _wake.set()
+
+
+async def _run(session_factory: Callable[[], AsyncSession]) -> None:
+    while True:
+        try:
+            async with session_factory() as session:
+                await dispatch_once(session, _scheduler)
+        except asyncio.CancelledError:
+            raise
+        except Exception:  # pragma: no cover - keep dispatching after transient DB errors
+            _log.exception("Scheduler tick failed")
+        try:
+            await asyncio.wait_for(_wake.wait(), timeout=settings.scheduler_interval_seconds)
+        except asyncio.TimeoutError:
+            pass
+        _wake.clear()
+
+
+def start(session_factory: Callable[[], AsyncSession]) -> None:
+    global _task
+    if _task is None or _task.done():
+        _task = asyncio.get_running_loop().create_task(_run(session_factory))
+
+
+async def stop() -> None:
+    global _task
+    if _task is not None:
+        _task.cancel()
+        try:
+            await _task
+        except asyncio.CancelledError:
+            pass
+        _task = None
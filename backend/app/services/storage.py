@@ -1,66 +1,216 @@
 from __future__ import annotations
 
+import math
+import threading
+import time
 import uuid
-from typing import List
-
-from minio import Minio
+from collections import OrderedDict
+from datetime import timedelta
+from typing import TYPE_CHECKING, List, Optional, Tuple
 
 from ..core.config import get_settings
 
+if TYPE_CHECKING:  # pragma: no cover
+    from minio import Minio
+
 settings = get_settings()
 
-_client = Minio(
-    settings.minio_endpoint,
-    access_key=settings.minio_access_key,
-    secret_key=settings.minio_secret_key,
-    secure=False,
-)
+# Created on first use rather than at import time.
+_client: Optional["Minio"] = None
+_client_lock = threading.Lock()
+
+
+def client() -> "Minio":
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                from minio import Minio
+
+                _client = Minio(
+                    settings.minio_endpoint,
+                    access_key=settings.minio_access_key,
+                    secret_key=settings.minio_secret_key,
+                    secure=settings.minio_secure,
+                    region=settings.minio_region or None,
+                )
+    return _client
+
+# S3 multipart limits: at most 10,000 parts, each at least 5 MiB except the last.
+MAX_UPLOAD_PARTS = 10_000
+MIN_PART_SIZE = 5 * 1024 * 1024
+
+_known_buckets: set[str] = set()
+_bucket_lock = threading.Lock()
+
+# (bucket, object, ttl, expiry window) -> signed URL
+_signed_urls: "OrderedDict[Tuple[str, str, int, int], str]" = OrderedDict()
+_signed_urls_lock = threading.Lock()
 
 
 def ensure_bucket(bucket: str) -> None:
-    """Create bucket if missing."""
-    if not _client.bucket_exists(bucket):
-        _client.make_bucket(bucket)
+    """Create bucket if missing; existence is checked once per process."""
+    if bucket in _known_buckets:
+        return
+    with _bucket_lock:
+        if bucket in _known_buckets:
+            return
+        if not client().bucket_exists(bucket):
+            client().make_bucket(bucket)
+        _known_buckets.add(bucket)
 
 
-def init_multipart_upload(filename: str, content_type: str) -> tuple[str, str]:
-    """Start a multipart upload and return (upload_id, object_name).
+def _reset_caches_for_tests() -> None:
+    with _bucket_lock:
+        _known_buckets.clear()
+    with _signed_urls_lock:
+        _signed_urls.clear()
 
-    For MVP we emulate multipart with a single presigned PUT; the client can still
-    split payloads if desired by reusing the signed URL per chunk.
-    """
+
+def part_size_for(total_size: int) -> int:
+    """Return the part size for an upload, growing it to stay within the S3 part limit."""
+    part_size = max(settings.upload_part_size, MIN_PART_SIZE)
+    if total_size > part_size * MAX_UPLOAD_PARTS:
+        part_size = math.ceil(total_size / MAX_UPLOAD_PARTS)
+    return part_size
+
+
+def part_count_for(total_size: int) -> int:
+    return max(1, math.ceil(total_size / part_size_for(total_size)))
+
+
+def init_multipart_upload(filename: str, content_type: str) -> tuple[str, str]:
+    """Start an S3 multipart upload and return (upload_id, object_name)."""
     ensure_bucket(settings.minio_bucket_raw)
     object_name = f"raw/{uuid.uuid4()}/{filename}"
-    upload_id = str(uuid.uuid4())
+    upload_id = client()._create_multipart_upload(
+        settings.minio_bucket_raw,
+        object_name,
+        {"Content-Type": content_type or "application/octet-stream"},
+    )
     return upload_id, object_name
 
 
-def get_presigned_parts(object_name: str, upload_id: str, total_size: int) -> List[dict]:
-    """Generate pre-signed URLs for each part."""
-    url = _client.presigned_put_object(
-        bucket_name=settings.minio_bucket_raw,
-        object_name=object_name,
-        expires=settings.upload_url_expiry_seconds,
+def presign_part(object_name: str, upload_id: str, part_number: int) -> str:
+    return client().get_presigned_url(
+        "PUT",
+        settings.minio_bucket_raw,
+        object_name,
+        expires=timedelta(seconds=settings.upload_url_expiry_seconds),
+        extra_query_params={"uploadId": upload_id, "partNumber": str(part_number)},
     )
-    return [{"partNumber": 1, "uploadUrl": url}]
+
+
+def get_presigned_parts(
+    object_name: str,
+    upload_id: str,
+    total_size: int,
+    skip_parts: Optional[set[int]] = None,
+) -> List[dict]:
+    """Generate one pre-signed PUT URL per part so clients can upload parts concurrently."""
+    skip_parts = skip_parts or set()
+    part_size = part_size_for(total_size)
+    parts: List[dict] = []
+    for index in range(part_count_for(total_size)):
+        part_number = index + 1
+        if part_number in skip_parts:
+            continue
+        offset = index * part_size
+        parts.append(
+            {
+                "partNumber": part_number,
+                "uploadUrl": presign_part(object_name, upload_id, part_number),
+                "offset": offset,
+                "size": min(part_size, total_size - offset) if total_size else 0,
+            }
+        )
+    return parts
+
+
+def list_uploaded_parts(object_name: str, upload_id: str) -> List[dict]:
+    """Return parts already stored for an in-progress upload (used to resume)."""
+    uploaded: List[dict] = []
+    marker: Optional[str] = None
+    while True:
+        result = client()._list_parts(
+            settings.minio_bucket_raw,
+            object_name,
+            upload_id,
+            part_number_marker=marker,
+        )
+        for part in result.parts:
+            uploaded.append({"partNumber": part.part_number, "etag": part.etag, "size": part.size})
+        if not result.is_truncated or not result.next_part_number_marker:
+            break
+        marker = str(result.next_part_number_marker)
+    return uploaded
 
 
 def complete_multipart_upload(object_name: str, upload_id: str, etags: List[str]) -> str:
-    """Finalize multipart upload and return object storage key."""
-    ensure_bucket(settings.minio_bucket_raw)
-    # MinIO handles the PUT automatically; nothing to finalize in the emulated flow.
+    """Finalize multipart upload and return object storage key.
+
+    `etags` are ordered by part number and checked against the parts the
+    object store recorded, so a bad list fails with a clear error instead of
+    an `InvalidPart` from the store. Empty entries (e.g. a browser that could
+    not read the `ETag` header) take the recorded etag. When `etags` is empty,
+    every recorded part is used, which lets clients that lost track of etags
+    finish a resumed upload.
+    """
+    from minio.datatypes import Part
+
+    uploaded = {item["partNumber"]: item["etag"].strip('"') for item in list_uploaded_parts(object_name, upload_id)}
+    numbers = range(1, len(etags) + 1) if etags else sorted(uploaded)
+    for number, etag in zip(numbers, etags):
+        etag = etag.strip('"')
+        if number not in uploaded:
+            raise ValueError(f"Part {number} was not uploaded.")
+        if etag and etag != uploaded[number]:
+            raise ValueError(f"Part {number} etag {etag!r} does not match the uploaded part.")
+    parts = [Part(number, uploaded[number]) for number in numbers]
+    if not parts:
+        raise ValueError("No uploaded parts to complete.")
+    client()._complete_multipart_upload(settings.minio_bucket_raw, object_name, upload_id, parts)
     return object_name
 
 
-def build_signed_url(object_name: str, bucket: str | None = None, expires: int = 3600) -> str:
-    """Return a signed download URL for an object."""
-    if object_name.startswith("http") or object_name.startswith("/"):
-        return object_name
-    bucket_name = bucket or settings.minio_bucket_public
-    ensure_bucket(bucket_name)
-    return _client.get_presigned_url(
+def abort_multipart_upload(object_name: str, upload_id: str) -> None:
+    client()._abort_multipart_upload(settings.minio_bucket_raw, object_name, upload_id)
+
+
+def _sign_download(bucket_name: str, object_name: str, ttl: int) -> str:
+    return client().get_presigned_url(
         method="GET",
         bucket_name=bucket_name,
         object_name=object_name,
-        expires=expires or settings.download_url_expiry_seconds,
+        expires=timedelta(seconds=ttl),
     )
+
+
+def build_signed_url(object_name: str, bucket: str | None = None, expires: Optional[int] = None) -> str:
+    """Return a signed download URL for an object.
+
+    URLs are cached per expiry window of `ttl * signed_url_refresh_ratio`
+    seconds. A URL is signed on the first request of its window, so every URL
+    served still has at least `ttl * (1 - ratio)` seconds of validity left.
+    """
+    if object_name.startswith("http") or object_name.startswith("/"):
+        return object_name
+    bucket_name = bucket or settings.minio_bucket_public
+    ttl = expires or settings.download_url_expiry_seconds
+    ensure_bucket(bucket_name)
+    if settings.signed_url_cache_size <= 0:
+        return _sign_download(bucket_name, object_name, ttl)
+
+    window = max(1, int(ttl * settings.signed_url_refresh_ratio))
+    key = (bucket_name, object_name, ttl, int(time.time() // window))
+    with _signed_urls_lock:
+        url = _signed_urls.get(key)
+        if url is not None:
+            _signed_urls.move_to_end(key)
+            return url
+    url = _sign_download(bucket_name, object_name, ttl)
+    with _signed_urls_lock:
+        _signed_urls[key] = url
+        while len(_signed_urls) > settings.signed_url_cache_size:
+            _signed_urls.popitem(last=False)
+    return url
@@ -0,0 +1,139 @@
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlmodel import SQLModel
+
+from app.core.database import get_session
+from app.main import app
+from app.models import Asset, Job, JobStatus
+from app.routes import jobs as jobs_route
+
+
+@pytest_asyncio.fixture
+async def client(tmp_path, monkeypatch):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'jobs.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    sessions = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+    async with sessions() as session:
+        session.add_all(Asset(external_id=f"asset-{idx}", target_langs=["es"], storage_keys={}) for idx in range(3))
+        await session.commit()
+
+    async def override_session():
+        async with sessions() as session:
+            yield session
+
+    batches: list[list[tuple]] = []
+
+    def enqueue(jobs):
+        batches.append(list(jobs))
+        return [task_id for _, _, task_id in jobs][: getattr(enqueue, "limit", None)]
+
+    monkeypatch.setattr(jobs_route, "enqueue_pipeline_jobs", enqueue)
+    statements: list[str] = []
+    event.listen(
+        engine.sync_engine,
+        "before_cursor_execute",
+        lambda _conn, _cursor, statement, *_args: statements.append(statement.split()[0].upper()),
+    )
+    app.dependency_overrides[get_session] = override_session
+    async with AsyncClient(app=app, base_url="http://test") as http:
+        http.batches = batches  # type: ignore[attr-defined]
+        http.enqueue = enqueue  # type: ignore[attr-defined]
+        http.statements = statements  # type: ignore[attr-defined]
+        http.sessions = sessions  # type: ignore[attr-defined]
+        yield http
+    app.dependency_overrides.pop(get_session, None)
+    await engine.dispose()
+
+
+def _item(asset_id: str, langs: list[str], **extra) -> dict:
+    return {"assetId": asset_id, "targetLangs": langs, **extra}
+
+
+@pytest.mark.asyncio
+async def test_bulk_creates_jobs_in_one_insert_and_one_enqueue(client) -> None:
+    client.statements.clear()
+    response = await client.post(
+        "/v1/jobs/translate/bulk",
+        json={"items": [_item(f"asset-{idx}", ["es", "fr"], priority=idx) for idx in range(3)]},
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["created"], body["coalesced"], body["failed"]) == (3, 0, 0)
+    assert [item["index"] for item in body["items"]] == [0, 1, 2]
+    assert client.statements.count("INSERT") == 1
+    assert len(client.batches) == 1
+    job_ids = [item["job"]["jobId"] for item in body["items"]]
+    assert [job_id for job_id, _, _ in client.batches[0]] == job_ids
+    async with client.sessions() as session:
+        stored = {job.external_id: job for job in (await session.execute(select(Job))).scalars()}
+    assert [stored[job_id].task_id for job_id in job_ids] == [task_id for _, _, task_id in client.batches[0]]
+    assert stored[job_ids[2]].priority == 2
+
+
+@pytest.mark.asyncio
+async def test_bulk_reports_per_item_failures_and_coalesces_within_batch(client) -> None:
+    response = await client.post(
+        "/v1/jobs/translate/bulk",
+        json={
+            "items": [
+                _item("asset-0", ["es", "fr"]),
+                _item("missing", ["es"]),
+                _item("asset-0", ["fr"]),
+                _item("asset-0", ["fr", "de"]),
+            ]
+        },
+    )
+
+    body = response.json()
+    assert [item["status"] for item in body["items"]] == [200, 404, 200, 200]
+    first, missing, duplicate, superset = body["items"]
+    assert missing["error"] == "Asset not found."
+    assert duplicate["job"]["coalesced"] is True
+    assert duplicate["job"]["jobId"] == first["job"]["jobId"]
+    assert superset["job"]["targetLangs"] == ["de"]
+    assert superset["job"]["coalescedWith"] == [first["job"]["jobId"]]
+    assert (body["created"], body["coalesced"], body["failed"]) == (2, 1, 1)
+    assert len(client.batches[0]) == 2
+
+
+@pytest.mark.asyncio
+async def test_bulk_applies_the_active_job_quota(client, monkeypatch) -> None:
+    monkeypatch.setattr(jobs_route.settings, "max_active_jobs_per_key", 2)
+    monkeypatch.setattr(jobs_route, "_client_id", lambda request: "key-1")
+
+    response = await client.post(
+        "/v1/jobs/translate/bulk",
+        json={"items": [_item(f"asset-{idx}", ["es"]) for idx in range(3)]},
+    )
+
+    assert [item["status"] for item in response.json()["items"]] == [200, 200, 429]
+
+
+@pytest.mark.asyncio
+async def test_bulk_fails_the_jobs_the_broker_did_not_take(client) -> None:
+    client.enqueue.limit = 1  # the broker fails after the first task
+
+    response = await client.post(
+        "/v1/jobs/translate/bulk", json={"items": [_item(f"asset-{idx}", ["es"]) for idx in range(3)]}
+    )
+
+    body = response.json()
+    assert (body["created"], body["failed"]) == (1, 2)
+    assert [item["status"] for item in body["items"]] == [200, 503, 503]
+    async with client.sessions() as session:
+        jobs = (await session.execute(select(Job).order_by(Job.id))).scalars().all()
+    assert [(job.status, job.task_id is None) for job in jobs] == [
+        (JobStatus.PENDING, False),
+        (JobStatus.FAILED, True),
+        (JobStatus.FAILED, True),
+    ]
+
+    # A later identical request is not coalesced onto a job that was never queued.
+    client.enqueue.limit = None
+    retried = (await client.post("/v1/jobs/translate/bulk", json={"items": [_item("asset-1", ["es"])]})).json()
+    assert retried["created"] == 1 and retried["coalesced"] == 0
@@ -0,0 +1,89 @@
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlmodel import SQLModel
+
+from app.models import Asset, Job, JobStage, JobStatus
+from app.services import scheduler as scheduler_service
+from app.services.scheduler import FairScheduler, QueuedJob
+
+BASE = datetime(2024, 1, 1)
+
+
+def _queued(job_id: int, tenant: str, priority: int = 0) -> QueuedJob:
+    created = BASE + timedelta(seconds=job_id)
+    return QueuedJob(job_id=job_id, external_id=f"job-{job_id}", tenant=tenant, priority=priority, created_at=created, queued_at=created)
+
+
+def test_backlogged_tenant_does_not_starve_others() -> None:
+    candidates = [_queued(idx, "bulk") for idx in range(100)] + [_queued(100 + idx, "small") for idx in range(3)]
+    picked = FairScheduler().order(candidates, 6)
+    assert [job.tenant for job in picked].count("small") == 3
+
+
+def test_weights_split_dispatch_slots() -> None:
+    candidates = [_queued(idx, "a") for idx in range(50)] + [_queued(100 + idx, "b") for idx in range(50)]
+    picked = FairScheduler({"a": 3.0}).order(candidates, 40)
+    assert [job.tenant for job in picked].count("a") == 30
+
+
+def test_priority_orders_jobs_within_tenant() -> None:
+    candidates = [_queued(1, "a"), _queued(2, "a"), _queued(3, "a", priority=5)]
+    picked = FairScheduler().order(candidates, 3)
+    assert [job.job_id for job in picked] == [3, 1, 2]
+
+
+def test_idle_tenant_does_not_bank_credit() -> None:
+    scheduler = FairScheduler()
+    scheduler.order([_queued(idx, "a") for idx in range(20)], 20)
+    picked = scheduler.order([_queued(100 + idx, "a") for idx in range(4)] + [_queued(200 + idx, "b") for idx in range(4)], 4)
+    assert [job.tenant for job in picked].count("b") == 2
+
+
+@pytest_asyncio.fixture
+async def session(tmp_path, monkeypatch):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'sched.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    sessions = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+    monkeypatch.setattr(scheduler_service.settings, "scheduler_max_inflight", 4)
+    monkeypatch.setattr(scheduler_service.settings, "scheduler_dispatch_batch", 3)
+    async with sessions() as session:
+        asset = Asset(external_id="asset-1", target_langs=["es"], storage_keys={})
+        session.add(asset)
+        await session.commit()
+        for idx in range(6):
+            session.add(
+                Job(
+                    external_id=f"{'bulk' if idx < 5 else 'small'}-{idx}",
+                    asset_id=asset.id,
+                    stage=JobStage.ASR,
+                    status=JobStatus.PENDING,
+                    requested_by="bulk" if idx < 5 else "small",
+                    created_at=BASE + timedelta(seconds=idx),
+                    updated_at=BASE + timedelta(seconds=idx),
+                )
+            )
+        await session.commit()
+        yield session
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_dispatch_respects_batch_and_inflight_limits(session) -> None:
+    sent: list[str] = []
+
+    def enqueue(job_external_id, resume_from=None):
+        assert threading.current_thread() is not threading.main_thread()  # off the event loop
+        sent.append(job_external_id)
+
+    scheduler = FairScheduler()
+    assert await scheduler_service.dispatch_once(session, scheduler, enqueue=enqueue) == 3
+    assert "small-5" in sent
+    # One slot left under the in-flight cap.
+    assert await scheduler_service.dispatch_once(session, scheduler, enqueue=enqueue) == 1
+    assert await scheduler_service.dispatch_once(session, scheduler, enqueue=enqueue) == 0
+    assert len(set(sent)) == 4
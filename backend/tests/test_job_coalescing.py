@@ -0,0 +1,65 @@
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlmodel import SQLModel
+
+from app.core.database import get_session
+from app.main import app
+from app.models import Asset
+from app.routes import jobs as jobs_route
+
+
+@pytest_asyncio.fixture
+async def client(tmp_path, monkeypatch):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'jobs.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    sessions = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+    async with sessions() as session:
+        session.add(Asset(external_id="asset-1", target_langs=["es"], storage_keys={}))
+        await session.commit()
+
+    async def override_session():
+        async with sessions() as session:
+            yield session
+
+    enqueued: list[str] = []
+    monkeypatch.setattr(jobs_route, "enqueue_pipeline_job", lambda job_external_id, resume_from=None: enqueued.append(job_external_id))
+    app.dependency_overrides[get_session] = override_session
+    async with AsyncClient(app=app, base_url="http://test") as http:
+        http.enqueued = enqueued  # type: ignore[attr-defined]
+        yield http
+    app.dependency_overrides.pop(get_session, None)
+    await engine.dispose()
+
+
+async def _translate(client, langs, presets=None):
+    response = await client.post(
+        "/v1/jobs/translate",
+        json={"assetId": "asset-1", "targetLangs": langs, "presets": presets or {}},
+    )
+    assert response.status_code == 200
+    return response.json()
+
+
+@pytest.mark.asyncio
+async def test_identical_request_returns_inflight_job(client) -> None:
+    first = await _translate(client, ["es", "fr"])
+    again = await _translate(client, ["fr"])
+    assert again["jobId"] == first["jobId"]
+    assert again["coalesced"] is True
+    assert client.enqueued == [first["jobId"]]
+
+
+@pytest.mark.asyncio
+async def test_superset_request_only_schedules_new_languages(client) -> None:
+    first = await _translate(client, ["es"])
+    superset = await _translate(client, ["es", "de"])
+    assert superset["jobId"] != first["jobId"]
+    assert superset["targetLangs"] == ["de"]
+    assert superset["coalescedWith"] == [first["jobId"]]
+
+    other_presets = await _translate(client, ["es"], presets={"default": "male_deep"})
+    assert other_presets["coalesced"] is False
+    assert len(client.enqueued) == 3
@@ -0,0 +1,126 @@
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlmodel import SQLModel
+
+from app.core.database import get_session
+from app.main import app
+from app.models import Asset, Job, JobStage, JobStatus
+from app.routes import jobs as jobs_route
+
+STATUSES = [JobStatus.PENDING, JobStatus.RUNNING, JobStatus.SUCCESS]
+
+
+@pytest_asyncio.fixture
+async def client(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'jobs.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    sessions = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+    created = datetime(2024, 1, 1)
+    async with sessions() as session:
+        assets = [Asset(external_id=f"asset-{idx}") for idx in range(2)]
+        session.add_all(assets)
+        await session.commit()
+        session.add_all(
+            Job(
+                external_id=f"job-{idx:02d}",
+                asset_id=assets[idx % 2].id,
+                status=STATUSES[idx % 3],
+                stage=JobStage.TTS if idx % 2 else JobStage.ASR,
+                requested_by="key-a" if idx < 5 else "key-b",
+                # Pairs share a timestamp, so the id breaks ties.
+                created_at=created + timedelta(minutes=idx // 2),
+            )
+            for idx in range(25)
+        )
+        await session.commit()
+
+    async def override_session():
+        async with sessions() as session:
+            yield session
+
+    statements: list[str] = []
+    event.listen(
+        engine.sync_engine,
+        "before_cursor_execute",
+        lambda _conn, _cursor, statement, *_args: statements.append(statement),
+    )
+    app.dependency_overrides[get_session] = override_session
+    async with AsyncClient(app=app, base_url="http://test") as http:
+        http.statements = statements  # type: ignore[attr-defined]
+        http.sessions = sessions  # type: ignore[attr-defined]
+        yield http
+    app.dependency_overrides.pop(get_session, None)
+    await engine.dispose()
+
+
+async def _walk(client, **params) -> list[dict]:
+    items, cursor = [], None
+    while True:
+        query = {**params, **({"cursor": cursor} if cursor else {})}
+        body = (await client.get("/v1/jobs", params=query)).json()
+        items += body["items"]
+        cursor = body["nextCursor"]
+        if cursor is None:
+            return items
+
+
+@pytest.mark.asyncio
+async def test_cursor_pages_cover_every_job_newest_first(client) -> None:
+    items = await _walk(client, pageSize=4, total="none")
+
+    assert [item["jobId"] for item in items] == [f"job-{idx:02d}" for idx in reversed(range(25))]
+    assert items[0]["assetId"] == "asset-0" and items[1]["assetId"] == "asset-1"
+
+
+@pytest.mark.asyncio
+async def test_page_is_one_joined_query(client) -> None:
+    client.statements.clear()
+    body = (await client.get("/v1/jobs", params={"pageSize": 10, "total": "none"})).json()
+
+    assert len(body["items"]) == 10 and body["total"] is None
+    assert len(client.statements) == 1
+    assert "JOIN assets" in client.statements[0]
+
+
+@pytest.mark.asyncio
+async def test_filters_and_totals(client) -> None:
+    running = await _walk(client, pageSize=3, status="RUNNING")
+    assert {item["status"] for item in running} == {"RUNNING"} and len(running) == 8
+
+    body = (await client.get("/v1/jobs", params={"stage": "TTS", "requestedBy": "key-a"})).json()
+    assert [item["jobId"] for item in body["items"]] == ["job-03", "job-01"]
+    assert (body["total"], body["totalEstimated"]) == (2, False)
+
+    estimated = (await client.get("/v1/jobs", params={"total": "estimate"})).json()
+    assert (estimated["total"], estimated["totalEstimated"]) == (25, True)
+
+    offset = (await client.get("/v1/jobs", params={"page": 2, "pageSize": 10})).json()
+    assert offset["items"][0]["jobId"] == "job-14" and offset["total"] == 25
+
+
+@pytest.mark.asyncio
+async def test_invalid_cursor_is_rejected(client) -> None:
+    response = await client.get("/v1/jobs", params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_cancel_revokes_the_task_off_the_event_loop(client, monkeypatch) -> None:
+    async with client.sessions() as session:
+        session.add(Job(external_id="job-cancel", asset_id=1, status=JobStatus.RUNNING, task_id="task-1"))
+        await session.commit()
+    revoked: list[tuple] = []
+    monkeypatch.setattr(jobs_route, "revoke_task", lambda task_id: revoked.append((task_id, threading.current_thread())))
+
+    response = await client.delete("/v1/jobs/job-cancel")
+
+    assert response.status_code == 204
+    assert [task_id for task_id, _ in revoked] == ["task-1"]
+    assert revoked[0][1] is not threading.main_thread()
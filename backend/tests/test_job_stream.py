@@ -0,0 +1,101 @@
+import asyncio
+import json
+
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlmodel import SQLModel
+
+from app.core.database import get_session
+from app.main import app
+from app.models import Asset, Job, JobStage, JobStatus
+from app.services import job_events, job_streams
+from shared.job_events import job_event
+
+
+@pytest_asyncio.fixture
+async def client(tmp_path, monkeypatch):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'jobs.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    sessions = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+    async with sessions() as session:
+        asset = Asset(external_id="asset-1")
+        session.add(asset)
+        await session.commit()
+        session.add(Job(external_id="job-1", asset_id=asset.id, status=JobStatus.RUNNING, stage=JobStage.ASR))
+        session.add(Job(external_id="job-2", asset_id=asset.id, status=JobStatus.SUCCESS, stage=JobStage.DONE))
+        await session.commit()
+
+    async def override_session():
+        async with sessions() as session:
+            yield session
+
+    statements: list[str] = []
+    event.listen(
+        engine.sync_engine,
+        "before_cursor_execute",
+        lambda _conn, _cursor, statement, *_args: statements.append(statement),
+    )
+    monkeypatch.setattr(job_events, "_following", True)
+    app.dependency_overrides[get_session] = override_session
+    async with AsyncClient(app=app, base_url="http://test") as http:
+        http.statements = statements  # type: ignore[attr-defined]
+        yield http
+    app.dependency_overrides.pop(get_session, None)
+    await engine.dispose()
+
+
+def _events(body: str) -> list[tuple[str, dict]]:
+    parsed = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines() if not line.startswith(":"))
+        if lines:
+            parsed.append((lines["event"], json.loads(lines["data"])))
+    return parsed
+
+
+async def _wait_for_watcher() -> None:
+    for _ in range(100):
+        if job_streams.connections():
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("stream never started watching")
+
+
+@pytest.mark.asyncio
+async def test_stream_pushes_changes_without_querying_per_event(client) -> None:
+    response = asyncio.create_task(client.get("/v1/jobs/job-1/events"))
+    await _wait_for_watcher()
+    queries = len(client.statements)
+    job_events.dispatch(job_event("job-2", status=JobStatus.RUNNING))  # another job: not forwarded
+    job_events.dispatch(job_event("job-1", status=JobStatus.RUNNING, stage=JobStage.TTS, progress=0.6))
+    job_events.dispatch(job_event("job-1", history={"TTS": {"status": "success"}}))
+    job_events.dispatch(job_event("job-1", status=JobStatus.SUCCESS, stage=JobStage.DONE, progress=1.0))
+    body = (await response).text
+
+    events = _events(body)
+    assert [name for name, _ in events] == ["job", "progress", "progress", "progress"]
+    assert events[0][1]["status"] == "RUNNING" and events[0][1]["assetId"] == "asset-1"
+    assert events[1][1]["progress"] == 0.6 and events[2][1]["history"] == {"TTS": {"status": "success"}}
+    assert len(client.statements) == queries
+    assert job_streams.connections() == 0
+
+
+@pytest.mark.asyncio
+async def test_stream_of_finished_job_ends_after_snapshot(client) -> None:
+    response = await client.get("/v1/jobs/job-2/events")
+
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert [name for name, _ in _events(response.text)] == ["job"]
+    assert (await client.get("/v1/jobs/missing/events")).status_code == 404
+    assert job_streams.connections() == 0
+
+
+@pytest.mark.asyncio
+async def test_stream_unavailable_without_event_stream(client, monkeypatch) -> None:
+    monkeypatch.setattr(job_events, "_following", False)
+
+    assert (await client.get("/v1/jobs/job-1/events")).status_code == 503
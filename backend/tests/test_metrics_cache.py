@@ -1,21 +1,14 @@
-from app.models import Job, JobStage, JobStatus
-from app.routes.metrics import (
+import pytest
+
+from app.models import JobStage, JobStatus
+from app.services import job_events
+from app.services.job_metrics import (
+    JobCounts,
     _mark_stage_event,
-    _record_stage_history_metrics,
     _reset_stage_history_cache_for_tests,
+    record_stage_history,
 )
-
-
-def _build_job(stage_history: dict) -> Job:
-    job = Job(
-        external_id="job-1",
-        asset_id=1,
-        stage=JobStage.ASR,
-        status=JobStatus.RUNNING,
-        progress=0.0,
-    )
-    job.stage_history = stage_history
-    return job
+from shared.job_events import decode, encode, job_event
 
 
 def test_mark_stage_event_deduplicates_entries() -> None:
@@ -24,16 +17,60 @@ def test_mark_stage_event_deduplicates_entries() -> None:
     assert _mark_stage_event("job", "ASR", "2024-01-01T00:00:00Z") is False
 
 
-def test_record_stage_history_metrics_counts_new_entries() -> None:
+def test_record_stage_history_counts_new_entries() -> None:
     _reset_stage_history_cache_for_tests()
     stage_history = {
         JobStage.ASR.value: {"status": "success", "details": {"durationMs": 1200}, "updatedAt": "2024-01-01T00:00:00Z"},
         JobStage.ALIGN_MIX.value: {"status": "failed", "details": {"durationMs": 2500}, "updatedAt": "2024-01-01T01:00:00Z"},
     }
-    job = _build_job(stage_history)
 
-    recorded = _record_stage_history_metrics(job)
+    recorded = record_stage_history("job-1", stage_history)
     assert recorded == 2
 
-    recorded_again = _record_stage_history_metrics(job)
+    recorded_again = record_stage_history("job-1", stage_history)
     assert recorded_again == 0
+
+
+def test_job_counts_follow_transitions() -> None:
+    counts = JobCounts()
+    counts.apply(job_event("job-1", status=JobStatus.PENDING, stage=JobStage.ASR))
+    counts.apply(job_event("job-2", status=JobStatus.PENDING, stage=JobStage.ASR))
+    counts.apply(job_event("job-1", status=JobStatus.RUNNING, stage=JobStage.TTS, progress=0.5))
+    assert counts.by_status == {JobStatus.PENDING: 1, JobStatus.RUNNING: 1}
+    assert counts.running == {JobStage.TTS: 1}
+
+    counts.apply(job_event("job-1", status=JobStatus.CANCELLED, stage=JobStage.DONE))
+    counts.apply(job_event("job-1", status=JobStatus.RUNNING, stage=JobStage.PACKAGE))
+    assert counts.by_status[JobStatus.CANCELLED] == 1  # late worker update after the cancel is ignored
+    assert counts.by_status[JobStatus.RUNNING] == 0 and counts.running[JobStage.TTS] == 0
+
+    counts.apply(job_event("job-1", status=JobStatus.PENDING, stage=JobStage.TTS))  # retry
+    assert (counts.by_status[JobStatus.CANCELLED], counts.by_status[JobStatus.PENDING]) == (0, 2)
+
+
+def test_reconcile_replaces_drifted_counts() -> None:
+    counts = JobCounts()
+    counts.apply(job_event("job-1", status=JobStatus.RUNNING, stage=JobStage.ASR))
+
+    drift = counts.reconcile(
+        {JobStatus.RUNNING: 1, JobStatus.SUCCESS: 3},
+        {"job-9": (JobStatus.RUNNING, JobStage.TTS)},
+    )
+
+    assert drift == 3
+    assert counts.running == {JobStage.TTS: 1}
+    counts.apply(job_event("job-9", status=JobStatus.SUCCESS, stage=JobStage.DONE))
+    assert counts.by_status == {JobStatus.RUNNING: 0, JobStatus.SUCCESS: 4}
+    assert counts.running == {JobStage.TTS: 0}
+
+
+@pytest.mark.asyncio
+async def test_publish_dispatches_locally_without_the_stream() -> None:
+    received: list[dict] = []
+    job_events.subscribe(received.append)
+    try:
+        await job_events.publish(job_event("job-1", status=JobStatus.PENDING))
+    finally:
+        job_events.unsubscribe(received.append)
+    assert [event["job"] for event in received] == ["job-1"]
+    assert decode(encode(received[0])) == received[0]
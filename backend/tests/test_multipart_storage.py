@@ -0,0 +1,67 @@
+from types import SimpleNamespace
+
+import pytest
+
+from minio.datatypes import Part
+
+from app.services import storage
+
+
+class FakeMinio:
+    def __init__(self) -> None:
+        self.completed: list[Part] = []
+
+    def get_presigned_url(self, method, bucket_name, object_name, expires, extra_query_params=None):
+        params = extra_query_params or {}
+        return f"http://s3/{bucket_name}/{object_name}?uploadId={params['uploadId']}&partNumber={params['partNumber']}"
+
+    def _list_parts(self, bucket_name, object_name, upload_id, part_number_marker=None):
+        if part_number_marker is None:
+            parts = [Part(1, "etag-1", size=10), Part(2, "etag-2", size=10)]
+            return SimpleNamespace(parts=parts, is_truncated=True, next_part_number_marker=2)
+        return SimpleNamespace(parts=[Part(3, "etag-3", size=5)], is_truncated=False, next_part_number_marker=None)
+
+    def _complete_multipart_upload(self, bucket_name, object_name, upload_id, parts):
+        self.completed = parts
+
+
+def test_part_size_grows_to_respect_part_limit() -> None:
+    assert storage.part_size_for(1024) == max(storage.settings.upload_part_size, storage.MIN_PART_SIZE)
+    huge = storage.MAX_UPLOAD_PARTS * storage.settings.upload_part_size * 2
+    assert storage.part_count_for(huge) <= storage.MAX_UPLOAD_PARTS
+
+
+def test_presigned_parts_cover_whole_object(monkeypatch) -> None:
+    monkeypatch.setattr(storage, "_client", FakeMinio())
+    part_size = storage.part_size_for(0)
+    total = part_size * 2 + 123
+    parts = storage.get_presigned_parts("raw/a/movie.mp4", "up-1", total)
+    assert [part["partNumber"] for part in parts] == [1, 2, 3]
+    assert sum(part["size"] for part in parts) == total
+    assert "partNumber=3" in parts[2]["uploadUrl"]
+
+    remaining = storage.get_presigned_parts("raw/a/movie.mp4", "up-1", total, skip_parts={1, 2})
+    assert [part["partNumber"] for part in remaining] == [3]
+
+
+def test_complete_uses_listed_parts_when_etags_missing(monkeypatch) -> None:
+    fake = FakeMinio()
+    monkeypatch.setattr(storage, "_client", fake)
+    assert [p["partNumber"] for p in storage.list_uploaded_parts("obj", "up-1")] == [1, 2, 3]
+
+    storage.complete_multipart_upload("obj", "up-1", ['"etag-1"', ""])
+    assert [(p.part_number, p.etag) for p in fake.completed] == [(1, "etag-1"), (2, "etag-2")]
+
+    storage.complete_multipart_upload("obj", "up-1", [])
+    assert [p.part_number for p in fake.completed] == [1, 2, 3]
+
+
+def test_complete_rejects_etags_that_were_not_uploaded(monkeypatch) -> None:
+    fake = FakeMinio()
+    monkeypatch.setattr(storage, "_client", fake)
+
+    with pytest.raises(ValueError, match="Part 1 etag"):
+        storage.complete_multipart_upload("obj", "up-1", ["mobile-etag"])
+    with pytest.raises(ValueError, match="Part 4 was not uploaded"):
+        storage.complete_multipart_upload("obj", "up-1", ["etag-1", "etag-2", "etag-3", "etag-4"])
+    assert fake.completed == []
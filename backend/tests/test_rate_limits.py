@@ -0,0 +1,104 @@
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlmodel import SQLModel
+
+from app.dependencies import security
+from app.main import app
+from app.models import Asset, Job, JobStatus
+from app.services import active_jobs, job_events, rate_limits
+from app.services.rate_limits import RATE_LIMIT_WINDOW, LocalWindows
+from shared.job_events import job_event
+
+
+def test_sliding_window_weighs_the_previous_window() -> None:
+    windows = LocalWindows()
+    start = 100 * RATE_LIMIT_WINDOW
+
+    assert all(windows.allow("key", 10, start + 1) for _ in range(10))
+    assert windows.allow("key", 10, start + 2) is False  # rejected requests are not counted
+    # A quarter into the next window, 75% of the previous 10 still count.
+    assert [windows.allow("key", 10, start + RATE_LIMIT_WINDOW * 1.25) for _ in range(4)] == [True, True, True, False]
+    # Two windows later nothing counts any more.
+    assert sum(windows.allow("key", 10, start + RATE_LIMIT_WINDOW * 3) for _ in range(11)) == 10
+
+
+def test_local_windows_drop_idle_keys() -> None:
+    windows = LocalWindows()
+    start = 100 * RATE_LIMIT_WINDOW
+    for idx in range(1000):
+        windows.allow(f"key-{idx}", 10, start)
+
+    windows.allow("key-0", 10, start + RATE_LIMIT_WINDOW)
+    assert len(windows) == 1000  # the previous window still counts
+    windows.allow("key-0", 10, start + 2 * RATE_LIMIT_WINDOW)
+    assert len(windows) == 1
+
+
+@pytest.mark.asyncio
+async def test_api_key_requests_are_limited(monkeypatch) -> None:
+    monkeypatch.setattr(security.settings, "api_keys", ["secret"])
+    monkeypatch.setattr(rate_limits.settings, "rate_limit_backend", "local")
+    monkeypatch.setattr(rate_limits.settings, "rate_limit_per_minute", 3)
+    monkeypatch.setattr(rate_limits, "local_windows", LocalWindows())
+
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        assert (await client.get("/metrics")).status_code == 401
+        codes = [(await client.get("/metrics", headers={"X-API-Key": "secret"})).status_code for _ in range(4)]
+
+    assert codes == [200, 200, 200, 429]
+
+
+@pytest_asyncio.fixture
+async def session(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'jobs.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    sessions = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+    async with sessions() as session:
+        asset = Asset(external_id="asset-1")
+        session.add(asset)
+        await session.commit()
+        session.add_all(
+            Job(external_id=f"job-{idx}", asset_id=asset.id, status=status, requested_by="key-a")
+            for idx, status in enumerate([JobStatus.PENDING, JobStatus.RUNNING, JobStatus.SUCCESS])
+        )
+        await session.commit()
+        statements: list[str] = []
+        event.listen(
+            engine.sync_engine,
+            "before_cursor_execute",
+            lambda _conn, _cursor, statement, *_args: statements.append(statement),
+        )
+        session.statements = statements  # type: ignore[attr-defined]
+        yield session
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_active_jobs_follow_transitions_without_recounting(session, monkeypatch) -> None:
+    monkeypatch.setattr(job_events, "_following", True)
+    tracker = active_jobs.ActiveJobs()
+
+    assert await tracker.count(session, "key-a") == 2
+    queries = len(session.statements)
+    tracker.add("key-a", ["job-new"])
+    tracker.apply(job_event("job-other", status=JobStatus.PENDING, requester="key-a"))  # created on another replica
+    tracker.apply(job_event("job-1", status=JobStatus.SUCCESS))
+    tracker.apply(job_event("job-1", status=JobStatus.RUNNING))  # late worker update: ignored
+    tracker.apply(job_event("job-9", status=JobStatus.PENDING, requester="key-b"))  # key-b not loaded
+
+    assert await tracker.count(session, "key-a") == 3
+    assert len(session.statements) == queries
+
+
+@pytest.mark.asyncio
+async def test_active_jobs_count_in_database_without_event_stream(session, monkeypatch) -> None:
+    monkeypatch.setattr(job_events, "_following", False)
+    tracker = active_jobs.ActiveJobs()
+
+    assert await tracker.count(session, "key-a") == 2
+    assert await tracker.count(session, "key-a") == 2
+    assert sum("count(" in statement.lower() for statement in session.statements) == 2
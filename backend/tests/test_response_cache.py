@@ -0,0 +1,146 @@
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlmodel import SQLModel
+
+from app.core.database import get_session
+from app.main import app
+from app.models import Asset, Job
+from app.services import response_cache
+from app.services.response_cache import ASSET, JOB, entry_key, etag_for, ttl_for
+
+
+@pytest_asyncio.fixture
+async def client(tmp_path, monkeypatch):
+    monkeypatch.setattr(response_cache.settings, "response_cache_enabled", False)
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'jobs.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    sessions = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+    async with sessions() as session:
+        asset = Asset(external_id="asset-1")
+        session.add(asset)
+        await session.commit()
+        session.add(Job(external_id="job-1", asset_id=asset.id))
+        await session.commit()
+
+    async def override_session():
+        async with sessions() as session:
+            yield session
+
+    app.dependency_overrides[get_session] = override_session
+    async with AsyncClient(app=app, base_url="http://test") as http:
+        yield http
+    app.dependency_overrides.pop(get_session, None)
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("path", ["/v1/jobs/job-1", "/v1/assets/asset-1"])
+async def test_matching_etag_is_not_modified(client, path) -> None:
+    first = await client.get(path)
+    etag = first.headers["etag"]
+    assert first.status_code == 200 and etag == etag_for(first.content)
+    assert first.headers["cache-control"] == "no-cache"
+
+    for header in (etag, f'"other", W/{etag}', "*"):
+        revalidated = await client.get(path, headers={"If-None-Match": header})
+        assert revalidated.status_code == 304 and revalidated.content == b""
+        assert revalidated.headers["etag"] == etag
+    changed = await client.get(path, headers={"If-None-Match": '"other"'})
+    assert changed.status_code == 200 and changed.content == first.content
+
+
+@pytest.mark.asyncio
+async def test_responses_keep_their_shape(client) -> None:
+    job = (await client.get("/v1/jobs/job-1")).json()
+    asset = (await client.get("/v1/assets/asset-1")).json()
+
+    assert (job["jobId"], job["assetId"], job["status"]) == ("job-1", "asset-1", "PENDING")
+    assert (asset["assetId"], asset["outputs"]) == ("asset-1", {})
+    assert (await client.get("/v1/jobs/missing")).status_code == 404
+    assert (await client.get("/v1/assets/missing")).status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_unreachable_redis_falls_back_to_the_database(client, monkeypatch) -> None:
+    monkeypatch.setattr(response_cache.settings, "response_cache_enabled", True)
+    monkeypatch.setattr(response_cache.settings, "redis_url", "redis://127.0.0.1:1/0")
+    monkeypatch.setattr(response_cache, "_client", None)
+    monkeypatch.setattr(response_cache, "_paused_until", 0.0)
+
+    response = await client.get("/v1/jobs/job-1")
+    assert response.status_code == 200 and response.json()["jobId"] == "job-1"
+    assert not response_cache._available()  # paused; later requests skip Redis
+
+
+class _FakeRedis:
+    def __init__(self) -> None:
+        self.down = False
+        self.commands: list[tuple] = []
+
+    def pipeline(self, transaction: bool = True) -> "_FakePipeline":
+        return _FakePipeline(self)
+
+    def register_script(self, script: str):
+        async def fill(keys, args):
+            return 1
+
+        return fill
+
+
+class _FakePipeline:
+    def __init__(self, redis: _FakeRedis) -> None:
+        self.redis = redis
+        self.queued: list[tuple] = []
+
+    def __getattr__(self, command: str):
+        return lambda *args: self.queued.append((command, *args))
+
+    async def execute(self) -> list:
+        if self.redis.down:
+            raise ConnectionError("redis down")
+        self.redis.commands += self.queued
+        return [[None, None] if command == "hmget" else None for command, *_ in self.queued]
+
+
+@pytest.mark.asyncio
+async def test_invalidations_made_during_an_outage_are_applied_before_reads_resume(client, monkeypatch) -> None:
+    redis = _FakeRedis()
+    monkeypatch.setattr(response_cache.settings, "response_cache_enabled", True)
+    monkeypatch.setattr(response_cache, "_client", redis)
+    monkeypatch.setattr(response_cache, "_paused_until", 0.0)
+    monkeypatch.setattr(response_cache, "_pending", set())
+
+    redis.down = True
+    await client.get("/v1/jobs/job-1")
+    assert not response_cache._available()
+    await response_cache.invalidate_jobs("job-1")  # attempted despite the pause, kept when it fails
+    assert response_cache._pending == {(JOB, "job-1")}
+
+    redis.down = False
+    await response_cache.invalidate_assets("asset-1")  # the read pause does not hold invalidations back
+    assert response_cache._pending == set()
+    deleted = {command[1] for command in redis.commands if command[0] == "delete"}
+    assert deleted == {entry_key(ASSET, "asset-1"), entry_key(JOB, "job-1")}
+
+    redis.down = True
+    await response_cache.invalidate_jobs("job-1")
+    redis.down = False
+    redis.commands.clear()
+    monkeypatch.setattr(response_cache, "_paused_until", 0.0)
+    await client.get("/v1/jobs/job-1")
+    # The pending delete is sent before the first lookup after the pause.
+    assert [command[0] for command in redis.commands][:2] == ["delete", "incr"]
+    assert response_cache._pending == set()
+
+
+def test_asset_entries_expire_before_their_signed_urls(monkeypatch) -> None:
+    monkeypatch.setattr(response_cache.settings, "response_cache_seconds", 300.0)
+    monkeypatch.setattr(response_cache.settings, "download_url_expiry_seconds", 900)
+    monkeypatch.setattr(response_cache.settings, "signed_url_refresh_ratio", 0.5)
+
+    assert ttl_for(JOB) == 300
+    # URLs are reused for 450 s of their 900 s, so each is valid for at least 450 s when served.
+    assert ttl_for(ASSET) == 225
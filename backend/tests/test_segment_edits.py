@@ -0,0 +1,86 @@
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlmodel import SQLModel
+
+from app.core.database import get_session
+from app.main import app
+from app.models import Asset, Job, JobStatus, Segment
+from app.routes import assets as assets_route
+
+
+@pytest_asyncio.fixture
+async def client(tmp_path, monkeypatch):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'edits.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    sessions = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+    async with sessions() as session:
+        asset = Asset(external_id="asset-1", target_langs=["es"], storage_keys={"public_es": "asset-1/public/es/audio.m3u8"})
+        session.add(asset)
+        await session.commit()
+        session.add(
+            Job(
+                external_id="done-1",
+                asset_id=asset.id,
+                status=JobStatus.SUCCESS,
+                target_langs=["es"],
+                presets={"default": "female_bright"},
+            )
+        )
+        await session.commit()
+
+    async def override_session():
+        async with sessions() as session:
+            yield session
+
+    enqueued: list[str] = []
+    monkeypatch.setattr(assets_route, "enqueue_redub_job", lambda job_external_id: enqueued.append(job_external_id))
+    app.dependency_overrides[get_session] = override_session
+    async with AsyncClient(app=app, base_url="http://test") as http:
+        http.enqueued = enqueued  # type: ignore[attr-defined]
+        http.sessions = sessions  # type: ignore[attr-defined]
+        yield http
+    app.dependency_overrides.pop(get_session, None)
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_edit_marks_segments_dirty_and_queues_redub(client) -> None:
+    response = await client.patch(
+        "/v1/assets/asset-1/segments",
+        json={"targetLang": "es", "edits": [{"idx": 3, "text": "hola"}, {"idx": 1, "text": "adiós"}]},
+    )
+    assert response.status_code == 200
+    body = response.json()
+    assert body["dirty"] == [1, 3]
+    assert client.enqueued == [body["jobId"]]
+
+    async with client.sessions() as session:
+        segments = (await session.execute(select(Segment).order_by(Segment.idx))).scalars().all()
+        job = (await session.execute(select(Job).where(Job.external_id == body["jobId"]))).scalar_one()
+    assert [(s.idx, s.text_tgt, s.dirty, s.language) for s in segments] == [(1, "adiós", True, "es"), (3, "hola", True, "es")]
+    assert job.kind == "redub"
+    assert job.presets == {"default": "female_bright"}
+    assert job.dispatched_at is not None
+
+
+@pytest.mark.asyncio
+async def test_edit_without_redub_only_marks_dirty(client) -> None:
+    payload = {"targetLang": "es", "edits": [{"idx": 0, "text": "uno"}], "redub": False}
+    response = await client.patch("/v1/assets/asset-1/segments", json=payload)
+    assert response.status_code == 200
+    assert response.json()["jobId"] is None
+    assert client.enqueued == []
+
+
+@pytest.mark.asyncio
+async def test_edit_rejects_language_without_dub(client) -> None:
+    payload = {"targetLang": "fr", "edits": [{"idx": 0, "text": "un"}]}
+    response = await client.patch("/v1/assets/asset-1/segments", json=payload)
+    assert response.status_code == 404
+    assert client.enqueued == []
+    async with client.sessions() as session:
+        assert (await session.execute(select(Segment))).scalars().all() == []
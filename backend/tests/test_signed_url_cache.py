@@ -0,0 +1,46 @@
+from app.services import storage
+
+
+class CountingMinio:
+    def __init__(self) -> None:
+        self.bucket_checks = 0
+        self.signed = 0
+
+    def bucket_exists(self, bucket_name):
+        self.bucket_checks += 1
+        return True
+
+    def get_presigned_url(self, method, bucket_name, object_name, expires):
+        self.signed += 1
+        return f"http://s3/{bucket_name}/{object_name}?expires={int(expires.total_seconds())}&sig={self.signed}"
+
+
+def test_signed_urls_are_reused_within_expiry_window(monkeypatch) -> None:
+    fake = CountingMinio()
+    monkeypatch.setattr(storage, "_client", fake)
+    storage._reset_caches_for_tests()
+    now = [1_000_000.0]
+    monkeypatch.setattr(storage.time, "time", lambda: now[0])
+    ttl = storage.settings.download_url_expiry_seconds
+
+    first = storage.build_signed_url("a/master.m3u8", bucket="pub")
+    assert storage.build_signed_url("a/master.m3u8", bucket="pub") == first
+    assert f"expires={ttl}" in first
+    assert fake.signed == 1
+
+    storage.build_signed_url("b/master.m3u8", bucket="pub")
+    assert fake.bucket_checks == 1
+
+    # Past the refresh point a new URL is signed well before the old one expires.
+    now[0] += ttl * storage.settings.signed_url_refresh_ratio
+    assert storage.build_signed_url("a/master.m3u8", bucket="pub") != first
+    assert fake.signed == 3
+
+
+def test_signed_url_cache_is_bounded(monkeypatch) -> None:
+    monkeypatch.setattr(storage, "_client", CountingMinio())
+    monkeypatch.setattr(storage.settings, "signed_url_cache_size", 2)
+    storage._reset_caches_for_tests()
+    for name in ("a", "b", "c"):
+        storage.build_signed_url(f"{name}/master.m3u8", bucket="pub")
+    assert len(storage._signed_urls) == 2
@@ -1,5 +1,6 @@
 import axios from "axios";
 import type { AxiosRequestConfig } from "axios";
+import type { Readable } from "stream";
 import { config } from "./config";
 
 const client = axios.create({
@@ -7,13 +8,29 @@ const client = axios.create({
   timeout: 15000,
 });
 
-export async function forwardRequest<T = unknown>(options: AxiosRequestConfig): Promise<T> {
-  const headers = {
-    ...options.headers,
+function withApiKey(headers: AxiosRequestConfig["headers"]) {
+  const merged = {
+    ...headers,
   };
   if (config.backendApiKey) {
-    headers[config.apiKeyHeader] = config.backendApiKey;
+    merged[config.apiKeyHeader] = config.backendApiKey;
   }
-  const response = await client.request<T>({ ...options, headers });
+  return merged;
+}
+
+export async function forwardRequest<T = unknown>(options: AxiosRequestConfig): Promise<T> {
+  const response = await client.request<T>({ ...options, headers: withApiKey(options.headers) });
+  return response.data;
+}
+
+// Opens a backend Server-Sent Events stream; the request never times out.
+export async function openStream(url: string): Promise<Readable> {
+  const response = await client.request<Readable>({
+    method: "GET",
+    url,
+    headers: withApiKey({ Accept: "text/event-stream" }),
+    responseType: "stream",
+    timeout: 0,
+  });
   return response.data;
 }
@@ -1,5 +1,6 @@
 import request from "supertest";
 import axios from "axios";
+import { Readable } from "stream";
 import app from "./server";
 
 jest.mock("axios");
@@ -23,4 +24,28 @@ describe("gateway routes", () => {
     await request(app).get("/api/jobs").expect(200, { items: [] });
     expect(mockedAxios.request).toHaveBeenCalledWith(expect.objectContaining({ url: "/jobs", method: "GET" }));
   });
+
+  it("relays the backend progress stream as full jobs", async () => {
+    const backendStream = Readable.from([
+      'event: job\ndata: {"jobId":"j","status":"RUNNING","stage":"ASR","progress":0.1,"stageHistory":{}}\n\n',
+      ": keepalive\n\n",
+      'event: progress\ndata: {"job":"j","progress":0.5}\n\nevent: progress\ndata: {"job":"j","status":"SUCCESS","stage":"DONE"}\n\n',
+    ]);
+    mockedAxios.request.mockResolvedValueOnce(mockData(backendStream));
+
+    const response = await request(app).get("/api/jobs/j/events").expect(200);
+
+    const jobs = response.text
+      .split("\n\n")
+      .filter((block) => block.startsWith("data: "))
+      .map((block) => JSON.parse(block.slice("data: ".length)));
+    expect(jobs.map((job) => [job.status, job.progress])).toEqual([
+      ["RUNNING", 0.1],
+      ["RUNNING", 0.5],
+      ["SUCCESS", 0.5],
+    ]);
+    expect(mockedAxios.request).toHaveBeenCalledWith(
+      expect.objectContaining({ url: "/jobs/j/events", responseType: "stream" })
+    );
+  });
 });
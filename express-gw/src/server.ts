@@ -3,7 +3,8 @@ import cors from "cors";
 import morgan from "morgan";
 import rateLimit from "express-rate-limit";
 import { config } from "./config";
-import { forwardRequest } from "./backendClient";
+import type { Readable } from "stream";
+import { forwardRequest, openStream } from "./backendClient";
 
 const app = express();
 app.use(cors());
@@ -82,33 +83,97 @@ app.delete(`${prefix}/jobs/:id`, async (req, res, next) => {
   }
 });
 
+const FINAL_STATUSES = ["SUCCESS", "FAILED", "CANCELLED"];
+
+// Each message is the full job. The backend stream (`GET /v1/jobs/:id/events`) is relayed
+// with its progress events merged into the job; if it cannot be opened (the backend answers
+// 503 without its event stream), the job is polled every 2 s instead.
 app.get(`${prefix}/jobs/:id/events`, async (req, res, next) => {
   res.setHeader("Content-Type", "text/event-stream");
   res.setHeader("Cache-Control", "no-cache");
   res.setHeader("Connection", "keep-alive");
 
   let active = true;
-  const send = async () => {
+  let upstream: Readable | null = null;
+  const finish = () => {
+    if (active) {
+      active = false;
+      res.end();
+    }
+    upstream?.destroy();
+  };
+
+  const poll = async () => {
     if (!active) return;
     try {
-      const data = await forwardRequest({ method: "GET", url: `/jobs/${req.params.id}` });
+      const data = await forwardRequest<{ status: string }>({ method: "GET", url: `/jobs/${req.params.id}` });
       res.write(`data: ${JSON.stringify(data)}\n\n`);
-      if (data.status === "SUCCESS" || data.status === "FAILED" || data.status === "CANCELLED") {
-        res.end();
-        active = false;
+      if (FINAL_STATUSES.includes(data.status)) {
+        finish();
         return;
       }
     } catch (err) {
       res.write(`event: error\ndata: ${JSON.stringify({ error: (err as Error).message })}\n\n`);
     }
-    setTimeout(send, 2000);
+    setTimeout(poll, 2000);
   };
 
   req.on("close", () => {
     active = false;
+    finish();
   });
 
-  send().catch(next);
+  try {
+    upstream = await openStream(`/jobs/${req.params.id}/events`);
+  } catch {
+    poll().catch(next);
+    return;
+  }
+
+  let job: Record<string, any> | null = null;
+  let buffer = "";
+  const handle = (block: string) => {
+    let event = "message";
+    let data = "";
+    for (const line of block.split("\n")) {
+      if (line.startsWith("event: ")) event = line.slice("event: ".length);
+      else if (line.startsWith("data: ")) data += line.slice("data: ".length);
+    }
+    if (!data) {
+      res.write(": keepalive\n\n");
+      return;
+    }
+    const payload = JSON.parse(data);
+    if (event === "job") {
+      job = payload;
+    } else if (event === "progress" && job) {
+      job = {
+        ...job,
+        status: payload.status ?? job.status,
+        stage: payload.stage ?? job.stage,
+        progress: payload.progress ?? job.progress,
+        stageHistory: { ...job.stageHistory, ...payload.history },
+      };
+    } else {
+      return;
+    }
+    res.write(`data: ${JSON.stringify(job)}\n\n`);
+    if (job && FINAL_STATUSES.includes(job.status)) {
+      finish();
+    }
+  };
+  upstream.on("data", (chunk: Buffer | string) => {
+    buffer += chunk.toString();
+    let end = buffer.indexOf("\n\n");
+    while (end >= 0 && active) {
+      handle(buffer.slice(0, end));
+      buffer = buffer.slice(end + 2);
+      end = buffer.indexOf("\n\n");
+    }
+  });
+  // The backend also ends the stream when this client falls behind; the client reconnects.
+  upstream.on("end", finish);
+  upstream.on("error", finish);
 });
 
 // Error handler
@@ -1,4 +1,5 @@
 import axios from "axios";
+import * as FileSystem from "expo-file-system";
 
 const client = axios.create({
   baseURL: "http://localhost:8000/v1",
@@ -31,18 +32,27 @@ export interface Asset {
   storageKeys: Record<string, string>;
 }
 
+export interface UploadPart {
+  partNumber: number;
+  uploadUrl: string;
+  offset?: number;
+  size?: number;
+}
+
 export interface UploadInitResponse {
   assetId: string;
   uploadId: string;
-  parts: { partNumber: number; uploadUrl: string }[];
+  parts: UploadPart[];
   partSize: number;
 }
 
 export interface JobListResponse {
   items: Job[];
-  total: number;
+  total: number | null;
+  totalEstimated?: boolean;
   page: number;
   pageSize: number;
+  nextCursor?: string | null;
 }
 
 export async function fetchJobs(page = 1, pageSize = 20): Promise<JobListResponse> {
@@ -65,6 +75,46 @@ export async function initUpload(filename: string, size: number, contentType: st
   return data as UploadInitResponse;
 }
 
+// Each part is copied to a temporary file first: uploadAsync can only send whole files.
+export async function uploadParts(
+  uri: string,
+  fileSize: number,
+  parts: UploadPart[],
+  partSize: number,
+  contentType: string,
+  concurrency = 2
+): Promise<string[]> {
+  const etags: string[] = new Array(parts.length);
+  let next = 0;
+  const worker = async () => {
+    while (next < parts.length) {
+      const part = parts[next++];
+      const position = part.offset ?? (part.partNumber - 1) * partSize;
+      const length = part.size ?? Math.min(partSize, fileSize - position);
+      const chunk = `${FileSystem.cacheDirectory}upload-part-${part.partNumber}`;
+      const encoding = FileSystem.EncodingType.Base64;
+      try {
+        const data = await FileSystem.readAsStringAsync(uri, { encoding, position, length });
+        await FileSystem.writeAsStringAsync(chunk, data, { encoding });
+        const result = await FileSystem.uploadAsync(part.uploadUrl, chunk, {
+          httpMethod: "PUT",
+          headers: { "Content-Type": contentType },
+          uploadType: FileSystem.FileSystemUploadType.BINARY_CONTENT
+        });
+        if (result.status < 200 || result.status >= 300) {
+          throw new Error(`Upload failed for part ${part.partNumber}`);
+        }
+        const etag = result.headers.ETag ?? result.headers.Etag ?? result.headers.etag ?? "";
+        etags[part.partNumber - 1] = etag.replace(/"/g, "");
+      } finally {
+        await FileSystem.deleteAsync(chunk, { idempotent: true });
+      }
+    }
+  };
+  await Promise.all(Array.from({ length: Math.min(concurrency, parts.length) }, worker));
+  return etags;
+}
+
 export async function completeUpload(
   assetId: string,
   uploadId: string,
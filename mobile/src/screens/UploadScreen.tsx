@@ -2,10 +2,9 @@ import { useState } from "react";
 import { ScrollView, StyleSheet, View } from "react-native";
 import { Button, Checkbox, HelperText, Text, TextInput } from "react-native-paper";
 import * as DocumentPicker from "expo-document-picker";
-import * as FileSystem from "expo-file-system";
 import type { NativeStackScreenProps } from "@react-navigation/native-stack";
 import type { RootStackParamList } from "../../App";
-import { completeUpload, createJob, initUpload } from "../api";
+import { completeUpload, createJob, initUpload, uploadParts } from "../api";
 
 const languages = [
   { value: "en", label: "English" },
@@ -53,16 +52,12 @@ export default function UploadScreen({ navigation }: NativeStackScreenProps<Root
     setError(null);
     try {
       setStatus("Creating upload session...");
-      const init = await initUpload(pickedFile.name, pickedFile.size ?? 0, pickedFile.mimeType ?? "application/octet-stream");
-      const uploadUrl = init.parts[0].uploadUrl;
-      setStatus("Uploading file...");
-      await FileSystem.uploadAsync(uploadUrl, pickedFile.uri, {
-        httpMethod: "PUT",
-        headers: { "Content-Type": pickedFile.mimeType ?? "application/octet-stream" },
-        uploadType: FileSystem.FileSystemUploadType.BINARY_CONTENT
-      });
+      const contentType = pickedFile.mimeType ?? "application/octet-stream";
+      const init = await initUpload(pickedFile.name, pickedFile.size ?? 0, contentType);
+      setStatus(`Uploading ${init.parts.length} part(s)...`);
+      const etags = await uploadParts(pickedFile.uri, pickedFile.size ?? 0, init.parts, init.partSize, contentType);
       setStatus("Finalizing...");
-      await completeUpload(init.assetId, init.uploadId, "en", targetLangs, ["mobile-etag"]);
+      await completeUpload(init.assetId, init.uploadId, "en", targetLangs, etags);
       setStatus("Starting job...");
       const job = await createJob(init.assetId, targetLangs, { default: preset });
       setStatus(null);
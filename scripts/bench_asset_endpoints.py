@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""Measure p50/p99 latency of the asset endpoints with and without URL caching.
+
+Runs the API in-process against a throwaway SQLite database and a live MinIO
+(bucket checks and signing hit the configured endpoint). Example:
+
+    MINIO_ENDPOINT=localhost:9000 python scripts/bench_asset_endpoints.py --requests 2000 --concurrency 32
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+root = Path(__file__).resolve().parents[1]
+sys.path.append(str(root))
+sys.path.append(str(root / "backend"))
+
+_tmp = tempfile.TemporaryDirectory()
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_tmp.name}/bench.db")
+
+from httpx import AsyncClient  # noqa: E402
+
+from app.core.database import SessionLocal, init_db  # noqa: E402
+from app.main import app  # noqa: E402
+from app.services import assets as asset_service  # noqa: E402
+from app.services import storage  # noqa: E402
+
+ENDPOINTS = ("/v1/assets/{asset_id}", "/v1/assets/{asset_id}/hls/master.m3u8")
+
+
+async def _seed_asset() -> str:
+    await init_db()
+    async with SessionLocal() as session:
+        asset = await asset_service.create_asset(
+            session,
+            user_id="bench",
+            src_lang="en",
+            target_langs=["es"],
+            storage_keys={"public": "bench/hls/master.m3u8"},
+            duration_sec=60.0,
+        )
+    return asset.external_id
+
+
+def _percentile(samples: list[float], fraction: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+async def _run(client: AsyncClient, path: str, total: int, concurrency: int, cached: bool) -> list[float]:
+    samples: list[float] = []
+    queue: asyncio.Queue[int] = asyncio.Queue()
+    for index in range(total):
+        queue.put_nowait(index)
+
+    async def worker() -> None:
+        while not queue.empty():
+            queue.get_nowait()
+            if not cached:
+                # Reproduce the uncached behaviour: a bucket check and a fresh signature per request.
+                storage._reset_caches_for_tests()
+            start = time.perf_counter()
+            response = await client.get(path)
+            samples.append((time.perf_counter() - start) * 1000)
+            response.raise_for_status()
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return samples
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    args = parser.parse_args()
+
+    asset_id = await _seed_asset()
+    print(f"{args.requests} requests per run, concurrency {args.concurrency}")
+    print(f"{'endpoint':<42} {'cache':<6} {'p50 ms':>8} {'p99 ms':>8} {'mean ms':>8}")
+    async with AsyncClient(app=app, base_url="http://bench") as client:
+        for template in ENDPOINTS:
+            path = template.format(asset_id=asset_id)
+            for cached in (False, True):
+                storage._reset_caches_for_tests()
+                samples = await _run(client, path, args.requests, args.concurrency, cached)
+                print(
+                    f"{template:<42} {'on' if cached else 'off':<6} "
+                    f"{_percentile(samples, 0.5):8.2f} {_percentile(samples, 0.99):8.2f} {statistics.mean(samples):8.2f}"
+                )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
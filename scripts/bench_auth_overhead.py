@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""Per-request cost of API key auth, rate limiting and the job quota check.
+
+- `auth`: median latency of a trivial route guarded by the previous
+  `require_api_key` (sync, so it runs in the threadpool, with an HMAC and an
+  unpruned per-minute dict) and by the current one (async, cached key hash,
+  sliding window) with the local backend and, when `--redis-url` answers, the
+  Redis backend;
+- `counters`: entries left in each limiter after `--keys` keys were seen over
+  `--windows` minutes;
+- `quota`: the COUNT the quota check used to run on every job creation vs a
+  cached `ActiveJobs.count`, with `--jobs` jobs in SQLite.
+
+Example:
+
+    python scripts/bench_auth_overhead.py --requests 5000 --redis-url redis://localhost:6379/0
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import hmac
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict
+
+from fastapi import HTTPException, Request
+
+root = Path(__file__).resolve().parents[1]
+sys.path.append(str(root))
+sys.path.append(str(root / "backend"))
+
+API_KEY = "bench-key"
+
+
+def _legacy_dependency(limit: int):
+    """The previous `require_api_key`, as it was."""
+    request_counters: Dict[str, Dict[str, int]] = {}
+
+    def require_api_key(request: Request) -> str:
+        api_key = request.headers.get("X-API-Key")
+        if api_key not in [API_KEY]:
+            raise HTTPException(status_code=401, detail="Invalid API key")
+        client_id = hmac.new(api_key.encode(), msg=b"movie-autotranslate", digestmod=hashlib.sha256).hexdigest()
+        window_key = f"{client_id}:{int(time.time() // 60)}"
+        record = request_counters.setdefault(window_key, {"count": 0})
+        record["count"] += 1
+        if record["count"] > limit:
+            raise HTTPException(status_code=429, detail="Rate limit exceeded")
+        request.state.client_id = client_id
+        return client_id
+
+    return require_api_key, request_counters
+
+
+async def _median_request_us(dependency, requests: int) -> float:
+    import httpx
+    from fastapi import Depends, FastAPI
+
+    app = FastAPI()
+
+    @app.get("/ping", dependencies=[Depends(dependency)])
+    async def ping() -> dict:
+        return {}
+
+    samples = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for _ in range(requests):
+            started = time.perf_counter()
+            response = await client.get("/ping", headers={"X-API-Key": API_KEY})
+            samples.append(time.perf_counter() - started)
+            assert response.status_code == 200, response.status_code
+    return statistics.median(samples) * 1e6
+
+
+async def _auth(args) -> None:
+    from app.dependencies import security
+    from app.services import rate_limits
+
+    security.settings.api_keys = [API_KEY]
+    rate_limits.settings.rate_limit_per_minute = args.requests * 10
+    legacy, _ = _legacy_dependency(args.requests * 10)
+    print(f"{'auth':<28} {'median µs/request':>18}")
+    print(f"{'previous (sync, dict)':<28} {await _median_request_us(legacy, args.requests):>18.0f}")
+    rate_limits.settings.rate_limit_backend = "local"
+    print(f"{'current, local backend':<28} {await _median_request_us(security.require_api_key, args.requests):>18.0f}")
+    if args.redis_url:
+        rate_limits.settings.rate_limit_backend = "redis"
+        rate_limits.settings.redis_url = args.redis_url
+        try:
+            await rate_limits.client().ping()
+        except Exception as exc:
+            print(f"{'current, redis backend':<28} {'unreachable (' + type(exc).__name__ + ')':>18}")
+        else:
+            latency = await _median_request_us(security.require_api_key, args.requests)
+            print(f"{'current, redis backend':<28} {latency:>18.0f}")
+
+
+def _counters(args) -> None:
+    from app.services.rate_limits import RATE_LIMIT_WINDOW, LocalWindows
+
+    legacy: Dict[str, Dict[str, int]] = {}
+    windows = LocalWindows()
+    start = time.time()
+    for minute in range(args.windows):
+        now = start + minute * RATE_LIMIT_WINDOW
+        for idx in range(args.keys):
+            record = legacy.setdefault(f"key-{idx}:{int(now // 60)}", {"count": 0})
+            record["count"] += 1
+            windows.allow(f"key-{idx}", 1000, now)
+    print(f"counters after {args.keys} keys x {args.windows} min: previous {len(legacy)}, current {len(windows)}")
+
+
+def _seed(database_url: str, jobs: int) -> None:
+    from sqlalchemy import create_engine, insert
+    from sqlmodel import SQLModel
+
+    from shared.database import driver_url
+    from shared.models import Asset, Job
+
+    engine = create_engine(driver_url(database_url, asynchronous=False))
+    SQLModel.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(insert(Asset.__table__), [{"external_id": "asset-0"}])
+        conn.execute(
+            insert(Job.__table__),
+            [
+                {
+                    "external_id": f"job-{idx}",
+                    "asset_id": 1,
+                    "status": "PENDING" if idx % 20 == 0 else "SUCCESS",
+                    "stage": "ASR",
+                    "progress": 0.0,
+                    "requested_by": f"key-{idx % 10}",
+                    "kind": "pipeline",
+                    "target_langs": ["es"],
+                    "presets": {},
+                    "stage_history": {},
+                }
+                for idx in range(jobs)
+            ],
+        )
+    engine.dispose()
+
+
+async def _quota(args) -> None:
+    from app.core.database import SessionLocal, engine
+    from app.services import active_jobs, job_events
+    from app.services import jobs as job_service
+
+    job_events._following = True  # stands in for a replica following the Redis stream
+    tracker = active_jobs.ActiveJobs()
+
+    async def timed(call) -> float:
+        samples = []
+        async with SessionLocal() as session:
+            for _ in range(args.repeat):
+                started = time.perf_counter()
+                await call(session)
+                samples.append(time.perf_counter() - started)
+        return statistics.median(samples) * 1e6
+
+    count = await timed(lambda session: job_service.count_active_jobs_for_requester(session, "key-3"))
+    cached = await timed(lambda session: tracker.count(session, "key-3"))
+    print(f"quota check with {args.jobs} jobs: COUNT {count:.0f} µs, cached {cached:.1f} µs")
+    await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=3000)
+    parser.add_argument("--redis-url", help="Also measure the Redis backend")
+    parser.add_argument("--keys", type=int, default=1000)
+    parser.add_argument("--windows", type=int, default=60)
+    parser.add_argument("--jobs", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    tmp_dir = tempfile.mkdtemp(prefix="bench-auth-")
+    database_url = f"sqlite:///{tmp_dir}/app.db"
+    os.environ["DATABASE_URL"] = database_url
+    os.environ["JOB_EVENTS_ENABLED"] = "false"
+    asyncio.run(_auth(args))
+    _counters(args)
+    _seed(database_url, args.jobs)
+    asyncio.run(_quota(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""Job submission throughput: one `POST /v1/jobs/translate` per job vs the bulk endpoint.
+
+Runs the API in-process (httpx ASGI transport) against a throwaway SQLite
+database with one asset per job, so no request is coalesced. Tasks go to
+Celery's in-memory broker unless `--broker redis://...` is given. Reports jobs
+per second for sequential single submissions and for bulk requests of
+`--batch` items. Example:
+
+    python scripts/bench_bulk_jobs.py --jobs 1000 --batch 250
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+root = Path(__file__).resolve().parents[1]
+sys.path.append(str(root))
+sys.path.append(str(root / "backend"))
+
+
+async def _seed(prefix: str, count: int) -> None:
+    from app.core.database import SessionLocal
+    from app.models import Asset
+
+    async with SessionLocal() as session:
+        session.add_all(Asset(external_id=f"{prefix}-{idx}", target_langs=["es"], storage_keys={}) for idx in range(count))
+        await session.commit()
+
+
+async def _run(args) -> None:
+    from httpx import ASGITransport, AsyncClient
+
+    from app.core.database import init_db
+    from app.main import app
+
+    await init_db()
+    modes = {"single": "/v1/jobs/translate", "bulk": "/v1/jobs/translate/bulk"}
+    print(f"{'mode':<8} {'jobs':>6} {'requests':>9} {'seconds':>9} {'jobs/s':>9}")
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://bench") as client:
+        for mode, path in modes.items():
+            prefix = f"bench-{mode}"
+            await _seed(prefix, args.jobs)
+            items = [{"assetId": f"{prefix}-{idx}", "targetLangs": ["es", "fr"]} for idx in range(args.jobs)]
+            started = time.perf_counter()
+            if mode == "single":
+                requests = len(items)
+                for item in items:
+                    response = await client.post(path, json=item)
+                    response.raise_for_status()
+            else:
+                chunks = [items[start : start + args.batch] for start in range(0, len(items), args.batch)]
+                requests = len(chunks)
+                for chunk in chunks:
+                    response = await client.post(path, json={"items": chunk})
+                    response.raise_for_status()
+                    assert response.json()["created"] == len(chunk)
+            elapsed = time.perf_counter() - started
+            print(f"{mode:<8} {args.jobs:>6} {requests:>9} {elapsed:>9.2f} {args.jobs / elapsed:>9.0f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=1000)
+    parser.add_argument("--batch", type=int, default=250, help="Items per bulk request")
+    parser.add_argument("--broker", default="memory://", help="Celery broker URL (default: in-memory)")
+    parser.add_argument("--database-url", help="Defaults to a temporary SQLite file")
+    args = parser.parse_args()
+
+    tmp_dir = tempfile.mkdtemp(prefix="bench-bulk-jobs-")
+    os.environ.setdefault("DATABASE_URL", args.database_url or f"sqlite:///{tmp_dir}/app.db")
+    os.environ.setdefault("MAX_ACTIVE_JOBS_PER_KEY", "0")
+
+    from app.queue import celery_app
+
+    celery_app.conf.broker_url = args.broker
+    celery_app.conf.result_backend = "cache+memory://"
+    asyncio.run(_run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""Measure cancel → freed-worker latency of a running TTS stage.
+
+Runs `synthesize_segments` for a synthetic language with simulated per-segment
+TTS latency, cancels the job part-way through and reports how long the stage
+kept the worker busy after the cancel request. The job status lookup is
+simulated (no database needed); `--db-ms` adds its latency to every check.
+Without checkpoints the stage would run to the end, so the "uncooperative" row
+is the remaining TTS time. Example:
+
+    python scripts/bench_cancellation.py --segments 200 --tts-ms 150 --cancel-after 5 --intervals 0 0.5 2
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+root = Path(__file__).resolve().parents[1]
+sys.path.append(str(root))
+
+from workers.common import cancellation  # noqa: E402
+from workers.tts import synth  # noqa: E402
+
+JOB_ID = "bench-cancel"
+LANGUAGE = "es"
+
+
+def _segments(count: int) -> list[dict]:
+    return [{"idx": idx, "t0": idx * 2.0, "t1": idx * 2.0 + 1.0, "text_tgt": f"segment {idx}"} for idx in range(count)]
+
+
+def _run(segments: list[dict], interval: float, cancel_after: float, db_ms: float) -> tuple[float, int, int]:
+    """Returns (cancel latency seconds, DB checks, segments rendered)."""
+    cancelled_at: list[datetime] = []
+    checks = 0
+
+    def lookup(job_external_id: str):
+        nonlocal checks
+        checks += 1
+        time.sleep(db_ms / 1000)
+        return cancelled_at[0] if cancelled_at else None
+
+    cancellation._cancel_requested_at = lookup
+    cancellation._settings.cancel_check_interval_seconds = interval
+    stopped = threading.Event()
+    with tempfile.TemporaryDirectory() as tmp:
+        output_dir = Path(tmp)
+
+        def stage() -> None:
+            try:
+                with cancellation.watch(JOB_ID):
+                    synth.synthesize_segments(segments, output_dir, LANGUAGE)
+            except cancellation.JobCancelled:
+                pass
+            finally:
+                stopped.set()
+
+        worker = threading.Thread(target=stage)
+        worker.start()
+        time.sleep(cancel_after)
+        cancelled_at.append(datetime.utcnow())
+        requested = time.perf_counter()
+        stopped.wait()
+        latency = time.perf_counter() - requested
+        worker.join()
+        rendered = len(list(output_dir.iterdir()))
+    return latency, checks, rendered
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--segments", type=int, default=200)
+    parser.add_argument("--tts-ms", type=float, default=150.0, help="Simulated TTS latency per segment")
+    parser.add_argument("--cancel-after", type=float, default=5.0, help="Seconds into the stage to cancel")
+    parser.add_argument("--db-ms", type=float, default=2.0, help="Simulated latency of one status check")
+    parser.add_argument("--intervals", type=float, nargs="+", default=[0.0, 0.5, 2.0])
+    args = parser.parse_args()
+    logging.getLogger("workers").setLevel(logging.ERROR)  # silence the tone-fallback warnings
+
+    tone = synth.synthesize_segment
+
+    def slow_tts(*call_args, **kwargs):
+        time.sleep(args.tts_ms / 1000)
+        return tone(*call_args, **kwargs)
+
+    synth.synthesize_segment = slow_tts
+    segments = _segments(args.segments)
+    remaining = max(args.segments * args.tts_ms / 1000 - args.cancel_after, 0.0)
+    print(f"{'check interval':>16} {'cancel latency':>16} {'status checks':>14} {'rendered':>9}")
+    print(f"{'uncooperative':>16} {remaining:>15.2f}s {0:>14} {args.segments:>9}")
+    for interval in args.intervals:
+        latency, checks, rendered = _run(segments, interval, args.cancel_after, args.db_ms)
+        print(f"{interval:>15.1f}s {latency:>15.2f}s {checks:>14} {rendered:>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""Concurrent read/write load against the job database, per engine profile.
+
+Worker-style writers (separate processes, write-through job-state updates) run
+against API-style readers (async sessions listing jobs) on one database file.
+Each profile runs for `--seconds`, and the script reports throughput, p95 write
+latency and lock errors. Profiles:
+
+- `legacy`: rollback journal, `synchronous=FULL` and the driver's default 5 s
+  lock timeout (the previous engine setup);
+- `tuned`: WAL, `synchronous=NORMAL` and `SQLITE_BUSY_TIMEOUT_MS`.
+
+Pass `--database-url postgresql://...` to load a Postgres server with the
+pooled profile instead. Example:
+
+    python scripts/bench_db_concurrency.py --writers 6 --readers 32 --seconds 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import multiprocessing as mp
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+root = Path(__file__).resolve().parents[1]
+sys.path.append(str(root))
+sys.path.append(str(root / "backend"))
+
+PROFILES = {
+    "legacy": {"SQLITE_WAL": "false", "SQLITE_SYNCHRONOUS": "FULL", "SQLITE_BUSY_TIMEOUT_MS": "5000"},
+    "tuned": {},
+}
+
+
+def _seed(env: dict, prefix: str, jobs: int) -> None:
+    os.environ.update(env)
+    from sqlmodel import Session, SQLModel
+
+    from shared.models import Asset, Job
+    from workers.common.db import engine
+
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        asset = Asset(external_id=f"{prefix}-asset")
+        session.add(asset)
+        session.commit()
+        session.add_all(Job(external_id=f"{prefix}-{idx}", asset_id=asset.id) for idx in range(jobs))
+        session.commit()
+
+
+def _writer(env: dict, prefix: str, index: int, jobs: int, seconds: float, results) -> None:
+    os.environ.update(env)
+    from sqlalchemy.exc import OperationalError
+
+    from shared.models import JobStage, JobStatus
+    from workers.common import jobs as job_state
+
+    latencies, errors = [], 0
+    deadline = time.perf_counter() + seconds
+    step = 0
+    while time.perf_counter() < deadline:
+        job_id = f"{prefix}-{(index * 7919 + step) % jobs}"
+        started = time.perf_counter()
+        try:
+            job_state.update_job(job_id, stage=JobStage.TTS, status=JobStatus.RUNNING, progress=step % 100 / 100)
+            job_state.record_stage_history(job_id, "TTS", "running", {"step": step})
+            latencies.append(time.perf_counter() - started)
+        except OperationalError:
+            errors += 1
+        step += 1
+    results.put(("write", len(latencies), errors, latencies))
+
+
+def _reader(env: dict, concurrency: int, seconds: float, results) -> None:
+    os.environ.update(env)
+    from sqlalchemy import func, select
+    from sqlalchemy.exc import OperationalError
+
+    from app.core.database import SessionLocal, engine
+    from shared.models import Job, JobStatus
+
+    async def run() -> tuple[int, int]:
+        done, errors = 0, 0
+        deadline = time.perf_counter() + seconds
+
+        async def client() -> None:
+            nonlocal done, errors
+            while time.perf_counter() < deadline:
+                try:
+                    async with SessionLocal() as session:
+                        await session.execute(select(Job).order_by(Job.updated_at.desc()).limit(50))
+                        await session.scalar(select(func.count(Job.id)).where(Job.status == JobStatus.RUNNING))
+                    done += 1
+                except OperationalError:
+                    errors += 1
+
+        await asyncio.gather(*(client() for _ in range(concurrency)))
+        await engine.dispose()
+        return done, errors
+
+    done, errors = asyncio.run(run())
+    results.put(("read", done, errors, []))
+
+
+def _run_profile(name: str, database_url: str, args) -> None:
+    env = {"DATABASE_URL": database_url, "JOB_STATE_FLUSH_SECONDS": "0", **PROFILES.get(name, {})}
+    prefix = f"bench-{name}-{int(time.time())}"
+    ctx = mp.get_context("spawn")
+    seed = ctx.Process(target=_seed, args=(env, prefix, args.jobs))
+    seed.start()
+    seed.join()
+    results = ctx.Queue()
+    processes = [
+        ctx.Process(target=_writer, args=(env, prefix, index, args.jobs, args.seconds, results))
+        for index in range(args.writers)
+    ]
+    processes.append(ctx.Process(target=_reader, args=(env, args.readers, args.seconds, results)))
+    for process in processes:
+        process.start()
+    collected = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+    writes = sum(count for kind, count, _, _ in collected if kind == "write")
+    reads = sum(count for kind, count, _, _ in collected if kind == "read")
+    errors = sum(errors for _, _, errors, _ in collected)
+    latencies = sorted(value for *_, values in collected for value in values)
+    p95 = latencies[int(len(latencies) * 0.95)] * 1000 if latencies else float("nan")
+    print(f"{name:<8} {writes / args.seconds:>10.0f} {reads / args.seconds:>10.0f} {p95:>12.1f} {errors:>8}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--writers", type=int, default=6, help="Worker processes writing job state")
+    parser.add_argument("--readers", type=int, default=32, help="Concurrent API sessions")
+    parser.add_argument("--jobs", type=int, default=500)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--database-url", help="Postgres URL; defaults to fresh SQLite files per profile")
+    args = parser.parse_args()
+
+    print(f"{'profile':<8} {'writes/s':>10} {'reads/s':>10} {'p95 write ms':>12} {'errors':>8}")
+    if args.database_url:
+        _run_profile("pooled", args.database_url, args)
+        return
+    for name in PROFILES:
+        db_dir = tempfile.mkdtemp(prefix=f"bench-db-{name}-")
+        _run_profile(name, f"sqlite:///{db_dir}/app.db", args)
+
+
+if __name__ == "__main__":
+    main()
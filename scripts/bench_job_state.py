@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""Count job-state DB statements per pipeline: write-through vs write-behind.
+
+Replays the `workers.common.jobs` calls a stage-mode pipeline makes
+(run_pipeline, ASR, TRANSLATE, TTS, ALIGN/MIX, PACKAGE, finalize_job),
+including the flushes before chaining a stage and after each task. Runs
+against a throwaway SQLite database (or `--database-url`) and reports the
+statements and wall time per pipeline. Example:
+
+    python scripts/bench_job_state.py --jobs 200 --threads 16
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+root = Path(__file__).resolve().parents[1]
+sys.path.append(str(root))
+
+STAGES = ["ASR", "TRANSLATE", "TTS", "ALIGN/MIX", "PACKAGE"]
+
+
+def _pipeline(job_state, job_id: str) -> None:
+    from shared.models import JobStage, JobStatus
+
+    def task_done() -> None:  # Celery task_postrun (one job per worker process)
+        job_state.flush(job_id)
+
+    job_state.update_job(job_id, stage=JobStage.INGESTED, status=JobStatus.RUNNING, progress=0.01)
+    job_state.update_task_id(job_id, f"{job_id}-asr")  # _chain: task id, flush, publish
+    job_state.flush(job_id)
+    task_done()
+    for position, stage in enumerate(STAGES):
+        job_state.update_job(job_id, stage=JobStage(stage), status=JobStatus.RUNNING, progress=0.1 + position * 0.15)
+        job_state.record_stage_history(job_id, stage, "success", {"durationMs": 1.0})
+        job_state.update_task_id(job_id, f"{job_id}-{position}")
+        job_state.flush(job_id)
+        task_done()
+    job_state.update_logs_key(job_id, f"proc/asset/logs/{job_id}.jsonl")
+    job_state.mark_success(job_id)
+    task_done()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=200)
+    parser.add_argument("--threads", type=int, default=16, help="Concurrent pipelines")
+    parser.add_argument("--database-url", help="Defaults to a temporary SQLite file")
+    args = parser.parse_args()
+
+    tmp_dir = tempfile.mkdtemp(prefix="bench-job-state-")
+    os.environ.setdefault("DATABASE_URL", args.database_url or f"sqlite:///{tmp_dir}/jobs.db")
+
+    from sqlalchemy import event
+    from sqlmodel import Session, SQLModel
+
+    from shared.models import Asset, Job
+    from workers.common import db
+    from workers.common import jobs as job_state
+
+    SQLModel.metadata.create_all(db.engine)
+    executed: list[int] = []
+    event.listen(db.engine, "before_cursor_execute", lambda *_args, **_kwargs: executed.append(1))
+
+    print(f"{'mode':<14} {'statements/pipeline':>20} {'seconds':>9}")
+    for label, flush_seconds in (("write-through", 0.0), ("write-behind", 0.5)):
+        with Session(db.engine) as session:
+            asset = Asset(external_id=f"bench-{label}")
+            session.add(asset)
+            session.commit()
+            job_ids = [f"{label}-{idx}" for idx in range(args.jobs)]
+            session.add_all(Job(external_id=job_id, asset_id=asset.id) for job_id in job_ids)
+            session.commit()
+        job_state.writer = job_state.JobStateWriter(flush_seconds)
+        executed.clear()
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.threads) as pool:
+            list(pool.map(lambda job_id: _pipeline(job_state, job_id), job_ids))
+        elapsed = time.perf_counter() - started
+        print(f"{label:<14} {len(executed) / args.jobs:>20.1f} {elapsed:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
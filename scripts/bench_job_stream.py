@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""Simulated viewer load: polling `GET /v1/jobs/{id}` vs the progress stream.
+
+Serves the API with uvicorn on a local port (SQLite in a temporary directory)
+and spreads `--viewers` viewers over `--jobs` running jobs. Every job changes
+once per `--event-interval` seconds. Two phases run for `--duration` seconds
+each:
+
+- `poll`: each viewer calls `GET /v1/jobs/{id}` every `--poll-interval`
+  seconds, like the web and mobile clients did;
+- `stream`: each viewer keeps one `GET /v1/jobs/{id}/events` open. Job changes
+  are handed to the replica's fan-out as if they came from the job event
+  stream, so Redis is not needed.
+
+For each phase it reports database statements per second, open connections
+and how stale the viewers' state was (the time from a change to the viewer
+seeing it). Example:
+
+    python scripts/bench_job_stream.py --viewers 1000 --jobs 50 --duration 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+root = Path(__file__).resolve().parents[1]
+sys.path.append(str(root))
+sys.path.append(str(root / "backend"))
+
+
+def _seed(database_url: str, jobs: int) -> None:
+    from sqlalchemy import create_engine, insert
+    from sqlmodel import SQLModel
+
+    from shared.database import driver_url
+    from shared.models import Asset, Job
+
+    engine = create_engine(driver_url(database_url, asynchronous=False))
+    SQLModel.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(insert(Asset.__table__), [{"external_id": "asset-0"}])
+        conn.execute(
+            insert(Job.__table__),
+            [
+                {
+                    "external_id": f"job-{idx}",
+                    "asset_id": 1,
+                    "status": "RUNNING",
+                    "stage": "TTS",
+                    "progress": 0.0,
+                    "kind": "pipeline",
+                    "target_langs": ["es"],
+                    "presets": {},
+                    "stage_history": {},
+                }
+                for idx in range(jobs)
+            ],
+        )
+    engine.dispose()
+
+
+class Changes:
+    """Applies one change per job and interval, to the database (poll) or the fan-out (stream)."""
+
+    def __init__(self, jobs: int, interval: float) -> None:
+        self.jobs = jobs
+        self.interval = interval
+        self.changed_at: dict[str, list[float]] = {f"job-{idx}": [] for idx in range(jobs)}
+
+    async def run(self, duration: float, apply) -> None:
+        deadline = time.perf_counter() + duration
+        step = 0
+        while time.perf_counter() < deadline:
+            step += 1
+            for idx in range(self.jobs):
+                job_id = f"job-{idx}"
+                self.changed_at[job_id].append(time.time())
+                await apply(job_id, (step % 100) / 100)
+            await asyncio.sleep(self.interval)
+
+
+def _staleness(changed_at: list[float], seen_at: list[tuple[float, float]]) -> list[float]:
+    """Seconds between each change and the first observation that reflects it."""
+    samples = []
+    observations = iter(sorted(seen_at))
+    current = next(observations, None)
+    for at in changed_at:
+        while current is not None and current[0] < at:
+            current = next(observations, None)
+        if current is not None:
+            samples.append(current[1] - at)
+    return samples
+
+
+async def _poll_phase(args, http, changes: Changes, count_statements) -> dict:
+    import httpx
+    from sqlalchemy import update
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    from app.core.database import async_database_url
+    from app.models import Job
+
+    writer = create_async_engine(async_database_url)  # not counted: the workers' writes
+
+    seen: list[tuple[str, list[tuple[float, float]]]] = []
+    latencies: list[float] = []
+    errors = [0]
+    stop = asyncio.Event()
+
+    async def apply(job_id: str, progress: float) -> None:
+        async with writer.begin() as conn:
+            await conn.execute(update(Job.__table__).where(Job.__table__.c.external_id == job_id).values(progress=progress))
+
+    async def viewer(job_id: str) -> None:
+        observations: list[tuple[float, float]] = []
+        seen.append((job_id, observations))
+        await asyncio.sleep(random.random() * args.poll_interval)
+        while not stop.is_set():
+            started = time.perf_counter()
+            try:
+                response = await http.get(f"/v1/jobs/{job_id}")
+                response.raise_for_status()
+            except httpx.HTTPError:
+                errors[0] += 1  # e.g. the database pool timed out under load
+                await asyncio.sleep(args.poll_interval)
+                continue
+            latencies.append(time.perf_counter() - started)
+            # The change the viewer now sees is the newest one made before the response.
+            observations.append((changes.changed_at[job_id][-1] if changes.changed_at[job_id] else 0.0, time.time()))
+            await asyncio.sleep(args.poll_interval)
+
+    viewers = [asyncio.create_task(viewer(f"job-{idx % args.jobs}")) for idx in range(args.viewers)]
+    before = count_statements()
+    await changes.run(args.duration, apply)
+    statements = count_statements() - before
+    stop.set()
+    await asyncio.gather(*viewers)
+    await writer.dispose()
+    staleness = [s for job_id, observations in seen for s in _staleness(changes.changed_at[job_id], observations)]
+    return {
+        "connections": args.viewers,
+        "statements/s": statements / args.duration,
+        "staleness p50 ms": statistics.median(staleness) * 1000,
+        "staleness p95 ms": statistics.quantiles(staleness, n=20)[-1] * 1000,
+        "request p95 ms": statistics.quantiles(latencies, n=20)[-1] * 1000,
+        "failed requests": errors[0],
+    }
+
+
+async def _stream_phase(args, http, changes: Changes, count_statements) -> dict:
+    import httpx
+
+    from app.services import job_events, job_streams
+    from shared.job_events import job_event
+
+    job_events._following = True  # stands in for a replica following the Redis stream
+    delays: list[float] = []
+    errors = [0]
+    connected = asyncio.Semaphore(0)
+    stop = asyncio.Event()
+
+    async def apply(job_id: str, progress: float) -> None:
+        job_events.dispatch(job_event(job_id, status="RUNNING", stage="TTS", progress=progress))
+
+    async def viewer(job_id: str) -> None:
+        try:
+            async with http.stream("GET", f"/v1/jobs/{job_id}/events") as response:
+                response.raise_for_status()
+                event = None
+                async for line in response.aiter_lines():
+                    if line.startswith("event: "):
+                        event = line[len("event: ") :]
+                    elif line.startswith("data: "):
+                        if event == "job":
+                            connected.release()
+                        elif event == "progress" and not stop.is_set():
+                            delays.append(time.time() - json.loads(line[len("data: ") :])["at"])
+        except httpx.HTTPError:
+            errors[0] += 1
+            connected.release()
+
+    before_connect = count_statements()
+    viewers = [asyncio.create_task(viewer(f"job-{idx % args.jobs}")) for idx in range(args.viewers)]
+    for _ in range(args.viewers):
+        await connected.acquire()
+    peak = job_streams.connections()
+    connect_statements = count_statements() - before_connect
+    before = count_statements()
+    await changes.run(args.duration, apply)
+    statements = count_statements() - before
+    stop.set()
+    for task in viewers:
+        task.cancel()
+    await asyncio.gather(*viewers, return_exceptions=True)
+    return {
+        "connections": peak,
+        "statements/s": statements / args.duration,
+        "staleness p50 ms": statistics.median(delays) * 1000,
+        "staleness p95 ms": statistics.quantiles(delays, n=20)[-1] * 1000,
+        "connect statements": connect_statements,
+        "failed connections": errors[0],
+    }
+
+
+async def _run(args) -> None:
+    import httpx
+    import uvicorn
+    from sqlalchemy import event
+
+    from app.core.database import engine
+    from app.main import app
+
+    statements = [0]
+
+    def count(*_args) -> None:
+        statements[0] += 1
+
+    event.listen(engine.sync_engine, "before_cursor_execute", count)
+    server = uvicorn.Server(
+        uvicorn.Config(app, host="127.0.0.1", port=args.port, log_level="warning", lifespan="off", backlog=4096)
+    )
+    serving = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.05)
+    limits = httpx.Limits(max_connections=args.viewers + 10, max_keepalive_connections=args.viewers + 10)
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{args.port}", limits=limits, timeout=60) as http:
+        results = {
+            "poll": await _poll_phase(args, http, Changes(args.jobs, args.event_interval), lambda: statements[0]),
+            "stream": await _stream_phase(args, http, Changes(args.jobs, args.event_interval), lambda: statements[0]),
+        }
+    server.should_exit = True
+    await serving
+    await engine.dispose()
+
+    print(f"{args.viewers} viewers on {args.jobs} jobs, one change per job every {args.event_interval:g} s")
+    for phase, metrics in results.items():
+        print(f"{phase}: " + ", ".join(f"{name} {value:.1f}" for name, value in metrics.items()))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--viewers", type=int, default=500)
+    parser.add_argument("--jobs", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=20.0)
+    parser.add_argument("--poll-interval", type=float, default=2.0)
+    parser.add_argument("--event-interval", type=float, default=1.0)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    tmp_dir = tempfile.mkdtemp(prefix="bench-job-stream-")
+    database_url = f"sqlite:///{tmp_dir}/app.db"
+    os.environ["DATABASE_URL"] = database_url
+    os.environ["API_KEYS"] = "[]"
+    os.environ["JOB_EVENTS_ENABLED"] = "false"
+    _seed(database_url, args.jobs)
+    asyncio.run(_run(args))
+
+
+if __name__ == "__main__":
+    main()
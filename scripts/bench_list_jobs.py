@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""`GET /v1/jobs` query latency on a large jobs table: OFFSET + N+1 vs keyset + join.
+
+Seeds `--jobs` rows (default 1,000,000) into a throwaway SQLite database, or
+reuses `--database-url` if it already holds that many jobs. It then times the
+queries behind one page:
+
+- `legacy`: OFFSET page, one `session.get(Asset)` per job and an unfiltered
+  COUNT (the previous implementation);
+- `keyset`: the joined keyset query from `services.jobs.list_jobs`, with an
+  exact, estimated or no total.
+
+Pages are timed at the start of the list and `--depth` rows deep. Example:
+
+    python scripts/bench_list_jobs.py --jobs 1000000 --depth 500000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+root = Path(__file__).resolve().parents[1]
+sys.path.append(str(root))
+sys.path.append(str(root / "backend"))
+
+STATUSES = ["PENDING", "RUNNING", "SUCCESS", "SUCCESS", "SUCCESS", "FAILED"]
+STAGES = ["ASR", "TRANSLATE", "TTS", "ALIGN/MIX", "PACKAGE", "DONE"]
+
+
+def _seed(database_url: str, jobs: int, assets: int) -> None:
+    from sqlalchemy import create_engine, func, insert, select
+    from sqlmodel import SQLModel
+
+    from shared.database import driver_url
+    from shared.models import Asset, Job
+
+    engine = create_engine(driver_url(database_url, asynchronous=False))
+    SQLModel.metadata.create_all(engine)
+    with engine.begin() as conn:
+        existing = conn.scalar(select(func.count()).select_from(Job.__table__)) or 0
+        if existing >= jobs:
+            return
+        conn.execute(insert(Asset.__table__), [{"external_id": f"asset-{idx}"} for idx in range(assets)])
+        asset_ids = [row[0] for row in conn.execute(select(Asset.__table__.c.id))]
+    started = datetime(2020, 1, 1)
+    chunk = 50_000
+    for offset in range(0, jobs, chunk):
+        rows = [
+            {
+                "external_id": f"job-{idx}",
+                "asset_id": asset_ids[idx % len(asset_ids)],
+                "status": STATUSES[idx % len(STATUSES)],
+                "stage": STAGES[idx % len(STAGES)],
+                "progress": 0.0,
+                "requested_by": f"key-{idx % 50}",
+                "priority": 0,
+                "kind": "pipeline",
+                "target_langs": ["es"],
+                "presets": {},
+                "stage_history": {},
+                "created_at": started + timedelta(seconds=idx * 30),
+                "updated_at": started + timedelta(seconds=idx * 30),
+            }
+            for idx in range(offset, min(offset + chunk, jobs))
+        ]
+        with engine.begin() as conn:
+            conn.execute(insert(Job.__table__), rows)
+    engine.dispose()
+
+
+async def _legacy(session, page: int, page_size: int) -> None:
+    from sqlalchemy import func, select
+
+    from app.models import Asset, Job
+
+    query = select(Job).order_by(Job.created_at.desc()).offset((page - 1) * page_size).limit(page_size)
+    for job in (await session.execute(query)).scalars():
+        await session.get(Asset, job.asset_id)
+    await session.scalar(select(func.count(Job.id)))
+
+
+async def _timed(runs: int, call) -> float:
+    from app.core.database import SessionLocal
+
+    samples = []
+    for _ in range(runs):
+        async with SessionLocal() as session:  # fresh identity map, like a request
+            started = time.perf_counter()
+            await call(session)
+            samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+async def _run(args) -> None:
+    from sqlalchemy import select
+
+    from app.core.database import SessionLocal, engine, init_db
+    from app.models import Job
+    from app.services import jobs as job_service
+
+    await init_db()
+    async with SessionLocal() as session:
+        anchor = (
+            await session.execute(select(Job).order_by(Job.created_at.desc(), Job.id.desc()).offset(args.depth).limit(1))
+        ).scalar_one()
+        deep_cursor = job_service.encode_cursor(anchor)
+    deep_page = args.depth // args.page_size + 1
+    running = job_service.JobFilters(status=job_service.JobStatus.RUNNING)
+    requester = job_service.JobFilters(requested_by="key-7")
+
+    def keyset(cursor=None, filters=job_service.JobFilters(), total=None):
+        async def call(session) -> None:
+            await job_service.list_jobs(session, page_size=args.page_size, cursor=cursor, filters=filters)
+            if total is not None:
+                await job_service.count_jobs(session, filters=filters, estimate=total == "estimate")
+
+        return call
+
+    cases = [
+        ("legacy first page", lambda session: _legacy(session, 1, args.page_size)),
+        (f"legacy page {deep_page}", lambda session: _legacy(session, deep_page, args.page_size)),
+        ("keyset first page, exact total", keyset(total="exact")),
+        ("keyset first page, estimated total", keyset(total="estimate")),
+        ("keyset first page, no total", keyset()),
+        (f"keyset {args.depth} deep, no total", keyset(cursor=deep_cursor)),
+        ("status=RUNNING, exact total", keyset(filters=running, total="exact")),
+        ("requestedBy, exact total", keyset(filters=requester, total="exact")),
+    ]
+    print(f"{'query':<36} {'median ms':>10}")
+    for label, call in cases:
+        print(f"{label:<36} {await _timed(args.repeat, call):>10.1f}")
+    await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=1_000_000)
+    parser.add_argument("--assets", type=int, default=10_000)
+    parser.add_argument("--page-size", type=int, default=20)
+    parser.add_argument("--depth", type=int, default=500_000, help="Rows skipped for the deep page")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--database-url", help="Defaults to a temporary SQLite file")
+    args = parser.parse_args()
+
+    tmp_dir = tempfile.mkdtemp(prefix="bench-list-jobs-")
+    database_url = args.database_url or f"sqlite:///{tmp_dir}/app.db"
+    os.environ.setdefault("DATABASE_URL", database_url)
+    started = time.perf_counter()
+    _seed(database_url, args.jobs, args.assets)
+    print(f"seeded {args.jobs} jobs in {time.perf_counter() - started:.0f} s")
+    asyncio.run(_run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""`GET /metrics` cost: per-scrape queries vs event-maintained job counts.
+
+Grows a throwaway SQLite database through each `--sizes` entry (a few percent
+of the jobs active, each with a `stage_history`) and, at every size, times:
+
+- `queries`: what a scrape used to run — the status GROUP BY, the running
+  jobs per stage GROUP BY and the 200 most recent jobs' stage history;
+- `events`: `job_metrics.counts.export()`, which only copies the in-memory
+  counts into the gauges;
+- `reconcile`: one `job_metrics.reconcile`, which now runs every
+  `METRICS_RECONCILE_SECONDS` instead of on every scrape.
+
+It also reports how many job events per second `JobCounts.apply` absorbs.
+Example:
+
+    python scripts/bench_metrics_scrape.py --sizes 10000 100000 1000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+root = Path(__file__).resolve().parents[1]
+sys.path.append(str(root))
+sys.path.append(str(root / "backend"))
+
+STAGES = ["ASR", "TRANSLATE", "TTS", "ALIGN/MIX", "PACKAGE"]
+HISTORY = {
+    stage: {"status": "success", "details": {"durationMs": 1500}, "updatedAt": "2024-01-01T00:00:00Z"}
+    for stage in STAGES
+}
+
+
+def _seed(database_url: str, start: int, jobs: int) -> None:
+    from sqlalchemy import create_engine, insert
+    from sqlmodel import SQLModel
+
+    from shared.database import driver_url
+    from shared.models import Asset, Job
+
+    engine = create_engine(driver_url(database_url, asynchronous=False))
+    SQLModel.metadata.create_all(engine)
+    if not start:
+        with engine.begin() as conn:
+            conn.execute(insert(Asset.__table__), [{"external_id": "asset-0"}])
+    chunk = 50_000
+    for offset in range(start, jobs, chunk):
+        rows = []
+        for idx in range(offset, min(offset + chunk, jobs)):
+            active = idx % 50 == 0
+            rows.append(
+                {
+                    "external_id": f"job-{idx}",
+                    "asset_id": 1,
+                    "status": ("RUNNING" if idx % 100 == 0 else "PENDING") if active else "SUCCESS",
+                    "stage": STAGES[idx % len(STAGES)] if active else "DONE",
+                    "progress": 0.0,
+                    "kind": "pipeline",
+                    "target_langs": ["es"],
+                    "presets": {},
+                    "stage_history": HISTORY,
+                }
+            )
+        with engine.begin() as conn:
+            conn.execute(insert(Job.__table__), rows)
+    engine.dispose()
+
+
+async def _legacy_scrape(session) -> None:
+    from sqlalchemy import func, select
+
+    from app.models import Job, JobStatus
+    from app.services import jobs as job_service
+
+    await job_service.count_jobs_by_status(session)
+    await session.execute(
+        select(Job.stage, func.count(Job.id)).where(Job.status == JobStatus.RUNNING).group_by(Job.stage)
+    )
+    for job in (await session.execute(select(Job).order_by(Job.updated_at.desc()).limit(200))).scalars():
+        job.stage_history.items()
+
+
+async def _median_ms(runs: int, call) -> float:
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        await call()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+async def _measure(repeat: int) -> tuple[float, float, float]:
+    from app.core.database import SessionLocal, engine
+    from app.services import job_metrics
+
+    async def legacy() -> None:
+        async with SessionLocal() as session:
+            await _legacy_scrape(session)
+
+    async def reconcile() -> None:
+        async with SessionLocal() as session:
+            await job_metrics.reconcile(session)
+
+    async def export() -> None:
+        job_metrics.counts.export()
+
+    results = (
+        await _median_ms(repeat, legacy),
+        await _median_ms(repeat, export),
+        await _median_ms(repeat, reconcile),
+    )
+    await engine.dispose()
+    return results
+
+
+def _apply_rate(events: int) -> float:
+    from app.services.job_metrics import JobCounts
+    from shared.job_events import job_event
+
+    counts = JobCounts()
+    stream = []
+    for idx in range(events // 3):
+        job_id = f"job-{idx}"
+        stream.append(job_event(job_id, status="PENDING", stage="ASR"))
+        stream.append(job_event(job_id, status="RUNNING", stage="TTS", progress=0.5))
+        stream.append(job_event(job_id, status="SUCCESS", stage="DONE", progress=1.0))
+    started = time.perf_counter()
+    for event in stream:
+        counts.apply(event)
+    return len(stream) / (time.perf_counter() - started)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--events", type=int, default=300_000)
+    args = parser.parse_args()
+
+    tmp_dir = tempfile.mkdtemp(prefix="bench-metrics-")
+    database_url = f"sqlite:///{tmp_dir}/app.db"
+    os.environ["DATABASE_URL"] = database_url
+    os.environ["JOB_EVENTS_ENABLED"] = "false"
+    print(f"{'jobs':>10} {'queries ms':>11} {'events ms':>10} {'reconcile ms':>13}")
+    seeded = 0
+    for size in sorted(args.sizes):
+        _seed(database_url, seeded, size)
+        seeded = size
+        legacy, export, reconcile = asyncio.run(_measure(args.repeat))
+        print(f"{size:>10} {legacy:>11.2f} {export:>10.3f} {reconcile:>13.2f}")
+    print(f"JobCounts.apply: {_apply_rate(args.events):,.0f} events/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""Latency and database load of polled `GET /v1/jobs/{jobId}` and `GET /v1/assets/{assetId}`.
+
+Runs the API in-process against a throwaway SQLite database with `--jobs`
+jobs. For each endpoint it reports the median latency and the SQL statements
+per request of:
+
+- `previous`: no cache, full body on every poll;
+- `etag, no redis`: `If-None-Match` answered with 304, still loaded and
+  serialized from the database (what happens while Redis is down);
+- with `--redis-url` reachable, `redis hit` and `redis 304`, and the hit ratio
+  of `--clients` clients polling `--polled` jobs while one of them changes
+  every `--update-every` polls.
+
+The asset has no HLS output, so no URL is signed and MinIO is not needed.
+
+Example:
+
+    python scripts/bench_response_cache.py --requests 2000 --redis-url redis://localhost:6379/0
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+root = Path(__file__).resolve().parents[1]
+sys.path.append(str(root))
+sys.path.append(str(root / "backend"))
+
+
+def _seed(database_url: str, jobs: int) -> None:
+    from sqlalchemy import create_engine, insert
+    from sqlmodel import SQLModel
+
+    from shared.database import driver_url
+    from shared.models import Asset, Job
+
+    engine = create_engine(driver_url(database_url, asynchronous=False))
+    SQLModel.metadata.create_all(engine)
+    now = datetime.utcnow()
+    with engine.begin() as conn:
+        conn.execute(
+            insert(Asset.__table__),
+            [
+                {
+                    "external_id": f"asset-{idx}",
+                    "target_langs": ["es", "fr"],
+                    "storage_keys": {"raw": f"asset-{idx}/source.mp4"},
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                for idx in range(100)
+            ],
+        )
+        conn.execute(
+            insert(Job.__table__),
+            [
+                {
+                    "external_id": f"job-{idx}",
+                    "asset_id": idx % 100 + 1,
+                    "status": "RUNNING",
+                    "stage": "TTS",
+                    "progress": 0.5,
+                    "requested_by": "bench",
+                    "kind": "pipeline",
+                    "target_langs": ["es", "fr"],
+                    "presets": {},
+                    "created_at": now,
+                    "updated_at": now,
+                    "stage_history": {
+                        stage: {"status": "success", "startedAt": "2024-01-01T00:00:00"}
+                        for stage in ("ASR", "TRANSLATE")
+                    },
+                }
+                for idx in range(jobs)
+            ],
+        )
+    engine.dispose()
+
+
+async def _measure(client, path: str, requests: int, statements: List[str], etag: Optional[str]) -> tuple:
+    headers = {"If-None-Match": etag} if etag else {}
+    samples = []
+    before = len(statements)
+    for _ in range(requests):
+        started = time.perf_counter()
+        response = await client.get(path, headers=headers)
+        samples.append(time.perf_counter() - started)
+        assert response.status_code in (200, 304), response.status_code
+    return statistics.median(samples) * 1e6, (len(statements) - before) / requests, response
+
+
+async def _run(args) -> None:
+    from httpx import ASGITransport, AsyncClient
+    from sqlalchemy import event
+
+    from app.core.database import engine
+    from app.main import app
+    from app.services import response_cache
+
+    statements: List[str] = []
+    event.listen(
+        engine.sync_engine,
+        "before_cursor_execute",
+        lambda _conn, _cursor, statement, *_args: statements.append(statement),
+    )
+    paths = {"job": f"/v1/jobs/job-{args.jobs // 2}", "asset": "/v1/assets/asset-50"}
+    print(f"{'endpoint':<8} {'mode':<16} {'median µs':>10} {'SQL/request':>12} {'status':>7} {'bytes':>6}")
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://bench") as client:
+        response_cache.settings.response_cache_enabled = False
+        await client.get(paths["job"])  # warm up the pool and the routes
+        modes = [("previous", False, False), ("etag, no redis", False, True)]
+        if args.redis_url:
+            response_cache.settings.redis_url = args.redis_url
+            try:
+                await response_cache.client().ping()
+            except Exception as exc:
+                print(f"redis at {args.redis_url} unreachable ({type(exc).__name__}); skipping the cached modes")
+            else:
+                modes += [("redis hit", True, False), ("redis 304", True, True)]
+        for kind, path in paths.items():
+            for mode, cached, revalidate in modes:
+                response_cache.settings.response_cache_enabled = cached
+                etag = (await client.get(path)).headers["etag"] if revalidate else None
+                latency, per_request, response = await _measure(client, path, args.requests, statements, etag)
+                print(
+                    f"{kind:<8} {mode:<16} {latency:>10.0f} {per_request:>12.1f} "
+                    f"{response.status_code:>7} {len(response.content):>6}"
+                )
+        if response_cache.settings.response_cache_enabled:
+            await _hit_ratio(client, args)
+
+
+async def _hit_ratio(client, args) -> None:
+    from app.services import response_cache
+
+    etags: Dict[tuple, str] = {}
+    rng = random.Random(0)
+    served = {"fresh": 0, "not_modified": 0}
+    before = _lookup_counts(response_cache)
+    for poll in range(args.requests):
+        if poll % args.update_every == 0:
+            await response_cache.invalidate_jobs(f"job-{rng.randrange(args.polled)}")
+        key = (rng.randrange(args.clients), f"job-{rng.randrange(args.polled)}")
+        etag = etags.get(key)
+        response = await client.get(f"/v1/jobs/{key[1]}", headers={"If-None-Match": etag} if etag else {})
+        etags[key] = response.headers["etag"]
+        served["not_modified" if response.status_code == 304 else "fresh"] += 1
+    after = _lookup_counts(response_cache)
+    counts = {result: after[result] - before[result] for result in after}
+    lookups = sum(counts.values())
+    hits = counts["hit"] + counts["not_modified"]
+    print(
+        f"{args.clients} clients polling {args.polled} jobs, one change every {args.update_every} polls: "
+        f"hit ratio {hits / lookups:.1%}, 304s {served['not_modified'] / args.requests:.1%} ({counts})"
+    )
+
+
+def _lookup_counts(response_cache) -> Dict[str, float]:
+    return {
+        result: response_cache._lookups.labels(kind="job", result=result)._value.get()
+        for result in ("hit", "not_modified", "miss", "bypass")
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=100_000)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--redis-url", help="Also measure the Redis-backed cache")
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--polled", type=int, default=200)
+    parser.add_argument("--update-every", type=int, default=20)
+    args = parser.parse_args()
+
+    tmp_dir = tempfile.mkdtemp(prefix="bench-response-cache-")
+    database_url = f"sqlite:///{tmp_dir}/app.db"
+    os.environ["DATABASE_URL"] = database_url
+    os.environ["JOB_EVENTS_ENABLED"] = "false"
+    os.environ["STORAGE_BACKEND"] = "local"
+    os.environ["LOCAL_STORAGE_DIR"] = tmp_dir
+    _seed(database_url, args.jobs)
+    asyncio.run(_run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""Compare time-to-first-audio and total latency: stage barrier vs segment streaming.
+
+Generates a synthetic long asset (ASR segments only) and runs MT → TTS → mix for
+one language both ways. MT and TTS latency are simulated per segment on top of
+the local fallbacks (source-text MT, tone TTS), so no LibreTranslate or Piper is
+needed. Example:
+
+    python scripts/bench_segment_streaming.py --segments 900 --mt-ms 30 --tts-ms 120 --tts-workers 2
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import shutil
+import sys
+import time
+import uuid
+from pathlib import Path
+
+root = Path(__file__).resolve().parents[1]
+sys.path.append(str(root))
+
+from workers.common.paths import asset_workspace, tts_segment_files  # noqa: E402
+from workers.mix.assemble import assemble_track  # noqa: E402
+from workers.mt import translate  # noqa: E402
+from workers.pipeline import streaming  # noqa: E402
+from workers.tts import synth  # noqa: E402
+
+LANGUAGE = "es"
+
+
+def _synthetic_segments(count: int, seconds: float) -> list[dict]:
+    return [
+        {"idx": idx, "t0": idx * seconds, "t1": idx * seconds + seconds * 0.8, "text": f"segment {idx}"}
+        for idx in range(count)
+    ]
+
+
+def _with_latency(func, delay_ms: float):
+    def wrapper(*args, **kwargs):
+        time.sleep(delay_ms / 1000)
+        return func(*args, **kwargs)
+
+    return wrapper
+
+
+def _run_barrier(asset_id: str, segments: list[dict]) -> tuple[float, float]:
+    workspace = asset_workspace(asset_id)
+    asr_path = workspace / "asr" / "segments_src.json"
+    asr_path.parent.mkdir(parents=True, exist_ok=True)
+    asr_path.write_text(json.dumps(segments), encoding="utf-8")
+    start = time.perf_counter()
+    translated = translate.translate_segments(asr_path, workspace / "translations", LANGUAGE)
+    synth.synthesize_segments(translated, workspace / "tts" / LANGUAGE, target_language=LANGUAGE)
+    assemble_track(
+        translated,
+        tts_segment_files(workspace / "tts" / LANGUAGE),
+        workspace / "mix" / LANGUAGE,
+        source_audio=None,
+        target_language=LANGUAGE,
+    )
+    total = time.perf_counter() - start
+    # The first audible output is the finished mix.
+    return total, total
+
+
+def _run_streaming(asset_id: str, segments: list[dict], window: float, tts_workers: int) -> tuple[float, float]:
+    result = streaming.stream_language(
+        asset_id,
+        LANGUAGE,
+        segments,
+        window_seconds=window,
+        tts_workers=tts_workers,
+    )
+    return (result.time_to_first_audio_ms or 0.0) / 1000, result.duration_ms / 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--segments", type=int, default=600)
+    parser.add_argument("--segment-seconds", type=float, default=3.0)
+    parser.add_argument("--mt-ms", type=float, default=20.0, help="simulated MT latency per segment")
+    parser.add_argument("--tts-ms", type=float, default=80.0, help="simulated TTS latency per segment")
+    parser.add_argument("--tts-workers", type=int, default=1)
+    parser.add_argument("--window", type=float, default=30.0, help="mix window in seconds")
+    args = parser.parse_args()
+
+    translate.translation_client = lambda: None
+    streaming.translation_client = lambda: None
+    translate.translate_segment = _with_latency(translate.translate_segment, args.mt_ms)
+    streaming.translate_segment = translate.translate_segment
+    synth.synthesize_segment = _with_latency(synth.synthesize_segment, args.tts_ms)
+    streaming.synthesize_segment = synth.synthesize_segment
+
+    segments = _synthetic_segments(args.segments, args.segment_seconds)
+    hours = args.segments * args.segment_seconds / 3600
+    print(
+        f"{args.segments} segments ({hours:.2f} h of audio), MT {args.mt_ms} ms, TTS {args.tts_ms} ms, "
+        f"window {args.window} s, TTS workers {args.tts_workers}"
+    )
+    print(f"{'mode':<12} {'first audio s':>14} {'total s':>10}")
+    for label, runner in (
+        ("barrier", lambda asset: _run_barrier(asset, segments)),
+        ("streaming", lambda asset: _run_streaming(asset, segments, args.window, args.tts_workers)),
+    ):
+        asset_id = f"bench-{uuid.uuid4()}"
+        try:
+            first, total = runner(asset_id)
+        finally:
+            shutil.rmtree(asset_workspace(asset_id), ignore_errors=True)
+        print(f"{label:<12} {first:14.2f} {total:10.2f}")
+
+
+if __name__ == "__main__":
+    main()
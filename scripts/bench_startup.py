@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""Cold-start import time and baseline RSS per process type.
+
+Each process type starts a fresh interpreter with `python -X importtime` and
+imports what that process loads: the API app, the Celery worker (app + task
+module, which every worker profile imports), or a worker plus the stage modules
+its first task pulls in. Reports the import wall time, the slowest top-level
+packages from the importtime log and the resident set size after import.
+Example:
+
+    python scripts/bench_startup.py --repeat 3 --top 3
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+root = Path(__file__).resolve().parents[1]
+
+WORKER = ["workers.celery_app", "workers.pipeline.tasks"]
+PROCESS_TYPES = {
+    "api": ["app.main"],
+    "worker": WORKER,
+    "worker+asr": WORKER + ["workers.asr.whisper", "workers.diarization.basic"],
+    "worker+mt": WORKER + ["workers.mt.translate"],
+    "worker+tts": WORKER + ["workers.tts.synth"],
+    "worker+mix": WORKER + ["workers.mix.assemble", "workers.mix.publisher"],
+    "worker+package": WORKER + ["workers.mix.publisher"],
+}
+
+_PROBE = """
+import importlib, resource, sys, time
+started = time.perf_counter()
+for name in sys.argv[1:]:
+    importlib.import_module(name)
+elapsed = time.perf_counter() - started
+print(f"{elapsed * 1000:.1f} {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss}", file=sys.__stdout__)
+"""
+
+
+def _measure(modules: list[str]) -> tuple[float, float, dict[str, int]]:
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join([str(root), str(root / "backend")])}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _PROBE, *modules],
+        capture_output=True,
+        text=True,
+        env=env,
+        cwd=root,
+        check=True,
+    )
+    elapsed_ms, max_rss_kb = result.stdout.split()[-2:]
+    packages: dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if name.startswith("  ") or not cumulative.strip().isdigit():
+            continue  # nested imports are indented; skip them and the header
+        package = name.strip().split(".")[0]
+        packages[package] = packages.get(package, 0) + int(cumulative)
+    return float(elapsed_ms), int(max_rss_kb) / 1024, packages
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per process type (median reported)")
+    parser.add_argument("--top", type=int, default=3, help="Slowest top-level packages to list")
+    parser.add_argument("types", nargs="*", default=list(PROCESS_TYPES), help="Process types to measure")
+    args = parser.parse_args()
+
+    print(f"{'process':<16} {'import ms':>10} {'RSS MiB':>8}  slowest packages")
+    for name in args.types:
+        runs = [_measure(PROCESS_TYPES[name]) for _ in range(args.repeat)]
+        elapsed = statistics.median(run[0] for run in runs)
+        rss = statistics.median(run[1] for run in runs)
+        packages = runs[-1][2]
+        slowest = sorted(packages.items(), key=lambda item: item[1], reverse=True)[: args.top]
+        listed = ", ".join(f"{package} {micros / 1000:.0f}ms" for package, micros in slowest)
+        print(f"{name:<16} {elapsed:>10.1f} {rss:>8.1f}  {listed}")
+
+
+if __name__ == "__main__":
+    main()
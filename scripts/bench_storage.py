@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""Benchmark worker object-store throughput against a local MinIO.
+
+Compares the single-stream `fput_object`/`fget_object` path with the parallel
+multipart transfer in `workers.common.storage`. Example:
+
+    MINIO_ENDPOINT=localhost:9000 python scripts/bench_storage.py --size-gb 2
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+root = Path(__file__).resolve().parents[1]
+sys.path.append(str(root))
+
+from workers.common import storage  # noqa: E402
+
+BUCKET = "bench"
+
+
+def _write_source(path: Path, size: int) -> None:
+    chunk = os.urandom(8 * 1024 * 1024)
+    with path.open("wb") as fp:
+        remaining = size
+        while remaining > 0:
+            fp.write(chunk[: min(len(chunk), remaining)])
+            remaining -= len(chunk)
+
+
+def _timed(label: str, size: int, func) -> float:
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {elapsed:8.2f}s  {size / elapsed / 1024 / 1024:8.1f} MiB/s")
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size-gb", type=float, default=1.0)
+    parser.add_argument("--part-size-mb", type=int, default=storage.settings.storage_part_size // (1024 * 1024))
+    parser.add_argument("--concurrency", type=int, default=storage.settings.storage_concurrency)
+    args = parser.parse_args()
+
+    size = int(args.size_gb * 1024**3)
+    storage.settings.storage_part_size = args.part_size_mb * 1024 * 1024
+    storage.ensure_bucket(BUCKET)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        source = Path(tmp) / "source.bin"
+        _write_source(source, size)
+        print(f"object size {size / 1024**3:.2f} GiB, part {args.part_size_mb} MiB, concurrency {args.concurrency}")
+
+        storage.settings.storage_concurrency = 1
+        _timed("upload single-stream", size, lambda: storage.upload_from_path(BUCKET, "single.bin", source))
+        _timed("download single-stream", size, lambda: storage.download_to_path(BUCKET, "single.bin", Path(tmp) / "a"))
+
+        storage.settings.storage_concurrency = args.concurrency
+        _timed("upload parallel multipart", size, lambda: storage.upload_from_path(BUCKET, "parallel.bin", source))
+        _timed("download parallel ranged", size, lambda: storage.download_to_path(BUCKET, "parallel.bin", Path(tmp) / "b"))
+
+    for name in ("single.bin", "parallel.bin"):
+        storage.client().remove_object(BUCKET, name)
+
+
+if __name__ == "__main__":
+    main()
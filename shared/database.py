@@ -0,0 +1,94 @@
+"""Engine profiles shared by the API (async) and the workers (sync).
+
+SQLite: every connection switches to WAL (readers no longer block the writer),
+`synchronous=NORMAL` (no fsync per commit in WAL mode; durable at checkpoints)
+and a busy timeout, so concurrent writers wait for the lock instead of failing
+with "database is locked".
+
+Postgres: a bounded connection pool per process with pre-ping (stale
+connections after a failover or idle timeout are replaced transparently) and
+periodic recycling. The async API uses asyncpg, the sync workers psycopg2.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Dict
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine, make_url
+
+
+@dataclass(frozen=True)
+class EngineProfile:
+    pool_size: int = 5
+    max_overflow: int = 10
+    pool_timeout: float = 30.0
+    pool_recycle: int = 1800
+    pool_pre_ping: bool = True
+    sqlite_wal: bool = True
+    sqlite_synchronous: str = "NORMAL"
+    sqlite_busy_timeout_ms: int = 5000
+
+    @classmethod
+    def from_settings(cls, settings: Any) -> "EngineProfile":
+        """Read the `DB_*`/`SQLITE_*` settings both the API and the worker settings declare."""
+        return cls(
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_timeout=settings.db_pool_timeout,
+            pool_recycle=settings.db_pool_recycle,
+            pool_pre_ping=settings.db_pool_pre_ping,
+            sqlite_wal=settings.sqlite_wal,
+            sqlite_synchronous=settings.sqlite_synchronous,
+            sqlite_busy_timeout_ms=settings.sqlite_busy_timeout_ms,
+        )
+
+
+def is_sqlite(url: str) -> bool:
+    return make_url(url).get_backend_name() == "sqlite"
+
+
+def driver_url(url: str, *, asynchronous: bool) -> str:
+    """`url` with the driver the API (async) or the workers (sync) use."""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend == "sqlite":
+        return parsed.set(drivername="sqlite+aiosqlite" if asynchronous else "sqlite").render_as_string(hide_password=False)
+    if backend == "postgresql":
+        drivername = "postgresql+asyncpg" if asynchronous else "postgresql+psycopg2"
+        return parsed.set(drivername=drivername).render_as_string(hide_password=False)
+    return url
+
+
+def engine_options(url: str, profile: EngineProfile) -> Dict[str, Any]:
+    """Keyword arguments for `create_engine`/`create_async_engine`."""
+    if is_sqlite(url):
+        # pysqlite/aiosqlite wait this long for a lock before raising.
+        return {"connect_args": {"timeout": profile.sqlite_busy_timeout_ms / 1000}}
+    return {
+        "pool_size": profile.pool_size,
+        "max_overflow": profile.max_overflow,
+        "pool_timeout": profile.pool_timeout,
+        "pool_recycle": profile.pool_recycle,
+        "pool_pre_ping": profile.pool_pre_ping,
+    }
+
+
+def configure_sqlite(engine: Engine, profile: EngineProfile) -> None:
+    """Apply the SQLite pragmas on every new connection (pass `AsyncEngine.sync_engine` for async engines)."""
+    if not is_sqlite(str(engine.url)):
+        return
+    synchronous = profile.sqlite_synchronous.upper()
+    if synchronous not in {"OFF", "NORMAL", "FULL", "EXTRA"}:
+        raise ValueError(f"Invalid SQLite synchronous mode {profile.sqlite_synchronous!r}")
+    in_memory = engine.url.database in (None, "", ":memory:")
+
+    @event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_connection, _record) -> None:
+        cursor = dbapi_connection.cursor()
+        if profile.sqlite_wal and not in_memory:
+            cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute(f"PRAGMA synchronous={synchronous}")
+        cursor.execute(f"PRAGMA busy_timeout={int(profile.sqlite_busy_timeout_ms)}")
+        cursor.close()
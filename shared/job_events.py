@@ -0,0 +1,55 @@
+"""Job state-change events, published by the workers and the API.
+
+Every committed status, stage, progress or stage-history change is appended to a
+capped Redis stream (`JOB_EVENTS_STREAM`). Each API replica reads the stream
+from the moment it starts and updates its in-memory views (metrics, progress
+streams) from it, instead of querying the jobs table.
+
+An event is a flat JSON object:
+`{"job": <external id>, "at": <unix time>, "status"?, "stage"?, "progress"?, "history"?: {stage: entry}, "requester"?}`.
+The API sets `requester` (the job's `requested_by`) on the events it publishes.
+"""
+
+from __future__ import annotations
+
+import json
+import time
+from typing import Any, Dict, Mapping, Optional
+
+FIELD = "event"
+
+
+def job_event(
+    job_external_id: str,
+    *,
+    status: Optional[str] = None,
+    stage: Optional[str] = None,
+    progress: Optional[float] = None,
+    history: Optional[Dict[str, dict]] = None,
+    requester: Optional[str] = None,
+) -> Dict[str, Any]:
+    event: Dict[str, Any] = {"job": job_external_id, "at": time.time()}
+    if status is not None:
+        event["status"] = str(getattr(status, "value", status))
+    if stage is not None:
+        event["stage"] = str(getattr(stage, "value", stage))
+    if progress is not None:
+        event["progress"] = float(progress)
+    if history:
+        event["history"] = history
+    if requester is not None:
+        event["requester"] = requester
+    return event
+
+
+def encode(event: Mapping[str, Any]) -> Dict[str, str]:
+    """Stream entry fields for `event`."""
+    return {FIELD: json.dumps(event, default=str)}
+
+
+def decode(fields: Mapping[Any, Any]) -> Dict[str, Any]:
+    """Inverse of `encode`; accepts the bytes keys/values redis-py returns."""
+    raw = fields.get(FIELD, fields.get(FIELD.encode()))
+    if isinstance(raw, bytes):
+        raw = raw.decode("utf-8")
+    return json.loads(raw)
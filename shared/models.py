@@ -4,6 +4,7 @@ import enum
 from datetime import datetime
 from typing import Optional
 
+from sqlalchemy import Index, false
 from sqlmodel import Column, DateTime, Field, JSON, SQLModel
 
 
@@ -42,6 +43,15 @@ class Asset(SQLModel, table=True):
 
 class Job(SQLModel, table=True):
     __tablename__ = "jobs"
+    __table_args__ = (
+        # In-flight lookups per asset (coalescing, cache pinning) filter on both columns.
+        Index("ix_jobs_asset_id_status", "asset_id", "status"),
+        # Keyset pagination of the job list, newest first, optionally filtered by one column.
+        Index("ix_jobs_created_at_id", "created_at", "id"),
+        Index("ix_jobs_status_created_at_id", "status", "created_at", "id"),
+        Index("ix_jobs_stage_created_at_id", "stage", "created_at", "id"),
+        Index("ix_jobs_requested_by_created_at_id", "requested_by", "created_at", "id"),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     external_id: str = Field(index=True, unique=True)
@@ -57,6 +67,12 @@ class Job(SQLModel, table=True):
     target_langs: list[str] = Field(default_factory=list, sa_column=Column(JSON))
     presets: dict[str, str] = Field(default_factory=dict, sa_column=Column(JSON))
     requested_by: str | None = Field(default=None, index=True)
+    priority: int = Field(default=0, sa_column_kwargs={"server_default": "0"})
+    # "pipeline" for full dubbing runs, "redub" for re-dubbing edited segments.
+    kind: str = Field(default="pipeline", sa_column_kwargs={"server_default": "pipeline"})
+    dispatched_at: Optional[datetime] = Field(default=None, sa_column=Column(DateTime(timezone=True)))
+    # Latest queued Celery task of the job, revoked on cancel.
+    task_id: Optional[str] = None
     created_at: datetime = Field(default_factory=datetime.utcnow, sa_column=Column(DateTime(timezone=True)))
     updated_at: datetime = Field(default_factory=datetime.utcnow, sa_column=Column(DateTime(timezone=True)))
     stage_history: dict = Field(default_factory=dict, sa_column=Column(JSON))
@@ -64,16 +80,22 @@ class Job(SQLModel, table=True):
 
 class Segment(SQLModel, table=True):
     __tablename__ = "segments"
+    __table_args__ = (Index("ix_segments_asset_id_language_dirty", "asset_id", "language", "dirty"),)
 
     id: Optional[int] = Field(default=None, primary_key=True)
     asset_id: int = Field(foreign_key="assets.id", index=True)
     idx: int = Field(index=True)
+    # Target language of `text_tgt`; edited segments are stored per language.
+    language: Optional[str] = None
     speaker_id: Optional[str] = Field(default=None, index=True)
-    t0: float
-    t1: float
-    text_src: str
+    t0: float = 0.0
+    t1: float = 0.0
+    text_src: str = ""
     text_tgt: Optional[str] = None
     wav_tgt_key: Optional[str] = None
+    # Set by the edit API; cleared once the segment is re-dubbed.
+    dirty: bool = Field(default=False, sa_column_kwargs={"server_default": false()})
+    updated_at: Optional[datetime] = Field(default=None, sa_column=Column(DateTime(timezone=True)))
 
 
 __all__ = [
@@ -0,0 +1,24 @@
+"""Redis keys of the API's response cache, shared with the workers that invalidate it.
+
+Each cached response is a hash `{etag, body}` under `entry_key`. Every
+invalidation bumps `generation_key` as well as deleting the entry, and a
+fill only succeeds if the generation is still the one read before the
+database query. A response read just before a concurrent write is
+therefore never cached after that write's invalidation. Both keys share a
+cluster hash tag.
+"""
+
+from __future__ import annotations
+
+JOB = "job"
+ASSET = "asset"
+
+GENERATION_TTL_SECONDS = 3600
+
+
+def entry_key(kind: str, external_id: str) -> str:
+    return f"resp:{{{kind}:{external_id}}}"
+
+
+def generation_key(kind: str, external_id: str) -> str:
+    return f"resp:{{{kind}:{external_id}}}:gen"
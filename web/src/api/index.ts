@@ -1,5 +1,5 @@
 import client from "./client";
-import type { Asset, Job } from "./types";
+import type { Asset, Job, JobProgressEvent } from "./types";
 
 export async function initUpload(filename: string, size: number, contentType: string) {
   const { data } = await client.post("/upload/init", {
@@ -10,11 +10,38 @@ export async function initUpload(filename: string, size: number, contentType: st
   return data as {
     assetId: string;
     uploadId: string;
-    parts: { partNumber: number; uploadUrl: string }[];
+    parts: UploadPart[];
     partSize: number;
   };
 }
 
+export interface UploadPart {
+  partNumber: number;
+  uploadUrl: string;
+  offset?: number;
+  size?: number;
+}
+
+export async function uploadParts(file: Blob, parts: UploadPart[], partSize: number, concurrency = 4) {
+  const etags: string[] = new Array(parts.length);
+  let next = 0;
+  const worker = async () => {
+    while (next < parts.length) {
+      const index = next++;
+      const part = parts[index];
+      const start = part.offset ?? (part.partNumber - 1) * partSize;
+      const end = part.size !== undefined ? start + part.size : Math.min(start + partSize, file.size);
+      const response = await fetch(part.uploadUrl, { method: "PUT", body: file.slice(start, end) });
+      if (!response.ok) {
+        throw new Error(`Upload failed for part ${part.partNumber}`);
+      }
+      etags[part.partNumber - 1] = response.headers.get("ETag")?.replace(/"/g, "") ?? "";
+    }
+  };
+  await Promise.all(Array.from({ length: Math.min(concurrency, parts.length) }, worker));
+  return etags;
+}
+
 export async function completeUpload(
   assetId: string,
   uploadId: string,
@@ -45,6 +72,56 @@ export async function fetchJob(jobId: string) {
   return data as Job;
 }
 
+const FINAL_STATUSES = ["SUCCESS", "FAILED", "CANCELLED"];
+
+// Follows a job over Server-Sent Events. `onUnavailable` is called when the stream
+// cannot be opened (e.g. the API answers 503), so the caller can fall back to polling.
+// Returns a function that closes the stream.
+export function streamJob(jobId: string, onJob: (job: Job) => void, onUnavailable: () => void) {
+  const source = new EventSource(`${client.defaults.baseURL}/jobs/${jobId}/events`);
+  let current: Job | null = null;
+  const finish = async () => {
+    source.close();
+    try {
+      // Error message, log key and end time are not part of progress events.
+      onJob(await fetchJob(jobId));
+    } catch {
+      // Keep the streamed state.
+    }
+  };
+  source.addEventListener("job", (message) => {
+    current = JSON.parse((message as MessageEvent).data) as Job;
+    onJob(current);
+    if (FINAL_STATUSES.includes(current.status)) {
+      source.close();
+    }
+  });
+  source.addEventListener("progress", (message) => {
+    const event = JSON.parse((message as MessageEvent).data) as JobProgressEvent;
+    if (!current) {
+      return;
+    }
+    current = {
+      ...current,
+      status: event.status ?? current.status,
+      stage: event.stage ?? current.stage,
+      progress: event.progress ?? current.progress,
+      stageHistory: { ...current.stageHistory, ...event.history }
+    };
+    onJob(current);
+    if (FINAL_STATUSES.includes(current.status)) {
+      void finish();
+    }
+  });
+  source.onerror = () => {
+    // The browser reconnects on its own unless the server refused the stream.
+    if (source.readyState === EventSource.CLOSED) {
+      onUnavailable();
+    }
+  };
+  return () => source.close();
+}
+
 export async function fetchAsset(assetId: string) {
   const { data } = await client.get(`/assets/${assetId}`);
   return data as Asset;
@@ -32,6 +32,21 @@ export interface Job {
     }
   >;
   availableOutputs?: Record<string, string>;
+  coalesced?: boolean;
+  coalescedWith?: string[];
+  priority?: number;
+  kind?: "pipeline" | "redub";
+  dispatchedAt?: string;
+}
+
+// One change pushed by `GET /v1/jobs/{jobId}/events`; absent fields did not change.
+export interface JobProgressEvent {
+  job: string;
+  at: number;
+  status?: JobStatus;
+  stage?: JobStage;
+  progress?: number;
+  history?: NonNullable<Job["stageHistory"]>;
 }
 
 export interface Asset {
@@ -1,6 +1,6 @@
 import { useEffect, useState } from "react";
 import { Link, useParams } from "react-router-dom";
-import { fetchJob } from "../api";
+import { fetchJob, streamJob } from "../api";
 import type { Job } from "../api/types";
 import JobProgress from "../components/JobProgress";
 import StageHistory from "../components/StageHistory";
@@ -15,22 +15,35 @@ export default function JobDetailPage() {
       return;
     }
     let isMounted = true;
-    const interval = setInterval(async () => {
-      try {
-        const data = await fetchJob(jobId);
+    let interval: ReturnType<typeof setInterval> | undefined;
+    const poll = () => {
+      interval = setInterval(async () => {
+        try {
+          const data = await fetchJob(jobId);
+          if (isMounted) {
+            setJob(data);
+            if (data.status === "SUCCESS" || data.status === "FAILED" || data.status === "CANCELLED") {
+              clearInterval(interval);
+            }
+          }
+        } catch (err) {
+          setError((err as Error).message);
+          clearInterval(interval);
+        }
+      }, 2000);
+    };
+    const close = streamJob(
+      jobId,
+      (data) => {
         if (isMounted) {
           setJob(data);
-          if (data.status === "SUCCESS" || data.status === "FAILED") {
-            clearInterval(interval);
-          }
         }
-      } catch (err) {
-        setError((err as Error).message);
-        clearInterval(interval);
-      }
-    }, 2000);
+      },
+      poll
+    );
     return () => {
       isMounted = false;
+      close();
       clearInterval(interval);
     };
   }, [jobId]);
@@ -1,6 +1,6 @@
 import { FormEvent, useMemo, useState } from "react";
 import { useNavigate } from "react-router-dom";
-import { completeUpload, createJob, initUpload } from "../api";
+import { completeUpload, createJob, initUpload, uploadParts } from "../api";
 
 const languages = [
   { value: "en", label: "English" },
@@ -48,21 +48,10 @@ export default function UploadPage() {
     try {
       setStatus("Requesting upload session...");
       const init = await initUpload(file.name, file.size, file.type);
-      const uploadUrl = init.parts[0].uploadUrl;
-      setStatus("Uploading...");
-      const uploadResp = await fetch(uploadUrl, {
-        method: "PUT",
-        headers: {
-          "Content-Type": file.type
-        },
-        body: await file.arrayBuffer()
-      });
-      if (!uploadResp.ok) {
-        throw new Error("Upload failed");
-      }
-      const etag = uploadResp.headers.get("ETag")?.replace(/"/g, "") ?? "demo-etag";
+      setStatus(`Uploading ${init.parts.length} part(s)...`);
+      const etags = await uploadParts(file, init.parts, init.partSize);
       setStatus("Finalizing upload...");
-      await completeUpload(init.assetId, init.uploadId, "en", targetLangs, [etag]);
+      await completeUpload(init.assetId, init.uploadId, "en", targetLangs, etags);
       setStatus("Creating job...");
       const job = await createJob(init.assetId, targetLangs, { default: defaultPreset });
       navigate(`/jobs/${job.jobId}`);
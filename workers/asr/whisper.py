@@ -3,10 +3,11 @@ from __future__ import annotations
 import json
 import logging
 from pathlib import Path
-from typing import List, Optional
+from typing import BinaryIO, List, Optional, Union
 
-from tenacity import retry, stop_after_attempt, wait_fixed
+from tenacity import retry, retry_if_not_exception_type, stop_after_attempt, wait_fixed
 
+from ..common.cancellation import JobCancelled, checkpoint
 from ..config import get_settings
 
 try:
@@ -61,14 +62,14 @@ def _stub_segment() -> List[dict]:
     ]
 
 
-@retry(stop=stop_after_attempt(3), wait=wait_fixed(2))
+@retry(stop=stop_after_attempt(3), wait=wait_fixed(2), retry=retry_if_not_exception_type(JobCancelled))
 def transcribe(
-    audio_path: Path,
+    audio_path: Union[Path, BinaryIO],
     output_dir: Path,
     diarization: Optional[List[dict]] = None,
 ) -> List[dict]:
     output_dir.mkdir(parents=True, exist_ok=True)
-    if not audio_path.exists():
+    if isinstance(audio_path, Path) and not audio_path.exists():
         _log.error("Audio path %s not found; returning stub segments", audio_path)
         segments = _stub_segment()
     else:
@@ -76,8 +77,10 @@ def transcribe(
         if model is None:
             segments = _stub_segment()
         else:  # pragma: no cover - depends on external model weights
+            if not isinstance(audio_path, Path):
+                audio_path.seek(0)
             segments_iter, info = model.transcribe(
-                str(audio_path),
+                str(audio_path) if isinstance(audio_path, Path) else audio_path,
                 beam_size=5,
                 vad_filter=True,
                 language=None,
@@ -87,6 +90,7 @@ def transcribe(
             diarization_data = diarization or []
             segments = []
             for idx, segment in enumerate(segments_iter):
+                checkpoint()
                 start = float(segment.start or 0.0)
                 end = float(segment.end or 0.0)
                 speaker_id = _assign_speaker(diarization_data, start, end) if diarization_data else None
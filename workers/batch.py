@@ -0,0 +1,194 @@
+"""Local batch runner: dub a directory (or manifest) of media files in-process.
+
+For back-catalog runs the per-stage Celery/Redis/MinIO round-trips are pure
+overhead. This runner calls the same stage functions the tasks use
+(`transcribe`, `translate_segments`, `synthesize_segments`, `assemble_track`,
+then encode + publish) directly, one file per process of a local pool, and
+stores objects on the local filesystem (`STORAGE_BACKEND=local`). No job or
+asset rows are written. Example:
+
+    python -m workers media/ --languages es,fr --processes 4 --output data/batch
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import re
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .config import get_settings
+
+STAGES = ["ASR", "TRANSLATE", "TTS", "ALIGN/MIX", "PACKAGE"]
+MEDIA_SUFFIXES = {".wav", ".flac", ".mp3", ".m4a", ".aac", ".ogg", ".opus", ".mp4", ".mkv", ".mov", ".webm"}
+MANIFEST_SUFFIXES = {".txt", ".json"}
+
+_log = logging.getLogger("workers.batch")
+
+
+@dataclass
+class FileResult:
+    source: str
+    asset_id: str
+    audio_seconds: float = 0.0
+    stage_seconds: Dict[str, float] = field(default_factory=dict)
+    outputs: Dict[str, str] = field(default_factory=dict)
+    error: Optional[str] = None
+
+
+def discover(inputs: List[Path]) -> List[Path]:
+    """Media files from directories (recursive), manifests (`.txt` lines or a `.json` list) and plain paths."""
+    found: List[Path] = []
+    for entry in inputs:
+        if entry.is_dir():
+            found += sorted(path for path in entry.rglob("*") if path.is_file() and path.suffix.lower() in MEDIA_SUFFIXES)
+        elif entry.suffix.lower() in MANIFEST_SUFFIXES:
+            text = entry.read_text(encoding="utf-8")
+            listed = json.loads(text) if entry.suffix.lower() == ".json" else text.splitlines()
+            for line in listed:
+                line = str(line).strip()
+                if line and not line.startswith("#"):
+                    path = Path(line)
+                    found.append(path if path.is_absolute() else entry.parent / path)
+        else:
+            found.append(entry)
+    unique: Dict[Path, None] = {}
+    for path in found:
+        unique.setdefault(path.resolve(), None)
+    return list(unique)
+
+
+def asset_id_for(path: Path) -> str:
+    """Stable asset id: readable file stem plus a short hash of the absolute path."""
+    slug = re.sub(r"[^a-z0-9]+", "-", path.stem.lower()).strip("-") or "asset"
+    digest = hashlib.sha1(path.resolve().as_posix().encode("utf-8")).hexdigest()[:8]
+    return f"{slug[:40]}-{digest}"
+
+
+def _audio_seconds(path: Path, segments: List[dict]) -> float:
+    import soundfile as sf
+
+    try:
+        return float(sf.info(str(path)).duration)
+    except Exception:  # containers soundfile cannot read; fall back to the transcript span
+        return max((float(segment.get("t1", 0.0)) for segment in segments), default=0.0)
+
+
+def process_file(source: Path, languages: List[str], output_dir: Path) -> FileResult:
+    """Run ASR -> MT -> TTS -> mix -> package for one file; stage errors are reported, not raised."""
+    from .asr.whisper import transcribe
+    from .common import codecs
+    from .common.paths import tts_segment_files
+    from .mix.assemble import assemble_track, publish_track
+    from .mt.translate import translate_segments
+    from .tts.synth import synthesize_segments
+
+    result = FileResult(source=source.as_posix(), asset_id=asset_id_for(source))
+    workspace = output_dir / "proc" / result.asset_id
+    public_dir = output_dir / "pub" / result.asset_id
+    stage = STAGES[0]
+
+    def timed(name: str, run):
+        nonlocal stage
+        stage = name
+        started = time.perf_counter()
+        value = run()
+        result.stage_seconds[name] = result.stage_seconds.get(name, 0.0) + time.perf_counter() - started
+        return value
+
+    try:
+        segments = timed("ASR", lambda: transcribe(source, workspace / "asr"))
+        result.audio_seconds = _audio_seconds(source, segments)
+        for lang in languages:
+            translated = timed(
+                "TRANSLATE",
+                lambda: translate_segments(workspace / "asr" / "segments_src.json", workspace / "translations", lang),
+            )
+            tts_dir = workspace / "tts" / lang
+            timed("TTS", lambda: synthesize_segments(translated, tts_dir, target_language=lang))
+            mix = timed(
+                "ALIGN/MIX",
+                lambda: assemble_track(
+                    translated, tts_segment_files(tts_dir), workspace / "mix" / lang, source_audio=source, target_language=lang
+                ),
+            )
+
+            def package() -> dict:
+                rendition = codecs.encode_for_publish(mix, public_dir / lang)
+                return publish_track(result.asset_id, lang, rendition, public_dir)
+
+            result.outputs[lang] = timed("PACKAGE", package)["audio"]
+    except Exception as exc:
+        _log.debug("Batch file %s failed:\n%s", source, traceback.format_exc())
+        result.error = f"{stage}: {exc}"
+    return result
+
+
+def _configure(output_dir: Path) -> None:
+    """Point object storage at `<output>/objects`; runs in the parent and in every pool process."""
+    settings = get_settings()  # the cached instance every module holds
+    settings.storage_backend = "local"
+    if "LOCAL_STORAGE_DIR" not in os.environ:
+        settings.local_storage_dir = str(output_dir / "objects")
+
+
+def summarize(results: List[FileResult], wall_seconds: float) -> str:
+    done = [result for result in results if result.error is None]
+    audio = sum(result.audio_seconds for result in done)
+    lines = [f"{'stage':<10} {'busy s':>9} {'files/min':>10} {'audio x realtime':>17}"]
+    for stage in STAGES:
+        busy = sum(result.stage_seconds.get(stage, 0.0) for result in done)
+        per_minute = len(done) / busy * 60 if busy else 0.0
+        realtime = audio / busy if busy else 0.0
+        lines.append(f"{stage:<10} {busy:>9.1f} {per_minute:>10.1f} {realtime:>17.1f}")
+    lines.append(
+        f"{len(done)}/{len(results)} files, {audio:.0f} s of audio in {wall_seconds:.1f} s wall "
+        f"({len(done) / wall_seconds * 60 if wall_seconds else 0.0:.1f} files/min, "
+        f"{audio / wall_seconds if wall_seconds else 0.0:.1f}x realtime)"
+    )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="workers", description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("inputs", nargs="+", type=Path, help="Media files, directories or manifests (.txt/.json)")
+    parser.add_argument("--languages", required=True, help="Comma-separated target languages, e.g. es,fr")
+    parser.add_argument("--output", type=Path, default=Path("data") / "batch", help="Workspace and object directory")
+    parser.add_argument("--processes", type=int, default=os.cpu_count() or 1, help="Files processed in parallel")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING, format="%(levelname)s %(name)s: %(message)s")
+    languages = [lang.strip() for lang in args.languages.split(",") if lang.strip()]
+    files = discover(args.inputs)
+    if not files or not languages:
+        parser.error("no media files or target languages given")
+    output_dir = args.output.resolve()
+    _configure(output_dir)
+
+    started = time.perf_counter()
+    results: List[FileResult] = []
+    processes = max(1, min(args.processes, len(files)))
+    with ProcessPoolExecutor(max_workers=processes, initializer=_configure, initargs=(output_dir,)) as pool:
+        futures = [pool.submit(process_file, path, languages, output_dir) for path in files]
+        for future in as_completed(futures):
+            result = future.result()
+            results.append(result)
+            status = "failed " + result.error if result.error else "ok"
+            print(f"[{len(results)}/{len(files)}] {result.source} -> {result.asset_id}: {status}", flush=True)
+    print(summarize(results, time.perf_counter() - started))
+    return 1 if any(result.error for result in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
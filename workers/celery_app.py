@@ -1,5 +1,13 @@
+import time
+
 from celery import Celery
+from celery.signals import before_task_publish, task_postrun, task_prerun, worker_init, worker_process_init
+from kombu import Queue
 
+from .common import db
+from .common import jobs as job_state
+from .common import metrics
+from .common.logging import configure_stdout_logging
 from .config import get_settings
 
 settings = get_settings()
@@ -10,5 +18,73 @@ celery_app = Celery(
     backend=settings.redis_url,
 )
 
+# task name -> (stage label, queue). Stages get their own queues so network-bound
+# work (MT, packaging) never waits behind long CPU-bound runs (ASR, mixing).
+STAGE_ROUTES = {
+    "workers.pipeline.run_pipeline": ("PIPELINE", settings.broker_queue),
+    "workers.pipeline.run_asr_stage": ("ASR", settings.queue_asr),
+    "workers.pipeline.run_translate_stage": ("TRANSLATE", settings.queue_mt),
+    "workers.pipeline.run_tts_stage": ("TTS", settings.queue_tts),
+    "workers.pipeline.run_mix_stage": ("ALIGN/MIX", settings.queue_mix),
+    "workers.pipeline.run_segment_stages": ("SEGMENTS", settings.queue_tts),
+    "workers.pipeline.run_redub_stage": ("REDUB", settings.queue_tts),
+    "workers.pipeline.run_package_stage": ("PACKAGE", settings.queue_package),
+    "workers.pipeline.finalize_job": ("FINALIZE", settings.broker_queue),
+}
+
+ENQUEUED_AT_HEADER = "enqueued_at"
+
 celery_app.conf.task_default_queue = settings.broker_queue
+celery_app.conf.task_queues = [Queue(name) for name in dict.fromkeys(queue for _, queue in STAGE_ROUTES.values())]
+celery_app.conf.task_routes = {name: {"queue": queue} for name, (_, queue) in STAGE_ROUTES.items()}
+# Long tasks: acknowledge after completion (a crashed worker's task is redelivered)
+# and reserve one task at a time so idle workers can pick up queued work.
+celery_app.conf.task_acks_late = True
+celery_app.conf.task_reject_on_worker_lost = True
+celery_app.conf.worker_prefetch_multiplier = settings.worker_prefetch_multiplier
+# Unacked tasks are redelivered after the visibility timeout; it must exceed the longest stage.
+celery_app.conf.broker_transport_options = {"visibility_timeout": settings.broker_visibility_timeout}
 celery_app.autodiscover_tasks(["workers.pipeline"])
+
+
+@before_task_publish.connect
+def _stamp_enqueue_time(headers=None, **_kwargs) -> None:
+    if headers is not None:
+        headers.setdefault(ENQUEUED_AT_HEADER, time.time())
+
+
+def enqueued_at(request) -> float | None:
+    value = getattr(request, ENQUEUED_AT_HEADER, None)
+    if value is None:
+        value = (getattr(request, "headers", None) or {}).get(ENQUEUED_AT_HEADER)
+    return float(value) if value is not None else None
+
+
+@task_prerun.connect
+def _observe_queue_wait(task=None, **_kwargs) -> None:
+    if task is None or task.name not in STAGE_ROUTES:
+        return
+    sent = enqueued_at(task.request)
+    if sent is None:
+        return
+    stage, queue = STAGE_ROUTES[task.name]
+    delivery_info = getattr(task.request, "delivery_info", None) or {}
+    metrics.report_queue_wait(stage, delivery_info.get("routing_key") or queue, time.time() - sent)
+
+
+@task_postrun.connect
+def _flush_job_state(**_kwargs) -> None:
+    job_state.flush()
+
+
+@worker_process_init.connect
+def _reset_db_pool(**_kwargs) -> None:
+    # Pooled connections must not be shared with the parent across fork.
+    db.engine.dispose(close=False)
+
+
+@worker_init.connect
+def _start_worker(**_kwargs) -> None:
+    # Process-wide side effects live here rather than in module imports.
+    configure_stdout_logging()
+    metrics.start_server(settings.metrics_port, host=settings.metrics_host)
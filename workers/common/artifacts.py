@@ -1,40 +1,165 @@
 from __future__ import annotations
 
+import json
+import logging
 from pathlib import Path
-from typing import Iterable
+from typing import Dict, Iterable, List, Optional
 
+from shared.models import JobStage
+
+from ..tts.checkpoint import SegmentCheckpoint
+from . import cache, manifest, metrics
 from .paths import (
     asr_segments_path,
+    mix_output_dir,
     mix_output_file,
+    tts_segment_files,
     tts_segment_path,
     translation_segments_path,
 )
 
+_log = logging.getLogger(__name__)
+
+# Stage outputs each stage reads.
+STAGE_INPUTS = {
+    JobStage.TRANSLATE: (JobStage.ASR,),
+    JobStage.TTS: (JobStage.TRANSLATE,),
+    JobStage.ALIGN_MIX: (JobStage.TRANSLATE, JobStage.TTS),
+    JobStage.PACKAGE: (JobStage.ALIGN_MIX,),
+}
+
+
+def _available(
+    asset_external_id: str,
+    stage: JobStage,
+    unit_path: Path,
+    marker: Optional[Path] = None,
+    presets: Optional[Dict[str, str]] = None,
+) -> bool:
+    """Check the node cache first, then lazily sync the unit from the asset manifest."""
+    if cache.lookup(unit_path, marker=marker):
+        metrics.report_artifact_resume(stage.value, "local")
+        return True
+    if manifest.sync_unit(asset_external_id, unit_path, manifest.stage_config(stage, presets)):
+        cache.record(unit_path)
+        metrics.report_artifact_resume(stage.value, "synced")
+        return True
+    metrics.report_artifact_resume(stage.value, "missing")
+    return False
+
 
 def has_asr_segments(asset_external_id: str) -> bool:
-    return asr_segments_path(asset_external_id).exists()
+    segments_path = asr_segments_path(asset_external_id)
+    return _available(asset_external_id, JobStage.ASR, segments_path.parent, marker=segments_path)
 
 
 def missing_translations(asset_external_id: str, languages: Iterable[str]) -> list[str]:
     missing = []
     for lang in languages:
-        if not translation_segments_path(asset_external_id, lang).exists():
+        if not _available(asset_external_id, JobStage.TRANSLATE, translation_segments_path(asset_external_id, lang)):
             missing.append(lang)
     return missing
 
 
-def missing_tts_segments(asset_external_id: str, languages: Iterable[str]) -> list[str]:
+def missing_tts_segments(
+    asset_external_id: str,
+    languages: Iterable[str],
+    presets: Optional[Dict[str, str]] = None,
+) -> list[str]:
     missing = []
     for lang in languages:
         lang_dir = tts_segment_path(asset_external_id, lang)
-        if not lang_dir.exists() or not any(lang_dir.glob("seg_*.wav")):
+        if not _available(asset_external_id, JobStage.TTS, lang_dir, presets=presets) or not _tts_complete(
+            asset_external_id, lang, presets
+        ):
             missing.append(lang)
     return missing
 
 
+def _tts_complete(asset_external_id: str, language: str, presets: Optional[Dict[str, str]] = None) -> bool:
+    """Whether every translated segment has a render, not just some of them."""
+    lang_dir = tts_segment_path(asset_external_id, language)
+    rendered = tts_segment_files(lang_dir)
+    translations_path = translation_segments_path(asset_external_id, language)
+    if not rendered or not translations_path.exists():
+        return bool(rendered)
+    segments = json.loads(translations_path.read_text(encoding="utf-8"))
+    state = SegmentCheckpoint(lang_dir, language, presets)
+    if state.exists:
+        return state.covers(segments)
+    # Renders synced from the manifest (or made before checkpoints) carry no journal.
+    return {path.stem for path in rendered} >= {f"seg_{int(segment['idx']):04d}" for segment in segments}
+
+
 def missing_mixes(asset_external_id: str, languages: Iterable[str]) -> list[str]:
     missing = []
     for lang in languages:
-        if not mix_output_file(asset_external_id, lang).exists():
+        mix_path = mix_output_file(asset_external_id, lang)
+        if not _available(asset_external_id, JobStage.ALIGN_MIX, mix_output_dir(asset_external_id, lang), marker=mix_path):
             missing.append(lang)
     return missing
+
+
+def missing_stage_outputs(
+    asset_external_id: str,
+    stage: JobStage,
+    languages: List[str],
+    presets: Optional[Dict[str, str]] = None,
+) -> list[str]:
+    if stage == JobStage.ASR:
+        return [] if has_asr_segments(asset_external_id) else ["*"]
+    if stage == JobStage.TRANSLATE:
+        return missing_translations(asset_external_id, languages)
+    if stage == JobStage.TTS:
+        return missing_tts_segments(asset_external_id, languages, presets)
+    if stage == JobStage.ALIGN_MIX:
+        return missing_mixes(asset_external_id, languages)
+    return []
+
+
+def ensure_stage_inputs(
+    asset_external_id: str,
+    stage: JobStage,
+    languages: List[str],
+    presets: Optional[Dict[str, str]] = None,
+) -> Dict[str, List[str]]:
+    """Make the upstream outputs a stage reads available locally (syncing as needed).
+
+    Returns the inputs that are still missing, keyed by upstream stage.
+    """
+    missing: Dict[str, List[str]] = {}
+    for upstream in STAGE_INPUTS.get(stage, ()):
+        absent = missing_stage_outputs(asset_external_id, upstream, languages, presets)
+        if absent:
+            missing[upstream.value] = absent
+    return missing
+
+
+def stage_outputs(asset_external_id: str, stage: JobStage, languages: Iterable[str]) -> List[Path]:
+    """Cache units (files or directories) produced by a stage."""
+    if stage == JobStage.ASR:
+        return [asr_segments_path(asset_external_id).parent]
+    if stage == JobStage.TRANSLATE:
+        return [translation_segments_path(asset_external_id, lang) for lang in languages]
+    if stage == JobStage.TTS:
+        return [tts_segment_path(asset_external_id, lang) for lang in languages]
+    if stage == JobStage.ALIGN_MIX:
+        return [mix_output_dir(asset_external_id, lang) for lang in languages]
+    return []
+
+
+def record_stage_outputs(
+    asset_external_id: str,
+    stage: JobStage,
+    languages: Iterable[str],
+    presets: Optional[Dict[str, str]] = None,
+) -> None:
+    """Register a stage's outputs with the node cache and the asset manifest."""
+    unit_paths = stage_outputs(asset_external_id, stage, languages)
+    for unit_path in unit_paths:
+        cache.record(unit_path)
+    try:
+        manifest.publish_units(asset_external_id, stage, unit_paths, manifest.stage_config(stage, presets))
+    except Exception as exc:  # pragma: no cover - depends on MinIO
+        _log.warning("Could not publish %s artifacts for %s (%s)", stage.value, asset_external_id, exc)
+    cache.enforce_budget()
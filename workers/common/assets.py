@@ -1,11 +1,18 @@
+import threading
 from datetime import datetime
+from typing import Dict, Optional
 
 from sqlmodel import select
 
 from shared.models import Asset
+from shared.response_cache import ASSET
 
+from . import events
 from .db import get_session
 
+# Serializes read-modify-write of storage_keys between publish threads of this process.
+_storage_keys_lock = threading.Lock()
+
 
 def update_storage_keys(asset_external_id: str, storage_keys: dict) -> None:
     with get_session() as session:
@@ -14,3 +21,29 @@ def update_storage_keys(asset_external_id: str, storage_keys: dict) -> None:
         asset.updated_at = datetime.utcnow()
         session.add(asset)
         session.commit()
+    events.invalidate(ASSET, asset_external_id)
+
+
+def merge_storage_keys(
+    asset_external_id: str,
+    updates: Dict[str, str],
+    defaults: Optional[Dict[str, str]] = None,
+) -> dict:
+    """Merge keys into `storage_keys` in a single transaction and return the result.
+
+    `defaults` are only set when absent. The row is locked (`FOR UPDATE`) where
+    the database supports it so concurrent publishers never drop each other's keys.
+    """
+    with _storage_keys_lock, get_session() as session:
+        stmt = select(Asset).where(Asset.external_id == asset_external_id).with_for_update()
+        asset = session.exec(stmt).one()
+        storage_keys = dict(asset.storage_keys or {})
+        for key, value in (defaults or {}).items():
+            storage_keys.setdefault(key, value)
+        storage_keys.update(updates)
+        asset.storage_keys = storage_keys
+        asset.updated_at = datetime.utcnow()
+        session.add(asset)
+        session.commit()
+    events.invalidate(ASSET, asset_external_id)
+    return storage_keys
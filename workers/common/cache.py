@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+import fcntl
+import itertools
+import json
+import logging
+import os
+import shutil
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+
+from sqlalchemy.exc import SQLAlchemyError
+from sqlmodel import select
+
+from shared.models import Asset, Job, JobStatus
+
+from ..config import get_settings
+from . import metrics
+from .db import get_session
+from .paths import DATA_DIR, PROC_DIR, PUB_DIR, directory_size_bytes
+
+_log = logging.getLogger(__name__)
+_settings = get_settings()
+
+INDEX_PATH = PROC_DIR / ".artifact_cache.json"
+LOCK_PATH = PROC_DIR / ".artifact_cache.lock"
+# One empty file per running stage, `<asset>.<pid>.<n>`, so every process on the node sees the pins.
+PINS_DIR = PROC_DIR / ".artifact_pins"
+
+_pin_ids = itertools.count()
+
+
+def _unit_key(unit_path: Path) -> str:
+    return unit_path.resolve().relative_to(DATA_DIR.resolve()).as_posix()
+
+
+def _asset_for_key(key: str) -> Optional[str]:
+    parts = key.split("/")
+    if len(parts) >= 2 and parts[0] in (PROC_DIR.name, PUB_DIR.name):
+        return parts[1]
+    return None
+
+
+def _unit_size(path: Path) -> int:
+    if path.is_dir():
+        return directory_size_bytes(path)
+    return path.stat().st_size if path.exists() else 0
+
+
+@contextmanager
+def _node_lock() -> Iterator[None]:
+    PROC_DIR.mkdir(parents=True, exist_ok=True)
+    with LOCK_PATH.open("a+") as lock_fp:
+        fcntl.flock(lock_fp, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_fp, fcntl.LOCK_UN)
+
+
+def _read_index() -> Dict[str, dict]:
+    try:
+        return json.loads(INDEX_PATH.read_text(encoding="utf-8"))
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+@contextmanager
+def _locked_index() -> Iterator[Dict[str, dict]]:
+    """Load the node-wide index under an exclusive file lock and save it on exit."""
+    with _node_lock():
+        index = _read_index()
+        yield index
+        tmp_path = INDEX_PATH.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(index), encoding="utf-8")
+        tmp_path.replace(INDEX_PATH)
+        metrics.report_cache_usage(sum(entry.get("bytes", 0) for entry in index.values()))
+
+
+@contextmanager
+def pinned(asset_external_id: str) -> Iterator[None]:
+    """Protect an asset's artifacts from eviction on this node while a stage works on it.
+
+    Stages pin their asset through `stage_context`. The pin is taken under the
+    node lock, so an eviction either finishes before it or skips the asset.
+    """
+    pin = PINS_DIR / f"{asset_external_id}.{os.getpid()}.{next(_pin_ids)}"
+    with _node_lock():
+        PINS_DIR.mkdir(parents=True, exist_ok=True)
+        pin.touch()
+    try:
+        yield
+    finally:
+        pin.unlink(missing_ok=True)
+
+
+def _process_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _pinned_assets() -> set[str]:
+    """Assets pinned by live processes on this node; pins of dead processes are removed."""
+    assets: set[str] = set()
+    if not PINS_DIR.exists():
+        return assets
+    for pin in PINS_DIR.iterdir():
+        asset, pid, _ = pin.name.rsplit(".", 2)
+        if _process_alive(int(pid)):
+            assets.add(asset)
+        else:
+            pin.unlink(missing_ok=True)
+    return assets
+
+
+def _active_assets() -> Optional[set[str]]:
+    """Assets with PENDING/RUNNING jobs; their artifacts are pinned cluster-wide.
+
+    Returns None when the job table cannot be read, in which case nothing is
+    safe to evict.
+    """
+    try:
+        with get_session() as session:
+            stmt = (
+                select(Asset.external_id)
+                .join(Job, Job.asset_id == Asset.id)
+                .where(Job.status.in_([JobStatus.PENDING, JobStatus.RUNNING]))
+                .distinct()
+            )
+            active = set(session.exec(stmt).all())
+    except SQLAlchemyError as exc:
+        _log.warning("Cannot read in-flight jobs (%s); skipping cache eviction", exc)
+        return None
+    return active
+
+
+def lookup(unit_path: Path, marker: Optional[Path] = None) -> bool:
+    """Return whether a stage artifact is present, recording hit/miss and recency."""
+    ready = (marker or unit_path).exists()
+    key = _unit_key(unit_path)
+    with _locked_index() as index:
+        if ready:
+            entry = index.get(key) or {"bytes": _unit_size(unit_path)}
+            entry["lastAccess"] = time.time()
+            index[key] = entry
+        else:
+            index.pop(key, None)
+    metrics.report_cache_lookup(hit=ready)
+    return ready
+
+
+def record(unit_path: Path) -> None:
+    """Register (or refresh) a freshly produced stage artifact."""
+    if not unit_path.exists():
+        return
+    key = _unit_key(unit_path)
+    with _locked_index() as index:
+        index[key] = {"bytes": _unit_size(unit_path), "lastAccess": time.time()}
+
+
+def enforce_budget(budget_bytes: Optional[int] = None) -> int:
+    """Evict least-recently-used unpinned artifacts until usage fits the budget.
+
+    Eviction stops at the low watermark so it does not run after every stage.
+    Returns the number of evicted artifacts.
+    """
+    budget = _settings.artifact_cache_budget_bytes if budget_bytes is None else budget_bytes
+    if budget <= 0:
+        return 0
+    # The index is replaced atomically, so this unlocked read is safe; it saves
+    # the query below on every call that is within budget.
+    if sum(entry.get("bytes", 0) for entry in _read_index().values()) <= budget:
+        return 0
+    # Queried before taking the node lock, which other processes wait on.
+    active = _active_assets()
+    if active is None:
+        return 0
+    with _locked_index() as index:
+        used = sum(entry.get("bytes", 0) for entry in index.values())
+        if used <= budget:
+            return 0
+        target = int(budget * _settings.artifact_cache_low_watermark)
+        active |= _pinned_assets()
+        evicted = 0
+        for key, entry in sorted(index.items(), key=lambda item: item[1].get("lastAccess", 0.0)):
+            if used <= target:
+                break
+            if _asset_for_key(key) in active:
+                continue
+            path = DATA_DIR / key
+            if path.is_dir():
+                shutil.rmtree(path, ignore_errors=True)
+            else:
+                path.unlink(missing_ok=True)
+            used -= entry.get("bytes", 0)
+            del index[key]
+            evicted += 1
+        metrics.report_cache_evictions(evicted)
+        return evicted
@@ -0,0 +1,115 @@
+"""Cooperative cancellation of running jobs.
+
+The API marks a job CANCELLED (recording the request time in `ended_at`) and
+revokes its queued stage task. A stage that is already running notices at the
+`checkpoint()` calls placed in long loops (ASR segment iteration, per-segment
+MT and TTS, mix blocks, external tools) and stops with `JobCancelled`; the stage
+task then records the cancellation and does not chain the next stage.
+
+Checkpoints are cheap: the job's status is read from the database at most once
+per `CANCEL_CHECK_INTERVAL_SECONDS` per process.
+"""
+
+from __future__ import annotations
+
+import subprocess
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from sqlmodel import select
+
+from shared.models import Job, JobStatus
+
+from ..config import get_settings
+from . import metrics
+from .db import get_session
+
+_settings = get_settings()
+
+# Job of the stage running in this process; set by `stage_context` (prefork workers run one task at a time).
+_watched: Optional[str] = None
+_checked: Dict[str, Tuple[float, Optional[datetime]]] = {}
+_checked_lock = threading.Lock()
+
+
+class JobCancelled(Exception):
+    def __init__(self, job_external_id: str) -> None:
+        super().__init__(f"Job {job_external_id} was cancelled")
+        self.job_external_id = job_external_id
+
+
+def _cancel_requested_at(job_external_id: str) -> Optional[datetime]:
+    with get_session() as session:
+        row = session.exec(select(Job.status, Job.ended_at).where(Job.external_id == job_external_id)).first()
+    if row is None or row[0] != JobStatus.CANCELLED:
+        return None
+    return row[1] or datetime.utcnow()
+
+
+def cancel_requested_at(job_external_id: str, max_age: Optional[float] = None) -> Optional[datetime]:
+    """When the job was cancelled, or None; reuses a check younger than `max_age` seconds."""
+    max_age = _settings.cancel_check_interval_seconds if max_age is None else max_age
+    now = time.monotonic()
+    with _checked_lock:
+        cached = _checked.get(job_external_id)
+    if cached is not None and now - cached[0] < max_age:
+        return cached[1]
+    requested_at = _cancel_requested_at(job_external_id)
+    with _checked_lock:
+        _checked[job_external_id] = (now, requested_at)
+    return requested_at
+
+
+def is_cancelled(job_external_id: str, max_age: Optional[float] = None) -> bool:
+    return cancel_requested_at(job_external_id, max_age) is not None
+
+
+@contextmanager
+def watch(job_external_id: str) -> Iterator[None]:
+    """Make `checkpoint()` calls in this process check `job_external_id`."""
+    global _watched
+    previous, _watched = _watched, job_external_id
+    try:
+        yield
+    finally:
+        _watched = previous
+        with _checked_lock:
+            _checked.pop(job_external_id, None)
+
+
+def checkpoint() -> None:
+    """Raise `JobCancelled` if the watched job was cancelled; no-op outside a stage."""
+    job_external_id = _watched
+    if job_external_id is not None and is_cancelled(job_external_id):
+        raise JobCancelled(job_external_id)
+
+
+def run_process(cmd: List[str], poll_seconds: float = 1.0, **kwargs) -> None:
+    """`subprocess.run(cmd, check=True)` that kills the process when the job is cancelled."""
+    process = subprocess.Popen(cmd, **kwargs)
+    try:
+        while True:
+            try:
+                returncode = process.wait(timeout=poll_seconds)
+                break
+            except subprocess.TimeoutExpired:
+                checkpoint()
+    except BaseException:
+        process.kill()
+        process.wait()
+        raise
+    if returncode:
+        raise subprocess.CalledProcessError(returncode, cmd)
+
+
+def report_stopped(job_external_id: str, stage: str) -> Optional[float]:
+    """Observe the time from the cancel request until this stage released its worker (ms)."""
+    requested_at = cancel_requested_at(job_external_id, max_age=0)
+    if requested_at is None:
+        return None
+    latency = max((datetime.utcnow() - requested_at.replace(tzinfo=None)).total_seconds(), 0.0)
+    metrics.report_cancel_latency(stage, latency)
+    return round(latency * 1000, 2)
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import logging
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import BinaryIO, Callable, Iterable, List, Tuple, TypeVar, Union
+
+import numpy as np
+import soundfile as sf
+
+from ..config import get_settings
+from .paths import AUDIO_SUFFIXES, intermediate_suffix
+
+_log = logging.getLogger(__name__)
+_settings = get_settings()
+
+T = TypeVar("T")
+
+SCRATCH_SUFFIX = ".npz"
+
+# format -> (suffix, content type)
+PUBLISH_FORMATS = {
+    "wav": (".wav", "audio/wav"),
+    "opus": (".opus", "audio/ogg"),
+    "aac": (".m4a", "audio/mp4"),
+}
+
+CONTENT_TYPES = {
+    ".wav": "audio/wav",
+    ".flac": "audio/flac",
+    ".opus": "audio/ogg",
+    ".m4a": "audio/mp4",
+}
+
+
+def _publish_format() -> str:
+    fmt = _settings.artifact_publish_format.lower()
+    return fmt if fmt in PUBLISH_FORMATS else "wav"
+
+
+def content_type_for(path: Path) -> str:
+    return CONTENT_TYPES.get(path.suffix, "application/octet-stream")
+
+
+def drop_stale_variants(path: Path) -> None:
+    """Delete copies of `path` in other formats, left behind when the configured format changed."""
+    for suffix in (SCRATCH_SUFFIX, *AUDIO_SUFFIXES):
+        if suffix != path.suffix:
+            path.with_suffix(suffix).unlink(missing_ok=True)
+
+
+def write_intermediate(path: Path, audio: np.ndarray, sample_rate: int) -> Path:
+    """Write a lossless intermediate using the configured codec (FLAC or WAV)."""
+    target = path.with_suffix(intermediate_suffix())
+    target.parent.mkdir(parents=True, exist_ok=True)
+    sf.write(target, audio, sample_rate)
+    drop_stale_variants(target)
+    return target
+
+
+def write_scratch(path: Path, audio: np.ndarray, sample_rate: int) -> Path:
+    """Write a scratch stem; float16 `.npz` when enabled, otherwise a regular intermediate."""
+    if not _settings.artifact_scratch_float16:
+        return write_intermediate(path, audio, sample_rate)
+    target = path.with_suffix(SCRATCH_SUFFIX)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    with target.open("wb") as fp:
+        np.savez(fp, audio=audio.astype(np.float16), sample_rate=np.int32(sample_rate))
+    drop_stale_variants(target)
+    return target
+
+
+def read_audio(path: Path) -> Tuple[np.ndarray, int]:
+    if path.suffix == SCRATCH_SUFFIX:
+        with np.load(path) as payload:
+            return payload["audio"].astype(np.float32), int(payload["sample_rate"])
+    data, sr = sf.read(path, always_2d=False)
+    return data.astype(np.float32), sr
+
+
+def read_window(source: Union[Path, BinaryIO], start_seconds: float, duration_seconds: float) -> Tuple[np.ndarray, int]:
+    """Decode only `[start, start + duration)` of a source, e.g. for previews and clips.
+
+    With a streamed source only the byte ranges backing that window are fetched.
+    """
+    if not isinstance(source, Path):
+        source.seek(0)
+    with sf.SoundFile(source) as handle:
+        sample_rate = handle.samplerate
+        start_frame = min(int(start_seconds * sample_rate), handle.frames)
+        handle.seek(start_frame)
+        data = handle.read(int(duration_seconds * sample_rate), dtype="float32", always_2d=False)
+    return data, sample_rate
+
+
+def _encode_with_ffmpeg(source: Path, destination: Path, codec_args: List[str]) -> None:
+    cmd = ["ffmpeg", "-y", "-i", str(source), *codec_args, str(destination)]
+    subprocess.run(cmd, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def encode_for_publish(source: Path, output_dir: Path, stem: str = "dubbed") -> Path:
+    """Encode a mixed track into the configured publish codec (Opus, AAC or WAV)."""
+    output_dir.mkdir(parents=True, exist_ok=True)
+    fmt = _publish_format()
+    suffix, _ = PUBLISH_FORMATS[fmt]
+    destination = output_dir / f"{stem}{suffix}"
+    if fmt == "aac":
+        try:
+            _encode_with_ffmpeg(source, destination, ["-c:a", "aac", "-b:a", _settings.artifact_aac_bitrate])
+            return destination
+        except (FileNotFoundError, subprocess.CalledProcessError) as exc:
+            _log.warning("AAC encoding unavailable (%s); publishing WAV instead", exc)
+            destination = output_dir / f"{stem}.wav"
+            fmt = "wav"
+
+    audio, sample_rate = read_audio(source)
+    if fmt == "opus":
+        try:
+            sf.write(destination, audio, sample_rate, format="OGG", subtype="OPUS")
+            return destination
+        except (RuntimeError, TypeError, ValueError) as exc:
+            _log.warning("Opus encoding unavailable (%s); publishing WAV instead", exc)
+            destination = output_dir / f"{stem}.wav"
+    sf.write(destination, audio, sample_rate, format="WAV")
+    return destination
+
+
+def run_parallel(tasks: Iterable[Callable[[], T]]) -> List[T]:
+    """Run encode callables on a bounded thread pool, preserving input order."""
+    task_list = list(tasks)
+    if not task_list:
+        return []
+    workers = max(1, min(_settings.artifact_encode_workers, len(task_list)))
+    if workers == 1:
+        return [task() for task in task_list]
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="encode") as pool:
+        futures = [pool.submit(task) for task in task_list]
+        return [future.result() for future in futures]
@@ -2,11 +2,16 @@ from contextlib import contextmanager
 
 from sqlmodel import Session, create_engine
 
+from shared.database import EngineProfile, configure_sqlite, driver_url, engine_options
+
 from ..config import get_settings
 
 settings = get_settings()
+_profile = EngineProfile.from_settings(settings)
 
-engine = create_engine(settings.database_url, echo=False)
+database_url = driver_url(settings.database_url, asynchronous=False)
+engine = create_engine(database_url, echo=False, **engine_options(database_url, _profile))
+configure_sqlite(engine, _profile)
 
 
 @contextmanager
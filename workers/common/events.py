@@ -0,0 +1,100 @@
+"""Publish job state changes to the job event stream (see `shared/job_events.py`).
+
+Publishing never fails a task: when Redis is unreachable the event is dropped,
+further attempts pause for `_RETRY_SECONDS`, and the API's periodic
+reconciliation corrects whatever the lost events would have changed.
+
+`invalidate` drops the API's cached response of a job or asset after a write
+(see `shared/response_cache.py`). It is attempted even while publishing is
+paused: an invalidation that fails stays pending and is sent again with the
+next one. An entry whose invalidation never gets through expires after
+`RESPONSE_CACHE_SECONDS`.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Dict, Optional, Set, Tuple
+
+from shared.job_events import encode
+from shared.response_cache import GENERATION_TTL_SECONDS, entry_key, generation_key
+
+from ..config import get_settings
+
+if TYPE_CHECKING:  # pragma: no cover
+    from redis import Redis
+
+_log = logging.getLogger(__name__)
+_settings = get_settings()
+
+_RETRY_SECONDS = 30.0
+
+_client: Optional["Redis"] = None
+_client_lock = threading.Lock()
+_paused_until = 0.0
+_pending: Set[Tuple[str, str]] = set()  # (kind, external_id) invalidations not applied yet
+_pending_lock = threading.Lock()
+
+
+def client() -> "Redis":
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                from redis import Redis
+
+                _client = Redis.from_url(_settings.redis_url, socket_connect_timeout=1, socket_timeout=1)
+    return _client
+
+
+def _available() -> bool:
+    return time.monotonic() >= _paused_until
+
+
+def _unavailable(what: str, exc: Exception) -> None:
+    global _paused_until
+    _paused_until = time.monotonic() + _RETRY_SECONDS
+    _log.warning("%s paused for %.0f s (%s)", what, _RETRY_SECONDS, exc)
+
+
+def publish(event: Dict[str, Any]) -> bool:
+    """Append `event` to the stream; returns False when it was dropped."""
+    if not _settings.job_events_enabled or not _available():
+        return False
+    try:
+        client().xadd(
+            _settings.job_events_stream,
+            encode(event),
+            maxlen=_settings.job_events_maxlen,
+            approximate=True,
+        )
+        return True
+    except Exception as exc:
+        _unavailable("Job event publishing", exc)
+        return False
+
+
+def invalidate(kind: str, external_id: str) -> bool:
+    """Drop the cached API response of `kind`/`external_id`; returns False while it is pending."""
+    if not _settings.response_cache_enabled:
+        return False
+    with _pending_lock:
+        _pending.add((kind, external_id))
+        batch = list(_pending)
+    was_available = _available()
+    try:
+        pipe = client().pipeline(transaction=False)
+        for pending_kind, pending_id in batch:
+            pipe.delete(entry_key(pending_kind, pending_id))
+            pipe.incr(generation_key(pending_kind, pending_id))
+            pipe.expire(generation_key(pending_kind, pending_id), GENERATION_TTL_SECONDS)
+        pipe.execute()
+    except Exception as exc:
+        if was_available:
+            _unavailable("Response cache invalidation", exc)
+        return False
+    with _pending_lock:
+        _pending.difference_update(batch)
+    return True
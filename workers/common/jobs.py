@@ -1,13 +1,229 @@
+"""Job state updates from the workers, buffered and coalesced per job.
+
+Stage tasks report progress, stage history, log keys and task ids several times
+per stage. Instead of loading and saving the whole `Job` row for each call,
+changes are buffered per job and written behind as a single targeted UPDATE
+per flush. Later values overwrite earlier ones, and history entries are merged
+into `stage_history`.
+
+The buffer is flushed:
+- `JOB_STATE_FLUSH_SECONDS` after the first buffered change;
+- before the next stage is queued;
+- when a task finishes (Celery `task_postrun`);
+- immediately for terminal states (success, failure, cancel).
+
+`JOB_STATE_FLUSH_SECONDS=0` writes every change through. Each write is
+followed by one event on the job event stream (`workers.common.events`) and
+drops the API's cached response of the job.
+"""
+
 from __future__ import annotations
 
+import json
+import logging
+import threading
+from dataclasses import dataclass, field
 from datetime import datetime
+from typing import Any, Dict, Optional
 
+from sqlalchemy import JSON, String, case, cast, func, literal, update
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlmodel import select
 
+from shared.job_events import job_event
 from shared.models import Job, JobStage, JobStatus
+from shared.response_cache import JOB
 
+from ..config import get_settings
+from . import events
 from .db import get_session
 
+_log = logging.getLogger(__name__)
+_settings = get_settings()
+
+_TERMINAL = {JobStatus.SUCCESS, JobStatus.FAILED, JobStatus.CANCELLED}
+
+
+@dataclass
+class _PendingState:
+    # Status columns; skipped by the UPDATE when the job was cancelled meanwhile.
+    guarded: Dict[str, Any] = field(default_factory=dict)
+    values: Dict[str, Any] = field(default_factory=dict)
+    history: Dict[str, dict] = field(default_factory=dict)
+    started: Optional[datetime] = None
+
+    def merge(self, newer: "_PendingState") -> None:
+        self.guarded.update(newer.guarded)
+        self.values.update(newer.values)
+        self.history.update(newer.history)
+        self.started = self.started or newer.started
+
+
+class JobStateWriter:
+    def __init__(self, flush_seconds: float) -> None:
+        self.flush_seconds = flush_seconds
+        self.statements = 0
+        self._pending: Dict[str, _PendingState] = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
+
+    def _buffer(self, job_external_id: str) -> _PendingState:
+        pending = self._pending.get(job_external_id)
+        if pending is None:
+            pending = self._pending[job_external_id] = _PendingState()
+        return pending
+
+    def _written(self, flush_now: bool = False) -> None:
+        if flush_now or self.flush_seconds <= 0:
+            self.flush()
+            return
+        with self._lock:
+            if self._timer is None:
+                self._timer = threading.Timer(self.flush_seconds, self._flush_in_background)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def _flush_in_background(self) -> None:
+        try:
+            self.flush()
+        except Exception:  # pragma: no cover - the changes stay buffered for the next flush
+            _log.exception("Job state flush failed")
+
+    def set_status(
+        self,
+        job_external_id: str,
+        *,
+        stage: JobStage,
+        status: JobStatus,
+        progress: float,
+        error_message: str | None = None,
+        failed_stage: JobStage | None = None,
+    ) -> None:
+        now = datetime.utcnow()
+        values = {
+            "stage": stage,
+            "status": status,
+            "progress": progress,
+            "error_message": error_message,
+            "failed_stage": failed_stage,
+        }
+        if status in {JobStatus.SUCCESS, JobStatus.FAILED}:
+            values["ended_at"] = now
+        with self._lock:
+            pending = self._buffer(job_external_id)
+            if status == JobStatus.CANCELLED:
+                # A cancel wins over buffered progress and is written unconditionally.
+                pending.guarded.clear()
+                pending.values.update(values)
+            else:
+                pending.guarded.update(values)
+            if status == JobStatus.RUNNING:
+                pending.started = pending.started or now
+        self._written(flush_now=status in _TERMINAL)
+
+    def set_values(self, job_external_id: str, **values: Any) -> None:
+        with self._lock:
+            self._buffer(job_external_id).values.update(values)
+        self._written()
+
+    def add_history(self, job_external_id: str, stage: str, entry: dict) -> None:
+        with self._lock:
+            self._buffer(job_external_id).history[stage] = entry
+        self._written()
+
+    def flush(self, job_external_id: Optional[str] = None) -> None:
+        """Write buffered changes (of one job, or all) now."""
+        with self._flush_lock:
+            with self._lock:
+                if job_external_id is None:
+                    batch, self._pending = self._pending, {}
+                else:
+                    pending = self._pending.pop(job_external_id, None)
+                    batch = {job_external_id: pending} if pending else {}
+                if not self._pending and self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+            written = []
+            try:
+                for external_id, pending in batch.items():
+                    self._write(external_id, pending)
+                    written.append(external_id)
+            except Exception:
+                with self._lock:
+                    for external_id, pending in batch.items():
+                        if external_id in written:
+                            continue
+                        newer = self._pending.get(external_id)
+                        if newer is not None:
+                            pending.merge(newer)
+                        self._pending[external_id] = pending
+                raise
+
+    def _write(self, job_external_id: str, pending: _PendingState) -> None:
+        columns = Job.__table__.c
+        params: Dict[str, Any] = dict(pending.values)
+        not_cancelled = columns.status != JobStatus.CANCELLED
+        for name, value in pending.guarded.items():
+            params[name] = case((not_cancelled, literal(value, type_=columns[name].type)), else_=columns[name])
+        if pending.started is not None:
+            params["started_at"] = case(
+                (not_cancelled, func.coalesce(columns.started_at, literal(pending.started, type_=columns.started_at.type))),
+                else_=columns.started_at,
+            )
+        params["updated_at"] = datetime.utcnow()
+        with get_session() as session:
+            if pending.history:
+                merged = _merged_history(session.get_bind().dialect.name, pending.history)
+                if merged is None:
+                    current = session.exec(select(Job.stage_history).where(Job.external_id == job_external_id)).first()
+                    self.statements += 1
+                    merged = {**(current or {}), **pending.history}
+                params["stage_history"] = merged
+            session.exec(update(Job).where(Job.external_id == job_external_id).values(**params))
+            session.commit()
+        self.statements += 1
+        events.invalidate(JOB, job_external_id)
+        event = _event(job_external_id, pending)
+        if event is not None:
+            events.publish(event)
+
+
+def _event(job_external_id: str, pending: _PendingState) -> Optional[Dict[str, Any]]:
+    """The state change of one write, or None if only bookkeeping columns changed."""
+    status = {**pending.guarded, **pending.values}
+    if "status" not in status and not pending.history:
+        return None
+    return job_event(
+        job_external_id,
+        status=status.get("status"),
+        stage=status.get("stage"),
+        progress=status.get("progress"),
+        history=pending.history,
+    )
+
+
+def _merged_history(dialect: str, entries: Dict[str, dict]) -> Any:
+    """SQL that replaces `entries` in `stage_history` in place, or None to read-modify-write."""
+    column = Job.__table__.c.stage_history
+    if dialect == "sqlite":
+        args: list = []
+        for stage, entry in entries.items():
+            args += [literal(f'$."{stage}"'), func.json(literal(json.dumps(entry), type_=String))]
+        return func.json_set(func.coalesce(column, literal("{}", type_=String)), *args)
+    if dialect == "postgresql":
+        patch = literal(json.dumps(entries), type_=String)
+        empty = cast(literal("{}", type_=String), JSON)
+        return cast(cast(func.coalesce(column, empty), JSONB).op("||")(cast(patch, JSONB)), JSON)
+    return None
+
+
+writer = JobStateWriter(_settings.job_state_flush_seconds)
+
+
+def flush(job_external_id: Optional[str] = None) -> None:
+    writer.flush(job_external_id)
+
 
 def update_job(
     job_external_id: str,
@@ -18,21 +234,15 @@ def update_job(
     error_message: str | None = None,
     failed_stage: JobStage | None = None,
 ) -> None:
-    with get_session() as session:
-        result = session.exec(select(Job).where(Job.external_id == job_external_id))
-        job = result.one()
-        job.stage = stage
-        job.status = status
-        job.progress = progress
-        job.updated_at = datetime.utcnow()
-        if status == JobStatus.RUNNING and job.started_at is None:
-            job.started_at = datetime.utcnow()
-        if status in {JobStatus.SUCCESS, JobStatus.FAILED}:
-            job.ended_at = datetime.utcnow()
-        job.error_message = error_message
-        job.failed_stage = failed_stage
-        session.add(job)
-        session.commit()
+    # A cancelled job stays cancelled; late stage updates are dropped by the UPDATE.
+    writer.set_status(
+        job_external_id,
+        stage=stage,
+        status=status,
+        progress=progress,
+        error_message=error_message,
+        failed_stage=failed_stage,
+    )
 
 
 def mark_success(job_external_id: str) -> None:
@@ -51,13 +261,12 @@ def mark_failure(job_external_id: str, stage: JobStage, message: str) -> None:
 
 
 def update_logs_key(job_external_id: str, logs_key: str | None) -> None:
-    with get_session() as session:
-        result = session.exec(select(Job).where(Job.external_id == job_external_id))
-        job = result.one()
-        job.logs_key = logs_key
-        job.updated_at = datetime.utcnow()
-        session.add(job)
-        session.commit()
+    writer.set_values(job_external_id, logs_key=logs_key)
+
+
+def update_task_id(job_external_id: str, task_id: str | None) -> None:
+    """Remember the job's latest queued Celery task so a cancel can revoke it."""
+    writer.set_values(job_external_id, task_id=task_id)
 
 
 def record_stage_history(
@@ -66,27 +275,12 @@ def record_stage_history(
     status: str,
     details: dict | None = None,
 ) -> None:
-    with get_session() as session:
-        result = session.exec(select(Job).where(Job.external_id == job_external_id))
-        job = result.one()
-        history = job.stage_history or {}
-        history[stage] = {
+    writer.add_history(
+        job_external_id,
+        stage,
+        {
             "status": status,
             "details": details or {},
             "updatedAt": datetime.utcnow().isoformat(),
-        }
-        job.stage_history = history
-        job.updated_at = datetime.utcnow()
-        session.add(job)
-        session.commit()
-
-
-def mark_cancelled(job_external_id: str, message: str = "Cancelled") -> None:
-    update_job(
-        job_external_id,
-        stage=JobStage.DONE,
-        status=JobStatus.CANCELLED,
-        progress=1.0,
-        error_message=message,
-        failed_stage=None,
+        },
     )
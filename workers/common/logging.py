@@ -4,13 +4,13 @@ import json
 import logging
 import sys
 import time
-from contextlib import contextmanager
+from contextlib import contextmanager, nullcontext
 from dataclasses import dataclass, field
 from contextvars import ContextVar
 from pathlib import Path
 from typing import Any, Dict, Iterator, Optional
 
-from . import metrics
+from . import cache, cancellation, metrics
 
 logger = logging.getLogger("workers")
 _log_file_ctx: ContextVar[Optional[Path]] = ContextVar("job_log_file", default=None)
@@ -97,10 +97,15 @@ def stage_context(
     )
     metrics.report_stage_start(stage)
     try:
-        yield timer
+        with cancellation.watch(job_id), (cache.pinned(asset_id) if asset_id else nullcontext()):
+            yield timer
         elapsed = time.perf_counter() - timer.start_time
         metrics.report_stage_end(stage, elapsed)
         timer.end("SUCCESS", "Stage finished")
+    except cancellation.JobCancelled:
+        metrics.report_stage_end(stage, time.perf_counter() - timer.start_time)
+        timer.end("CANCELLED", "Stage cancelled")
+        raise
     except Exception as exc:
         metrics.report_stage_failure(stage)
         elapsed = time.perf_counter() - timer.start_time
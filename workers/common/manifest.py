@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import random
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from shared.models import JobStage
+
+from ..config import get_settings
+from . import storage
+from .paths import asset_workspace, intermediate_suffix
+
+_log = logging.getLogger(__name__)
+_settings = get_settings()
+
+MANIFEST_VERSION = 1
+
+
+def manifest_key(asset_external_id: str) -> str:
+    return f"proc/{asset_external_id}/manifest.json"
+
+
+def _artifact_key(asset_external_id: str, relative_path: str) -> str:
+    return f"proc/{asset_external_id}/artifacts/{relative_path}"
+
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as fp:
+        for chunk in iter(lambda: fp.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def stage_config(stage: JobStage, presets: Optional[Dict[str, str]] = None) -> dict:
+    """Settings that determine a stage's output; artifacts are reused only when they match."""
+    if stage == JobStage.ASR:
+        return {"model": _settings.default_asr_model, "computeType": _settings.asr_compute_type}
+    if stage == JobStage.TRANSLATE:
+        return {"engine": "libretranslate"}
+    if stage == JobStage.TTS:
+        return {
+            "engine": _settings.tts_engine,
+            "voices": _settings.piper_voices,
+            "presets": presets or {},
+            "format": intermediate_suffix(),
+        }
+    if stage == JobStage.ALIGN_MIX:
+        return {
+            "demucs": _settings.demucs_model if _settings.mix_use_demucs else None,
+            "voiceGain": _settings.mix_voice_gain,
+            "backgroundGain": _settings.mix_background_gain,
+            "targetLoudness": _settings.mix_target_loudness,
+            "format": intermediate_suffix(),
+        }
+    return {}
+
+
+_SAVE_ATTEMPTS = 20
+
+
+def _empty_manifest(asset_external_id: str) -> dict:
+    return {"version": MANIFEST_VERSION, "assetId": asset_external_id, "artifacts": {}}
+
+
+def load_manifest(asset_external_id: str) -> dict:
+    payload = storage.download_bytes(_settings.minio_bucket_processed, manifest_key(asset_external_id))
+    if not payload:
+        return _empty_manifest(asset_external_id)
+    return json.loads(payload)
+
+
+def _update_manifest(asset_external_id: str, update: Callable[[dict], None]) -> dict:
+    """Apply `update` to the stored manifest with a conditional write, retrying on conflicts.
+
+    Several jobs can publish units of one asset at the same time (different
+    presets or API keys). Each write only succeeds if the manifest still has
+    the ETag it was read with, so no writer drops another's entries.
+    """
+    key = manifest_key(asset_external_id)
+    for attempt in range(_SAVE_ATTEMPTS):
+        payload, etag = storage.download_bytes_with_etag(_settings.minio_bucket_processed, key)
+        manifest = json.loads(payload) if payload else _empty_manifest(asset_external_id)
+        update(manifest)
+        body = json.dumps(manifest, indent=2, sort_keys=True).encode("utf-8")
+        if storage.upload_bytes_if_match(_settings.minio_bucket_processed, key, body, "application/json", etag):
+            return manifest
+        time.sleep(random.uniform(0, 0.05 * (attempt + 1)))
+    raise RuntimeError(f"Manifest of {asset_external_id} kept changing; gave up after {_SAVE_ATTEMPTS} attempts")
+
+
+def _unit_files(unit_path: Path) -> List[Path]:
+    # Only top-level files: nested tool scratch (e.g. demucs output) is not an artifact.
+    if unit_path.is_dir():
+        return sorted(path for path in unit_path.iterdir() if path.is_file())
+    return [unit_path] if unit_path.exists() else []
+
+
+def publish_units(
+    asset_external_id: str,
+    stage: JobStage,
+    unit_paths: List[Path],
+    config: dict,
+) -> int:
+    """Upload stage outputs and record them (hash, size, config) in the asset manifest.
+
+    Files whose hash already matches the manifest are not uploaded again.
+    Returns the number of bytes uploaded.
+    """
+    if not _settings.artifact_manifest_enabled:
+        return 0
+    workspace = asset_workspace(asset_external_id)
+    previous_entries = load_manifest(asset_external_id).get("artifacts", {})
+    published: Dict[str, dict] = {}
+    uploaded = 0
+    for unit_path in unit_paths:
+        unit = unit_path.relative_to(workspace).as_posix()
+        previous = {item["path"]: item for item in (previous_entries.get(unit) or {}).get("files", [])}
+        files = []
+        for file_path in _unit_files(unit_path):
+            relative = file_path.relative_to(workspace).as_posix()
+            sha = file_sha256(file_path)
+            size = file_path.stat().st_size
+            object_name = _artifact_key(asset_external_id, relative)
+            if previous.get(relative, {}).get("sha256") != sha:
+                storage.upload_from_path(_settings.minio_bucket_processed, object_name, file_path)
+                uploaded += size
+            files.append({"path": relative, "object": object_name, "sha256": sha, "size": size})
+        if not files:
+            continue
+        published[unit] = {
+            "stage": stage.value,
+            "config": config,
+            "files": files,
+            "updatedAt": datetime.utcnow().isoformat(),
+        }
+    if published:
+        # Only this call's units are replaced; entries other writers added meanwhile are kept.
+        _update_manifest(asset_external_id, lambda manifest: manifest.setdefault("artifacts", {}).update(published))
+    return uploaded
+
+
+def sync_unit(
+    asset_external_id: str,
+    unit_path: Path,
+    config: dict,
+    manifest: Optional[dict] = None,
+) -> bool:
+    """Fetch a stage output recorded by another node, if its producing config matches.
+
+    Returns True when the unit is complete locally afterwards.
+    """
+    if not _settings.artifact_manifest_enabled:
+        return False
+    workspace = asset_workspace(asset_external_id)
+    unit = unit_path.relative_to(workspace).as_posix()
+    try:
+        manifest = manifest or load_manifest(asset_external_id)
+    except Exception as exc:  # pragma: no cover - depends on MinIO
+        _log.warning("Artifact manifest unavailable for %s (%s)", asset_external_id, exc)
+        return False
+    entry = manifest.get("artifacts", {}).get(unit)
+    if not entry or entry.get("config") != json.loads(json.dumps(config)):
+        return False
+    try:
+        for item in entry.get("files", []):
+            local_path = workspace / item["path"]
+            if local_path.exists() and local_path.stat().st_size == item["size"] and file_sha256(local_path) == item["sha256"]:
+                continue
+            storage.download_to_path(_settings.minio_bucket_processed, item["object"], local_path)
+            if file_sha256(local_path) != item["sha256"]:
+                local_path.unlink(missing_ok=True)
+                _log.warning("Hash mismatch syncing %s for %s", item["path"], asset_external_id)
+                return False
+    except Exception as exc:  # pragma: no cover - depends on MinIO
+        _log.warning("Could not sync %s for %s (%s)", unit, asset_external_id, exc)
+        return False
+    return True
@@ -40,6 +40,29 @@ stage_duration = Histogram(
     buckets=(1, 5, 10, 30, 60, 120, 300, 600),
 )
 
+artifact_cache_bytes = Gauge("artifact_cache_bytes", "Bytes used by cached stage artifacts on this node")
+artifact_cache_evictions = Counter("artifact_cache_evictions_total", "Stage artifacts evicted from the node cache")
+artifact_cache_lookups = Counter("artifact_cache_lookups_total", "Stage artifact cache lookups", ["result"])
+artifact_resume = Counter(
+    "artifact_resume_total",
+    "Stage artifact availability on resume (local, synced from manifest, missing)",
+    ["stage", "outcome"],
+)
+
+task_queue_wait = Histogram(
+    "task_queue_wait_seconds",
+    "Time a stage task waited in its broker queue before a worker started it",
+    ["stage", "queue"],
+    buckets=(0.1, 0.5, 1, 5, 15, 60, 300, 900, 3600),
+)
+
+cancel_latency = Histogram(
+    "job_cancel_latency_seconds",
+    "Time from a cancel request until the running stage stopped and freed its worker",
+    ["stage"],
+    buckets=(0.5, 1, 2, 5, 10, 30, 60, 300),
+)
+
 
 def report_stage_start(stage: str) -> None:
     stage_in_progress.labels(stage=stage).inc()
@@ -52,3 +75,41 @@ def report_stage_end(stage: str, duration_seconds: float) -> None:
 
 def report_stage_failure(stage: str) -> None:
     stage_failures.labels(stage=stage).inc()
+
+
+def report_cache_usage(used_bytes: int) -> None:
+    artifact_cache_bytes.set(used_bytes)
+
+
+def report_cache_evictions(count: int) -> None:
+    if count:
+        artifact_cache_evictions.inc(count)
+
+
+def report_cache_lookup(hit: bool) -> None:
+    artifact_cache_lookups.labels(result="hit" if hit else "miss").inc()
+
+
+def report_artifact_resume(stage: str, outcome: str) -> None:
+    artifact_resume.labels(stage=stage, outcome=outcome).inc()
+
+
+def report_queue_wait(stage: str, queue: str, wait_seconds: float) -> None:
+    task_queue_wait.labels(stage=stage, queue=queue).observe(max(0.0, wait_seconds))
+
+
+def report_cancel_latency(stage: str, latency_seconds: float) -> None:
+    cancel_latency.labels(stage=stage).observe(latency_seconds)
+
+
+def start_server(port: int, host: str = "0.0.0.0") -> bool:
+    """Expose the metrics over HTTP; called once by the worker startup hook."""
+    try:
+        from prometheus_client import start_http_server
+    except ImportError:  # pragma: no cover - optional dependency for local tests
+        return False
+    try:
+        start_http_server(port, addr=host)
+    except OSError:  # pragma: no cover - port taken (another worker on this host)
+        return False
+    return True
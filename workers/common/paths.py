@@ -1,4 +1,7 @@
 from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from ..config import get_settings
 
 
 ROOT = Path(__file__).resolve().parents[2]
@@ -6,6 +9,21 @@ DATA_DIR = ROOT / "data"
 PROC_DIR = DATA_DIR / "proc"
 RAW_DIR = DATA_DIR / "raw"
 PUB_DIR = DATA_DIR / "pub"
+CACHE_DIR = DATA_DIR / "cache"
+
+INTERMEDIATE_SUFFIXES = {"wav": ".wav", "flac": ".flac"}
+AUDIO_SUFFIXES = tuple(INTERMEDIATE_SUFFIXES.values())
+
+
+def intermediate_suffix() -> str:
+    return INTERMEDIATE_SUFFIXES.get(get_settings().artifact_intermediate_format.lower(), ".wav")
+
+
+def newest_variant(directory: Path, stem: str, suffixes: Iterable[str] = AUDIO_SUFFIXES) -> Optional[Path]:
+    """The most recently written `<stem><suffix>`; a format change can leave an older sibling."""
+    candidates = [directory / f"{stem}{suffix}" for suffix in suffixes]
+    existing = [path for path in candidates if path.exists()]
+    return max(existing, key=lambda path: path.stat().st_mtime_ns, default=None)
 
 
 def asset_workspace(asset_external_id: str) -> Path:
@@ -32,13 +50,33 @@ def tts_segment_path(asset_external_id: str, language: str) -> Path:
     return asset_workspace(asset_external_id) / "tts" / language
 
 
+def tts_segment_files(segment_dir: Path) -> List[Path]:
+    """One render per segment, in index order (the newest if several formats are present)."""
+    if not segment_dir.exists():
+        return []
+    stems = {path.stem for path in segment_dir.glob("seg_*") if path.suffix in AUDIO_SUFFIXES}
+    renders: Dict[str, Path] = {}
+    for stem in stems:
+        render = newest_variant(segment_dir, stem)
+        if render is not None:
+            renders[stem] = render
+    return [renders[stem] for stem in sorted(renders)]
+
+
 def mix_output_dir(asset_external_id: str, language: str) -> Path:
     return asset_workspace(asset_external_id) / "mix" / language
 
 
 def mix_output_file(asset_external_id: str, language: str) -> Path:
-    return mix_output_dir(asset_external_id, language) / "dubbed.wav"
+    output_dir = mix_output_dir(asset_external_id, language)
+    return newest_variant(output_dir, "dubbed") or output_dir / f"dubbed{intermediate_suffix()}"
 
 
 def job_log_path(asset_external_id: str, job_external_id: str) -> Path:
     return asset_workspace(asset_external_id) / "logs" / f"{job_external_id}.jsonl"
+
+
+def directory_size_bytes(path: Path) -> int:
+    if not path.exists():
+        return 0
+    return sum(entry.stat().st_size for entry in path.rglob("*") if entry.is_file())
@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import hashlib
+import io
+import os
+import shutil
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import BinaryIO, Optional
+
+from ..config import get_settings
+from . import storage
+from .paths import CACHE_DIR
+
+_settings = get_settings()
+
+BLOCK_CACHE_DIR = CACHE_DIR / "blocks"
+
+
+class RemoteObjectFile(io.RawIOBase):
+    """Seekable, read-only file object over an object-store key.
+
+    Reads are served in fixed-size blocks fetched with ranged GETs. Blocks are
+    kept in a small in-memory LRU and persisted under `data/cache/blocks`, so a
+    decoder that only touches part of the source (ASR windows, mix previews,
+    clips) never downloads the rest, and later stages on the same node reuse
+    what earlier ones fetched.
+    """
+
+    def __init__(
+        self,
+        bucket: str,
+        object_name: str,
+        *,
+        block_size: Optional[int] = None,
+        memory_blocks: Optional[int] = None,
+        cache_dir: Optional[Path] = BLOCK_CACHE_DIR,
+    ) -> None:
+        super().__init__()
+        self.bucket = bucket
+        self.object_name = object_name
+        self.block_size = block_size or _settings.source_block_size
+        self.memory_blocks = max(1, memory_blocks or _settings.source_memory_blocks)
+        self.size, etag = storage.object_fingerprint(bucket, object_name)
+        self._position = 0
+        self._blocks: "OrderedDict[int, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.bytes_fetched = 0
+        self.cache_dir: Optional[Path] = None
+        if cache_dir is not None:
+            digest = hashlib.sha1(f"{bucket}/{object_name}@{etag}".encode("utf-8")).hexdigest()
+            self.cache_dir = cache_dir / digest
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def __repr__(self) -> str:
+        return f"RemoteObjectFile({self.bucket}/{self.object_name})"
+
+    @property
+    def name(self) -> str:
+        return f"{self.bucket}/{self.object_name}"
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            position = offset
+        elif whence == io.SEEK_CUR:
+            position = self._position + offset
+        elif whence == io.SEEK_END:
+            position = self.size + offset
+        else:
+            raise ValueError(f"Invalid whence: {whence}")
+        if position < 0:
+            raise ValueError("Negative seek position")
+        self._position = position
+        return position
+
+    def _block_path(self, index: int) -> Optional[Path]:
+        return self.cache_dir / f"{index:08d}.blk" if self.cache_dir else None
+
+    def _fetch_block(self, index: int) -> bytes:
+        with self._lock:
+            if index in self._blocks:
+                self._blocks.move_to_end(index)
+                return self._blocks[index]
+        block_path = self._block_path(index)
+        data: Optional[bytes] = None
+        if block_path is not None:
+            try:
+                data = block_path.read_bytes()
+            except FileNotFoundError:  # not fetched yet, or evicted by another process
+                pass
+        if data is None:
+            offset = index * self.block_size
+            length = min(self.block_size, self.size - offset)
+            data = storage.read_range(self.bucket, self.object_name, offset, length)
+            self.bytes_fetched += len(data)
+            if block_path is not None:
+                self._persist(block_path, data)
+        with self._lock:
+            self._blocks[index] = data
+            while len(self._blocks) > self.memory_blocks:
+                self._blocks.popitem(last=False)
+        return data
+
+    def _persist(self, block_path: Path, data: bytes) -> None:
+        tmp_path = block_path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            block_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path.write_bytes(data)
+            os.replace(tmp_path, block_path)
+        except FileNotFoundError:  # the directory was evicted meanwhile; keep the block in memory only
+            tmp_path.unlink(missing_ok=True)
+
+    def readinto(self, buffer) -> int:  # type: ignore[override]
+        view = memoryview(buffer).cast("B")
+        wanted = min(len(view), max(0, self.size - self._position))
+        written = 0
+        while written < wanted:
+            index, block_offset = divmod(self._position, self.block_size)
+            block = self._fetch_block(index)
+            chunk = block[block_offset : block_offset + (wanted - written)]
+            if not chunk:
+                break
+            view[written : written + len(chunk)] = chunk
+            written += len(chunk)
+            self._position += len(chunk)
+        return written
+
+
+def open_remote(bucket: str, object_name: str, **kwargs: object) -> io.BufferedReader:
+    """Return a buffered, seekable reader over an object (what decoders expect)."""
+    raw = RemoteObjectFile(bucket, object_name, **kwargs)  # type: ignore[arg-type]
+    return io.BufferedReader(raw, buffer_size=min(raw.block_size, 1024 * 1024))
+
+
+def materialize(source: BinaryIO, destination: Path) -> Path:
+    """Copy a streamed source to a local path, for tools that need a real file."""
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    source.seek(0)
+    with destination.open("wb") as fp:
+        shutil.copyfileobj(source, fp, length=1024 * 1024)
+    source.seek(0)
+    return destination
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Dict, List
+
+from sqlmodel import select
+
+from shared.models import Asset, Segment
+
+from .db import get_session
+
+
+def dirty_segments(asset_external_id: str, language: str) -> Dict[int, str]:
+    """Edited target texts awaiting a re-dub, by segment idx."""
+    with get_session() as session:
+        stmt = (
+            select(Segment)
+            .join(Asset, Asset.id == Segment.asset_id)
+            .where(Asset.external_id == asset_external_id, Segment.language == language, Segment.dirty)
+        )
+        return {row.idx: row.text_tgt or "" for row in session.exec(stmt)}
+
+
+def mark_redubbed(asset_external_id: str, language: str, segments: List[dict]) -> int:
+    """Clear the dirty flag of segments re-dubbed with their current text; returns the count.
+
+    A segment edited again while the re-dub ran keeps its flag for the next run.
+    Timing and source text are filled in from the translated segments.
+    """
+    by_idx = {segment["idx"]: segment for segment in segments}
+    cleared = 0
+    with get_session() as session:
+        stmt = (
+            select(Segment)
+            .join(Asset, Asset.id == Segment.asset_id)
+            .where(Asset.external_id == asset_external_id, Segment.language == language, Segment.dirty)
+        )
+        for row in session.exec(stmt):
+            segment = by_idx.get(row.idx)
+            if segment is None or segment.get("text_tgt") != row.text_tgt:
+                continue
+            row.t0 = float(segment["t0"])
+            row.t1 = float(segment["t1"])
+            row.text_src = segment.get("text_src") or ""
+            row.speaker_id = segment.get("speakerId")
+            row.dirty = False
+            row.updated_at = datetime.utcnow()
+            session.add(row)
+            cleared += 1
+        session.commit()
+    return cleared
+
+
+def drop_edits(asset_external_id: str, language: str, idxs: List[int]) -> int:
+    """Delete pending edits of segments the dub does not have (e.g. a mistyped idx); returns the count."""
+    if not idxs:
+        return 0
+    with get_session() as session:
+        stmt = (
+            select(Segment)
+            .join(Asset, Asset.id == Segment.asset_id)
+            .where(
+                Asset.external_id == asset_external_id,
+                Segment.language == language,
+                Segment.dirty,
+                Segment.idx.in_(idxs),  # type: ignore[attr-defined]
+            )
+        )
+        dropped = 0
+        for row in session.exec(stmt):
+            session.delete(row)
+            dropped += 1
+        session.commit()
+    return dropped
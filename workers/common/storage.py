@@ -1,42 +1,312 @@
 from __future__ import annotations
 
+import fcntl
 import io
+import os
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
-
-from minio import Minio
+from typing import TYPE_CHECKING, Iterator, List, Optional
 
 from ..config import get_settings
 
+if TYPE_CHECKING:  # pragma: no cover
+    from minio import Minio
+
 settings = get_settings()
 
-_client = Minio(
-    settings.minio_endpoint,
-    access_key=settings.minio_access_key,
-    secret_key=settings.minio_secret_key,
-    secure=False,
-)
+# Built on first use, so processes that never touch object storage skip the
+# minio/urllib3 import and connection pool.
+_client: Optional["Minio"] = None
+_client_lock = threading.Lock()
+
+
+def client() -> "Minio":
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                import urllib3
+                from minio import Minio
+
+                # Sized so every transfer thread (plus the control-plane calls) gets its own
+                # keep-alive connection instead of blocking on the default 10-slot pool.
+                http = urllib3.PoolManager(
+                    maxsize=max(settings.storage_pool_size, settings.storage_concurrency + 2),
+                    block=True,
+                    timeout=urllib3.Timeout(connect=settings.storage_connect_timeout, read=settings.storage_read_timeout),
+                    retries=urllib3.Retry(total=5, backoff_factor=0.2, status_forcelist=[500, 502, 503, 504]),
+                )
+                _client = Minio(
+                    settings.minio_endpoint,
+                    access_key=settings.minio_access_key,
+                    secret_key=settings.minio_secret_key,
+                    secure=False,
+                    http_client=http,
+                )
+    return _client
+
+
+def _local() -> bool:
+    """True when objects live under LOCAL_STORAGE_DIR instead of MinIO (the batch runner)."""
+    return settings.storage_backend == "local"
+
+
+def _local_path(bucket: str, object_name: str) -> Path:
+    return Path(settings.local_storage_dir) / bucket / object_name
+
+
+def _local_write(target: Path, write) -> None:
+    target.parent.mkdir(parents=True, exist_ok=True)
+    partial = target.with_name(f"{target.name}.part")
+    write(partial)
+    os.replace(partial, target)
+
+
+_known_buckets: set[str] = set()
+_bucket_lock = threading.Lock()
 
 
 def ensure_bucket(bucket: str) -> None:
-    if not _client.bucket_exists(bucket):
-        _client.make_bucket(bucket)
+    if bucket in _known_buckets:
+        return
+    with _bucket_lock:
+        if bucket in _known_buckets:
+            return
+        if _local():
+            (Path(settings.local_storage_dir) / bucket).mkdir(parents=True, exist_ok=True)
+        elif not client().bucket_exists(bucket):
+            client().make_bucket(bucket)
+        _known_buckets.add(bucket)
+
+
+def object_size(bucket: str, object_name: str) -> int:
+    if _local():
+        return _local_path(bucket, object_name).stat().st_size
+    return client().stat_object(bucket, object_name).size or 0
+
+
+def object_fingerprint(bucket: str, object_name: str) -> tuple[int, str]:
+    if _local():
+        stat = _local_path(bucket, object_name).stat()
+        return stat.st_size, f"{stat.st_mtime_ns:x}"
+    stat = client().stat_object(bucket, object_name)
+    return stat.size or 0, (stat.etag or "").strip('"')
+
+
+def read_range(bucket: str, object_name: str, offset: int, length: int) -> bytes:
+    if _local():
+        with _local_path(bucket, object_name).open("rb") as handle:
+            handle.seek(offset)
+            return handle.read(length)
+    response = client().get_object(bucket, object_name, offset=offset, length=length)
+    try:
+        return response.read()
+    finally:
+        response.close()
+        response.release_conn()
+
+
+def _part_ranges(size: int, part_size: int) -> List[tuple[int, int]]:
+    return [(offset, min(part_size, size - offset)) for offset in range(0, size, part_size)]
+
+
+def _transfer_workers(part_count: int) -> int:
+    return max(1, min(settings.storage_concurrency, part_count))
+
+
+def _download_range(bucket: str, object_name: str, fd: int, offset: int, length: int) -> None:
+    response = client().get_object(bucket, object_name, offset=offset, length=length)
+    try:
+        position = offset
+        for chunk in response.stream(1024 * 1024):
+            os.pwrite(fd, chunk, position)
+            position += len(chunk)
+        if position != offset + length:
+            raise IOError(f"Short read for {object_name} at offset {offset}")
+    finally:
+        response.close()
+        response.release_conn()
 
 
 def download_to_path(bucket: str, object_name: str, destination: Path) -> Path:
+    """Download an object, fetching byte ranges in parallel for large objects."""
     ensure_bucket(bucket)
     destination.parent.mkdir(parents=True, exist_ok=True)
-    _client.fget_object(bucket, object_name, destination.as_posix())
+    if _local():
+        _local_write(destination, lambda partial: shutil.copyfile(_local_path(bucket, object_name), partial))
+        return destination
+    size = object_size(bucket, object_name)
+    ranges = _part_ranges(size, settings.storage_part_size)
+    if len(ranges) <= 1 or settings.storage_concurrency <= 1:
+        client().fget_object(bucket, object_name, destination.as_posix())
+        return destination
+
+    partial = destination.with_name(f"{destination.name}.part")
+    fd = os.open(partial, os.O_CREAT | os.O_WRONLY | os.O_TRUNC, 0o644)
+    try:
+        os.ftruncate(fd, size)
+        with ThreadPoolExecutor(max_workers=_transfer_workers(len(ranges)), thread_name_prefix="s3-get") as pool:
+            futures = [
+                pool.submit(_download_range, bucket, object_name, fd, offset, length) for offset, length in ranges
+            ]
+            for future in futures:
+                future.result()
+    except Exception:
+        os.close(fd)
+        partial.unlink(missing_ok=True)
+        raise
+    os.close(fd)
+    os.replace(partial, destination)
     return destination
 
 
+def _upload_part(bucket: str, object_name: str, upload_id: str, fd: int, part_number: int, offset: int, length: int) -> str:
+    data = os.pread(fd, length, offset)
+    return client()._upload_part(bucket, object_name, data, None, upload_id, part_number)
+
+
 def upload_from_path(bucket: str, object_name: str, file_path: Path, content_type: str = "application/octet-stream") -> None:
+    """Upload a file, using a parallel multipart upload for large files."""
+    ensure_bucket(bucket)
+    if _local():
+        _local_write(_local_path(bucket, object_name), lambda partial: shutil.copyfile(file_path, partial))
+        return
+    size = file_path.stat().st_size
+    ranges = _part_ranges(size, settings.storage_part_size)
+    if len(ranges) <= 1 or settings.storage_concurrency <= 1:
+        client().fput_object(bucket, object_name, file_path.as_posix(), content_type=content_type)
+        return
+
+    from minio.datatypes import Part
+
+    upload_id = client()._create_multipart_upload(bucket, object_name, {"Content-Type": content_type})
+    fd = os.open(file_path, os.O_RDONLY)
+    try:
+        with ThreadPoolExecutor(max_workers=_transfer_workers(len(ranges)), thread_name_prefix="s3-put") as pool:
+            futures = [
+                pool.submit(_upload_part, bucket, object_name, upload_id, fd, index + 1, offset, length)
+                for index, (offset, length) in enumerate(ranges)
+            ]
+            parts = [Part(index + 1, future.result()) for index, future in enumerate(futures)]
+        client()._complete_multipart_upload(bucket, object_name, upload_id, parts)
+    except Exception:
+        client()._abort_multipart_upload(bucket, object_name, upload_id)
+        raise
+    finally:
+        os.close(fd)
+
+
+def download_bytes(bucket: str, object_name: str) -> Optional[bytes]:
+    """Return an object's content, or None when it does not exist."""
+    from minio.error import S3Error
+
+    ensure_bucket(bucket)
+    if _local():
+        path = _local_path(bucket, object_name)
+        return path.read_bytes() if path.exists() else None
+    try:
+        response = client().get_object(bucket, object_name)
+    except S3Error as exc:
+        if exc.code in {"NoSuchKey", "NoSuchObject"}:
+            return None
+        raise
+    try:
+        return response.read()
+    finally:
+        response.close()
+        response.release_conn()
+
+
+def download_bytes_with_etag(bucket: str, object_name: str) -> tuple[Optional[bytes], Optional[str]]:
+    """Return an object's content and ETag, or (None, None) when it does not exist."""
+    from minio.error import S3Error
+
+    ensure_bucket(bucket)
+    if _local():
+        path = _local_path(bucket, object_name)
+        with _local_lock(path):
+            if not path.exists():
+                return None, None
+            return path.read_bytes(), _local_etag(path)
+    try:
+        response = client().get_object(bucket, object_name)
+    except S3Error as exc:
+        if exc.code in {"NoSuchKey", "NoSuchObject"}:
+            return None, None
+        raise
+    try:
+        return response.read(), (response.headers.get("etag") or "").strip('"')
+    finally:
+        response.close()
+        response.release_conn()
+
+
+_CONFLICT_CODES = {"PreconditionFailed", "ConditionalRequestConflict"}
+
+
+def upload_bytes_if_match(
+    bucket: str,
+    object_name: str,
+    payload: bytes,
+    content_type: str,
+    etag: Optional[str],
+) -> bool:
+    """Write an object only if it still has `etag` (or, with None, does not exist yet).
+
+    Returns False when another writer changed it first; the caller reloads and
+    retries. MinIO and S3 evaluate `If-Match`/`If-None-Match` atomically; the
+    local backend compares under a file lock instead.
+    """
+    from minio.error import S3Error
+
     ensure_bucket(bucket)
-    _client.fput_object(bucket, object_name, file_path.as_posix(), content_type=content_type)
+    if _local():
+        path = _local_path(bucket, object_name)
+        with _local_lock(path):
+            current = _local_etag(path) if path.exists() else None
+            if current != etag:
+                return False
+            _local_write(path, lambda partial: partial.write_bytes(payload))
+        return True
+    headers = {"Content-Type": content_type}
+    if etag is None:
+        headers["If-None-Match"] = "*"
+    else:
+        headers["If-Match"] = f'"{etag}"'
+    try:
+        client()._put_object(bucket, object_name, payload, headers)
+    except S3Error as exc:
+        if exc.code in _CONFLICT_CODES:
+            return False
+        raise
+    return True
+
+
+@contextmanager
+def _local_lock(path: Path) -> Iterator[None]:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.with_name(f"{path.name}.lock").open("a+") as lock_fp:
+        fcntl.flock(lock_fp, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_fp, fcntl.LOCK_UN)
+
+
+def _local_etag(path: Path) -> str:
+    stat = path.stat()
+    return f"{stat.st_mtime_ns:x}-{stat.st_size:x}-{stat.st_ino:x}"
 
 
 def upload_bytes(bucket: str, object_name: str, payload: bytes, content_type: str) -> None:
     ensure_bucket(bucket)
-    _client.put_object(
+    if _local():
+        _local_write(_local_path(bucket, object_name), lambda partial: partial.write_bytes(payload))
+        return
+    client().put_object(
         bucket,
         object_name,
         io.BytesIO(payload),
@@ -11,6 +11,10 @@ def _default_database_url() -> str:
     return f"sqlite:///{root / 'data' / 'app.db'}"
 
 
+def _default_local_storage_dir() -> str:
+    return str(Path(__file__).resolve().parents[1] / "data" / "objects")
+
+
 def _default_piper_voices() -> Dict[str, str]:
     return {
         "en": "en/en_US-amy-medium.onnx",
@@ -23,13 +27,38 @@ def _default_piper_voices() -> Dict[str, str]:
 class WorkerSettings(BaseSettings):
     redis_url: str = Field(default="redis://redis:6379/0", env="REDIS_URL")
     broker_queue: str = Field(default="pipeline", env="BROKER_QUEUE")
+    queue_asr: str = Field(default="asr", env="QUEUE_ASR")
+    queue_mt: str = Field(default="mt", env="QUEUE_MT")
+    queue_tts: str = Field(default="tts", env="QUEUE_TTS")
+    queue_mix: str = Field(default="mix", env="QUEUE_MIX")
+    queue_package: str = Field(default="package", env="QUEUE_PACKAGE")
+    worker_prefetch_multiplier: int = Field(default=1, env="WORKER_PREFETCH_MULTIPLIER")
+    broker_visibility_timeout: int = Field(default=6 * 3600, env="BROKER_VISIBILITY_TIMEOUT")  # > longest task
     database_url: str = Field(default_factory=_default_database_url, env="DATABASE_URL")
+    db_pool_size: int = Field(default=2, env="DB_POOL_SIZE")
+    db_max_overflow: int = Field(default=4, env="DB_MAX_OVERFLOW")
+    db_pool_timeout: float = Field(default=30.0, env="DB_POOL_TIMEOUT")
+    db_pool_recycle: int = Field(default=1800, env="DB_POOL_RECYCLE")
+    db_pool_pre_ping: bool = Field(default=True, env="DB_POOL_PRE_PING")
+    sqlite_wal: bool = Field(default=True, env="SQLITE_WAL")
+    sqlite_synchronous: str = Field(default="NORMAL", env="SQLITE_SYNCHRONOUS")
+    sqlite_busy_timeout_ms: int = Field(default=5000, env="SQLITE_BUSY_TIMEOUT_MS")
     minio_endpoint: str = Field(default="minio:9000", env="MINIO_ENDPOINT")
     minio_access_key: str = Field(default="minioadmin", env="MINIO_ACCESS_KEY")
     minio_secret_key: str = Field(default="minioadmin", env="MINIO_SECRET_KEY")
     minio_bucket_raw: str = Field(default="raw", env="MINIO_BUCKET_RAW")
     minio_bucket_processed: str = Field(default="proc", env="MINIO_BUCKET_PROCESSED")
     minio_bucket_public: str = Field(default="pub", env="MINIO_BUCKET_PUBLIC")
+    storage_backend: str = Field(default="minio", env="STORAGE_BACKEND")  # minio | local
+    local_storage_dir: str = Field(default_factory=_default_local_storage_dir, env="LOCAL_STORAGE_DIR")
+    storage_part_size: int = Field(default=16 * 1024 * 1024, env="STORAGE_PART_SIZE")  # 16 MB
+    storage_concurrency: int = Field(default=4, env="STORAGE_CONCURRENCY")
+    storage_pool_size: int = Field(default=16, env="STORAGE_POOL_SIZE")
+    storage_connect_timeout: float = Field(default=10.0, env="STORAGE_CONNECT_TIMEOUT")
+    storage_read_timeout: float = Field(default=120.0, env="STORAGE_READ_TIMEOUT")
+    source_streaming: bool = Field(default=True, env="SOURCE_STREAMING")
+    source_block_size: int = Field(default=4 * 1024 * 1024, env="SOURCE_BLOCK_SIZE")  # 4 MB
+    source_memory_blocks: int = Field(default=8, env="SOURCE_MEMORY_BLOCKS")
 
     default_asr_model: str = Field(default="small", env="ASR_MODEL")
     asr_device: str = Field(default="cpu", env="ASR_DEVICE")
@@ -49,6 +78,26 @@ class WorkerSettings(BaseSettings):
     mix_voice_gain: float = Field(default=1.0, env="MIX_VOICE_GAIN")
     mix_background_gain: float = Field(default=0.35, env="MIX_BACKGROUND_GAIN")
     mix_target_loudness: float = Field(default=-16.0, env="MIX_TARGET_LOUDNESS")
+
+    artifact_intermediate_format: str = Field(default="flac", env="ARTIFACT_INTERMEDIATE_FORMAT")
+    artifact_publish_format: str = Field(default="opus", env="ARTIFACT_PUBLISH_FORMAT")
+    artifact_aac_bitrate: str = Field(default="128k", env="ARTIFACT_AAC_BITRATE")
+    artifact_scratch_float16: bool = Field(default=False, env="ARTIFACT_SCRATCH_FLOAT16")
+    artifact_encode_workers: int = Field(default=4, env="ARTIFACT_ENCODE_WORKERS")
+    artifact_cache_budget_bytes: int = Field(default=50 * 1024**3, env="ARTIFACT_CACHE_BUDGET_BYTES")  # 50 GB
+    artifact_cache_low_watermark: float = Field(default=0.9, env="ARTIFACT_CACHE_LOW_WATERMARK")
+    artifact_manifest_enabled: bool = Field(default=True, env="ARTIFACT_MANIFEST_ENABLED")
+    publish_during_mix: bool = Field(default=True, env="PUBLISH_DURING_MIX")
+    publish_upload_workers: int = Field(default=2, env="PUBLISH_UPLOAD_WORKERS")
+    pipeline_mode: str = Field(default="stages", env="PIPELINE_MODE")  # stages | segments
+    segment_window_seconds: float = Field(default=30.0, env="SEGMENT_WINDOW_SECONDS")
+    segment_tts_workers: int = Field(default=2, env="SEGMENT_TTS_WORKERS")
+    cancel_check_interval_seconds: float = Field(default=2.0, env="CANCEL_CHECK_INTERVAL_SECONDS")
+    job_state_flush_seconds: float = Field(default=0.5, env="JOB_STATE_FLUSH_SECONDS")
+    job_events_enabled: bool = Field(default=True, env="JOB_EVENTS_ENABLED")
+    job_events_stream: str = Field(default="job-events", env="JOB_EVENTS_STREAM")
+    job_events_maxlen: int = Field(default=100_000, env="JOB_EVENTS_MAXLEN")
+    response_cache_enabled: bool = Field(default=True, env="RESPONSE_CACHE_ENABLED")
     metrics_host: str = Field(default="0.0.0.0", env="METRICS_HOST")
     metrics_port: int = Field(default=9101, env="METRICS_PORT")
 
@@ -4,25 +4,31 @@ import json
 import logging
 import math
 import subprocess
+import threading
 from pathlib import Path
-from typing import Iterable, List, Tuple
+from typing import BinaryIO, Iterable, List, Tuple, Union
 
 import numpy as np
-import pyloudnorm as pyln
 import soundfile as sf
-from scipy import signal
 
 from ..config import get_settings
-from ..common import storage
+from ..common import codecs, storage
+from ..common.cancellation import checkpoint, run_process
+from ..common.remote_file import materialize
 
 DEFAULT_SR = 48_000
+# Written next to `dubbed.*`: the loudness gain applied to the stems, so edits can be patched in.
+MIX_INFO = "mix.json"
 
 _log = logging.getLogger(__name__)
 _settings = get_settings()
 
+# The asset master playlist is shared by all languages; publishes may run concurrently.
+_master_lock = threading.Lock()
+
 
 def _load_mono(path: Path) -> Tuple[np.ndarray, int]:
-    data, sr = sf.read(path, always_2d=False)
+    data, sr = codecs.read_audio(path)
     if data.ndim > 1:
         data = data.mean(axis=1)
     return data.astype(np.float32), sr
@@ -34,6 +40,8 @@ def _resample(audio: np.ndarray, src_sr: int, dst_sr: int) -> np.ndarray:
     gcd = math.gcd(src_sr, dst_sr)
     up = dst_sr // gcd
     down = src_sr // gcd
+    from scipy import signal  # scipy is slow to import; loaded on first resample
+
     resampled = signal.resample_poly(audio, up, down).astype(np.float32)
     return resampled
 
@@ -45,48 +53,75 @@ def _pad_to(array: np.ndarray, length: int) -> np.ndarray:
     return np.pad(array, (0, padding), mode="constant")
 
 
-def _normalize_loudness(audio: np.ndarray, sample_rate: int, target_lufs: float) -> np.ndarray:
+def _loudness_gain(audio: np.ndarray, sample_rate: int, target_lufs: float) -> float:
     if not np.any(audio):
-        return audio
+        return 1.0
+    import pyloudnorm as pyln  # pulls in scipy.signal
+
     meter = pyln.Meter(sample_rate)
     loudness = meter.integrated_loudness(audio)
     if math.isinf(loudness):
-        return audio
+        return 1.0
     gain = target_lufs - loudness
-    factor = 10 ** (gain / 20.0)
+    return 10 ** (gain / 20.0)
+
+
+def _normalize_loudness(audio: np.ndarray, sample_rate: int, target_lufs: float) -> np.ndarray:
+    factor = _loudness_gain(audio, sample_rate, target_lufs)
+    if factor == 1.0:
+        return audio
     normalized = audio * factor
     normalized = np.clip(normalized, -0.99, 0.99)
     return normalized.astype(np.float32)
 
 
+def apply_mix_gain(voice: np.ndarray, background: np.ndarray, gain: float) -> np.ndarray:
+    """Final samples from gain-staged stems: loudness gain, clipping, NaN cleanup."""
+    mixed = np.clip((voice + background) * gain, -0.99, 0.99) if gain != 1.0 else voice + background
+    return np.nan_to_num(mixed, nan=0.0).astype(np.float32)
+
+
+def empty_voice_track(segments: List[dict]) -> np.ndarray:
+    """Silent track long enough for every segment (plus a short tail)."""
+    max_t1 = max((float(seg["t1"]) for seg in segments), default=0.0)
+    return np.zeros(max(DEFAULT_SR, int(math.ceil(max_t1 * DEFAULT_SR)) + DEFAULT_SR // 10), dtype=np.float32)
+
+
+def place_segment(voice_track: np.ndarray, segment: dict, path: Path) -> np.ndarray:
+    """Add a rendered segment at its start time, growing the track if it overruns."""
+    audio, sr = _load_mono(path)
+    audio = _resample(audio, sr, DEFAULT_SR)
+    start = int(round(float(segment["t0"]) * DEFAULT_SR))
+    end = start + len(audio)
+    if end > len(voice_track):
+        voice_track = _pad_to(voice_track, end)
+    voice_track[start:end] += audio[: end - start]
+    return voice_track
+
+
 def _voice_track(segments: List[dict], segment_paths: Iterable[Path]) -> Tuple[np.ndarray, int]:
     ordered = sorted(zip(segments, segment_paths), key=lambda item: item[0]["idx"])
     if not ordered:
         return np.zeros(DEFAULT_SR, dtype=np.float32), DEFAULT_SR
 
-    max_t1 = max(float(seg["t1"]) for seg, _ in ordered)
-    total_samples = max(DEFAULT_SR, int(math.ceil(max_t1 * DEFAULT_SR)) + DEFAULT_SR // 10)
-    voice_track = np.zeros(total_samples, dtype=np.float32)
-
+    voice_track = empty_voice_track([seg for seg, _ in ordered])
     for segment, path in ordered:
-        audio, sr = _load_mono(path)
-        audio = _resample(audio, sr, DEFAULT_SR)
-        start = int(round(float(segment["t0"]) * DEFAULT_SR))
-        end = start + len(audio)
-        if end > len(voice_track):
-            voice_track = _pad_to(voice_track, end)
-        voice_track[start:end] += audio[: end - start]
+        checkpoint()
+        voice_track = place_segment(voice_track, segment, path)
 
     return voice_track, DEFAULT_SR
 
 
-def _extract_background(source_audio: Path, sample_rate: int, work_dir: Path) -> np.ndarray:
-    if not source_audio.exists():
+def extract_background(source_audio: Union[Path, BinaryIO], sample_rate: int, work_dir: Path) -> np.ndarray:
+    if isinstance(source_audio, Path) and not source_audio.exists():
         return np.zeros(sample_rate, dtype=np.float32)
 
     if _settings.mix_use_demucs:
         out_dir = work_dir / "demucs"
         out_dir.mkdir(parents=True, exist_ok=True)
+        if not isinstance(source_audio, Path):
+            # demucs only reads local files; spill the streamed source once.
+            source_audio = materialize(source_audio, out_dir / "source.wav")
         cmd = [
             "demucs",
             "-n",
@@ -97,14 +132,20 @@ def _extract_background(source_audio: Path, sample_rate: int, work_dir: Path) ->
             str(out_dir),
         ]
         try:
-            subprocess.run(cmd, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            # Demucs can run for many minutes; poll so a cancelled job kills it.
+            run_process(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
             background_candidate = next(out_dir.glob("**/no_vocals.wav"))
             background_audio, bg_sr = _load_mono(background_candidate)
             return _resample(background_audio, bg_sr, sample_rate)
         except (FileNotFoundError, StopIteration, subprocess.CalledProcessError) as exc:
             _log.warning("Demucs separation unavailable (%s); using attenuated source", exc)
 
-    original_audio, original_sr = _load_mono(source_audio)
+    if not isinstance(source_audio, Path):
+        source_audio.seek(0)
+        data, original_sr = sf.read(source_audio, always_2d=False)
+        original_audio = (data.mean(axis=1) if data.ndim > 1 else data).astype(np.float32)
+    else:
+        original_audio, original_sr = _load_mono(source_audio)
     return _resample(original_audio, original_sr, sample_rate)
 
 
@@ -112,7 +153,7 @@ def assemble_track(
     translated_segments: List[dict],
     segment_paths: List[Path],
     output_dir: Path,
-    source_audio: Path | None,
+    source_audio: Path | BinaryIO | None,
     target_language: str,
 ) -> Path:
     output_dir.mkdir(parents=True, exist_ok=True)
@@ -120,23 +161,44 @@ def assemble_track(
     voice_track, sample_rate = _voice_track(translated_segments, segment_paths)
     background = np.zeros_like(voice_track)
     if source_audio:
-        background = _extract_background(source_audio, sample_rate, output_dir)
+        background = extract_background(source_audio, sample_rate, output_dir)
+    return finish_mix(voice_track, background, sample_rate, output_dir, target_language)
+
 
+def mix_window(voice_track: np.ndarray, background: np.ndarray, start: int, end: int) -> np.ndarray:
+    """Gain-staged mix of `[start, end)` for early previews (no loudness normalization)."""
+    voice = _pad_to(voice_track[start:end], end - start) * float(_settings.mix_voice_gain)
+    back = _pad_to(background[start:end], end - start) * float(_settings.mix_background_gain)
+    return np.clip(np.nan_to_num(voice + back, nan=0.0), -0.99, 0.99).astype(np.float32)
+
+
+def finish_mix(
+    voice_track: np.ndarray,
+    background: np.ndarray,
+    sample_rate: int,
+    output_dir: Path,
+    target_language: str,
+) -> Path:
+    """Apply gains and loudness normalization, then write the stems and `dubbed.*`."""
     mix_length = max(len(voice_track), len(background))
     voice_track = _pad_to(voice_track, mix_length) * float(_settings.mix_voice_gain)
     background = _pad_to(background, mix_length) * float(_settings.mix_background_gain)
 
-    mixed = voice_track + background
-    mixed = _normalize_loudness(mixed, sample_rate, _settings.mix_target_loudness)
-    mixed = np.nan_to_num(mixed, nan=0.0)
+    gain = _loudness_gain(voice_track + background, sample_rate, _settings.mix_target_loudness)
+    mixed = apply_mix_gain(voice_track, background, gain)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    (output_dir / MIX_INFO).write_text(json.dumps({"gain": gain, "sampleRate": sample_rate}), encoding="utf-8")
 
     voice_path = output_dir / f"voice_{target_language}.wav"
     background_path = output_dir / f"background_{target_language}.wav"
-    sf.write(voice_path, voice_track, sample_rate)
-    sf.write(background_path, background, sample_rate)
-
     final_path = output_dir / "dubbed.wav"
-    sf.write(final_path, mixed, sample_rate)
+    _, _, final_path = codecs.run_parallel(
+        [
+            lambda: codecs.write_scratch(voice_path, voice_track, sample_rate),
+            lambda: codecs.write_scratch(background_path, background, sample_rate),
+            lambda: codecs.write_intermediate(final_path, mixed, sample_rate),
+        ]
+    )
     return final_path
 
 
@@ -144,27 +206,30 @@ def publish_track(asset_id: str, language: str, audio_path: Path, public_dir: Pa
     playlist_dir = public_dir / language
     playlist_dir.mkdir(parents=True, exist_ok=True)
     master_path = public_dir / "master.m3u8"
-    audio_object_name = f"pub/{asset_id}/{language}/dubbed.wav"
+    audio_object_name = f"pub/{asset_id}/{language}/dubbed{audio_path.suffix}"
     storage.upload_from_path(
         _settings.minio_bucket_public,
         audio_object_name,
         audio_path,
-        content_type="audio/wav",
+        content_type=codecs.content_type_for(audio_path),
     )
+    uploaded_bytes = audio_path.stat().st_size
     manifest = {
         "assetId": asset_id,
         "language": language,
         "audioObject": audio_object_name,
     }
-    master_path.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
     master_object_name = f"pub/{asset_id}/master.m3u8"
-    try:
-        storage.upload_from_path(
-            _settings.minio_bucket_public,
-            master_object_name,
-            master_path,
-            content_type="application/vnd.apple.mpegurl",
-        )
-        return {"master": master_object_name, "audio": audio_object_name}
-    except Exception:  # pragma: no cover - depends on MinIO
-        return {"master": master_path.as_posix(), "audio": audio_object_name}
+    with _master_lock:
+        master_path.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+        try:
+            storage.upload_from_path(
+                _settings.minio_bucket_public,
+                master_object_name,
+                master_path,
+                content_type="application/vnd.apple.mpegurl",
+            )
+            uploaded_bytes += master_path.stat().st_size
+            return {"master": master_object_name, "audio": audio_object_name, "bytes": uploaded_bytes}
+        except Exception:  # pragma: no cover - depends on MinIO
+            return {"master": master_path.as_posix(), "audio": audio_object_name, "bytes": uploaded_bytes}
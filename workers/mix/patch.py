@@ -0,0 +1,147 @@
+"""Patch re-synthesized segments into an existing mix.
+
+`finish_mix` keeps the gain-staged voice and background stems plus the loudness
+gain (`mix.json`) next to `dubbed.*`. A re-rendered segment is swapped into the
+voice stem (old render subtracted, new one added) and only the samples it
+covers are recomputed in `dubbed.*`; WAV mixes are rewritten in place.
+
+`dubbed.*` is written before the stems and the voice stem is replaced last, in
+one `os.replace`: until then the stem still holds the old renders, so a patch
+that fails part-way is simply applied again (see `voice_stem_version`).
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import numpy as np
+import soundfile as sf
+
+from ..common import codecs
+from ..common.paths import AUDIO_SUFFIXES, newest_variant
+from ..config import get_settings
+from .assemble import DEFAULT_SR, MIX_INFO, _load_mono, _pad_to, _resample, apply_mix_gain
+
+_settings = get_settings()
+
+
+@dataclass
+class SegmentChange:
+    segment: dict
+    previous: Optional[np.ndarray]  # old render at DEFAULT_SR, None if there was none
+    path: Path
+
+
+def load_render(path: Path) -> np.ndarray:
+    audio, sr = _load_mono(path)
+    return _resample(audio, sr, DEFAULT_SR)
+
+
+def _stem(mix_dir: Path, stem: str) -> Path:
+    path = newest_variant(mix_dir, stem, (codecs.SCRATCH_SUFFIX, *AUDIO_SUFFIXES))
+    if path is None:
+        raise FileNotFoundError(f"Mix stem {stem} missing in {mix_dir}")
+    return path
+
+
+def voice_stem_version(mix_dir: Path, language: str) -> List:
+    """Identity of the current voice stem; it changes when `patch_mix` commits."""
+    path = _stem(mix_dir, f"voice_{language}")
+    info = path.stat()
+    return [path.name, info.st_ino, info.st_mtime_ns, info.st_size]
+
+
+def _replace_stem(mix_dir: Path, stem: str, audio: np.ndarray, sample_rate: int) -> Path:
+    staged = codecs.write_scratch(mix_dir / f".{stem}.patch.wav", audio, sample_rate)
+    target = mix_dir / f"{stem}{staged.suffix}"
+    os.replace(staged, target)
+    codecs.drop_stale_variants(target)
+    return target
+
+
+def _merge(ranges: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    merged: List[Tuple[int, int]] = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def _mix_gain(mix_dir: Path, voice: np.ndarray, background: np.ndarray, final_path: Path) -> float:
+    info_path = mix_dir / MIX_INFO
+    if info_path.exists():
+        return float(json.loads(info_path.read_text(encoding="utf-8"))["gain"])
+    # Mixes written before the gain was recorded: least-squares fit against the output.
+    mixed, _ = codecs.read_audio(final_path)
+    stems = _pad_to(voice, len(mixed)) + _pad_to(background, len(mixed))
+    unclipped = np.abs(mixed) < 0.99
+    energy = float(np.dot(stems[unclipped], stems[unclipped]))
+    return float(np.dot(mixed[unclipped], stems[unclipped]) / energy) if energy else 1.0
+
+
+def patch_mix(mix_dir: Path, language: str, changes: List[SegmentChange]) -> List[Tuple[int, int]]:
+    """Swap changed segment renders into the stored mix; returns the patched sample ranges."""
+    voice_path = _stem(mix_dir, f"voice_{language}")
+    background_path = _stem(mix_dir, f"background_{language}")
+    final_path = _stem(mix_dir, "dubbed")
+    voice, sample_rate = codecs.read_audio(voice_path)
+    background, _ = codecs.read_audio(background_path)
+    if sample_rate != DEFAULT_SR:
+        raise ValueError(f"Unexpected mix sample rate {sample_rate}")
+    gain = _mix_gain(mix_dir, voice, background, final_path)
+    voice_gain = float(_settings.mix_voice_gain)
+    length = max(len(voice), len(background))
+    voice, background = _pad_to(voice, length), _pad_to(background, length)
+
+    ranges: List[Tuple[int, int]] = []
+    for change in changes:
+        start = int(round(float(change.segment["t0"]) * DEFAULT_SR))
+        end = start
+        if change.previous is not None:
+            end = min(start + len(change.previous), len(voice))
+            voice[start:end] -= change.previous[: end - start] * voice_gain
+        audio = load_render(change.path)
+        if start + len(audio) > len(voice):
+            voice = _pad_to(voice, start + len(audio))
+            background = _pad_to(background, start + len(audio))
+        voice[start : start + len(audio)] += audio * voice_gain
+        ranges.append((start, max(end, start + len(audio))))
+    ranges = _merge(ranges)
+
+    grown = len(voice) > length
+    _write_final(final_path, voice, background, ranges, gain, sample_rate, rewrite=grown)
+    if grown:
+        _replace_stem(mix_dir, f"background_{language}", background, sample_rate)
+    _replace_stem(mix_dir, f"voice_{language}", voice, sample_rate)
+    return ranges
+
+
+def _write_final(
+    final_path: Path,
+    voice: np.ndarray,
+    background: np.ndarray,
+    ranges: List[Tuple[int, int]],
+    gain: float,
+    sample_rate: int,
+    *,
+    rewrite: bool,
+) -> None:
+    if final_path.suffix == ".wav" and not rewrite:
+        with sf.SoundFile(final_path, "r+") as handle:
+            if handle.frames == len(voice):
+                for start, end in ranges:
+                    handle.seek(start)
+                    handle.write(apply_mix_gain(voice[start:end], background[start:end], gain))
+                return
+    # Compressed intermediates (FLAC) and length changes: rewrite the file.
+    mixed, _ = codecs.read_audio(final_path)
+    mixed = _pad_to(mixed, len(voice))
+    for start, end in ranges:
+        mixed[start:end] = apply_mix_gain(voice[start:end], background[start:end], gain)
+    sf.write(final_path, mixed, sample_rate)
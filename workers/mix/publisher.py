@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Optional
+
+from ..common import assets as asset_state
+from ..common import cache, codecs
+from ..common.cancellation import checkpoint
+from ..common.paths import asset_public_dir
+from ..config import get_settings
+from .assemble import publish_track
+
+_settings = get_settings()
+
+
+class PublishQueue:
+    """Encode and upload finished mixes in the background.
+
+    `submit` returns immediately, so the caller can mix the next language while
+    earlier ones are encoded and uploaded. Each completed upload merges its keys
+    into `storage_keys` on its own, which makes a language playable as soon as
+    its rendition is stored.
+    """
+
+    def __init__(self, asset_external_id: str, workers: Optional[int] = None) -> None:
+        self.asset_external_id = asset_external_id
+        self.public_dir = asset_public_dir(asset_external_id)
+        self.upload_bytes = 0
+        self.encode_ms = 0.0
+        self._futures: Dict[str, Future] = {}
+        self._stats_lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(
+            max_workers=max(1, workers or _settings.publish_upload_workers),
+            thread_name_prefix="publish",
+        )
+
+    def __enter__(self) -> "PublishQueue":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        # On error, drop uploads that have not started; running ones finish.
+        self._pool.shutdown(wait=True, cancel_futures=exc_type is not None)
+
+    def submit(self, language: str, mix_path: Path) -> None:
+        if language not in self._futures:
+            self._futures[language] = self._pool.submit(self._publish, language, mix_path)
+
+    def _publish(self, language: str, mix_path: Path) -> dict:
+        checkpoint()
+        encode_start = time.perf_counter()
+        rendition = codecs.encode_for_publish(mix_path, self.public_dir / language)
+        encode_ms = (time.perf_counter() - encode_start) * 1000
+        info = publish_track(self.asset_external_id, language, rendition, self.public_dir)
+        # The uploaded rendition is only a local copy now; let the node cache evict it.
+        cache.record(self.public_dir / language)
+        info["storageKeys"] = asset_state.merge_storage_keys(
+            self.asset_external_id,
+            {f"public_{language}": info["audio"]},
+            defaults={"public": info["master"]},
+        )
+        with self._stats_lock:
+            self.upload_bytes += info.get("bytes", 0)
+            self.encode_ms += encode_ms
+        return info
+
+    def wait(self) -> Dict[str, dict]:
+        """Block until every submitted language is published; re-raise the first failure."""
+        results: Dict[str, dict] = {}
+        error: Optional[BaseException] = None
+        for language, future in self._futures.items():
+            try:
+                results[language] = future.result()
+            except Exception as exc:
+                error = error or exc
+        if error is not None:
+            raise error
+        return results
@@ -7,6 +7,7 @@ from typing import Dict, List
 from libretranslatepy import LibreTranslateAPI
 from tenacity import retry, stop_after_attempt, wait_fixed
 
+from ..common.cancellation import checkpoint
 from ..config import get_settings
 
 _settings = get_settings()
@@ -18,7 +19,35 @@ def _apply_glossary(text: str, glossary: Dict[str, str]) -> str:
     return text
 
 
+def translation_client() -> LibreTranslateAPI | None:
+    try:
+        return LibreTranslateAPI(_settings.libretranslate_url)
+    except Exception:  # pragma: no cover - network dependency
+        return None
+
+
 @retry(stop=stop_after_attempt(3), wait=wait_fixed(1))
+def translate_segment(
+    client: LibreTranslateAPI | None,
+    segment: dict,
+    target_lang: str,
+    glossary: Dict[str, str] | None = None,
+) -> dict:
+    text_src = _apply_glossary(segment["text"], glossary or {})
+    if client is None:
+        text_tgt = text_src  # fallback to source text
+    else:  # pragma: no cover - requires LibreTranslate service
+        text_tgt = client.translate(text_src, segment.get("lang", "auto"), target_lang)
+    return {
+        "idx": segment["idx"],
+        "t0": segment["t0"],
+        "t1": segment["t1"],
+        "text_src": segment["text"],
+        "text_tgt": text_tgt,
+        "speakerId": segment.get("speakerId"),
+    }
+
+
 def translate_segments(
     segments_src_path: Path,
     output_dir: Path,
@@ -27,30 +56,11 @@ def translate_segments(
 ) -> List[dict]:
     output_dir.mkdir(parents=True, exist_ok=True)
     segments = json.loads(segments_src_path.read_text(encoding="utf-8"))
-    glossary = glossary or {}
-
-    try:
-        client = LibreTranslateAPI(_settings.libretranslate_url)
-    except Exception:  # pragma: no cover - network dependency
-        client = None  # type: ignore
-
-    translated: List[dict] = []
+    client = translation_client()
+    translated = []
     for segment in segments:
-        text_src = _apply_glossary(segment["text"], glossary)
-        if client is None:
-            text_tgt = text_src  # fallback to source text
-        else:  # pragma: no cover - requires LibreTranslate service
-            text_tgt = client.translate(text_src, segment.get("lang", "auto"), target_lang)
-        translated.append(
-            {
-                "idx": segment["idx"],
-                "t0": segment["t0"],
-                "t1": segment["t1"],
-                "text_src": segment["text"],
-                "text_tgt": text_tgt,
-                "speakerId": segment.get("speakerId"),
-            }
-        )
+        checkpoint()
+        translated.append(translate_segment(client, segment, target_lang, glossary))
 
     output_path = output_dir / f"segments_tgt.{target_lang}.json"
     output_path.write_text(json.dumps(translated, indent=2), encoding="utf-8")
@@ -0,0 +1,138 @@
+"""Re-dub edited segments without re-running TTS and mix for the whole asset.
+
+Only segments whose target text changed are synthesized again; their renders
+are swapped into the stored mix (see `workers.mix.patch`), so publishing a
+one-line fix costs one TTS call and a patch of the affected samples.
+
+New renders are staged in `tts/.<lang>.redub/`. The translations and the TTS
+checkpoint are written before the patch, then `commit.json` records the voice
+stem the patch starts from. Replacing that stem commits the patch (see
+`workers.mix.patch`); only then are the staged renders moved into place. A run
+that failed before the commit is redone from scratch. A run that failed after
+it has its renders installed by the next run before anything else.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from ..common import codecs
+from ..common.cancellation import checkpoint
+from ..common.paths import mix_output_dir, mix_output_file, newest_variant, translation_segments_path, tts_segment_path
+from ..config import get_settings
+from ..mix.assemble import DEFAULT_SR
+from ..mix.patch import SegmentChange, load_render, patch_mix, voice_stem_version
+from ..tts.checkpoint import SegmentCheckpoint
+from ..tts.synth import synthesize_segment
+
+_settings = get_settings()
+_COMMIT = "commit.json"
+
+
+@dataclass
+class RedubResult:
+    language: str
+    mix_path: Path
+    segments: List[dict] = field(default_factory=list)
+    skipped: List[int] = field(default_factory=list)  # edited idx the dub does not have
+    patched_seconds: float = 0.0
+    duration_ms: float = 0.0
+
+
+def _previous_render(tts_dir: Path, idx: int) -> Optional[Path]:
+    return newest_variant(tts_dir, f"seg_{idx:04d}")
+
+
+def _install(staging_dir: Path, tts_dir: Path, names: List[str]) -> List[Path]:
+    installed = []
+    for name in names:
+        staged, target = staging_dir / name, tts_dir / name
+        if not staged.exists():
+            continue  # moved before the previous run stopped
+        os.replace(staged, target)
+        codecs.drop_stale_variants(target)
+        installed.append(target)
+    return installed
+
+
+def _recover(staging_dir: Path, tts_dir: Path, mix_dir: Path, language: str) -> None:
+    """Finish a committed patch left by a failed run, then clear the staging dir."""
+    commit_path = staging_dir / _COMMIT
+    if commit_path.exists():
+        commit = json.loads(commit_path.read_text(encoding="utf-8"))
+        if commit["stem"] != voice_stem_version(mix_dir, language):
+            _install(staging_dir, tts_dir, commit["renders"])
+    shutil.rmtree(staging_dir, ignore_errors=True)
+
+
+def redub_language(
+    asset_external_id: str,
+    language: str,
+    edits: Dict[int, str],
+    *,
+    voice_presets: Optional[Dict[str, str]] = None,
+    tts_workers: Optional[int] = None,
+) -> RedubResult:
+    """Apply `edits` (segment idx -> new target text) to one language's dub.
+
+    Edits of segments the dub does not have are left out and reported in `skipped`.
+    """
+    started = time.perf_counter()
+    tts_dir = tts_segment_path(asset_external_id, language)
+    mix_dir = mix_output_dir(asset_external_id, language)
+    staging_dir = tts_dir.parent / f".{language}.redub"
+    _recover(staging_dir, tts_dir, mix_dir, language)
+
+    translations_path = translation_segments_path(asset_external_id, language)
+    translated = json.loads(translations_path.read_text(encoding="utf-8"))
+    by_idx = {segment["idx"]: segment for segment in translated}
+    result = RedubResult(
+        language=language,
+        mix_path=mix_output_file(asset_external_id, language),
+        skipped=sorted(set(edits) - set(by_idx)),
+    )
+    edits = {idx: text for idx, text in edits.items() if idx in by_idx}
+    if not edits:
+        return result
+    staging_dir.mkdir(parents=True)
+
+    def render(idx: int) -> SegmentChange:
+        checkpoint()
+        segment = by_idx[idx]
+        segment["text_tgt"] = edits[idx]
+        previous_path = _previous_render(tts_dir, idx)
+        previous = load_render(previous_path) if previous_path else None
+        path = synthesize_segment(segment, staging_dir, language, voice_presets)
+        return SegmentChange(segment=segment, previous=previous, path=path)
+
+    with ThreadPoolExecutor(
+        max_workers=max(1, tts_workers or _settings.segment_tts_workers), thread_name_prefix="redub-tts"
+    ) as pool:
+        changes = list(pool.map(render, sorted(edits)))
+
+    tmp_path = translations_path.with_suffix(f".{os.getpid()}.tmp")
+    tmp_path.write_text(json.dumps(translated, indent=2), encoding="utf-8")
+    os.replace(tmp_path, translations_path)
+    state = SegmentCheckpoint(tts_dir, language, voice_presets)
+    for change in changes:
+        state.record(change.segment, change.path)  # same file name once installed
+    commit = {"stem": voice_stem_version(mix_dir, language), "renders": [change.path.name for change in changes]}
+    tmp_path = staging_dir / f"{_COMMIT}.tmp"
+    tmp_path.write_text(json.dumps(commit), encoding="utf-8")
+    os.replace(tmp_path, staging_dir / _COMMIT)
+
+    ranges = patch_mix(mix_dir, language, changes)
+    for change, target in zip(changes, _install(staging_dir, tts_dir, commit["renders"])):
+        change.path = target
+    shutil.rmtree(staging_dir)
+    result.segments = [change.segment for change in changes]
+    result.patched_seconds = round(sum(end - start for start, end in ranges) / DEFAULT_SR, 3)
+    result.duration_ms = round((time.perf_counter() - started) * 1000, 2)
+    return result
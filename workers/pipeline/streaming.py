@@ -0,0 +1,267 @@
+"""Segment-granularity execution of MT → TTS → mix for one language.
+
+Instead of waiting for every segment at each stage barrier, a segment is handed
+to TTS as soon as it is translated, and the mixer lays down each time window
+(`SEGMENT_WINDOW_SECONDS`) once all segments starting in it are rendered. Each
+completed window is written as a preview chunk, so the first audio is available
+long before the whole asset is dubbed. The final `dubbed.*` is identical in
+layout to the stage pipeline's output.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import BinaryIO, Dict, List, Optional, Union
+
+import numpy as np
+
+from ..common import codecs
+from ..common.cancellation import checkpoint
+from ..common.paths import asset_workspace, intermediate_suffix
+from ..config import get_settings
+from ..mix.assemble import (
+    DEFAULT_SR,
+    empty_voice_track,
+    extract_background,
+    finish_mix,
+    mix_window,
+    place_segment,
+)
+from ..mt.translate import translate_segment, translation_client
+from ..tts.synth import synthesize_segment
+
+_settings = get_settings()
+
+PENDING, TRANSLATED, RENDERED, MIXED = 0, 1, 2, 3
+
+
+class SegmentState:
+    """Per-segment progress (by position), kept in an append-only journal.
+
+    Each transition appends one `<position> <status>` line, so the writes stay
+    linear in the number of transitions on long assets. A line cut short by a
+    crash is ignored. On load the journal is compacted, rewritten to a temp
+    file and moved into place with `os.replace`. The `# <count>` header
+    discards a journal written for a different segment list.
+    """
+
+    def __init__(self, path: Path, count: int) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._states = bytearray(count)
+        if path.exists():
+            lines = path.read_text(encoding="utf-8").splitlines()
+            if lines and lines[0] == f"# {count}":
+                for line in lines[1:]:
+                    try:
+                        position, status = (int(value) for value in line.split())
+                        self._states[position] = status
+                    except (ValueError, IndexError):
+                        continue  # torn tail of an interrupted append
+            self._compact()
+
+    def __getitem__(self, position: int) -> int:
+        return self._states[position]
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+    def set(self, position: int, status: int) -> None:
+        with self._lock:
+            if self._states[position] == status:
+                return
+            self._states[position] = status
+            if not self.path.exists():
+                self._compact()
+                return
+            with self.path.open("a", encoding="utf-8") as handle:
+                handle.write(f"{position} {status}\n")
+
+    def count(self, status: int) -> int:
+        return sum(1 for value in self._states if value >= status)
+
+    def _compact(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        lines = [f"# {len(self._states)}\n"]
+        lines.extend(f"{position} {status}\n" for position, status in enumerate(self._states) if status)
+        tmp_path = self.path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text("".join(lines), encoding="utf-8")
+        os.replace(tmp_path, self.path)
+
+
+@dataclass
+class StreamResult:
+    language: str
+    mix_path: Path
+    segments: int
+    chunks: List[Path] = field(default_factory=list)
+    time_to_first_audio_ms: Optional[float] = None
+    duration_ms: float = 0.0
+    reused: int = 0
+
+
+def state_path(asset_external_id: str, language: str) -> Path:
+    return asset_workspace(asset_external_id) / "stream" / f"{language}.state"
+
+
+def _windows(segments: List[dict], window_seconds: float) -> List[List[int]]:
+    """Group segment positions by the window their start time falls in (in time order)."""
+    grouped: Dict[int, List[int]] = {}
+    for position, segment in enumerate(segments):
+        grouped.setdefault(int(float(segment["t0"]) // window_seconds), []).append(position)
+    return [grouped[key] for key in sorted(grouped)]
+
+
+def _load_partial(path: Path) -> Dict[int, dict]:
+    if not path.exists():
+        return {}
+    translated: Dict[int, dict] = {}
+    for line in path.read_text(encoding="utf-8").splitlines():
+        if line.strip():
+            item = json.loads(line)
+            translated[item["idx"]] = item
+    return translated
+
+
+def stream_language(
+    asset_external_id: str,
+    language: str,
+    segments: List[dict],
+    *,
+    voice_presets: Optional[Dict[str, str]] = None,
+    source_audio: Union[Path, BinaryIO, None] = None,
+    glossary: Optional[Dict[str, str]] = None,
+    window_seconds: Optional[float] = None,
+    tts_workers: Optional[int] = None,
+) -> StreamResult:
+    """Translate, synthesize and mix one language segment by segment.
+
+    Progress survives restarts: segments already rendered (per the state file,
+    with their translation in the partial JSONL and audio on disk) are reused.
+    """
+    started = time.perf_counter()
+    workspace = asset_workspace(asset_external_id)
+    translations_dir = workspace / "translations"
+    translations_dir.mkdir(parents=True, exist_ok=True)
+    tts_dir = workspace / "tts" / language
+    tts_dir.mkdir(parents=True, exist_ok=True)
+    mix_dir = workspace / "mix" / language
+    chunk_dir = mix_dir / "chunks"
+    chunk_dir.mkdir(parents=True, exist_ok=True)
+
+    partial_path = translations_dir / f"segments_tgt.{language}.partial.jsonl"
+    state = SegmentState(state_path(asset_external_id, language), len(segments))
+    previous = _load_partial(partial_path)
+    windows = _windows(segments, window_seconds or _settings.segment_window_seconds)
+    translated: List[Optional[dict]] = [None] * len(segments)
+    rendered: Dict[int, Path] = {}
+    # (position, future-or-path) on success; (None, exception) when MT fails.
+    completed: "queue.Queue[tuple]" = queue.Queue()
+    stop = threading.Event()
+    result = StreamResult(language=language, mix_path=mix_dir / "dubbed.wav", segments=len(segments))
+
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="stream-bg") as bg_pool, ThreadPoolExecutor(
+        max_workers=max(1, tts_workers or _settings.segment_tts_workers), thread_name_prefix="stream-tts"
+    ) as tts_pool, ThreadPoolExecutor(max_workers=1, thread_name_prefix="stream-mt") as mt_pool, ThreadPoolExecutor(
+        max_workers=1, thread_name_prefix="stream-chunk"
+    ) as chunk_pool:
+        # Background separation (e.g. demucs) overlaps with MT and TTS.
+        background_future: Optional[Future] = None
+        if source_audio:
+            background_future = bg_pool.submit(extract_background, source_audio, DEFAULT_SR, mix_dir)
+
+        def render(position: int, segment: dict) -> Path:
+            checkpoint()
+            path = synthesize_segment(segment, tts_dir, language, voice_presets)
+            state.set(position, RENDERED)
+            return path
+
+        def translate_all() -> None:
+            try:
+                client = translation_client()
+                with partial_path.open("a", encoding="utf-8") as partial:
+                    for position, segment in enumerate(segments):
+                        if stop.is_set():
+                            return
+                        checkpoint()
+                        item = previous.get(segment["idx"])
+                        if item is not None and state[position] >= RENDERED:
+                            existing = tts_dir / f"seg_{segment['idx']:04d}{intermediate_suffix()}"
+                            if existing.exists():
+                                translated[position] = item
+                                result.reused += 1
+                                completed.put((position, existing))
+                                continue
+                        if item is None:
+                            item = translate_segment(client, segment, language, glossary)
+                            partial.write(json.dumps(item) + "\n")
+                            partial.flush()
+                        translated[position] = item
+                        state.set(position, TRANSLATED)
+                        future = tts_pool.submit(render, position, item)
+                        future.add_done_callback(lambda done, position=position: completed.put((position, done)))
+            except Exception as exc:
+                completed.put((None, exc))
+
+        def write_chunk(index: int, audio: np.ndarray) -> Path:
+            chunk = codecs.write_intermediate(chunk_dir / f"chunk_{index:04d}", audio, DEFAULT_SR)
+            if result.time_to_first_audio_ms is None:
+                result.time_to_first_audio_ms = round((time.perf_counter() - started) * 1000, 2)
+            return chunk
+
+        mt_future = mt_pool.submit(translate_all)
+        chunk_futures: List[Future] = []
+
+        try:
+            voice_track = empty_voice_track(segments)
+            background: Optional[np.ndarray] = None
+            next_window = 0
+            while next_window < len(windows):
+                position, outcome = completed.get()
+                if position is None:
+                    raise outcome
+                rendered[position] = outcome.result() if isinstance(outcome, Future) else outcome
+                while next_window < len(windows) and all(pos in rendered for pos in windows[next_window]):
+                    window = windows[next_window]
+                    for pos in window:
+                        voice_track = place_segment(voice_track, segments[pos], rendered[pos])
+                        state.set(pos, MIXED)
+                    if background is None:
+                        background = background_future.result() if background_future else np.zeros(0, dtype=np.float32)
+                    start = int(round(float(segments[window[0]]["t0"]) * DEFAULT_SR))
+                    if next_window + 1 < len(windows):
+                        end = int(round(float(segments[windows[next_window + 1][0]]["t0"]) * DEFAULT_SR))
+                    else:
+                        end = max(len(voice_track), len(background))
+                    # Encoding runs off the mixer thread; mix_window returns a copy.
+                    chunk_futures.append(
+                        chunk_pool.submit(write_chunk, next_window, mix_window(voice_track, background, start, end))
+                    )
+                    next_window += 1
+        except BaseException:
+            # Stop feeding TTS and drop queued renders; in-flight ones finish.
+            stop.set()
+            tts_pool.shutdown(wait=False, cancel_futures=True)
+            raise
+        mt_future.result()
+        result.chunks = [future.result() for future in chunk_futures]
+        if background is None:
+            background = background_future.result() if background_future else np.zeros(0, dtype=np.float32)
+
+    ordered = [item for item in translated if item is not None]
+    (translations_dir / f"segments_tgt.{language}.json").write_text(json.dumps(ordered, indent=2), encoding="utf-8")
+    partial_path.unlink(missing_ok=True)
+    if not len(background):
+        background = np.zeros_like(voice_track)
+    result.mix_path = finish_mix(voice_track, background, DEFAULT_SR, mix_dir, language)
+    if result.time_to_first_audio_ms is None:
+        result.time_to_first_audio_ms = round((time.perf_counter() - started) * 1000, 2)
+    result.duration_ms = round((time.perf_counter() - started) * 1000, 2)
+    return result
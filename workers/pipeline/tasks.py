@@ -1,8 +1,10 @@
 from __future__ import annotations
 
 import json
+import uuid
+from contextlib import contextmanager, nullcontext
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Union
 
 try:  # pragma: no cover - fallback for environments without Celery installed
     from celery import shared_task
@@ -12,12 +14,6 @@ except ImportError:  # pragma: no cover
             return func
 
         return decorator
-try:  # pragma: no cover - allow local tests without prometheus_client
-    from prometheus_client import start_http_server
-except ImportError:  # pragma: no cover
-    def start_http_server(*_args, **_kwargs) -> None:
-        return None
-
 
 _TASK_RETRY_KWARGS = {
     "bind": True,
@@ -31,36 +27,31 @@ from sqlmodel import select
 
 from shared.models import Asset, Job, JobStage, JobStatus
 
-from ..asr.whisper import transcribe
-from ..common import artifacts
-from ..common import assets as asset_state
+from ..common import artifacts, cache, cancellation
+from ..common.cancellation import JobCancelled
 from ..common import jobs as job_state
+from ..common import segments as segment_edits
 from ..common.db import get_session
 from ..common.logging import (
-    configure_stdout_logging,
     log_event,
     set_job_log_file,
     stage_context,
 )
 from ..common.paths import (
-    asset_public_dir,
     asset_workspace,
+    directory_size_bytes,
     job_log_path,
     mix_output_file,
+    tts_segment_files,
 )
-from ..common.storage import download_to_path, upload_from_path
+from ..common.remote_file import open_remote
+from ..common.storage import download_to_path
 from ..config import get_settings
-from ..diarization.basic import run_diarization
-from ..mix.assemble import assemble_track, publish_track
-from ..mt.translate import translate_segments
-from ..tts.synth import synthesize_segments
+
+# Stage implementations (faster-whisper, libretranslate, scipy/pyloudnorm, ...)
+# are imported inside their task, so each worker profile only loads what it runs.
 
 _settings = get_settings()
-configure_stdout_logging()
-try:  # pragma: no cover - metrics server optional
-    start_http_server(_settings.metrics_port, addr=_settings.metrics_host)
-except OSError:
-    pass
 
 STAGE_PROGRESS = {
     JobStage.ASR: 0.10,
@@ -93,6 +84,32 @@ def _update_job(job_external_id: str, stage: JobStage, progress: float) -> None:
     job_state.update_job(job_external_id, stage=stage, status=JobStatus.RUNNING, progress=progress)
 
 
+def _stage_cancelled(job_id: str, asset_id: str, stage: str) -> bool:
+    """True (and recorded) when the job was cancelled before `stage` started."""
+    if not cancellation.is_cancelled(job_id, max_age=0):
+        return False
+    _record_cancelled(job_id, asset_id, stage)
+    return True
+
+
+def _record_cancelled(job_id: str, asset_id: str, stage: str) -> None:
+    latency_ms = cancellation.report_stopped(job_id, stage)
+    job_state.record_stage_history(job_id, stage, "cancelled", {"cancelLatencyMs": latency_ms})
+    log_event(job_id=job_id, asset_id=asset_id, stage=stage, event="CANCELLED", message="Job cancelled; stage stopped")
+    set_job_log_file(None)
+
+
+def _chain(task: Any, job_id: str, *args: Any) -> None:
+    """Queue the next task unless the job was cancelled; its id is kept so the API can revoke it."""
+    if cancellation.is_cancelled(job_id, max_age=0):
+        return
+    # The next stage may run on another worker; it must see this stage's state.
+    task_id = str(uuid.uuid4())
+    job_state.update_task_id(job_id, task_id)
+    job_state.flush(job_id)
+    task.apply_async(args=(job_id, *args), task_id=task_id)
+
+
 def _stage_order(stage: JobStage) -> int:
     return STAGE_ORDER.get(stage, 0)
 
@@ -139,6 +156,45 @@ def _ensure_source_audio(asset: Asset, workspace: Path) -> Path:
     return audio_path
 
 
+@contextmanager
+def _source_audio(asset: Asset, workspace: Path) -> Iterator[Union[Path, BinaryIO]]:
+    """Yield the source as a local path or, when streaming, a range-read file object.
+
+    Streaming avoids pulling the whole raw object on every node that runs ASR or
+    mix; only the byte ranges the decoder touches are fetched (and block-cached).
+    """
+    raw_key = asset.storage_keys.get("raw")
+    local_path = workspace / "source.wav"
+    if local_path.exists() or not raw_key or not _settings.source_streaming:
+        audio_path = _ensure_source_audio(asset, workspace)
+        try:
+            yield audio_path
+        finally:
+            if raw_key:
+                # Usually the largest file in the workspace; evictable because it is downloaded again on demand.
+                cache.record(audio_path)
+        return
+    reader = open_remote(_settings.minio_bucket_raw, raw_key)
+    try:
+        yield reader
+    finally:
+        block_dir = reader.raw.cache_dir
+        reader.close()
+        if block_dir is not None:
+            cache.record(block_dir)
+
+
+def _log_resume(job_id: str, asset_id: str, stage: JobStage, languages: List[str], missing: List[str]) -> None:
+    log_event(
+        job_id=job_id,
+        asset_id=asset_id,
+        stage=stage.value,
+        event="RESUME",
+        message="Artifact availability checked",
+        extra={"reused": len(languages) - len(missing), "redo": len(missing), "missing": missing},
+    )
+
+
 def _missing_packages(asset: Asset, languages: List[str]) -> List[str]:
     missing = []
     storage_keys = asset.storage_keys or {}
@@ -177,6 +233,8 @@ def _persist_job_logs(job: Job, asset: Asset, log_path: Path) -> None:
 @shared_task(name="workers.pipeline.run_pipeline")
 def run_pipeline(job_id: str, resume_from: Optional[str] = None) -> str:
     job, asset = _load_job(job_id)
+    if _stage_cancelled(job_id, asset.external_id, "PIPELINE"):
+        return job_id
     workspace = asset_workspace(asset.external_id)
     log_path = job_log_path(asset.external_id, job.external_id)
     log_path.parent.mkdir(parents=True, exist_ok=True)
@@ -191,18 +249,22 @@ def run_pipeline(job_id: str, resume_from: Optional[str] = None) -> str:
         message=f"Pipeline queued (resumeFrom={resume_value})",
     )
     set_job_log_file(None)
-    run_asr_stage.delay(job_id, resume_value, str(log_path))
+    _chain(run_asr_stage, job_id, resume_value, str(log_path))
     return job_id
 
 
 @shared_task(name="workers.pipeline.run_asr_stage", **_TASK_RETRY_KWARGS)
 def run_asr_stage(self, job_id: str, resume_from: str, log_file: str) -> None:
+    from ..asr.whisper import transcribe
+    from ..diarization.basic import run_diarization
+
     set_job_log_file(Path(log_file))
     job, asset = _load_job(job_id)
     workspace = asset_workspace(asset.external_id)
-    audio_path = _ensure_source_audio(asset, workspace)
     resume_stage = _parse_resume(resume_from)
     artifact_ready = artifacts.has_asr_segments(asset.external_id)
+    if _stage_cancelled(job_id, asset.external_id, JobStage.ASR.value):
+        return
     _update_job(job_id, JobStage.ASR, STAGE_PROGRESS[JobStage.ASR])
 
     if _should_skip(JobStage.ASR, resume_stage, artifact_ready):
@@ -214,7 +276,11 @@ def run_asr_stage(self, job_id: str, resume_from: str, log_file: str) -> None:
         diarization_enabled = bool(asset.storage_keys.get("diarization"))
         timer = None
         try:
-            with stage_context(job_id=job_id, asset_id=asset.external_id, stage=JobStage.ASR.value) as stage_timer:
+            with stage_context(
+                job_id=job_id,
+                asset_id=asset.external_id,
+                stage=JobStage.ASR.value,
+            ) as stage_timer, _source_audio(asset, workspace) as audio_path:
                 timer = stage_timer
                 if diarization_enabled:
                     diarization_segments = run_diarization(audio_path, diarization_dir)
@@ -224,6 +290,10 @@ def run_asr_stage(self, job_id: str, resume_from: str, log_file: str) -> None:
             if timer and timer.duration_ms is not None:
                 details["durationMs"] = timer.duration_ms
             job_state.record_stage_history(job_id, JobStage.ASR.value, "success", details)
+            artifacts.record_stage_outputs(asset.external_id, JobStage.ASR, [])
+        except JobCancelled:
+            _record_cancelled(job_id, asset.external_id, JobStage.ASR.value)
+            return
         except Exception as exc:
             retries, will_retry = _retry_state(self)
             attempt = retries + 1
@@ -246,24 +316,32 @@ def run_asr_stage(self, job_id: str, resume_from: str, log_file: str) -> None:
             raise
 
     set_job_log_file(None)
-    run_translate_stage.delay(job_id, resume_from, log_file)
+    if _settings.pipeline_mode == "segments":
+        _chain(run_segment_stages, job_id, resume_from, log_file)
+    else:
+        _chain(run_translate_stage, job_id, resume_from, log_file)
 
 
 @shared_task(name="workers.pipeline.run_translate_stage", **_TASK_RETRY_KWARGS)
 def run_translate_stage(self, job_id: str, resume_from: str, log_file: str) -> None:
+    from ..mt.translate import translate_segments
+
     set_job_log_file(Path(log_file))
     job, asset = _load_job(job_id)
     resume_stage = _parse_resume(resume_from)
     workspace = asset_workspace(asset.external_id)
     asr_path = workspace / "asr" / "segments_src.json"
-    if not asr_path.exists():
+    if artifacts.ensure_stage_inputs(asset.external_id, JobStage.TRANSLATE, []):
         job_state.mark_failure(job_id, JobStage.TRANSLATE, "Missing ASR output")
         set_job_log_file(None)
         raise RuntimeError("ASR output missing; cannot translate")
 
     languages = _target_languages(job, asset)
     missing = artifacts.missing_translations(asset.external_id, languages)
+    _log_resume(job_id, asset.external_id, JobStage.TRANSLATE, languages, missing)
     artifact_ready = len(missing) == 0
+    if _stage_cancelled(job_id, asset.external_id, JobStage.TRANSLATE.value):
+        return
     _update_job(job_id, JobStage.TRANSLATE, STAGE_PROGRESS[JobStage.TRANSLATE])
 
     if _should_skip(JobStage.TRANSLATE, resume_stage, artifact_ready):
@@ -289,6 +367,10 @@ def run_translate_stage(self, job_id: str, resume_from: str, log_file: str) -> N
             if timer and timer.duration_ms is not None:
                 details["durationMs"] = timer.duration_ms
             job_state.record_stage_history(job_id, JobStage.TRANSLATE.value, "success", details)
+            artifacts.record_stage_outputs(asset.external_id, JobStage.TRANSLATE, missing)
+        except JobCancelled:
+            _record_cancelled(job_id, asset.external_id, JobStage.TRANSLATE.value)
+            return
         except Exception as exc:
             retries, will_retry = _retry_state(self)
             attempt = retries + 1
@@ -311,17 +393,22 @@ def run_translate_stage(self, job_id: str, resume_from: str, log_file: str) -> N
             raise
 
     set_job_log_file(None)
-    run_tts_stage.delay(job_id, resume_from, log_file)
+    _chain(run_tts_stage, job_id, resume_from, log_file)
 
 
 @shared_task(name="workers.pipeline.run_tts_stage", **_TASK_RETRY_KWARGS)
 def run_tts_stage(self, job_id: str, resume_from: str, log_file: str) -> None:
+    from ..tts.synth import synthesize_segments
+
     set_job_log_file(Path(log_file))
     job, asset = _load_job(job_id)
     resume_stage = _parse_resume(resume_from)
     languages = _target_languages(job, asset)
-    missing = artifacts.missing_tts_segments(asset.external_id, languages)
+    missing = artifacts.missing_tts_segments(asset.external_id, languages, job.presets)
+    _log_resume(job_id, asset.external_id, JobStage.TTS, languages, missing)
     artifact_ready = len(missing) == 0
+    if _stage_cancelled(job_id, asset.external_id, JobStage.TTS.value):
+        return
     _update_job(job_id, JobStage.TTS, STAGE_PROGRESS[JobStage.TTS])
 
     if _should_skip(JobStage.TTS, resume_stage, artifact_ready):
@@ -340,10 +427,13 @@ def run_tts_stage(self, job_id: str, resume_from: str, log_file: str) -> None:
                 metadata={"targets": languages},
             ) as stage_timer:
                 timer = stage_timer
+                missing_inputs = artifacts.ensure_stage_inputs(asset.external_id, JobStage.TTS, missing)
+                if missing_inputs:
+                    raise RuntimeError(f"Missing TTS inputs: {missing_inputs}")
                 for lang in languages:
-                    segments_path = translations_dir / f"segments_tgt.{lang}.json"
-                    translated_segments = json.loads(segments_path.read_text(encoding="utf-8"))
                     if lang in missing:
+                        segments_path = translations_dir / f"segments_tgt.{lang}.json"
+                        translated_segments = json.loads(segments_path.read_text(encoding="utf-8"))
                         synthesize_segments(
                             translated_segments,
                             workspace / "tts" / lang,
@@ -355,6 +445,10 @@ def run_tts_stage(self, job_id: str, resume_from: str, log_file: str) -> None:
             if timer and timer.duration_ms is not None:
                 details["durationMs"] = timer.duration_ms
             job_state.record_stage_history(job_id, JobStage.TTS.value, "success", details)
+            artifacts.record_stage_outputs(asset.external_id, JobStage.TTS, missing, job.presets)
+        except JobCancelled:
+            _record_cancelled(job_id, asset.external_id, JobStage.TTS.value)
+            return
         except Exception as exc:
             retries, will_retry = _retry_state(self)
             attempt = retries + 1
@@ -377,27 +471,35 @@ def run_tts_stage(self, job_id: str, resume_from: str, log_file: str) -> None:
             raise
 
     set_job_log_file(None)
-    run_mix_stage.delay(job_id, resume_from, log_file)
+    _chain(run_mix_stage, job_id, resume_from, log_file)
 
 
 @shared_task(name="workers.pipeline.run_mix_stage", **_TASK_RETRY_KWARGS)
 def run_mix_stage(self, job_id: str, resume_from: str, log_file: str) -> None:
+    from ..mix.assemble import assemble_track
+    from ..mix.publisher import PublishQueue
+
     set_job_log_file(Path(log_file))
     job, asset = _load_job(job_id)
     resume_stage = _parse_resume(resume_from)
     languages = _target_languages(job, asset)
     missing = artifacts.missing_mixes(asset.external_id, languages)
+    _log_resume(job_id, asset.external_id, JobStage.ALIGN_MIX, languages, missing)
     artifact_ready = len(missing) == 0
+    if _stage_cancelled(job_id, asset.external_id, JobStage.ALIGN_MIX.value):
+        return
     _update_job(job_id, JobStage.ALIGN_MIX, STAGE_PROGRESS[JobStage.ALIGN_MIX])
 
     workspace = asset_workspace(asset.external_id)
-    audio_path = _ensure_source_audio(asset, workspace)
 
     if _should_skip(JobStage.ALIGN_MIX, resume_stage, artifact_ready):
         job_state.record_stage_history(job_id, JobStage.ALIGN_MIX.value, "skipped", {"languages": languages})
         log_event(job_id=job_id, asset_id=asset.external_id, stage=JobStage.ALIGN_MIX.value, event="SKIP", message="Mix reused")
     else:
         lang_status: Dict[str, str] = {lang: "existing" for lang in languages if lang not in missing}
+        # Publishing overlaps with mixing: each finished language uploads while the next one mixes.
+        publisher = PublishQueue(asset.external_id) if _settings.publish_during_mix else None
+        published: Dict[str, dict] = {}
         timer = None
         try:
             with stage_context(
@@ -405,14 +507,20 @@ def run_mix_stage(self, job_id: str, resume_from: str, log_file: str) -> None:
                 asset_id=asset.external_id,
                 stage=JobStage.ALIGN_MIX.value,
                 metadata={"targets": languages},
-            ) as stage_timer:
+            ) as stage_timer, _source_audio(asset, workspace) as audio_path, publisher or nullcontext():
                 timer = stage_timer
+                missing_inputs = artifacts.ensure_stage_inputs(asset.external_id, JobStage.ALIGN_MIX, missing, job.presets)
+                if missing_inputs:
+                    raise RuntimeError(f"Missing mix inputs: {missing_inputs}")
+                if publisher is not None:
+                    for lang in _missing_packages(asset, languages):
+                        if lang not in missing:
+                            publisher.submit(lang, mix_output_file(asset.external_id, lang))
                 for lang in languages:
-                    segments_path = workspace / "translations" / f"segments_tgt.{lang}.json"
-                    translated_segments = json.loads(segments_path.read_text(encoding="utf-8"))
-                    tts_dir = workspace / "tts" / lang
-                    synth_paths = sorted(tts_dir.glob("seg_*.wav"))
                     if lang in missing:
+                        segments_path = workspace / "translations" / f"segments_tgt.{lang}.json"
+                        translated_segments = json.loads(segments_path.read_text(encoding="utf-8"))
+                        synth_paths = tts_segment_files(workspace / "tts" / lang)
                         final_audio = assemble_track(
                             translated_segments,
                             synth_paths,
@@ -423,10 +531,21 @@ def run_mix_stage(self, job_id: str, resume_from: str, log_file: str) -> None:
                         if not final_audio.exists():
                             raise RuntimeError(f"Mix failed for {lang}")
                         lang_status[lang] = "success"
-            details = {"languages": lang_status}
+                        if publisher is not None:
+                            publisher.submit(lang, final_audio)
+                if publisher is not None:
+                    published = publisher.wait()
+            details = {"languages": lang_status, "diskBytes": directory_size_bytes(workspace)}
+            if publisher is not None:
+                details["published"] = sorted(published)
+                details["uploadBytes"] = publisher.upload_bytes
             if timer and timer.duration_ms is not None:
                 details["durationMs"] = timer.duration_ms
             job_state.record_stage_history(job_id, JobStage.ALIGN_MIX.value, "success", details)
+            artifacts.record_stage_outputs(asset.external_id, JobStage.ALIGN_MIX, missing)
+        except JobCancelled:
+            _record_cancelled(job_id, asset.external_id, JobStage.ALIGN_MIX.value)
+            return
         except Exception as exc:
             retries, will_retry = _retry_state(self)
             attempt = retries + 1
@@ -449,31 +568,207 @@ def run_mix_stage(self, job_id: str, resume_from: str, log_file: str) -> None:
             raise
 
     set_job_log_file(None)
-    run_package_stage.delay(job_id, resume_from, log_file)
+    _chain(run_package_stage, job_id, resume_from, log_file)
+
+
+@shared_task(name="workers.pipeline.run_segment_stages", **_TASK_RETRY_KWARGS)
+def run_segment_stages(self, job_id: str, resume_from: str, log_file: str) -> None:
+    """TRANSLATE, TTS and ALIGN/MIX at segment granularity (`PIPELINE_MODE=segments`)."""
+    from .streaming import stream_language
+
+    set_job_log_file(Path(log_file))
+    job, asset = _load_job(job_id)
+    workspace = asset_workspace(asset.external_id)
+    asr_path = workspace / "asr" / "segments_src.json"
+    if artifacts.ensure_stage_inputs(asset.external_id, JobStage.TRANSLATE, []):
+        job_state.mark_failure(job_id, JobStage.TRANSLATE, "Missing ASR output")
+        set_job_log_file(None)
+        raise RuntimeError("ASR output missing; cannot translate")
+
+    languages = _target_languages(job, asset)
+    missing = artifacts.missing_mixes(asset.external_id, languages)
+    _log_resume(job_id, asset.external_id, JobStage.ALIGN_MIX, languages, missing)
+    if _stage_cancelled(job_id, asset.external_id, JobStage.TTS.value):
+        return
+    _update_job(job_id, JobStage.TTS, STAGE_PROGRESS[JobStage.TTS])
+
+    lang_status: Dict[str, str] = {lang: "existing" for lang in languages if lang not in missing}
+    streaming: Dict[str, dict] = {}
+    timer = None
+    try:
+        with stage_context(
+            job_id=job_id,
+            asset_id=asset.external_id,
+            stage="SEGMENTS",
+            metadata={"targets": languages},
+        ) as stage_timer, _source_audio(asset, workspace) as audio_path:
+            timer = stage_timer
+            segments = json.loads(asr_path.read_text(encoding="utf-8"))
+            for lang in languages:
+                if lang in missing:
+                    result = stream_language(
+                        asset.external_id,
+                        lang,
+                        segments,
+                        voice_presets=job.presets,
+                        source_audio=audio_path,
+                    )
+                    lang_status[lang] = "success"
+                    streaming[lang] = {
+                        "timeToFirstAudioMs": result.time_to_first_audio_ms,
+                        "durationMs": result.duration_ms,
+                        "chunks": len(result.chunks),
+                        "reusedSegments": result.reused,
+                    }
+        details = {"languages": lang_status, "mode": "segments"}
+        job_state.record_stage_history(job_id, JobStage.TRANSLATE.value, "success", details)
+        job_state.record_stage_history(job_id, JobStage.TTS.value, "success", details)
+        details = {**details, "streaming": streaming, "diskBytes": directory_size_bytes(workspace)}
+        if timer and timer.duration_ms is not None:
+            details["durationMs"] = timer.duration_ms
+        job_state.record_stage_history(job_id, JobStage.ALIGN_MIX.value, "success", details)
+        artifacts.record_stage_outputs(asset.external_id, JobStage.TRANSLATE, missing)
+        artifacts.record_stage_outputs(asset.external_id, JobStage.TTS, missing, job.presets)
+        artifacts.record_stage_outputs(asset.external_id, JobStage.ALIGN_MIX, missing)
+    except JobCancelled:
+        _record_cancelled(job_id, asset.external_id, JobStage.TTS.value)
+        return
+    except Exception as exc:
+        retries, will_retry = _retry_state(self)
+        attempt = retries + 1
+        details = {"error": str(exc), "attempt": attempt, "mode": "segments"}
+        if timer and timer.duration_ms is not None:
+            details["durationMs"] = timer.duration_ms
+        status = "retrying" if will_retry else "failed"
+        job_state.record_stage_history(job_id, JobStage.TTS.value, status, details)
+        set_job_log_file(None)
+        if will_retry:
+            log_event(
+                job_id=job_id,
+                asset_id=asset.external_id,
+                stage=JobStage.TTS.value,
+                event="RETRY",
+                message=f"Segment pipeline failed (attempt {attempt}), retrying",
+            )
+            raise
+        job_state.mark_failure(job_id, JobStage.TTS, str(exc))
+        raise
+
+    set_job_log_file(None)
+    _chain(run_package_stage, job_id, resume_from, log_file)
+
+
+@shared_task(name="workers.pipeline.run_redub_stage", **_TASK_RETRY_KWARGS)
+def run_redub_stage(self, job_id: str, log_file: Optional[str] = None) -> None:
+    """Re-synthesize edited (dirty) segments, patch them into the mix and republish."""
+    from ..mix.publisher import PublishQueue
+    from .redub import redub_language
+
+    job, asset = _load_job(job_id)
+    if log_file is None:
+        log_path = job_log_path(asset.external_id, job.external_id)
+        log_path.parent.mkdir(parents=True, exist_ok=True)
+        log_file = str(log_path)
+    set_job_log_file(Path(log_file))
+    languages = list(job.target_langs)
+    if _stage_cancelled(job_id, asset.external_id, "REDUB"):
+        return
+    _update_job(job_id, JobStage.TTS, STAGE_PROGRESS[JobStage.TTS])
+
+    lang_status: Dict[str, dict] = {}
+    timer = None
+    try:
+        with stage_context(
+            job_id=job_id,
+            asset_id=asset.external_id,
+            stage="REDUB",
+            metadata={"targets": languages},
+        ) as stage_timer:
+            timer = stage_timer
+            missing_inputs = artifacts.ensure_stage_inputs(asset.external_id, JobStage.ALIGN_MIX, languages, job.presets)
+            missing_mix = artifacts.missing_mixes(asset.external_id, languages)
+            if missing_inputs or missing_mix:
+                raise RuntimeError(f"Nothing to patch (missing {missing_inputs or missing_mix}); retry from TTS instead")
+            with PublishQueue(asset.external_id) as publisher:
+                for lang in languages:
+                    edits = segment_edits.dirty_segments(asset.external_id, lang)
+                    if not edits:
+                        lang_status[lang] = {"segments": 0}
+                        continue
+                    result = redub_language(asset.external_id, lang, edits, voice_presets=job.presets)
+                    if result.segments:
+                        publisher.submit(lang, result.mix_path)
+                    lang_status[lang] = {
+                        "segments": len(result.segments),
+                        "patchedSeconds": result.patched_seconds,
+                        "durationMs": result.duration_ms,
+                    }
+                    lang_status[lang]["cleared"] = segment_edits.mark_redubbed(asset.external_id, lang, result.segments)
+                    if result.skipped:
+                        # Edits of segments the dub does not have would fail every later run.
+                        segment_edits.drop_edits(asset.external_id, lang, result.skipped)
+                        lang_status[lang]["skipped"] = result.skipped
+                publisher.wait()
+            changed = [lang for lang, status in lang_status.items() if status["segments"]]
+            artifacts.record_stage_outputs(asset.external_id, JobStage.TRANSLATE, changed)
+            artifacts.record_stage_outputs(asset.external_id, JobStage.TTS, changed, job.presets)
+            artifacts.record_stage_outputs(asset.external_id, JobStage.ALIGN_MIX, changed)
+        details = {"languages": lang_status, "uploadBytes": publisher.upload_bytes}
+        if timer and timer.duration_ms is not None:
+            details["durationMs"] = timer.duration_ms
+        job_state.record_stage_history(job_id, "REDUB", "success", details)
+    except JobCancelled:
+        _record_cancelled(job_id, asset.external_id, "REDUB")
+        return
+    except Exception as exc:
+        retries, will_retry = _retry_state(self)
+        attempt = retries + 1
+        details = {"error": str(exc), "attempt": attempt}
+        if timer and timer.duration_ms is not None:
+            details["durationMs"] = timer.duration_ms
+        status = "retrying" if will_retry else "failed"
+        job_state.record_stage_history(job_id, "REDUB", status, details)
+        set_job_log_file(None)
+        if will_retry:
+            log_event(
+                job_id=job_id,
+                asset_id=asset.external_id,
+                stage="REDUB",
+                event="RETRY",
+                message=f"Re-dub failed (attempt {attempt}), retrying",
+            )
+            raise
+        job_state.mark_failure(job_id, JobStage.TTS, str(exc))
+        raise
+
+    set_job_log_file(None)
+    _chain(finalize_job, job_id, log_file)
 
 
 @shared_task(name="workers.pipeline.run_package_stage", **_TASK_RETRY_KWARGS)
 def run_package_stage(self, job_id: str, resume_from: str, log_file: str) -> None:
+    from ..mix.publisher import PublishQueue
+
     set_job_log_file(Path(log_file))
     job, asset = _load_job(job_id)
     resume_stage = _parse_resume(resume_from)
     languages = _target_languages(job, asset)
     missing = _missing_packages(asset, languages)
     artifact_ready = len(missing) == 0
+    if _stage_cancelled(job_id, asset.external_id, JobStage.PACKAGE.value):
+        return
     _update_job(job_id, JobStage.PACKAGE, STAGE_PROGRESS[JobStage.PACKAGE])
 
-    storage_keys = asset.storage_keys or {}
-    asset.storage_keys = storage_keys
-
     if _should_skip(JobStage.PACKAGE, resume_stage, artifact_ready):
         job_state.record_stage_history(job_id, JobStage.PACKAGE.value, "skipped", {"languages": languages})
         log_event(job_id=job_id, asset_id=asset.external_id, stage=JobStage.PACKAGE.value, event="SKIP", message="Package reused")
         set_job_log_file(None)
-        finalize_job.delay(job_id, log_file)
+        _chain(finalize_job, job_id, log_file)
         return
 
     lang_status: Dict[str, str] = {lang: "existing" for lang in languages if lang not in missing}
-    public_dir = asset_public_dir(asset.external_id)
+    upload_bytes = 0
+    encode_ms = 0.0
     timer = None
     try:
         with stage_context(
@@ -483,23 +778,30 @@ def run_package_stage(self, job_id: str, resume_from: str, log_file: str) -> Non
             metadata={"targets": languages},
         ) as stage_timer:
             timer = stage_timer
-            for lang in languages:
-                mix_path = mix_output_file(asset.external_id, lang)
-                if not mix_path.exists():
-                    raise RuntimeError(f"Missing mix output for {lang}")
-                if lang in missing:
-                    publish_info = publish_track(asset.external_id, lang, mix_path, public_dir)
-                    master_key = publish_info["master"]
-                    audio_key = publish_info["audio"]
-                    if "public" not in asset.storage_keys:
-                        asset.storage_keys["public"] = master_key
-                    asset.storage_keys[f"public_{lang}"] = audio_key
-                    asset_state.update_storage_keys(asset.external_id, asset.storage_keys)
-                    lang_status[lang] = "success"
-        details = {"languages": lang_status}
+            pending = [lang for lang in languages if lang in missing]
+            missing_inputs = artifacts.ensure_stage_inputs(asset.external_id, JobStage.PACKAGE, pending)
+            if missing_inputs:
+                raise RuntimeError(f"Missing mix output for {', '.join(missing_inputs[JobStage.ALIGN_MIX.value])}")
+            with PublishQueue(asset.external_id, workers=_settings.artifact_encode_workers) as publisher:
+                for lang in pending:
+                    publisher.submit(lang, mix_output_file(asset.external_id, lang))
+                publisher.wait()
+            upload_bytes = publisher.upload_bytes
+            encode_ms = round(publisher.encode_ms, 2)
+            for lang in pending:
+                lang_status[lang] = "success"
+        details = {
+            "languages": lang_status,
+            "uploadBytes": upload_bytes,
+            "encodeMs": encode_ms,
+            "diskBytes": directory_size_bytes(asset_workspace(asset.external_id)),
+        }
         if timer and timer.duration_ms is not None:
             details["durationMs"] = timer.duration_ms
         job_state.record_stage_history(job_id, JobStage.PACKAGE.value, "success", details)
+    except JobCancelled:
+        _record_cancelled(job_id, asset.external_id, JobStage.PACKAGE.value)
+        return
     except Exception as exc:
         retries, will_retry = _retry_state(self)
         attempt = retries + 1
@@ -522,14 +824,22 @@ def run_package_stage(self, job_id: str, resume_from: str, log_file: str) -> Non
         raise
 
     set_job_log_file(None)
-    finalize_job.delay(job_id, log_file)
+    _chain(finalize_job, job_id, log_file)
 
 
 @shared_task(name="workers.pipeline.finalize_job")
 def finalize_job(job_id: str, log_file: str) -> None:
     set_job_log_file(Path(log_file))
     job, asset = _load_job(job_id)
-    log_event(job_id=job_id, asset_id=asset.external_id, stage="PIPELINE", event="END", message="Pipeline finished")
+    cancelled = cancellation.is_cancelled(job_id, max_age=0)
+    log_event(
+        job_id=job_id,
+        asset_id=asset.external_id,
+        stage="PIPELINE",
+        event="END",
+        message="Pipeline cancelled" if cancelled else "Pipeline finished",
+    )
     _persist_job_logs(job, asset, Path(log_file))
-    job_state.mark_success(job_id)
+    if not cancelled:
+        job_state.mark_success(job_id)
     set_job_log_file(None)
@@ -0,0 +1,70 @@
+import json
+from pathlib import Path
+
+import numpy as np
+import pytest
+import soundfile as sf
+
+from workers import batch
+from workers.common import storage
+from workers.mt import translate
+
+
+@pytest.fixture
+def local_storage(tmp_path: Path, monkeypatch) -> Path:
+    root = tmp_path / "objects"
+    monkeypatch.setattr(storage.settings, "storage_backend", "local")
+    monkeypatch.setattr(storage.settings, "local_storage_dir", str(root))
+    return root
+
+
+def _clip(path: Path, seconds: float = 2.0) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    sf.write(path, (0.1 * np.sin(np.arange(int(16000 * seconds)) * 0.05)).astype(np.float32), 16000)
+    return path
+
+
+def test_local_storage_round_trip(local_storage: Path, tmp_path: Path) -> None:
+    source = tmp_path / "in.bin"
+    source.write_bytes(b"0123456789")
+
+    storage.upload_from_path("proc", "a/b.bin", source)
+    storage.upload_bytes("proc", "a/c.json", b"{}", "application/json")
+
+    assert (local_storage / "proc" / "a" / "b.bin").read_bytes() == b"0123456789"
+    assert storage.read_range("proc", "a/b.bin", 2, 3) == b"234"
+    assert storage.object_size("proc", "a/b.bin") == 10
+    assert storage.download_bytes("proc", "a/c.json") == b"{}"
+    assert storage.download_bytes("proc", "a/missing") is None
+    copied = storage.download_to_path("proc", "a/b.bin", tmp_path / "out.bin")
+    assert copied.read_bytes() == b"0123456789"
+
+
+def test_discover_reads_directories_and_manifests(tmp_path: Path) -> None:
+    first = _clip(tmp_path / "media" / "a.wav")
+    second = _clip(tmp_path / "media" / "nested" / "b.flac")
+    (tmp_path / "media" / "notes.txt").write_text("not media", encoding="utf-8")
+    manifest = tmp_path / "list.txt"
+    manifest.write_text("# back catalog\nmedia/a.wav\n\nmedia/nested/b.flac\n", encoding="utf-8")
+    (tmp_path / "list.json").write_text(json.dumps([str(second)]), encoding="utf-8")
+
+    assert batch.discover([tmp_path / "media"]) == [first.resolve(), second.resolve()]
+    assert batch.discover([manifest, tmp_path / "list.json"]) == [first.resolve(), second.resolve()]
+    assert batch.asset_id_for(first) == batch.asset_id_for(first)
+    assert batch.asset_id_for(first) != batch.asset_id_for(tmp_path / "other" / "a.wav")
+
+
+def test_process_file_runs_every_stage_locally(local_storage: Path, tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setattr(translate, "translation_client", lambda: None)
+    source = _clip(tmp_path / "media" / "Episode 01.wav")
+
+    result = batch.process_file(source, ["es", "fr"], tmp_path / "out")
+
+    assert result.error is None
+    assert result.asset_id.startswith("episode-01-")
+    assert set(result.stage_seconds) == set(batch.STAGES)
+    assert result.audio_seconds == pytest.approx(2.0)
+    for lang in ("es", "fr"):
+        assert (local_storage / "pub" / result.outputs[lang]).exists()
+    summary = batch.summarize([result], wall_seconds=1.0)
+    assert "1/1 files" in summary and "PACKAGE" in summary
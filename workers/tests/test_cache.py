@@ -0,0 +1,103 @@
+import fcntl
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from workers.common import cache
+from workers.pipeline import tasks
+
+
+def _setup(tmp_path: Path, monkeypatch, active: set[str]) -> Path:
+    proc_dir = tmp_path / "proc"
+    proc_dir.mkdir()
+    monkeypatch.setattr(cache, "DATA_DIR", tmp_path)
+    monkeypatch.setattr(cache, "PROC_DIR", proc_dir)
+    monkeypatch.setattr(cache, "INDEX_PATH", proc_dir / ".artifact_cache.json")
+    monkeypatch.setattr(cache, "LOCK_PATH", proc_dir / ".artifact_cache.lock")
+    monkeypatch.setattr(cache, "PINS_DIR", proc_dir / ".artifact_pins")
+    monkeypatch.setattr(cache, "_active_assets", lambda: set(active))
+    return proc_dir
+
+
+def _make_unit(proc_dir: Path, asset: str, size: int) -> Path:
+    unit = proc_dir / asset / "tts" / "es"
+    unit.mkdir(parents=True)
+    (unit / "seg_0000.flac").write_bytes(b"x" * size)
+    return unit
+
+
+def test_enforce_budget_evicts_least_recently_used(tmp_path: Path, monkeypatch) -> None:
+    proc_dir = _setup(tmp_path, monkeypatch, active=set())
+    oldest = _make_unit(proc_dir, "asset-a", 600)
+    newest = _make_unit(proc_dir, "asset-b", 600)
+    cache.record(oldest)
+    cache.record(newest)
+    assert cache.lookup(newest) is True
+
+    assert cache.enforce_budget(budget_bytes=1000) == 1
+    assert not oldest.exists()
+    assert newest.exists()
+    assert cache.lookup(oldest) is False
+
+
+def test_pinned_assets_are_never_evicted(tmp_path: Path, monkeypatch) -> None:
+    proc_dir = _setup(tmp_path, monkeypatch, active={"asset-running"})
+    running = _make_unit(proc_dir, "asset-running", 600)
+    local = _make_unit(proc_dir, "asset-local", 600)
+    cache.record(running)
+    cache.record(local)
+
+    with cache.pinned("asset-local"):
+        assert cache.enforce_budget(budget_bytes=100) == 0
+    assert running.exists() and local.exists()
+    assert cache.enforce_budget(budget_bytes=100) == 1
+    assert running.exists() and not local.exists()
+
+
+def test_pins_of_dead_processes_are_dropped(tmp_path: Path, monkeypatch) -> None:
+    proc_dir = _setup(tmp_path, monkeypatch, active=set())
+    unit = _make_unit(proc_dir, "asset-a", 600)
+    cache.record(unit)
+    cache.PINS_DIR.mkdir()
+    stale = cache.PINS_DIR / "asset-a.999999999.0"  # no such pid
+    stale.touch()
+
+    assert cache.enforce_budget(budget_bytes=100) == 1
+    assert not stale.exists() and not unit.exists()
+
+
+def test_in_flight_jobs_are_queried_outside_the_node_lock(tmp_path: Path, monkeypatch) -> None:
+    proc_dir = _setup(tmp_path, monkeypatch, active=set())
+    cache.record(_make_unit(proc_dir, "asset-a", 600))
+
+    def active_assets() -> set[str]:
+        with cache.LOCK_PATH.open("a+") as lock_fp:
+            fcntl.flock(lock_fp, fcntl.LOCK_EX | fcntl.LOCK_NB)  # raises if the lock is held
+            fcntl.flock(lock_fp, fcntl.LOCK_UN)
+        return set()
+
+    monkeypatch.setattr(cache, "_active_assets", active_assets)
+    assert cache.enforce_budget(budget_bytes=100) == 1
+    monkeypatch.setattr(cache, "_active_assets", lambda: pytest.fail("queried while within budget"))
+    assert cache.enforce_budget(budget_bytes=100) == 0
+
+
+def test_source_audio_and_renditions_count_against_the_budget(tmp_path: Path, monkeypatch) -> None:
+    proc_dir = _setup(tmp_path, monkeypatch, active={"asset-b"})
+    workspace = proc_dir / "asset-a"
+    workspace.mkdir()
+    (workspace / "source.wav").write_bytes(b"x" * 600)
+    asset = SimpleNamespace(storage_keys={"raw": "asset-a/source.mp4"})
+    with tasks._source_audio(asset, workspace) as audio_path:
+        assert audio_path == workspace / "source.wav"
+    renditions = {}
+    for asset_id in ("asset-a", "asset-b"):
+        renditions[asset_id] = tmp_path / "pub" / asset_id / "es"
+        renditions[asset_id].mkdir(parents=True)
+        (renditions[asset_id] / "dubbed.opus").write_bytes(b"x" * 300)
+        cache.record(renditions[asset_id])
+
+    assert cache.enforce_budget(budget_bytes=500) == 2
+    assert not (workspace / "source.wav").exists() and not renditions["asset-a"].exists()
+    assert renditions["asset-b"].exists()  # asset-b has a job in flight
@@ -0,0 +1,63 @@
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+from workers.common import cancellation
+from workers.tts import synth
+
+
+@pytest.fixture
+def cancelled(monkeypatch) -> set[str]:
+    jobs: set[str] = set()
+    monkeypatch.setattr(
+        cancellation, "_cancel_requested_at", lambda job_id: datetime.utcnow() if job_id in jobs else None
+    )
+    return jobs
+
+
+def test_checkpoint_is_noop_outside_a_stage(cancelled: set[str]) -> None:
+    cancelled.add("job-1")
+    cancellation.checkpoint()
+
+
+def test_checkpoint_raises_for_watched_job(cancelled: set[str], monkeypatch) -> None:
+    monkeypatch.setattr(cancellation._settings, "cancel_check_interval_seconds", 0.0)
+    with cancellation.watch("job-1"):
+        cancellation.checkpoint()
+        cancelled.add("job-1")
+        with pytest.raises(cancellation.JobCancelled):
+            cancellation.checkpoint()
+
+
+def test_tts_stops_between_segments(cancelled: set[str], tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setattr(cancellation._settings, "cancel_check_interval_seconds", 0.0)
+    segments = [{"idx": idx, "t0": idx, "t1": idx + 0.5, "text_tgt": f"line {idx}"} for idx in range(5)]
+    original = synth.synthesize_segment
+
+    def synthesize(segment, output_dir, language, voice_presets=None):
+        if segment["idx"] == 2:
+            cancelled.add("job-1")
+        return original(segment, output_dir, language, voice_presets)
+
+    monkeypatch.setattr(synth, "synthesize_segment", synthesize)
+    with cancellation.watch("job-1"), pytest.raises(cancellation.JobCancelled):
+        synth.synthesize_segments(segments, tmp_path, "es")
+    assert len(list(tmp_path.iterdir())) == 3
+
+
+def test_run_process_kills_cancelled_command(cancelled: set[str], monkeypatch) -> None:
+    monkeypatch.setattr(cancellation._settings, "cancel_check_interval_seconds", 0.0)
+    cancelled.add("job-1")
+    started = time.monotonic()
+    with cancellation.watch("job-1"), pytest.raises(cancellation.JobCancelled):
+        cancellation.run_process([sys.executable, "-c", "import time; time.sleep(30)"], poll_seconds=0.05)
+    assert time.monotonic() - started < 5
+
+
+def test_run_process_reports_failures() -> None:
+    with pytest.raises(subprocess.CalledProcessError):
+        cancellation.run_process([sys.executable, "-c", "raise SystemExit(3)"], poll_seconds=0.05)
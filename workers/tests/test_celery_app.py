@@ -0,0 +1,30 @@
+from types import SimpleNamespace
+
+from workers import celery_app as celery_module
+from workers.celery_app import STAGE_ROUTES, celery_app, enqueued_at
+
+
+def test_stages_route_to_dedicated_queues() -> None:
+    routes = celery_app.conf.task_routes
+    assert routes["workers.pipeline.run_asr_stage"] == {"queue": "asr"}
+    assert routes["workers.pipeline.run_translate_stage"] == {"queue": "mt"}
+    assert routes["workers.pipeline.run_package_stage"] == {"queue": "package"}
+    assert {queue.name for queue in celery_app.conf.task_queues} == {queue for _, queue in STAGE_ROUTES.values()}
+    assert celery_app.conf.task_acks_late is True
+    assert celery_app.conf.worker_prefetch_multiplier == 1
+
+
+def test_queue_wait_is_observed_from_publish_header(monkeypatch) -> None:
+    observed = []
+    monkeypatch.setattr(celery_module.metrics, "report_queue_wait", lambda *args: observed.append(args))
+    monkeypatch.setattr(celery_module.time, "time", lambda: 110.0)
+
+    headers: dict = {}
+    celery_module._stamp_enqueue_time(headers=headers)
+    assert headers["enqueued_at"] == 110.0
+
+    request = SimpleNamespace(headers={"enqueued_at": 100.0}, delivery_info={"routing_key": "asr"})
+    assert enqueued_at(request) == 100.0
+    task = SimpleNamespace(name="workers.pipeline.run_asr_stage", request=request)
+    celery_module._observe_queue_wait(task=task)
+    assert observed == [("ASR", "asr", 10.0)]
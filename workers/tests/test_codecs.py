@@ -0,0 +1,78 @@
+import threading
+from pathlib import Path
+
+import numpy as np
+import soundfile as sf
+
+from workers.common import codecs, paths
+from workers.config import get_settings
+from workers.mix.assemble import assemble_track
+from workers.tts.synth import synthesize_segment, synthesize_segments
+
+
+def test_write_intermediate_uses_lossless_codec(tmp_path: Path) -> None:
+    audio = 0.1 * np.sin(np.linspace(0, 100, 48_000)).astype(np.float32)
+    written = codecs.write_intermediate(tmp_path / "seg_0000.wav", audio, 48_000)
+    assert written.suffix == ".flac"
+    decoded, sr = sf.read(written)
+    assert sr == 48_000
+    assert np.allclose(decoded, audio, atol=1e-4)
+
+
+def test_write_scratch_float16_roundtrip(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setattr(codecs._settings, "artifact_scratch_float16", True)
+    audio = np.linspace(-0.5, 0.5, 1000).astype(np.float32)
+    written = codecs.write_scratch(tmp_path / "voice_es.wav", audio, 48_000)
+    assert written.suffix == ".npz"
+    decoded, sr = codecs.read_audio(written)
+    assert sr == 48_000
+    assert decoded.dtype == np.float32
+    assert np.allclose(decoded, audio, atol=1e-3)
+
+
+def test_encode_for_publish_runs_in_parallel(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setattr(codecs._settings, "artifact_encode_workers", 3)
+    sources = []
+    for idx in range(3):
+        path = tmp_path / f"mix_{idx}.flac"
+        sf.write(path, np.zeros(48_000, dtype=np.float32), 48_000)
+        sources.append(path)
+    # Every encode waits for the other two, so this only finishes if all three overlap.
+    started = threading.Barrier(len(sources), timeout=10)
+
+    def encode(src: Path) -> Path:
+        started.wait()
+        return codecs.encode_for_publish(src, tmp_path / src.stem)
+
+    outputs = codecs.run_parallel([lambda src=src: encode(src) for src in sources])
+    assert [out.parent.name for out in outputs] == [src.stem for src in sources]
+    for out in outputs:
+        assert out.suffix in {".opus", ".wav"}
+
+
+def test_switching_formats_leaves_one_file_per_render_and_mix(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setattr(paths, "PROC_DIR", tmp_path)
+    settings = get_settings()
+    monkeypatch.setattr(settings, "artifact_intermediate_format", "wav")
+    monkeypatch.setattr(settings, "artifact_scratch_float16", False)
+    segments = [{"idx": idx, "t0": idx * 2.0, "t1": idx * 2.0 + 1.0 + idx, "text_tgt": f"línea {idx}"} for idx in range(2)]
+    tts_dir = paths.tts_segment_path("asset-1", "es")
+    mix_dir = paths.mix_output_dir("asset-1", "es")
+    assemble_track(segments, synthesize_segments(segments, tts_dir, "es"), mix_dir, None, "es")
+
+    # A workspace from before the switch, with segment 1 rendered again afterwards.
+    monkeypatch.setattr(settings, "artifact_intermediate_format", "flac")
+    monkeypatch.setattr(settings, "artifact_scratch_float16", True)
+    synthesize_segment(segments[1], tts_dir, "es")
+    renders = paths.tts_segment_files(tts_dir)
+    assert [path.name for path in renders] == ["seg_0000.wav", "seg_0001.flac"]
+    assert sf.info(renders[1]).duration == 2.0
+    assemble_track(segments, renders, mix_dir, None, "es")
+
+    assert sorted(path.name for path in mix_dir.glob("*_es.*")) == ["background_es.npz", "voice_es.npz"]
+    assert [path.name for path in mix_dir.glob("dubbed.*")] == ["dubbed.flac"]
+    assert paths.mix_output_file("asset-1", "es").name == "dubbed.flac"
+
+    # Siblings that were not cleaned up (e.g. restored from an old manifest): the newest wins.
+    sf.write(tts_dir / "seg_0000.flac", np.zeros(48_000, dtype=np.float32), 48_000)
+    assert [path.name for path in paths.tts_segment_files(tts_dir)] == ["seg_0000.flac", "seg_0001.flac"]
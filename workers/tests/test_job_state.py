@@ -0,0 +1,142 @@
+from contextlib import contextmanager
+
+import pytest
+from sqlmodel import Session, SQLModel, create_engine, select
+
+from shared.models import Asset, Job, JobStage, JobStatus
+from shared.response_cache import entry_key
+from workers.common import jobs as job_state
+
+
+@pytest.fixture
+def job(tmp_path, monkeypatch) -> str:
+    engine = create_engine(f"sqlite:///{tmp_path / 'jobs.db'}")
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        asset = Asset(external_id="asset-1")
+        session.add(asset)
+        session.commit()
+        session.add(Job(external_id="job-1", asset_id=asset.id))
+        session.commit()
+
+    @contextmanager
+    def get_session():
+        with Session(engine) as session:
+            yield session
+
+    monkeypatch.setattr(job_state, "get_session", get_session)
+    monkeypatch.setattr(job_state, "writer", job_state.JobStateWriter(flush_seconds=60))
+    return "job-1"
+
+
+def _load(external_id: str) -> Job:
+    with job_state.get_session() as session:
+        return session.exec(select(Job).where(Job.external_id == external_id)).one()
+
+
+def test_updates_are_coalesced_into_one_write(job: str) -> None:
+    job_state.update_job(job, stage=JobStage.ASR, status=JobStatus.RUNNING, progress=0.1)
+    job_state.record_stage_history(job, "ASR", "success", {"durationMs": 5})
+    job_state.update_job(job, stage=JobStage.TRANSLATE, status=JobStatus.RUNNING, progress=0.3)
+    job_state.record_stage_history(job, "TRANSLATE", "success")
+    job_state.update_task_id(job, "task-2")
+    assert _load(job).status == JobStatus.PENDING  # still buffered
+
+    job_state.flush(job)
+    stored = _load(job)
+    assert job_state.writer.statements == 1  # history merged by the UPDATE itself
+    assert (stored.stage, stored.status, stored.progress, stored.task_id) == (
+        JobStage.TRANSLATE,
+        JobStatus.RUNNING,
+        0.3,
+        "task-2",
+    )
+    assert stored.started_at is not None
+    assert set(stored.stage_history) == {"ASR", "TRANSLATE"}
+
+    job_state.record_stage_history(job, "TTS", "success")
+    job_state.mark_success(job)  # terminal states are written immediately
+    stored = _load(job)
+    assert stored.status == JobStatus.SUCCESS and stored.ended_at is not None
+    assert set(stored.stage_history) == {"ASR", "TRANSLATE", "TTS"}
+
+
+def test_cancelled_job_keeps_its_status(job: str) -> None:
+    # The API's cancel, as seen by the write-behind writer.
+    job_state.update_job(job, stage=JobStage.DONE, status=JobStatus.CANCELLED, progress=1.0, error_message="Cancelled")
+    job_state.update_job(job, stage=JobStage.TTS, status=JobStatus.RUNNING, progress=0.5)
+    job_state.record_stage_history(job, "TTS", "cancelled")
+    job_state.flush()
+    stored = _load(job)
+    assert (stored.status, stored.stage, stored.started_at) == (JobStatus.CANCELLED, JobStage.DONE, None)
+    assert stored.stage_history["TTS"]["status"] == "cancelled"
+
+
+def test_each_write_publishes_one_event(job: str, monkeypatch) -> None:
+    published: list[dict] = []
+    monkeypatch.setattr(job_state.events, "publish", published.append)
+    job_state.update_job(job, stage=JobStage.ASR, status=JobStatus.RUNNING, progress=0.1)
+    job_state.record_stage_history(job, "ASR", "success", {"durationMs": 5})
+    job_state.update_job(job, stage=JobStage.TRANSLATE, status=JobStatus.RUNNING, progress=0.3)
+    job_state.flush(job)
+    job_state.update_task_id(job, "task-2")
+    job_state.flush(job)  # bookkeeping only; no event
+
+    assert len(published) == 1
+    event = published[0]
+    assert (event["job"], event["status"], event["stage"], event["progress"]) == (job, "RUNNING", "TRANSLATE", 0.3)
+    assert event["history"]["ASR"]["details"] == {"durationMs": 5}
+
+
+def test_each_write_drops_the_cached_response(job: str, monkeypatch) -> None:
+    invalidated: list[tuple] = []
+    monkeypatch.setattr(job_state.events, "invalidate", lambda *key: invalidated.append(key))
+    job_state.update_job(job, stage=JobStage.ASR, status=JobStatus.RUNNING, progress=0.1)
+    job_state.update_job(job, stage=JobStage.ASR, status=JobStatus.RUNNING, progress=0.2)
+    assert invalidated == []  # still buffered
+    job_state.flush(job)
+    job_state.update_task_id(job, "task-2")
+    job_state.flush(job)  # every write, not just those that publish an event
+
+    assert invalidated == [("job", job), ("job", job)]
+
+
+def test_invalidation_is_not_held_back_by_the_publish_pause(monkeypatch) -> None:
+    events = job_state.events
+    sent: list[str] = []
+    down = [True]
+
+    class Pipeline:
+        def __init__(self) -> None:
+            self.keys: list[str] = []
+
+        def delete(self, key: str) -> None:
+            self.keys.append(key)
+
+        def incr(self, key: str) -> None:
+            pass
+
+        def expire(self, key: str, seconds: int) -> None:
+            pass
+
+        def execute(self) -> None:
+            if down[0]:
+                raise ConnectionError("redis down")
+            sent.extend(self.keys)
+
+    class Redis:
+        def pipeline(self, transaction: bool = True) -> Pipeline:
+            return Pipeline()
+
+    monkeypatch.setattr(events, "_client", Redis())
+    monkeypatch.setattr(events, "_paused_until", 0.0)
+    monkeypatch.setattr(events, "_pending", set())
+    monkeypatch.setattr(events._settings, "response_cache_enabled", True)
+
+    assert not events.invalidate("job", "job-1")
+    assert not events._available()  # publishing pauses
+    down[0] = False
+    assert events.invalidate("job", "job-2")
+
+    assert sorted(sent) == [entry_key("job", "job-1"), entry_key("job", "job-2")]
+    assert events._pending == set()
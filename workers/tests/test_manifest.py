@@ -0,0 +1,119 @@
+import shutil
+import threading
+from pathlib import Path
+
+from shared.models import JobStage
+from workers.common import manifest, storage
+
+
+def _fake_object_store(monkeypatch) -> dict:
+    objects: dict[str, bytes] = {}
+    versions: dict[str, int] = {}
+
+    def upload_bytes_if_match(bucket, name, payload, content_type, etag):
+        if (str(versions[name]) if name in objects else None) != etag:
+            return False
+        objects[name] = payload
+        versions[name] = versions.get(name, 0) + 1
+        return True
+
+    def upload_from_path(bucket, name, path, content_type="application/octet-stream"):
+        objects[name] = Path(path).read_bytes()
+
+    def download_to_path(bucket, name, destination):
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        destination.write_bytes(objects[name])
+        return destination
+
+    monkeypatch.setattr(storage, "upload_from_path", upload_from_path)
+    monkeypatch.setattr(storage, "download_to_path", download_to_path)
+    monkeypatch.setattr(storage, "upload_bytes", lambda bucket, name, payload, content_type: objects.__setitem__(name, payload))
+    monkeypatch.setattr(storage, "download_bytes", lambda bucket, name: objects.get(name))
+    monkeypatch.setattr(
+        storage,
+        "download_bytes_with_etag",
+        lambda bucket, name: (objects[name], str(versions[name])) if name in objects else (None, None),
+    )
+    monkeypatch.setattr(storage, "upload_bytes_if_match", upload_bytes_if_match)
+    return objects
+
+
+def test_stage_output_resumes_on_another_node(tmp_path: Path, monkeypatch) -> None:
+    objects = _fake_object_store(monkeypatch)
+    workspace = tmp_path / "asset-1"
+    monkeypatch.setattr(manifest, "asset_workspace", lambda asset_id: workspace)
+
+    tts_dir = workspace / "tts" / "es"
+    tts_dir.mkdir(parents=True)
+    (tts_dir / "seg_0000.flac").write_bytes(b"audio-0")
+    (tts_dir / "seg_0001.flac").write_bytes(b"audio-1")
+    config = manifest.stage_config(JobStage.TTS, {"default": "neutral"})
+
+    uploaded = manifest.publish_units("asset-1", JobStage.TTS, [tts_dir], config)
+    assert uploaded == len(b"audio-0") + len(b"audio-1")
+    assert manifest.publish_units("asset-1", JobStage.TTS, [tts_dir], config) == 0
+    entry = manifest.load_manifest("asset-1")["artifacts"]["tts/es"]
+    assert entry["stage"] == JobStage.TTS.value
+    assert [item["size"] for item in entry["files"]] == [7, 7]
+
+    # Simulate a different node: empty workspace, same manifest.
+    shutil.rmtree(workspace)
+    other_config = manifest.stage_config(JobStage.TTS, {"default": "male_deep"})
+    assert manifest.sync_unit("asset-1", tts_dir, other_config) is False
+    assert manifest.sync_unit("asset-1", tts_dir, config) is True
+    assert (tts_dir / "seg_0001.flac").read_bytes() == b"audio-1"
+    assert "proc/asset-1/manifest.json" in objects
+
+
+def _tts_unit(workspace: Path, lang: str) -> Path:
+    unit = workspace / "tts" / lang
+    unit.mkdir(parents=True)
+    (unit / "seg_0000.flac").write_bytes(f"audio-{lang}".encode())
+    return unit
+
+
+def test_concurrent_publishers_keep_each_others_units(tmp_path: Path, monkeypatch) -> None:
+    _fake_object_store(monkeypatch)
+    workspace = tmp_path / "asset-1"
+    monkeypatch.setattr(manifest, "asset_workspace", lambda asset_id: workspace)
+    config = manifest.stage_config(JobStage.TTS, {"default": "neutral"})
+    es, fr = _tts_unit(workspace, "es"), _tts_unit(workspace, "fr")
+
+    # The other job publishes between this job's read and its write.
+    write = storage.upload_bytes_if_match
+    interleaved = []
+
+    def racing_write(bucket, name, payload, content_type, etag):
+        if not interleaved:
+            interleaved.append(True)
+            manifest.publish_units("asset-1", JobStage.TTS, [fr], config)
+        return write(bucket, name, payload, content_type, etag)
+
+    monkeypatch.setattr(storage, "upload_bytes_if_match", racing_write)
+    manifest.publish_units("asset-1", JobStage.TTS, [es], config)
+
+    assert set(manifest.load_manifest("asset-1")["artifacts"]) == {"tts/es", "tts/fr"}
+
+
+def test_parallel_publishers_on_the_local_backend(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setattr(storage.settings, "storage_backend", "local")
+    monkeypatch.setattr(storage.settings, "local_storage_dir", str(tmp_path / "store"))
+    monkeypatch.setattr(storage, "_known_buckets", set())
+    workspace = tmp_path / "asset-1"
+    monkeypatch.setattr(manifest, "asset_workspace", lambda asset_id: workspace)
+    config = manifest.stage_config(JobStage.TTS, {"default": "neutral"})
+    langs = [f"l{idx}" for idx in range(8)]
+    units = [_tts_unit(workspace, lang) for lang in langs]
+    start = threading.Barrier(len(units))
+
+    def publish(unit: Path) -> None:
+        start.wait()
+        manifest.publish_units("asset-1", JobStage.TTS, [unit], config)
+
+    threads = [threading.Thread(target=publish, args=(unit,)) for unit in units]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert set(manifest.load_manifest("asset-1")["artifacts"]) == {f"tts/{lang}" for lang in langs}
@@ -1,5 +1,6 @@
 import pytest
 
+from workers.common import cache
 from workers.common.logging import stage_context
 from workers.pipeline import tasks
 from shared.models import JobStage
@@ -18,13 +19,21 @@ def test_should_skip_stage_only_when_artifacts_ready() -> None:
     assert tasks._should_skip(JobStage.TTS, resume_stage, artifact_ready=True) is False
 
 
-def test_stage_context_records_duration_on_success() -> None:
+@pytest.fixture
+def node_cache(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(cache, "PROC_DIR", tmp_path)
+    monkeypatch.setattr(cache, "LOCK_PATH", tmp_path / ".artifact_cache.lock")
+    monkeypatch.setattr(cache, "PINS_DIR", tmp_path / ".artifact_pins")
+
+
+def test_stage_context_records_duration_on_success(node_cache) -> None:
     with stage_context(job_id="job-1", asset_id="asset-1", stage="TEST") as timer:
-        pass
+        assert cache._pinned_assets() == {"asset-1"}  # protected from eviction while the stage runs
     assert timer.duration_ms is not None
+    assert cache._pinned_assets() == set()
 
 
-def test_stage_context_records_duration_on_failure() -> None:
+def test_stage_context_records_duration_on_failure(node_cache) -> None:
     captured_timer = None
 
     with pytest.raises(RuntimeError):
@@ -0,0 +1,65 @@
+import threading
+from pathlib import Path
+
+import pytest
+
+from workers.mix import publisher as publisher_module
+from workers.mix.publisher import PublishQueue
+
+
+def _patch_publish(monkeypatch, tmp_path: Path, release: threading.Event, fail: str | None = None) -> dict:
+    storage_keys: dict = {}
+
+    def encode(source, output_dir, stem="dubbed"):
+        release.wait(timeout=5)
+        return source
+
+    def publish(asset_id, language, audio_path, public_dir):
+        if language == fail:
+            raise RuntimeError("upload failed")
+        return {"master": f"pub/{asset_id}/master.m3u8", "audio": f"pub/{asset_id}/{language}/dubbed.wav", "bytes": 10}
+
+    def merge(asset_id, updates, defaults=None):
+        for key, value in (defaults or {}).items():
+            storage_keys.setdefault(key, value)
+        storage_keys.update(updates)
+        return dict(storage_keys)
+
+    monkeypatch.setattr(publisher_module, "asset_public_dir", lambda asset_id: tmp_path / "public")
+    monkeypatch.setattr(publisher_module.codecs, "encode_for_publish", encode)
+    monkeypatch.setattr(publisher_module, "publish_track", publish)
+    monkeypatch.setattr(publisher_module.asset_state, "merge_storage_keys", merge)
+    return storage_keys
+
+
+def test_submit_does_not_block_and_merges_keys(tmp_path: Path, monkeypatch) -> None:
+    release = threading.Event()
+    storage_keys = _patch_publish(monkeypatch, tmp_path, release)
+
+    with PublishQueue("asset-1", workers=2) as queue:
+        queue.submit("es", tmp_path / "es.flac")
+        queue.submit("fr", tmp_path / "fr.flac")
+        # Both uploads are still pending: the caller is free to keep mixing.
+        assert "public_es" not in storage_keys
+        release.set()
+        results = queue.wait()
+
+    assert sorted(results) == ["es", "fr"]
+    assert storage_keys["public"] == "pub/asset-1/master.m3u8"
+    assert storage_keys["public_fr"] == "pub/asset-1/fr/dubbed.wav"
+    assert queue.upload_bytes == 20
+
+
+def test_wait_raises_after_other_languages_finish(tmp_path: Path, monkeypatch) -> None:
+    release = threading.Event()
+    release.set()
+    storage_keys = _patch_publish(monkeypatch, tmp_path, release, fail="es")
+
+    with PublishQueue("asset-1", workers=1) as queue:
+        queue.submit("es", tmp_path / "es.flac")
+        queue.submit("fr", tmp_path / "fr.flac")
+        with pytest.raises(RuntimeError):
+            queue.wait()
+
+    assert "public_fr" in storage_keys
+    assert "public_es" not in storage_keys
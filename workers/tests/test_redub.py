@@ -0,0 +1,107 @@
+import json
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from workers.common import codecs, paths
+from workers.config import get_settings
+from workers.mix.assemble import DEFAULT_SR, MIX_INFO, apply_mix_gain, assemble_track, empty_voice_track, place_segment
+from workers.pipeline import redub
+from workers.tts.synth import synthesize_segments
+
+ASSET = "asset-1"
+
+
+def _segments(count: int) -> list[dict]:
+    return [
+        {"idx": idx, "t0": idx * 2.0, "t1": idx * 2.0 + 1.0, "text_src": f"line {idx}", "text_tgt": f"línea {idx}"}
+        for idx in range(count)
+    ]
+
+
+@pytest.fixture(params=["flac", "wav"])
+def dubbed(request, tmp_path: Path, monkeypatch) -> list[dict]:
+    monkeypatch.setattr(paths, "PROC_DIR", tmp_path)
+    monkeypatch.setattr(get_settings(), "artifact_intermediate_format", request.param)
+    segments = _segments(5)
+    paths.translation_segments_path(ASSET, "es").parent.mkdir(parents=True, exist_ok=True)
+    paths.translation_segments_path(ASSET, "es").write_text(json.dumps(segments), encoding="utf-8")
+    renders = synthesize_segments(segments, paths.tts_segment_path(ASSET, "es"), "es")
+    assemble_track(segments, renders, paths.mix_output_dir(ASSET, "es"), source_audio=None, target_language="es")
+    return segments
+
+
+def _louder_tone(segment, output_dir, language, voice_presets=None):
+    duration = float(segment["t1"]) - float(segment["t0"])
+    t = np.linspace(0, duration, int(duration * DEFAULT_SR), False)
+    return codecs.write_intermediate(output_dir / f"seg_{segment['idx']:04d}", 0.5 * np.sin(2 * np.pi * 440 * t), DEFAULT_SR)
+
+
+def test_redub_patches_only_edited_segment(dubbed: list[dict], monkeypatch) -> None:
+    mix_path = paths.mix_output_file(ASSET, "es")
+    before, _ = codecs.read_audio(mix_path)
+    monkeypatch.setattr(redub, "synthesize_segment", _louder_tone)
+
+    result = redub.redub_language(ASSET, "es", {2: "línea corregida"})
+
+    after, _ = codecs.read_audio(result.mix_path)
+    start, end = 2 * 2 * DEFAULT_SR, 3 * 2 * DEFAULT_SR
+    assert result.patched_seconds == pytest.approx(1.0, abs=0.01)
+    np.testing.assert_array_equal(after[:start], before[:start])
+    np.testing.assert_array_equal(after[end:], before[end:])
+
+    # The patched range matches a full re-mix with the stored loudness gain.
+    voice = empty_voice_track(dubbed)
+    tts_dir = paths.tts_segment_path(ASSET, "es")
+    for path, segment in zip(paths.tts_segment_files(tts_dir), dubbed):
+        voice = place_segment(voice, segment, path)
+    gain = json.loads((paths.mix_output_dir(ASSET, "es") / MIX_INFO).read_text())["gain"]
+    expected = apply_mix_gain(voice * get_settings().mix_voice_gain, np.zeros_like(voice), gain)
+    np.testing.assert_allclose(after[start:end], expected[start:end], atol=1e-3)
+
+    translated = json.loads(paths.translation_segments_path(ASSET, "es").read_text(encoding="utf-8"))
+    assert translated[2]["text_tgt"] == "línea corregida"
+    assert len(paths.tts_segment_files(tts_dir)) == 5
+
+
+def test_redub_skips_unknown_segments(dubbed: list[dict], monkeypatch) -> None:
+    monkeypatch.setattr(redub, "synthesize_segment", _louder_tone)
+
+    result = redub.redub_language(ASSET, "es", {42: "nope", 1: "otra"})
+
+    assert result.skipped == [42]
+    assert [segment["idx"] for segment in result.segments] == [1]
+    assert redub.redub_language(ASSET, "es", {42: "nope"}).segments == []
+
+
+def _remixed(segments: list[dict]) -> np.ndarray:
+    voice = empty_voice_track(segments)
+    for path, segment in zip(paths.tts_segment_files(paths.tts_segment_path(ASSET, "es")), segments):
+        voice = place_segment(voice, segment, path)
+    gain = json.loads((paths.mix_output_dir(ASSET, "es") / MIX_INFO).read_text())["gain"]
+    return apply_mix_gain(voice * get_settings().mix_voice_gain, np.zeros_like(voice), gain)
+
+
+@pytest.mark.parametrize("failing", ["_replace_stem", "_install"])
+def test_redub_retry_after_failure_matches_full_remix(dubbed: list[dict], monkeypatch, failing: str) -> None:
+    from workers.mix import patch
+
+    monkeypatch.setattr(redub, "synthesize_segment", _louder_tone)
+    module = patch if failing == "_replace_stem" else redub
+    original = getattr(module, failing)
+
+    def fail_once(*args, **kwargs):
+        monkeypatch.setattr(module, failing, original)
+        raise OSError("disk full")
+
+    monkeypatch.setattr(module, failing, fail_once)
+    with pytest.raises(OSError):
+        redub.redub_language(ASSET, "es", {2: "línea corregida"})
+
+    result = redub.redub_language(ASSET, "es", {2: "línea corregida"})
+
+    after, _ = codecs.read_audio(result.mix_path)
+    expected = _remixed(dubbed)
+    np.testing.assert_allclose(after[: len(expected)], expected, atol=1e-3)
+    assert not (paths.tts_segment_path(ASSET, "es").parent / ".es.redub").exists()
@@ -0,0 +1,112 @@
+import shutil
+from pathlib import Path
+from types import SimpleNamespace
+
+from workers.common import storage
+
+
+class _Response:
+    def __init__(self, payload: bytes) -> None:
+        self._payload = payload
+
+    def stream(self, amt: int):
+        for start in range(0, len(self._payload), amt):
+            yield self._payload[start : start + amt]
+
+    def close(self) -> None:
+        pass
+
+    def release_conn(self) -> None:
+        pass
+
+
+class FakeMinio:
+    def __init__(self) -> None:
+        self.objects: dict[tuple[str, str], bytes] = {}
+        self.uploads: dict[str, dict[int, bytes]] = {}
+        self.bucket_checks = 0
+
+    def bucket_exists(self, bucket: str) -> bool:
+        self.bucket_checks += 1
+        return True
+
+    def stat_object(self, bucket: str, name: str):
+        return SimpleNamespace(size=len(self.objects[(bucket, name)]))
+
+    def get_object(self, bucket: str, name: str, offset: int = 0, length: int = 0):
+        return _Response(self.objects[(bucket, name)][offset : offset + length])
+
+    def _create_multipart_upload(self, bucket: str, name: str, headers: dict) -> str:
+        self.uploads["up-1"] = {}
+        return "up-1"
+
+    def _upload_part(self, bucket, name, data, headers, upload_id, part_number) -> str:
+        self.uploads[upload_id][part_number] = data
+        return f"etag-{part_number}"
+
+    def _complete_multipart_upload(self, bucket, name, upload_id, parts) -> None:
+        chunks = self.uploads.pop(upload_id)
+        self.objects[(bucket, name)] = b"".join(chunks[part.part_number] for part in parts)
+
+
+def test_parallel_multipart_roundtrip(tmp_path: Path, monkeypatch) -> None:
+    fake = FakeMinio()
+    monkeypatch.setattr(storage, "_client", fake)
+    monkeypatch.setattr(storage, "_known_buckets", set())
+    monkeypatch.setattr(storage.settings, "storage_part_size", 1024)
+    monkeypatch.setattr(storage.settings, "storage_concurrency", 4)
+
+    payload = bytes(range(256)) * 20  # 5 KiB -> 5 parts
+    source = tmp_path / "source.bin"
+    source.write_bytes(payload)
+    storage.upload_from_path("raw", "obj", source)
+    assert fake.objects[("raw", "obj")] == payload
+
+    destination = storage.download_to_path("raw", "obj", tmp_path / "copy.bin")
+    assert destination.read_bytes() == payload
+    assert not (tmp_path / "copy.bin.part").exists()
+    assert fake.bucket_checks == 1
+
+
+def test_remote_file_reads_only_needed_blocks(tmp_path: Path, monkeypatch) -> None:
+    import numpy as np
+    import soundfile as sf
+
+    from workers.common import codecs, remote_file
+
+    source = tmp_path / "source.wav"
+    sf.write(source, np.linspace(-0.5, 0.5, 48_000 * 10).astype(np.float32), 48_000, subtype="FLOAT")
+    payload = source.read_bytes()
+    monkeypatch.setattr(storage, "object_fingerprint", lambda bucket, name: (len(payload), "etag"))
+    monkeypatch.setattr(storage, "read_range", lambda bucket, name, offset, length: payload[offset : offset + length])
+
+    reader = remote_file.open_remote("raw", "movie.wav", block_size=64 * 1024, cache_dir=tmp_path / "blocks")
+    clip, sr = codecs.read_window(reader, start_seconds=5.0, duration_seconds=0.5)
+    expected, _ = codecs.read_window(source, start_seconds=5.0, duration_seconds=0.5)
+    assert sr == 48_000
+    assert np.array_equal(clip, expected)
+    assert reader.raw.bytes_fetched < len(payload) // 4
+    assert any((tmp_path / "blocks").rglob("*.blk"))
+
+
+def test_remote_file_refetches_evicted_blocks(tmp_path: Path, monkeypatch) -> None:
+    from workers.common import remote_file
+
+    payload = bytes(range(256)) * 64
+    fetched: list[int] = []
+
+    def read_range(bucket, name, offset, length):
+        fetched.append(offset)
+        return payload[offset : offset + length]
+
+    monkeypatch.setattr(storage, "object_fingerprint", lambda bucket, name: (len(payload), "etag"))
+    monkeypatch.setattr(storage, "read_range", read_range)
+    first = remote_file.RemoteObjectFile("raw", "movie.wav", block_size=1024, memory_blocks=1, cache_dir=tmp_path)
+    assert first.read(10) == payload[:10]
+
+    shutil.rmtree(first.cache_dir)  # evicted by another process on the node
+    second = remote_file.RemoteObjectFile("raw", "movie.wav", block_size=1024, memory_blocks=1, cache_dir=tmp_path)
+    shutil.rmtree(second.cache_dir)
+    assert second.read(2048) == payload[:2048]
+    assert fetched == [0, 0, 1024]
+    assert (second.cache_dir / "00000001.blk").exists()  # the directory is recreated
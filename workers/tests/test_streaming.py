@@ -0,0 +1,66 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from workers.pipeline import streaming
+
+
+def _segments(count: int) -> list[dict]:
+    return [{"idx": idx, "t0": idx * 2.0, "t1": idx * 2.0 + 1.0, "text": f"line {idx}"} for idx in range(count)]
+
+
+@pytest.fixture
+def workspace(tmp_path: Path, monkeypatch) -> Path:
+    monkeypatch.setattr(streaming, "asset_workspace", lambda asset_id: tmp_path)
+    monkeypatch.setattr(streaming, "translation_client", lambda: None)
+    return tmp_path
+
+
+def test_stream_language_emits_window_chunks_and_final_mix(workspace: Path) -> None:
+    result = streaming.stream_language("asset-1", "es", _segments(6), window_seconds=4.0, tts_workers=2)
+
+    assert len(result.chunks) == 3
+    assert result.time_to_first_audio_ms is not None
+    assert result.time_to_first_audio_ms <= result.duration_ms
+    assert result.mix_path.exists()
+    translated = json.loads((workspace / "translations" / "segments_tgt.es.json").read_text(encoding="utf-8"))
+    assert [item["idx"] for item in translated] == list(range(6))
+    state = streaming.SegmentState(streaming.state_path("asset-1", "es"), 6)
+    assert state.count(streaming.MIXED) == 6
+    assert not (workspace / "translations" / "segments_tgt.es.partial.jsonl").exists()
+
+
+def test_stream_language_resumes_rendered_segments(workspace: Path, monkeypatch) -> None:
+    synthesize = streaming.synthesize_segment
+
+    def flaky(segment, *args, **kwargs):
+        if segment["idx"] == 3:
+            raise RuntimeError("tts crashed")
+        return synthesize(segment, *args, **kwargs)
+
+    monkeypatch.setattr(streaming, "synthesize_segment", flaky)
+    with pytest.raises(RuntimeError):
+        streaming.stream_language("asset-1", "es", _segments(4), window_seconds=4.0, tts_workers=1)
+
+    monkeypatch.setattr(streaming, "synthesize_segment", synthesize)
+    result = streaming.stream_language("asset-1", "es", _segments(4), window_seconds=4.0, tts_workers=1)
+    assert result.reused == 3
+    assert result.mix_path.exists()
+
+
+def test_segment_state_appends_one_line_per_transition(tmp_path: Path) -> None:
+    path = tmp_path / "es.state"
+    state = streaming.SegmentState(path, 1000)
+    for position in range(1000):
+        for status in (streaming.TRANSLATED, streaming.RENDERED, streaming.MIXED):
+            state.set(position, status)
+    state.set(0, streaming.MIXED)  # unchanged; nothing written
+    with path.open("a", encoding="utf-8") as handle:
+        handle.write("12")  # torn tail of an interrupted append
+
+    assert len(path.read_text(encoding="utf-8").splitlines()) == 1 + 3000 + 1
+    reloaded = streaming.SegmentState(path, 1000)
+    assert reloaded.count(streaming.MIXED) == 1000
+    assert len(path.read_text(encoding="utf-8").splitlines()) == 1 + 1000  # compacted
+    assert streaming.SegmentState(path, 999).count(streaming.TRANSLATED) == 0  # other segment list
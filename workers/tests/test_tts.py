@@ -1,5 +1,10 @@
+import json
 from pathlib import Path
 
+import pytest
+
+from workers.common import artifacts, paths
+from workers.tts import synth
 from workers.tts.synth import synthesize_segments
 
 
@@ -13,3 +18,46 @@ def test_synthesize_segments(tmp_path: Path) -> None:
     for path in generated:
         assert path.exists()
         assert path.stat().st_size > 0
+
+
+_synthesize_segment = synth.synthesize_segment
+
+
+def _crash_at(idx: int, calls: list[int]):
+    def synthesize(segment, output_dir, language, voice_presets=None):
+        calls.append(segment["idx"])
+        if segment["idx"] == idx:
+            raise RuntimeError("TTS worker died")
+        return _synthesize_segment(segment, output_dir, language, voice_presets)
+
+    return synthesize
+
+
+def test_retry_resumes_from_checkpoint(tmp_path: Path, monkeypatch) -> None:
+    segments = [{"idx": idx, "t0": float(idx), "t1": idx + 0.5, "text_tgt": f"línea {idx}"} for idx in range(5)]
+    calls: list[int] = []
+    monkeypatch.setattr(synth, "synthesize_segment", _crash_at(3, calls))
+    with pytest.raises(RuntimeError):
+        synth.synthesize_segments(segments, tmp_path / "es", target_language="es")
+
+    calls.clear()
+    monkeypatch.setattr(synth, "synthesize_segment", _crash_at(-1, calls))
+    (tmp_path / "es" / "seg_0001.flac").write_bytes(b"corrupt")  # a damaged render is redone
+    segments[0]["text_tgt"] = "línea corregida"  # so is one whose input changed
+    generated = synth.synthesize_segments(segments, tmp_path / "es", target_language="es")
+    assert calls == [0, 1, 3, 4]
+    assert [path.name for path in generated] == [f"seg_{idx:04d}.flac" for idx in range(5)]
+
+
+def test_partial_tts_output_is_not_complete(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setattr(paths, "PROC_DIR", tmp_path)
+    monkeypatch.setattr(artifacts, "_available", lambda *args, **kwargs: True)
+    segments = [{"idx": idx, "t0": float(idx), "t1": idx + 0.5, "text_tgt": f"línea {idx}"} for idx in range(4)]
+    translations = paths.translation_segments_path("asset-1", "es")
+    translations.parent.mkdir(parents=True)
+    translations.write_text(json.dumps(segments), encoding="utf-8")
+    synth.synthesize_segments(segments[:2], paths.tts_segment_path("asset-1", "es"), target_language="es")
+    assert artifacts.missing_tts_segments("asset-1", ["es"]) == ["es"]
+
+    synth.synthesize_segments(segments, paths.tts_segment_path("asset-1", "es"), target_language="es")
+    assert artifacts.missing_tts_segments("asset-1", ["es"]) == []
@@ -0,0 +1,105 @@
+"""Per-segment TTS checkpoint, so a retried TTS stage resumes where it stopped.
+
+Every finished render is recorded as one JSON line in
+`tts/<lang>.checkpoint.jsonl` (next to the segment directory, so it is not
+published as an artifact): the segment index, a hash of everything the render
+depends on (text, timing, speaker, voice presets, engine, format) and the
+SHA-256 of the written file. A render is reused only when both hashes still
+match. A line is appended only after its file is completely written, and a line
+cut short by a crash is ignored. On load the journal is compacted, rewritten to
+a temp file and moved into place with `os.replace`.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+from shared.models import JobStage
+
+from ..common.manifest import file_sha256, stage_config
+
+_INPUT_FIELDS = ("t0", "t1", "text_tgt", "text_src", "speakerId")
+
+
+def checkpoint_path(output_dir: Path) -> Path:
+    return output_dir.parent / f"{output_dir.name}.checkpoint.jsonl"
+
+
+class SegmentCheckpoint:
+    def __init__(self, output_dir: Path, target_language: str, voice_presets: Optional[Dict[str, str]] = None) -> None:
+        self.output_dir = output_dir
+        self.path = checkpoint_path(output_dir)
+        self._config = {"language": target_language, **stage_config(JobStage.TTS, voice_presets)}
+        self._lock = threading.Lock()
+        self._entries: Dict[int, dict] = {}
+        self.reused = 0
+        if self.path.exists():
+            for line in self.path.read_text(encoding="utf-8").splitlines():
+                try:
+                    entry = json.loads(line)
+                    self._entries[int(entry["idx"])] = entry
+                except (ValueError, KeyError, TypeError):
+                    continue  # torn tail of an interrupted append
+            self._compact()
+
+    @property
+    def exists(self) -> bool:
+        return self.path.exists()
+
+    def input_hash(self, segment: dict) -> str:
+        payload = {"config": self._config, "segment": {key: segment.get(key) for key in _INPUT_FIELDS}}
+        return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+    def _matching(self, segment: dict) -> Optional[dict]:
+        entry = self._entries.get(int(segment["idx"]))
+        if entry is None or entry.get("input") != self.input_hash(segment):
+            return None
+        return entry
+
+    def covers(self, segments: Iterable[dict]) -> bool:
+        """Whether every segment has a current render (size check only; `completed` verifies hashes)."""
+        for segment in segments:
+            entry = self._matching(segment)
+            render = self.output_dir / entry["file"] if entry else None
+            if render is None or not render.exists() or render.stat().st_size != entry.get("size"):
+                return False
+        return True
+
+    def completed(self, segment: dict) -> Optional[Path]:
+        """The existing render of `segment` if it is still valid, else None."""
+        entry = self._matching(segment)
+        if entry is None:
+            return None
+        render = self.output_dir / entry["file"]
+        if not render.exists() or file_sha256(render) != entry.get("sha256"):
+            return None
+        self.reused += 1
+        return render
+
+    def record(self, segment: dict, render: Path) -> None:
+        entry = {
+            "idx": int(segment["idx"]),
+            "input": self.input_hash(segment),
+            "file": render.name,
+            "sha256": file_sha256(render),
+            "size": render.stat().st_size,
+        }
+        line = json.dumps(entry, sort_keys=True) + "\n"
+        with self._lock:
+            self._entries[entry["idx"]] = entry
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("a", encoding="utf-8") as handle:
+                handle.write(line)
+
+    def _compact(self) -> None:
+        tmp_path = self.path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(
+            "".join(json.dumps(self._entries[idx], sort_keys=True) + "\n" for idx in sorted(self._entries)),
+            encoding="utf-8",
+        )
+        os.replace(tmp_path, self.path)
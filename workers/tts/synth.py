@@ -10,7 +10,11 @@ from typing import Dict, List
 import numpy as np
 import soundfile as sf
 
+from ..common import codecs
+from ..common.cancellation import checkpoint
+from ..common.paths import intermediate_suffix
 from ..config import get_settings
+from .checkpoint import SegmentCheckpoint
 
 DEFAULT_SR = 48000
 PIPER_MIN_TEMPO = 0.90
@@ -111,7 +115,55 @@ def _write_fallback(segment: dict, output_path: Path, preset: str | None) -> Non
     elif preset == "elderly_male":
         freq = 160.0
     waveform = _tone(duration, freq=freq)
-    sf.write(output_path, waveform, DEFAULT_SR)
+    codecs.write_intermediate(output_path, waveform, DEFAULT_SR)
+
+
+def synthesize_segment(
+    segment: dict,
+    output_dir: Path,
+    target_language: str,
+    voice_presets: Dict[str, str] | None = None,
+) -> Path:
+    voice_presets = voice_presets or {}
+    speaker_id = segment.get("speakerId") or "default"
+    preset_key = voice_presets.get(speaker_id) or voice_presets.get("default") or speaker_id
+    voice_choice = _resolve_voice(target_language, preset_key)
+    final_path = output_dir / f"seg_{segment['idx']:04d}{intermediate_suffix()}"
+
+    if voice_choice is None:
+        _log.warning("Falling back to synthetic tone for segment %s", segment["idx"])
+        _write_fallback(segment, final_path, preset_key)
+        return final_path
+
+    model_path, config_path = voice_choice
+    with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tmp_file:
+        tmp_path = Path(tmp_file.name)
+
+    try:
+        target_duration = _segments_duration(segment)
+        length_scale = None
+        if preset_key in {"elderly_male", "elderly_female"}:
+            length_scale = 1.15
+        elif preset_key == "female_bright":
+            length_scale = 0.95
+
+        text = segment.get("text_tgt") or segment.get("text_src") or ""
+        _synthesize_with_piper(text, model_path, config_path, tmp_path, length_scale)
+        info = sf.info(tmp_path.as_posix())
+        current_duration = info.frames / info.samplerate if info.samplerate else target_duration
+        tempo = target_duration / current_duration if current_duration else None
+        if tempo is not None:
+            tempo = max(PIPER_MIN_TEMPO, min(PIPER_MAX_TEMPO, tempo))
+        _render_with_ffmpeg(tmp_path, final_path, tempo)
+        codecs.drop_stale_variants(final_path)
+    except Exception as exc:  # pragma: no cover - dependent on external binaries
+        _log.warning("Piper synthesis failed (%s); using fallback tone", exc)
+        _write_fallback(segment, final_path, preset_key)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+    return final_path
 
 
 def synthesize_segments(
@@ -121,48 +173,15 @@ def synthesize_segments(
     voice_presets: Dict[str, str] | None = None,
 ) -> List[Path]:
     output_dir.mkdir(parents=True, exist_ok=True)
-    voice_presets = voice_presets or {}
-    generated_paths: List[Path] = []
-
+    state = SegmentCheckpoint(output_dir, target_language, voice_presets)
+    paths = []
     for segment in translated_segments:
-        speaker_id = segment.get("speakerId") or "default"
-        preset_key = voice_presets.get(speaker_id) or voice_presets.get("default") or speaker_id
-        voice_choice = _resolve_voice(target_language, preset_key)
-        final_path = output_dir / f"seg_{segment['idx']:04d}.wav"
-
-        if voice_choice is None:
-            _log.warning("Falling back to synthetic tone for segment %s", segment["idx"])
-            _write_fallback(segment, final_path, preset_key)
-            generated_paths.append(final_path)
-            continue
-
-        model_path, config_path = voice_choice
-        with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tmp_file:
-            tmp_path = Path(tmp_file.name)
-
-        try:
-            target_duration = _segments_duration(segment)
-            length_scale = None
-            if preset_key in {"elderly_male", "elderly_female"}:
-                length_scale = 1.15
-            elif preset_key == "female_bright":
-                length_scale = 0.95
-
-            text = segment.get("text_tgt") or segment.get("text_src") or ""
-            _synthesize_with_piper(text, model_path, config_path, tmp_path, length_scale)
-            info = sf.info(tmp_path.as_posix())
-            current_duration = info.frames / info.samplerate if info.samplerate else target_duration
-            tempo = target_duration / current_duration if current_duration else None
-            if tempo is not None:
-                tempo = max(PIPER_MIN_TEMPO, min(PIPER_MAX_TEMPO, tempo))
-            _render_with_ffmpeg(tmp_path, final_path, tempo)
-        except Exception as exc:  # pragma: no cover - dependent on external binaries
-            _log.warning("Piper synthesis failed (%s); using fallback tone", exc)
-            _write_fallback(segment, final_path, preset_key)
-        finally:
-            if tmp_path.exists():
-                tmp_path.unlink()
-
-        generated_paths.append(final_path)
-
-    return generated_paths
+        checkpoint()
+        path = state.completed(segment)
+        if path is None:
+            path = synthesize_segment(segment, output_dir, target_language, voice_presets)
+            state.record(segment, path)
+        paths.append(path)
+    if state.reused:
+        _log.info("Resumed TTS for %s: %d/%d segments reused", target_language, state.reused, len(paths))
+    return paths